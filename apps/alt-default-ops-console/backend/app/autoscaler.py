@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+ApplyFunc = Callable[[str, str, int, bool], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class AutoscalerPolicy:
+    """Bounds and damping for warm pool targets.
+
+    ``lead_time_seconds`` is how long a consumed warm sandbox takes to be
+    replaced; the pool has to cover the claims expected in that window.
+    """
+
+    min_replicas: int = 0
+    max_replicas: int = 5
+    lead_time_seconds: float = 120.0
+    headroom: float = 1.25
+    half_life_seconds: float = 300.0
+    min_demand: float = 0.2
+    scale_up_cooldown_seconds: float = 30.0
+    scale_down_delay_seconds: float = 600.0
+    scale_down_hysteresis: int = 1
+
+    def bounded(self, replicas: int) -> int:
+        return max(self.min_replicas, min(self.max_replicas, replicas))
+
+
+class DemandForecaster:
+    """Per-template EWMA of claim arrival rate (claims per second).
+
+    The smoothing factor is derived from the elapsed time and a half-life so
+    forecasts do not depend on how often the controller ticks.
+    """
+
+    def __init__(self, half_life_seconds: float) -> None:
+        self.half_life_seconds = max(float(half_life_seconds), 1.0)
+        self.rates: dict[str, float] = {}
+
+    def observe(self, template: str, arrivals: int, elapsed_seconds: float) -> float:
+        elapsed = max(float(elapsed_seconds), 1e-3)
+        alpha = 1.0 - 0.5 ** (elapsed / self.half_life_seconds)
+        previous = self.rates.get(template)
+        instant = arrivals / elapsed
+        rate = instant if previous is None else previous + alpha * (instant - previous)
+        self.rates[template] = rate
+        return rate
+
+
+@dataclass
+class _TemplateState:
+    last_scale_up_at: float = -math.inf
+    below_since: float | None = None
+
+
+class WarmPoolAutoscaler:
+    """Turns observed claim arrivals into warm pool replica targets.
+
+    ``evaluate`` takes the ``warm_pool_profiles`` and ``sandboxclaims_detailed``
+    rows of an overview snapshot. In ``dry_run`` mode decisions are recorded
+    but ``apply`` is never called.
+    """
+
+    def __init__(
+        self,
+        policy: AutoscalerPolicy,
+        apply: ApplyFunc,
+        *,
+        dry_run: bool = True,
+        templates: Iterable[str] = (),
+        history: int = 200,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.policy = policy
+        self.dry_run = dry_run
+        self.templates = frozenset(templates)
+        self.forecaster = DemandForecaster(policy.half_life_seconds)
+        self.decisions: deque[dict[str, Any]] = deque(maxlen=max(int(history), 1))
+        self._apply = apply
+        self._clock = clock
+        self._seen_claims: set[str] | None = None
+        self._last_tick: float | None = None
+        self._states: dict[str, _TemplateState] = {}
+        self.ticks = 0
+        self.errors = 0
+        self.last_error = ""
+
+    def _arrivals(self, claims: list[dict[str, Any]]) -> dict[str, int]:
+        names = {str(claim.get("name") or "") for claim in claims}
+        seen = self._seen_claims
+        self._seen_claims = names
+        if seen is None:
+            # First tick: existing claims are backlog, not new demand.
+            return {}
+        arrivals: dict[str, int] = {}
+        for claim in claims:
+            if str(claim.get("name") or "") in seen:
+                continue
+            template = str(claim.get("template") or "")
+            arrivals[template] = arrivals.get(template, 0) + 1
+        return arrivals
+
+    def _decide(
+        self,
+        profile: dict[str, Any],
+        *,
+        arrivals: int,
+        rate: float,
+        now: float,
+    ) -> dict[str, Any]:
+        policy = self.policy
+        template = str(profile.get("template_name") or "")
+        pools = profile.get("pools") or []
+        current = int(profile.get("total_replicas") or 0)
+        expected = rate * policy.lead_time_seconds * policy.headroom
+        raw_target = math.ceil(expected) if expected >= policy.min_demand else 0
+        target = policy.bounded(raw_target)
+        state = self._states.setdefault(template, _TemplateState())
+
+        desired = current
+        if target > current:
+            state.below_since = None
+            if now - state.last_scale_up_at >= policy.scale_up_cooldown_seconds:
+                desired = target
+                reason = (
+                    f"forecast {expected:.2f} claims per "
+                    f"{policy.lead_time_seconds:.0f}s lead time exceeds "
+                    f"{current} replicas"
+                )
+            else:
+                reason = "scale-up cooldown active"
+        elif target <= current - policy.scale_down_hysteresis:
+            if state.below_since is None:
+                state.below_since = now
+            waited = now - state.below_since
+            if waited >= policy.scale_down_delay_seconds:
+                desired = target
+                state.below_since = None
+                reason = (
+                    f"forecast {expected:.2f} stayed below {current} replicas "
+                    f"for {waited:.0f}s"
+                )
+            else:
+                reason = (
+                    f"scale-down pending ({waited:.0f}/"
+                    f"{policy.scale_down_delay_seconds:.0f}s below target)"
+                )
+        else:
+            state.below_since = None
+            reason = "within hysteresis band"
+
+        if current < policy.min_replicas or current > policy.max_replicas:
+            desired = policy.bounded(current)
+            reason = (
+                f"replicas outside bounds [{policy.min_replicas}, "
+                f"{policy.max_replicas}]"
+            )
+
+        if desired > current:
+            state.last_scale_up_at = now
+        action = "hold"
+        if desired > current:
+            action = "scale_up"
+        elif desired < current:
+            action = "scale_down"
+        return {
+            "at": now,
+            "template": template,
+            "warm_pool": str(
+                (pools[0].get("name") if pools else "")
+                or profile.get("default_warm_pool_name")
+                or ""
+            ),
+            "pool_exists": bool(pools),
+            "arrivals": arrivals,
+            "forecast_per_minute": round(rate * 60.0, 4),
+            "target": target,
+            "current": current,
+            "desired": desired,
+            "action": action,
+            "reason": reason,
+            "applied": False,
+            "error": "",
+        }
+
+    async def evaluate(
+        self,
+        profiles: list[dict[str, Any]],
+        claims: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        now = self._clock()
+        elapsed = 0.0 if self._last_tick is None else now - self._last_tick
+        self._last_tick = now
+        arrivals = self._arrivals(claims)
+        self.ticks += 1
+        if elapsed <= 0:
+            return []
+
+        decisions: list[dict[str, Any]] = []
+        for profile in profiles:
+            template = str(profile.get("template_name") or "")
+            if self.templates and template not in self.templates:
+                continue
+            count = arrivals.get(template, 0)
+            rate = self.forecaster.observe(template, count, elapsed)
+            decision = self._decide(profile, arrivals=count, rate=rate, now=now)
+            if decision["action"] != "hold" and not self.dry_run:
+                try:
+                    await self._apply(
+                        decision["warm_pool"],
+                        template,
+                        decision["desired"],
+                        decision["pool_exists"],
+                    )
+                    decision["applied"] = True
+                except Exception as exc:
+                    self.errors += 1
+                    self.last_error = str(exc)
+                    decision["error"] = str(exc)
+            decisions.append(decision)
+            if decision["action"] != "hold" or decision["arrivals"]:
+                self.decisions.append(decision)
+        return decisions
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "policy": asdict(self.policy),
+            "templates": sorted(self.templates),
+            "ticks": self.ticks,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "forecast_per_minute": {
+                template: round(rate * 60.0, 4)
+                for template, rate in sorted(self.forecaster.rates.items())
+            },
+            "decisions": list(reversed(self.decisions)),
+        }
+
+
+class AutoscalerLoop:
+    """Runs ``WarmPoolAutoscaler.evaluate`` on an interval."""
+
+    def __init__(
+        self,
+        autoscaler: WarmPoolAutoscaler,
+        collect: Callable[[], Awaitable[dict[str, Any]]],
+        *,
+        interval_seconds: float,
+    ) -> None:
+        self.autoscaler = autoscaler
+        self._collect = collect
+        self.interval_seconds = max(float(interval_seconds), 1.0)
+        self._task: asyncio.Task[None] | None = None
+
+    async def tick(self) -> list[dict[str, Any]]:
+        try:
+            payload = await self._collect()
+        except Exception as exc:
+            self.autoscaler.errors += 1
+            self.autoscaler.last_error = str(exc)
+            return []
+        return await self.autoscaler.evaluate(
+            payload.get("warm_pool_profiles") or [],
+            payload.get("sandboxclaims_detailed") or [],
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await self.tick()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            **self.autoscaler.status(),
+        }
+
+
+def load_trace(path: str | Path) -> list[tuple[float, str]]:
+    """Read claim arrivals from JSON lines ``{"ts": <seconds>, "template": ...}``."""
+    arrivals: list[tuple[float, str]] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        arrivals.append((float(row["ts"]), str(row["template"])))
+    arrivals.sort(key=lambda item: item[0])
+    return arrivals
+
+
+def simulate_trace(
+    arrivals: list[tuple[float, str]],
+    policy: AutoscalerPolicy,
+    *,
+    tick_seconds: float = 30.0,
+    initial_replicas: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """Replay claim arrivals against a modelled warm pool.
+
+    Each claim takes a ready warm sandbox if one exists (a warm hit) and
+    otherwise cold-starts. Consumed or newly added replicas become ready
+    ``policy.lead_time_seconds`` later. ``replica_seconds`` is the idle warm
+    capacity paid for, the cost side of the hit rate.
+    """
+    if not arrivals:
+        return {"claims": 0, "warm_hits": 0, "cold_starts": 0, "hit_rate": 0.0}
+    templates = sorted({template for _, template in arrivals})
+    replicas = {t: int((initial_replicas or {}).get(t, 0)) for t in templates}
+    ready = dict(replicas)
+    refills: list[tuple[float, str]] = []
+    clock = {"now": arrivals[0][0]}
+
+    async def apply(_: str, template: str, desired: int, __: bool) -> None:
+        delta = desired - replicas[template]
+        replicas[template] = desired
+        if delta > 0:
+            ready_at = clock["now"] + policy.lead_time_seconds
+            refills.extend((ready_at, template) for _ in range(delta))
+        else:
+            ready[template] = min(ready[template], desired)
+
+    autoscaler = WarmPoolAutoscaler(
+        policy, apply, dry_run=False, history=10_000, clock=lambda: clock["now"]
+    )
+    claims: list[dict[str, Any]] = []
+    stats = {"claims": 0, "warm_hits": 0, "cold_starts": 0, "replica_seconds": 0.0}
+    scale_events = 0
+
+    def settle(until: float) -> None:
+        refills.sort()
+        while refills and refills[0][0] <= until:
+            _, template = refills.pop(0)
+            ready[template] = min(ready[template] + 1, replicas[template])
+
+    index = 0
+    now = arrivals[0][0]
+    end = arrivals[-1][0] + tick_seconds
+    loop = asyncio.new_event_loop()
+    try:
+        while now <= end:
+            tick_end = now + tick_seconds
+            while index < len(arrivals) and arrivals[index][0] < tick_end:
+                at, template = arrivals[index]
+                settle(at)
+                stats["claims"] += 1
+                if ready[template] > 0:
+                    ready[template] -= 1
+                    stats["warm_hits"] += 1
+                    refills.append((at + policy.lead_time_seconds, template))
+                else:
+                    stats["cold_starts"] += 1
+                claims.append({"name": f"claim-{index}", "template": template})
+                index += 1
+            settle(tick_end)
+            stats["replica_seconds"] += sum(ready.values()) * tick_seconds
+            now = clock["now"] = tick_end
+            profiles = [
+                {
+                    "template_name": template,
+                    "default_warm_pool_name": f"{template}-warmpool",
+                    "total_replicas": replicas[template],
+                    "pools": [],
+                }
+                for template in templates
+            ]
+            decisions = loop.run_until_complete(autoscaler.evaluate(profiles, claims))
+            scale_events += sum(1 for d in decisions if d["action"] != "hold")
+    finally:
+        loop.close()
+
+    hit_rate = stats["warm_hits"] / stats["claims"] if stats["claims"] else 0.0
+    return {
+        **stats,
+        "hit_rate": round(hit_rate, 4),
+        "scale_events": scale_events,
+        "final_replicas": replicas,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay a claim arrival trace against the warm pool autoscaler."
+    )
+    parser.add_argument("trace", help="JSON lines file with ts and template fields")
+    parser.add_argument("--tick-seconds", type=float, default=30.0)
+    parser.add_argument("--min-replicas", type=int, default=0)
+    parser.add_argument("--max-replicas", type=int, default=5)
+    parser.add_argument("--lead-time-seconds", type=float, default=120.0)
+    parser.add_argument("--half-life-seconds", type=float, default=300.0)
+    parser.add_argument("--headroom", type=float, default=1.25)
+    args = parser.parse_args(argv)
+    policy = AutoscalerPolicy(
+        min_replicas=args.min_replicas,
+        max_replicas=args.max_replicas,
+        lead_time_seconds=args.lead_time_seconds,
+        half_life_seconds=args.half_life_seconds,
+        headroom=args.headroom,
+    )
+    result = simulate_trace(
+        load_trace(args.trace), policy, tick_seconds=args.tick_seconds
+    )
+    print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
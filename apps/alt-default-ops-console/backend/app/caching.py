@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    fetched_at: float
+
+
+class StaleWhileRevalidateCache:
+    """Small async response cache with request coalescing.
+
+    Fresh entries are returned directly. Entries past ``ttl_seconds`` but within
+    ``stale_seconds`` are returned immediately while one background refresh runs.
+    Concurrent misses for the same key share a single upstream fetch. Failed
+    fetches are not cached.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = max(float(ttl_seconds), 0.0)
+        self.stale_seconds = max(float(stale_seconds), 0.0)
+        self.max_entries = max(int(max_entries), 1)
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._background: set[asyncio.Task[Any]] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh_errors = 0
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = _CacheEntry(value=value, fetched_at=self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _fetch_and_store(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            value = await fetch()
+            self._store(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_shared(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # The fetch runs in a task owned by the cache, so cancelling the
+            # caller that started it does not cancel the callers sharing it.
+            task = asyncio.create_task(self._fetch_and_store(key, fetch))
+            # Mark failures retrieved so an unobserved one does not log a warning.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        if key in self._inflight:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._fetch_shared(key, fetch)
+            except Exception:
+                self.refresh_errors += 1
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            if age < self.ttl_seconds:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return entry.value
+        self.misses += 1
+        return await self._fetch_shared(key, fetch)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refresh_errors": self.refresh_errors,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
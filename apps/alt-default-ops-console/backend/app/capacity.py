@@ -0,0 +1,544 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .kube_objects import get_field, node_pool, parse_timestamp, pod_requests
+from .pricing import parse_cpu_cores, parse_quantity_gib
+
+# Taint effects that keep pods without a matching toleration off a node.
+_BLOCKING_EFFECTS = frozenset({"NoSchedule", "NoExecute"})
+_DEFAULT_MAX_PODS = 110
+
+# Scheduler messages look like "0/5 nodes are available: 2 Insufficient cpu,
+# 3 node(s) had untolerated taint {sandbox.gke.io/runtime: gvisor}. ..."
+_SCHEDULER_CLAUSE = re.compile(r"(\d+)\s+([^,.]+)")
+_CAUSE_PATTERNS = (
+    ("cpu", "insufficient cpu"),
+    ("memory", "insufficient memory"),
+    ("pods", "too many pods"),
+    ("taint", "taint"),
+    ("selector", "affinity/selector"),
+    ("selector", "node affinity"),
+    ("unschedulable", "unschedulable"),
+    ("not_ready", "not-ready"),
+    ("not_ready", "not ready"),
+    ("runtime_class", "runtimeclass"),
+    ("volume", "volume"),
+)
+
+
+def _cause(text: str) -> str:
+    lowered = text.lower()
+    for cause, needle in _CAUSE_PATTERNS:
+        if needle in lowered:
+            return cause
+    return "other"
+
+
+def scheduling_causes(message: str) -> dict[str, int]:
+    """Count nodes per rejection cause in a FailedScheduling message."""
+    _, _, detail = str(message or "").partition("available:")
+    # Drop trailing sentences such as "preemption: 0/3 nodes are available."
+    detail = detail.split(". ", 1)[0]
+    causes: dict[str, int] = {}
+    for count, text in _SCHEDULER_CLAUSE.findall(detail):
+        cause = _cause(text)
+        causes[cause] = causes.get(cause, 0) + int(count)
+    if not causes and message:
+        causes[_cause(str(message))] = 0
+    return causes
+
+
+@dataclass(frozen=True)
+class _Taint:
+    key: str
+    value: str
+    effect: str
+
+
+@dataclass(frozen=True)
+class _Toleration:
+    key: str
+    operator: str
+    value: str
+    effect: str
+
+    def tolerates(self, taint: _Taint) -> bool:
+        if self.effect and self.effect != taint.effect:
+            return False
+        if self.operator == "Exists":
+            return not self.key or self.key == taint.key
+        return self.key == taint.key and self.value == taint.value
+
+
+@dataclass(frozen=True)
+class _Node:
+    node_pool: str
+    labels: tuple[tuple[str, str], ...]
+    taints: tuple[_Taint, ...]
+    ready: bool
+    unschedulable: bool
+    allocatable_cpu: float
+    allocatable_memory_gib: float
+    max_pods: int
+
+
+@dataclass(frozen=True)
+class _Pod:
+    node: str
+    cpu_cores: float
+    memory_gib: float
+
+
+@dataclass
+class _Pending:
+    namespace: str
+    name: str
+    sandbox: str
+    cpu_cores: float
+    memory_gib: float
+    since: float | None
+    reason: str = ""
+    message: str = ""
+    event_message: str = ""
+    event_count: int = 0
+    event_at: float | None = None
+
+
+@dataclass(frozen=True)
+class _Template:
+    cpu_cores: float
+    memory_gib: float
+    node_selector: tuple[tuple[str, str], ...]
+    tolerations: tuple[_Toleration, ...]
+    runtime_class: str
+
+
+@dataclass
+class _Usage:
+    cpu_cores: float = 0.0
+    memory_gib: float = 0.0
+    pods: int = 0
+    keys: set[str] = field(default_factory=set)
+
+
+def _node_info(node: Any) -> _Node:
+    labels = get_field(node, "metadata", "labels") or {}
+    allocatable = get_field(node, "status", "allocatable") or {}
+    ready = any(
+        get_field(condition, "type") == "Ready"
+        and str(get_field(condition, "status")) == "True"
+        for condition in get_field(node, "status", "conditions") or []
+    )
+    taints = tuple(
+        _Taint(
+            key=str(get_field(taint, "key") or ""),
+            value=str(get_field(taint, "value") or ""),
+            effect=str(get_field(taint, "effect") or ""),
+        )
+        for taint in get_field(node, "spec", "taints") or []
+    )
+    max_pods = int(parse_cpu_cores(allocatable.get("pods")) or _DEFAULT_MAX_PODS)
+    return _Node(
+        node_pool=node_pool(node),
+        labels=tuple(sorted((str(k), str(v)) for k, v in labels.items())),
+        taints=taints,
+        ready=ready,
+        unschedulable=bool(get_field(node, "spec", "unschedulable")),
+        allocatable_cpu=parse_cpu_cores(allocatable.get("cpu")),
+        allocatable_memory_gib=parse_quantity_gib(allocatable.get("memory")),
+        max_pods=max_pods,
+    )
+
+
+def _template_info(template: Any) -> _Template:
+    pod_spec = get_field(template, "spec", "podTemplate", "spec") or {}
+    cpu_cores, memory_gib = pod_requests(pod_spec)
+    selector = get_field(pod_spec, "nodeSelector") or {}
+    return _Template(
+        cpu_cores=cpu_cores,
+        memory_gib=memory_gib,
+        node_selector=tuple(sorted((str(k), str(v)) for k, v in selector.items())),
+        tolerations=tuple(
+            _Toleration(
+                key=str(get_field(item, "key") or ""),
+                operator=str(get_field(item, "operator") or "Equal"),
+                value=str(get_field(item, "value") or ""),
+                effect=str(get_field(item, "effect") or ""),
+            )
+            for item in get_field(pod_spec, "tolerations") or []
+        ),
+        runtime_class=str(get_field(pod_spec, "runtimeClassName") or ""),
+    )
+
+
+def _sandbox_owner(pod: Any) -> str:
+    for owner in get_field(pod, "metadata", "ownerReferences") or []:
+        if get_field(owner, "kind") == "Sandbox":
+            return str(get_field(owner, "name") or "")
+    return ""
+
+
+def _scheduled_condition(pod: Any) -> tuple[str, str, float | None]:
+    for condition in get_field(pod, "status", "conditions") or []:
+        if get_field(condition, "type") == "PodScheduled":
+            return (
+                str(get_field(condition, "reason") or ""),
+                str(get_field(condition, "message") or ""),
+                parse_timestamp(get_field(condition, "lastTransitionTime")),
+            )
+    return "", "", None
+
+
+def _blocked_by(template: _Template, node: _Node) -> str:
+    """Why ``template`` pods cannot land on ``node`` at all ("" if they can)."""
+    if not node.ready:
+        return "not_ready"
+    if node.unschedulable:
+        return "unschedulable"
+    labels = dict(node.labels)
+    if any(labels.get(key) != value for key, value in template.node_selector):
+        return "selector"
+    for taint in node.taints:
+        if taint.effect in _BLOCKING_EFFECTS and not any(
+            toleration.tolerates(taint) for toleration in template.tolerations
+        ):
+            return "taint"
+    return ""
+
+
+def _fits(template: _Template, node: _Node, usage: _Usage) -> tuple[int, str]:
+    """Whole template-sized pods that still fit on the node, and the limit."""
+    limits = {"pods": max(node.max_pods - usage.pods, 0)}
+    if template.cpu_cores > 0:
+        free = max(node.allocatable_cpu - usage.cpu_cores, 0.0)
+        limits["cpu"] = int(free / template.cpu_cores + 1e-9)
+    if template.memory_gib > 0:
+        free = max(node.allocatable_memory_gib - usage.memory_gib, 0.0)
+        limits["memory"] = int(free / template.memory_gib + 1e-9)
+    limit = min(limits, key=lambda name: (limits[name], name))
+    return limits[limit], limit
+
+
+class CapacityTracker:
+    """Per-node-pool headroom for each sandbox template, fed by watch events.
+
+    Node allocatable and the requests of scheduled pods are kept per node, so
+    an event only adjusts the node it touches. A snapshot then answers "how
+    many more sandboxes of each template fit right now" by checking every
+    template's node selector, tolerations and requests against each node.
+    Pending pods are reported with their PodScheduled reason and the latest
+    FailedScheduling event, broken down by cause.
+
+    Only pods the console watches (the sandbox namespace) count as used, so
+    DaemonSet and system pods are not subtracted from node allocatable.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._nodes: dict[str, _Node] = {}
+        self._usage: dict[str, _Usage] = {}
+        self._pods: dict[str, _Pod] = {}
+        self._pending: dict[str, _Pending] = {}
+        self._templates: dict[str, _Template] = {}
+        self._events: dict[str, tuple[str, int, float | None]] = {}
+        self._version = 0
+        self._snapshot_version = -1
+        self._snapshot: dict[str, Any] = {}
+        self.last_event_at: float | None = None
+
+    def _release(self, key: str) -> None:
+        pod = self._pods.pop(key, None)
+        if pod is None:
+            return
+        usage = self._usage.get(pod.node)
+        if usage is None:
+            return
+        usage.cpu_cores -= pod.cpu_cores
+        usage.memory_gib -= pod.memory_gib
+        usage.pods -= 1
+        usage.keys.discard(key)
+        if not usage.keys:
+            del self._usage[pod.node]
+
+    def observe_node(self, event_type: str, node: Any) -> None:
+        name = str(get_field(node, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            if event_type == "DELETED":
+                if self._nodes.pop(name, None) is None:
+                    return
+            else:
+                info = _node_info(node)
+                if self._nodes.get(name) == info:
+                    return
+                self._nodes[name] = info
+            self._version += 1
+
+    def observe_pod(self, event_type: str, pod: Any) -> None:
+        namespace = str(get_field(pod, "metadata", "namespace") or "")
+        name = str(get_field(pod, "metadata", "name") or "")
+        key = f"{namespace}/{name}"
+        phase = str(get_field(pod, "status", "phase") or "")
+        node = str(get_field(pod, "spec", "nodeName") or "")
+        with self._lock:
+            previous = self._pods.get(key)
+            was_pending = key in self._pending
+            if event_type == "DELETED" or phase in {"Succeeded", "Failed"}:
+                if previous is None and not was_pending:
+                    return
+                self._release(key)
+                self._pending.pop(key, None)
+                self._version += 1
+                return
+
+            cpu_cores, memory_gib = pod_requests(get_field(pod, "spec"))
+            if node:
+                self._pending.pop(key, None)
+                current = _Pod(node=node, cpu_cores=cpu_cores, memory_gib=memory_gib)
+                if current == previous and not was_pending:
+                    return
+                self._release(key)
+                self._pods[key] = current
+                usage = self._usage.setdefault(node, _Usage())
+                usage.cpu_cores += cpu_cores
+                usage.memory_gib += memory_gib
+                usage.pods += 1
+                usage.keys.add(key)
+            else:
+                self._release(key)
+                reason, message, since = _scheduled_condition(pod)
+                entry = self._pending.get(key)
+                if entry is None:
+                    entry = self._pending[key] = _Pending(
+                        namespace=namespace,
+                        name=name,
+                        sandbox=_sandbox_owner(pod),
+                        cpu_cores=cpu_cores,
+                        memory_gib=memory_gib,
+                        since=since,
+                    )
+                    event = self._events.get(key)
+                    if event is not None:
+                        entry.event_message, entry.event_count, entry.event_at = event
+                entry.reason, entry.message = reason, message
+                entry.since = since or entry.since
+            self._version += 1
+
+    def observe_template(self, event_type: str, template: Any) -> None:
+        name = str(get_field(template, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            if event_type == "DELETED":
+                if self._templates.pop(name, None) is None:
+                    return
+            else:
+                info = _template_info(template)
+                if self._templates.get(name) == info:
+                    return
+                self._templates[name] = info
+            self._version += 1
+
+    def observe_event(self, event_type: str, event: Any) -> None:
+        if get_field(event, "reason") != "FailedScheduling":
+            return
+        if get_field(event, "involvedObject", "kind") != "Pod":
+            return
+        namespace = str(
+            get_field(event, "involvedObject", "namespace")
+            or get_field(event, "metadata", "namespace")
+            or ""
+        )
+        key = f"{namespace}/{get_field(event, 'involvedObject', 'name') or ''}"
+        with self._lock:
+            if event_type == "DELETED":
+                self._events.pop(key, None)
+                return
+            seen = parse_timestamp(
+                get_field(event, "lastTimestamp")
+                or get_field(event, "eventTime")
+                or get_field(event, "metadata", "creationTimestamp")
+            )
+            current = self._events.get(key)
+            if current is not None and (current[2] or 0) > (seen or 0):
+                return
+            record = (
+                str(get_field(event, "message") or ""),
+                int(get_field(event, "count") or 1),
+                seen,
+            )
+            self._events[key] = record
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry.event_message, entry.event_count, entry.event_at = record
+                self._version += 1
+
+    def handle(self, kind: str, event_type: str, obj: Any, _old: Any) -> None:
+        if kind not in {"nodes", "pods", "templates", "events"}:
+            return
+        self.last_event_at = self._clock()
+        if kind == "nodes":
+            self.observe_node(event_type, obj)
+        elif kind == "pods":
+            self.observe_pod(event_type, obj)
+        elif kind == "templates":
+            self.observe_template(event_type, obj)
+        else:
+            self.observe_event(event_type, obj)
+
+    def load(self, objects: dict[str, list[Any]]) -> None:
+        """Feed a full listing; used when no informers are running."""
+        for kind in ("nodes", "templates", "events", "pods"):
+            for obj in objects.get(kind) or []:
+                self.handle(kind, "ADDED", obj, None)
+
+    def _node_pools(self) -> list[dict[str, Any]]:
+        pools: dict[str, dict[str, Any]] = {}
+        for name, node in self._nodes.items():
+            usage = self._usage.get(name) or _Usage()
+            pool = pools.setdefault(
+                node.node_pool,
+                {
+                    "node_pool": node.node_pool,
+                    "nodes": 0,
+                    "ready_nodes": 0,
+                    "allocatable_cpu": 0.0,
+                    "requested_cpu": 0.0,
+                    "allocatable_memory_gib": 0.0,
+                    "requested_memory_gib": 0.0,
+                    "max_pods": 0,
+                    "pods": 0,
+                    "taints": set(),
+                },
+            )
+            pool["nodes"] += 1
+            pool["ready_nodes"] += int(node.ready and not node.unschedulable)
+            pool["allocatable_cpu"] += node.allocatable_cpu
+            pool["requested_cpu"] += usage.cpu_cores
+            pool["allocatable_memory_gib"] += node.allocatable_memory_gib
+            pool["requested_memory_gib"] += usage.memory_gib
+            pool["max_pods"] += node.max_pods
+            pool["pods"] += usage.pods
+            pool["taints"].update(
+                f"{t.key}={t.value}:{t.effect}"
+                for t in node.taints
+                if t.effect in _BLOCKING_EFFECTS
+            )
+        rows = []
+        for pool in sorted(pools.values(), key=lambda item: item["node_pool"]):
+            pool["free_cpu"] = max(pool["allocatable_cpu"] - pool["requested_cpu"], 0.0)
+            pool["free_memory_gib"] = max(
+                pool["allocatable_memory_gib"] - pool["requested_memory_gib"], 0.0
+            )
+            pool["taints"] = sorted(pool["taints"])
+            rows.append(pool)
+        return rows
+
+    def _headroom(self, name: str, template: _Template) -> dict[str, Any]:
+        pools: dict[str, dict[str, Any]] = {}
+        for node_name, node in self._nodes.items():
+            pool = pools.setdefault(
+                node.node_pool,
+                {
+                    "node_pool": node.node_pool,
+                    "fits": 0,
+                    "eligible_nodes": 0,
+                    "limited_by": {},
+                    "blocked_nodes": {},
+                },
+            )
+            blocked = _blocked_by(template, node)
+            if blocked:
+                counts = pool["blocked_nodes"]
+                counts[blocked] = counts.get(blocked, 0) + 1
+                continue
+            fits, limit = _fits(template, node, self._usage.get(node_name) or _Usage())
+            pool["eligible_nodes"] += 1
+            pool["fits"] += fits
+            pool["limited_by"][limit] = pool["limited_by"].get(limit, 0) + 1
+        by_pool = sorted(pools.values(), key=lambda item: item["node_pool"])
+        limited_by: dict[str, int] = {}
+        for pool in by_pool:
+            for limit, count in pool["limited_by"].items():
+                limited_by[limit] = limited_by.get(limit, 0) + count
+        blocked_nodes: dict[str, int] = {}
+        for pool in by_pool:
+            for reason, count in pool["blocked_nodes"].items():
+                blocked_nodes[reason] = blocked_nodes.get(reason, 0) + count
+        return {
+            "template": name,
+            "cpu_cores": template.cpu_cores,
+            "memory_gib": template.memory_gib,
+            "runtime_class": template.runtime_class or None,
+            "fits_now": sum(pool["fits"] for pool in by_pool),
+            "eligible_nodes": sum(pool["eligible_nodes"] for pool in by_pool),
+            "limited_by": (
+                min(limited_by, key=lambda k: (-limited_by[k], k))
+                if limited_by
+                else ("no_eligible_nodes" if self._nodes else "no_nodes")
+            ),
+            "blocked_nodes": blocked_nodes,
+            "by_node_pool": [pool for pool in by_pool if pool["eligible_nodes"]],
+        }
+
+    def _pending_rows(self, now: float, limit: int) -> dict[str, Any]:
+        causes: dict[str, int] = {}
+        rows = []
+        for entry in self._pending.values():
+            message = entry.event_message or entry.message
+            pod_causes = scheduling_causes(message) if message else {}
+            for cause in pod_causes:
+                causes[cause] = causes.get(cause, 0) + 1
+            rows.append(
+                {
+                    "name": entry.name,
+                    "namespace": entry.namespace,
+                    "sandbox": entry.sandbox or None,
+                    "cpu_cores": entry.cpu_cores,
+                    "memory_gib": entry.memory_gib,
+                    "reason": entry.reason or None,
+                    "message": message or None,
+                    "causes": pod_causes,
+                    "failed_scheduling_count": entry.event_count,
+                    "pending_seconds": (
+                        round(max(now - entry.since, 0.0), 1) if entry.since else None
+                    ),
+                }
+            )
+        rows.sort(key=lambda row: (-(row["pending_seconds"] or 0.0), row["name"]))
+        return {
+            "count": len(rows),
+            "sandboxes": sum(1 for row in rows if row["sandbox"]),
+            "causes": dict(sorted(causes.items(), key=lambda item: -item[1])),
+            "pods": rows[:limit],
+        }
+
+    def snapshot(self, *, pending_limit: int = 50) -> dict[str, Any]:
+        with self._lock:
+            if self._snapshot_version != self._version:
+                self._snapshot = {
+                    "node_pools": self._node_pools(),
+                    "templates": [
+                        self._headroom(name, template)
+                        for name, template in sorted(self._templates.items())
+                    ],
+                }
+                self._snapshot_version = self._version
+            static = self._snapshot
+            pending = self._pending_rows(self._clock(), pending_limit)
+            stats = {
+                "nodes": len(self._nodes),
+                "scheduled_pods": len(self._pods),
+                "templates": len(self._templates),
+                "version": self._version,
+                "last_event_at": self.last_event_at,
+            }
+        return {**static, "pending": pending, "stats": stats}
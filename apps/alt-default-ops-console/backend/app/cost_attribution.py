@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .kube_objects import (
+    claim_sandbox_name,
+    get_field,
+    node_pool,
+    node_price_key,
+    pod_requests,
+)
+from .pricing import PricingTable, parse_cpu_cores, parse_quantity_gib, request_share
+
+UNCLAIMED = "(unclaimed)"
+UNKNOWN = "(unknown)"
+
+
+@dataclass
+class _NodeCost:
+    hourly_usd: float | None
+    allocatable_cpu: float
+    allocatable_memory_gib: float
+    node_pool: str
+
+
+@dataclass
+class _PodCost:
+    node: str
+    sandbox: str
+    cpu_cores: float
+    memory_gib: float
+    hourly_usd: float = 0.0
+
+
+def _node_cost(pricing: PricingTable, node: Any) -> _NodeCost:
+    allocatable = get_field(node, "status", "allocatable") or {}
+    return _NodeCost(
+        hourly_usd=pricing.node_hourly(**node_price_key(node)),
+        allocatable_cpu=parse_cpu_cores(allocatable.get("cpu")),
+        allocatable_memory_gib=parse_quantity_gib(allocatable.get("memory")),
+        node_pool=node_pool(node),
+    )
+
+
+def _pod_cost(pod: Any) -> _PodCost | None:
+    node = str(get_field(pod, "spec", "nodeName") or "")
+    if not node or get_field(pod, "status", "phase") in {"Succeeded", "Failed"}:
+        return None
+    sandbox = ""
+    for owner in get_field(pod, "metadata", "ownerReferences") or []:
+        if get_field(owner, "kind") == "Sandbox":
+            sandbox = str(get_field(owner, "name") or "")
+            break
+    cpu_cores, memory_gib = pod_requests(get_field(pod, "spec"))
+    return _PodCost(
+        node=node, sandbox=sandbox, cpu_cores=cpu_cores, memory_gib=memory_gib
+    )
+
+
+class CostAttributor:
+    """Apportions node hourly cost to sandbox pods and rolls it up by owner.
+
+    Each pod is charged ``node_hourly * request_share`` (mean of its CPU and
+    memory request shares of node allocatable). Informer events update only
+    the pods they touch: a pod event reprices that pod, a node event reprices
+    the pods on that node. Per-sandbox rows are rebuilt lazily when something
+    changed; owner rollups join them with the SRA claim owner index per call.
+    """
+
+    def __init__(
+        self, pricing: PricingTable, *, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.pricing = pricing
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._nodes: dict[str, _NodeCost] = {}
+        self._pods: dict[str, _PodCost] = {}
+        self._pods_by_node: dict[str, set[str]] = {}
+        self._claim_templates: dict[str, str] = {}
+        self._claim_sandbox: dict[str, str] = {}
+        self._sandbox_claim: dict[str, str] = {}
+        self._version = 0
+        self._rows_version = -1
+        self._rows: list[dict[str, Any]] = []
+        self.pod_recomputations = 0
+        self.last_event_at: float | None = None
+
+    def _reprice(self, key: str) -> None:
+        pod = self._pods[key]
+        node = self._nodes.get(pod.node)
+        pod.hourly_usd = 0.0
+        if node is not None and node.hourly_usd is not None:
+            pod.hourly_usd = node.hourly_usd * request_share(
+                pod.cpu_cores,
+                pod.memory_gib,
+                node.allocatable_cpu,
+                node.allocatable_memory_gib,
+            )
+        self.pod_recomputations += 1
+
+    def _drop_pod(self, key: str) -> None:
+        pod = self._pods.pop(key, None)
+        if pod is not None:
+            keys = self._pods_by_node.get(pod.node)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._pods_by_node[pod.node]
+
+    def observe_node(self, event_type: str, node: Any) -> None:
+        name = str(get_field(node, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            if event_type == "DELETED":
+                self._nodes.pop(name, None)
+            else:
+                cost = _node_cost(self.pricing, node)
+                if self._nodes.get(name) == cost:
+                    return
+                self._nodes[name] = cost
+            for key in self._pods_by_node.get(name, ()):
+                self._reprice(key)
+            self._version += 1
+
+    def observe_pod(self, event_type: str, pod: Any) -> None:
+        namespace = str(get_field(pod, "metadata", "namespace") or "")
+        key = f"{namespace}/{get_field(pod, 'metadata', 'name') or ''}"
+        with self._lock:
+            cost = None if event_type == "DELETED" else _pod_cost(pod)
+            previous = self._pods.get(key)
+            if (
+                cost is not None
+                and previous is not None
+                and (cost.node, cost.sandbox, cost.cpu_cores, cost.memory_gib)
+                == (
+                    previous.node,
+                    previous.sandbox,
+                    previous.cpu_cores,
+                    previous.memory_gib,
+                )
+            ):
+                return
+            self._drop_pod(key)
+            if cost is not None:
+                self._pods[key] = cost
+                self._pods_by_node.setdefault(cost.node, set()).add(key)
+                self._reprice(key)
+            elif previous is None:
+                return
+            self._version += 1
+
+    def observe_claim(self, event_type: str, claim: Any) -> None:
+        name = str(get_field(claim, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            previous_sandbox = self._claim_sandbox.pop(name, "")
+            if self._sandbox_claim.get(previous_sandbox) == name:
+                del self._sandbox_claim[previous_sandbox]
+            if event_type == "DELETED":
+                self._claim_templates.pop(name, None)
+            else:
+                self._claim_templates[name] = str(
+                    get_field(claim, "spec", "sandboxTemplateRef", "name") or ""
+                )
+                sandbox = claim_sandbox_name(claim)
+                if sandbox:
+                    self._claim_sandbox[name] = sandbox
+                    self._sandbox_claim[sandbox] = name
+            self._version += 1
+
+    def observe_sandbox(self, event_type: str, sandbox: Any) -> None:
+        name = str(get_field(sandbox, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            if event_type == "DELETED":
+                self._sandbox_claim.pop(name, None)
+            else:
+                claim = str(
+                    get_field(sandbox, "spec", "sandboxClaimRef", "name")
+                    or get_field(sandbox, "status", "sandboxClaimRef", "name")
+                    or ""
+                )
+                if not claim or self._sandbox_claim.get(name) == claim:
+                    return
+                self._sandbox_claim[name] = claim
+                self._claim_sandbox[claim] = name
+            self._version += 1
+
+    def handle(self, kind: str, event_type: str, obj: Any, _old: Any) -> None:
+        if kind not in {"nodes", "pods", "claims", "sandboxes"}:
+            return
+        self.last_event_at = self._clock()
+        if kind == "nodes":
+            self.observe_node(event_type, obj)
+        elif kind == "pods":
+            self.observe_pod(event_type, obj)
+        elif kind == "claims":
+            self.observe_claim(event_type, obj)
+        else:
+            self.observe_sandbox(event_type, obj)
+
+    def load(self, objects: dict[str, list[Any]]) -> None:
+        """Feed a full listing; used when no informers are running."""
+        for kind in ("nodes", "claims", "sandboxes", "pods"):
+            for obj in objects.get(kind) or []:
+                self.handle(kind, "ADDED", obj, None)
+
+    def _sandbox_rows(self) -> list[dict[str, Any]]:
+        if self._rows_version == self._version:
+            return self._rows
+        rows: dict[str, dict[str, Any]] = {}
+        for pod in self._pods.values():
+            if not pod.sandbox:
+                continue
+            row = rows.get(pod.sandbox)
+            if row is None:
+                claim = self._sandbox_claim.get(pod.sandbox, "")
+                node = self._nodes.get(pod.node)
+                row = rows[pod.sandbox] = {
+                    "sandbox": pod.sandbox,
+                    "claim": claim or None,
+                    "template": self._claim_templates.get(claim, "") or UNKNOWN,
+                    "node": pod.node,
+                    "node_pool": node.node_pool if node else "unknown",
+                    "pods": 0,
+                    "cpu_cores": 0.0,
+                    "memory_gib": 0.0,
+                    "hourly_usd": 0.0,
+                }
+            row["pods"] += 1
+            row["cpu_cores"] += pod.cpu_cores
+            row["memory_gib"] += pod.memory_gib
+            row["hourly_usd"] += pod.hourly_usd
+        self._rows = sorted(rows.values(), key=lambda r: -float(r["hourly_usd"]))
+        self._rows_version = self._version
+        return self._rows
+
+    def snapshot(
+        self,
+        *,
+        claim_owner_index: dict[str, dict[str, Any]] | None = None,
+        top: int = 20,
+    ) -> dict[str, Any]:
+        owners = claim_owner_index or {}
+        with self._lock:
+            rows = self._sandbox_rows()
+            node_total = sum(
+                node.hourly_usd or 0.0 for node in self._nodes.values()
+            )
+            pod_total = sum(pod.hourly_usd for pod in self._pods.values())
+            pods = len(self._pods)
+            nodes = len(self._nodes)
+            version = self._version
+
+        groups: dict[str, dict[tuple[str, ...], dict[str, Any]]] = {
+            "user": {},
+            "template": {},
+            "session": {},
+        }
+        sandboxes: list[dict[str, Any]] = []
+        for row in rows:
+            claim = row["claim"]
+            owner = owners.get(claim or "") or {}
+            user_id = str(owner.get("user_id") or (UNKNOWN if claim else UNCLAIMED))
+            session_id = str(
+                owner.get("session_id") or (UNKNOWN if claim else UNCLAIMED)
+            )
+            template = str(row["template"] if claim else UNCLAIMED)
+            keys = {
+                "user": (user_id,),
+                "template": (template,),
+                "session": (session_id, user_id),
+            }
+            for group, key in keys.items():
+                entry = groups[group].setdefault(
+                    key,
+                    {
+                        "sandboxes": 0,
+                        "cpu_cores": 0.0,
+                        "memory_gib": 0.0,
+                        "hourly_usd": 0.0,
+                    },
+                )
+                entry["sandboxes"] += 1
+                entry["cpu_cores"] += row["cpu_cores"]
+                entry["memory_gib"] += row["memory_gib"]
+                entry["hourly_usd"] += row["hourly_usd"]
+            if len(sandboxes) < top:
+                sandboxes.append(
+                    {**row, "user_id": user_id, "session_id": session_id}
+                )
+
+        def ranked(group: str, fields: tuple[str, ...]) -> list[dict[str, Any]]:
+            items = [
+                {**dict(zip(fields, key)), **entry}
+                for key, entry in groups[group].items()
+            ]
+            items.sort(key=lambda item: -float(item["hourly_usd"]))
+            return items[:top]
+
+        sandbox_total = sum(float(row["hourly_usd"]) for row in rows)
+        return {
+            "currency": self.pricing.currency,
+            "period": "hour",
+            "catalog_version": self.pricing.version,
+            "node_hourly_total_usd": node_total,
+            "sandbox_hourly_usd": sandbox_total,
+            "other_pods_hourly_usd": max(pod_total - sandbox_total, 0.0),
+            "unallocated_hourly_usd": max(node_total - pod_total, 0.0),
+            "by_user": ranked("user", ("user_id",)),
+            "by_template": ranked("template", ("template",)),
+            "by_session": ranked("session", ("session_id", "user_id")),
+            "top_sandboxes": sandboxes,
+            "stats": {
+                "nodes": nodes,
+                "pods": pods,
+                "sandboxes": len(rows),
+                "version": version,
+                "pod_recomputations": self.pod_recomputations,
+                "last_event_at": self.last_event_at,
+            },
+        }
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .kube_objects import get_field, parse_timestamp
+
+# Dedup key: (namespace, involvedObject kind, involvedObject name, reason).
+EventKey = tuple[str, str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_groups (
+    namespace TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    source TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (namespace, kind, name, reason)
+);
+CREATE INDEX IF NOT EXISTS event_groups_reason ON event_groups (reason, last_seen);
+CREATE INDEX IF NOT EXISTS event_groups_kind ON event_groups (kind, last_seen);
+CREATE INDEX IF NOT EXISTS event_groups_last_seen ON event_groups (last_seen);
+"""
+
+_UPSERT = """
+INSERT INTO event_groups
+    (namespace, kind, name, reason, type, message, source, count, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (namespace, kind, name, reason) DO UPDATE SET
+    type = excluded.type,
+    message = excluded.message,
+    source = excluded.source,
+    count = excluded.count,
+    first_seen = MIN(event_groups.first_seen, excluded.first_seen),
+    last_seen = MAX(event_groups.last_seen, excluded.last_seen)
+"""
+
+_COLUMNS = (
+    "namespace",
+    "kind",
+    "name",
+    "reason",
+    "type",
+    "message",
+    "source",
+    "count",
+    "first_seen",
+    "last_seen",
+)
+
+
+@dataclass
+class EventGroup:
+    namespace: str
+    kind: str
+    name: str
+    reason: str
+    type: str
+    message: str
+    source: str
+    count: int
+    first_seen: float
+    last_seen: float
+
+    @property
+    def key(self) -> EventKey:
+        return (self.namespace, self.kind, self.name, self.reason)
+
+    def row(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, column) for column in _COLUMNS)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {column: getattr(self, column) for column in _COLUMNS}
+
+
+def _event_count(event: Any) -> int:
+    series = get_field(event, "series", "count")
+    return max(int(series or get_field(event, "count") or 1), 1)
+
+
+def _event_time(event: Any, *fields: str) -> float | None:
+    for name in fields:
+        value = parse_timestamp(get_field(event, name))
+        if value is not None:
+            return value
+    return parse_timestamp(get_field(event, "metadata", "creationTimestamp"))
+
+
+class EventIndex:
+    """Deduplicated Kubernetes Events, searchable by reason, kind and time.
+
+    Events are grouped by involved object and reason. Each Event object's
+    ``count`` (or ``series.count``) is tracked by uid, so MODIFIED events add
+    only the new occurrences. The most recently seen ``max_entries`` groups
+    stay in memory; with a ``path`` every group is also upserted into SQLite
+    (in batches) and kept for ``retention_seconds`` after Kubernetes has
+    expired the Event itself.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str | None = None,
+        max_entries: int = 5000,
+        retention_seconds: float = 7 * 86400,
+        flush_interval_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self.retention_seconds = max(float(retention_seconds), 60.0)
+        self.flush_interval_seconds = max(float(flush_interval_seconds), 0.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._groups: OrderedDict[EventKey, EventGroup] = OrderedDict()
+        self._event_counts: OrderedDict[str, int] = OrderedDict()
+        self._dirty: dict[EventKey, EventGroup] = {}
+        self._last_flush = clock()
+        self._db: sqlite3.Connection | None = None
+        self.path = path or None
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+        self.events = 0
+        self.occurrences = 0
+        self.flushes = 0
+        self.pruned = 0
+        self.last_error = ""
+
+    def observe(self, event: Any) -> None:
+        uid = str(get_field(event, "metadata", "uid") or "")
+        namespace = str(
+            get_field(event, "involvedObject", "namespace")
+            or get_field(event, "metadata", "namespace")
+            or ""
+        )
+        key: EventKey = (
+            namespace,
+            str(get_field(event, "involvedObject", "kind") or ""),
+            str(get_field(event, "involvedObject", "name") or ""),
+            str(get_field(event, "reason") or ""),
+        )
+        count = _event_count(event)
+        now = self._clock()
+        last_seen = _event_time(event, "lastTimestamp", "eventTime") or now
+        first_seen = _event_time(event, "firstTimestamp", "eventTime") or last_seen
+        source = str(
+            get_field(event, "source", "component")
+            or get_field(event, "reportingComponent")
+            or ""
+        )
+        with self._lock:
+            previous = self._event_counts.pop(uid, 0) if uid else 0
+            if uid:
+                self._event_counts[uid] = max(count, previous)
+                while len(self._event_counts) > self.max_entries * 4:
+                    self._event_counts.popitem(last=False)
+            added = max(count - previous, 0)
+            if not added:
+                return
+            group = self._groups.pop(key, None) or self._dirty.get(key)
+            if group is None and self._db is not None:
+                group = self._load_group(key)
+                # After a restart the uid counts are gone; an Event no newer
+                # than the stored group was already counted before.
+                if group is not None and not previous and last_seen <= group.last_seen:
+                    self._groups[key] = group
+                    return
+            self.events += 1
+            self.occurrences += added
+            if group is None:
+                group = EventGroup(
+                    *key,
+                    type="",
+                    message="",
+                    source="",
+                    count=0,
+                    first_seen=first_seen,
+                    last_seen=last_seen,
+                )
+            group.count += added
+            group.first_seen = min(group.first_seen, first_seen)
+            if last_seen >= group.last_seen or not group.message:
+                group.type = str(get_field(event, "type") or group.type or "Normal")
+                group.message = str(get_field(event, "message") or "")
+                group.source = source
+            group.last_seen = max(group.last_seen, last_seen)
+            self._groups[key] = group
+            while len(self._groups) > self.max_entries:
+                self._groups.popitem(last=False)
+            if self._db is not None:
+                self._dirty[key] = group
+                if now - self._last_flush >= self.flush_interval_seconds:
+                    self._flush_locked(now)
+
+    def handle(self, kind: str, event_type: str, obj: Any, _old: Any) -> None:
+        # Kubernetes deletes Events after its TTL; the index keeps the history.
+        if kind == "events" and event_type != "DELETED":
+            self.observe(obj)
+
+    def load(self, events: Iterable[Any]) -> None:
+        for event in events:
+            self.observe(event)
+
+    def _load_group(self, key: EventKey) -> EventGroup | None:
+        row = self._db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM event_groups "
+            "WHERE namespace = ? AND kind = ? AND name = ? AND reason = ?",
+            key,
+        ).fetchone()
+        return EventGroup(*row) if row else None
+
+    def _flush_locked(self, now: float) -> None:
+        self._last_flush = now
+        if self._db is None or not self._dirty:
+            return
+        rows = [group.row() for group in self._dirty.values()]
+        self._dirty.clear()
+        try:
+            with self._db:
+                self._db.executemany(_UPSERT, rows)
+                cursor = self._db.execute(
+                    "DELETE FROM event_groups WHERE last_seen < ?",
+                    (now - self.retention_seconds,),
+                )
+            self.pruned += max(cursor.rowcount, 0)
+            self.flushes += 1
+        except sqlite3.Error as exc:
+            self.last_error = str(exc)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked(self._clock())
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked(self._clock())
+            db, self._db = self._db, None
+        if db is not None:
+            db.close()
+
+    def query(
+        self,
+        *,
+        reason: str | None = None,
+        kind: str | None = None,
+        name: str | None = None,
+        event_type: str | None = None,
+        since: float | None = None,
+        limit: int = 100,
+    ) -> dict[str, Any]:
+        """Matching groups (latest first) plus totals by reason and kind."""
+        filters = {
+            "reason": reason,
+            "kind": kind,
+            "name": name,
+            "type": event_type,
+        }
+        with self._lock:
+            if self._db is not None:
+                self._flush_locked(self._clock())
+                return self._query_db(filters, since, limit)
+            groups = [
+                group
+                for group in self._groups.values()
+                if (since is None or group.last_seen >= since)
+                and all(
+                    value is None or getattr(group, field) == value
+                    for field, value in filters.items()
+                )
+            ]
+        groups.sort(key=lambda group: -group.last_seen)
+        by_reason: dict[tuple[str, str], dict[str, Any]] = {}
+        by_kind: dict[str, dict[str, Any]] = {}
+        for group in groups:
+            entries = (
+                by_reason.setdefault(
+                    (group.reason, group.type),
+                    {"reason": group.reason, "type": group.type},
+                ),
+                by_kind.setdefault(group.kind, {"kind": group.kind}),
+            )
+            for entry in entries:
+                entry["groups"] = entry.get("groups", 0) + 1
+                entry["count"] = entry.get("count", 0) + group.count
+                entry["last_seen"] = max(entry.get("last_seen", 0.0), group.last_seen)
+        return self._result(
+            [group.as_dict() for group in groups[:limit]],
+            list(by_reason.values()),
+            list(by_kind.values()),
+            total_groups=len(groups),
+        )
+
+    def _query_db(
+        self, filters: dict[str, str | None], since: float | None, limit: int
+    ) -> dict[str, Any]:
+        clauses = [f"{field} = ?" for field, value in filters.items() if value]
+        params: list[Any] = [value for value in filters.values() if value]
+        if since is not None:
+            clauses.append("last_seen >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        db = self._db
+        rows = db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM event_groups {where} "
+            "ORDER BY last_seen DESC LIMIT ?",
+            (*params, max(int(limit), 0)),
+        ).fetchall()
+        by_reason = db.execute(
+            "SELECT reason, type, COUNT(*), SUM(count), MAX(last_seen) "
+            f"FROM event_groups {where} GROUP BY reason, type",
+            params,
+        ).fetchall()
+        by_kind = db.execute(
+            "SELECT kind, COUNT(*), SUM(count), MAX(last_seen) "
+            f"FROM event_groups {where} GROUP BY kind",
+            params,
+        ).fetchall()
+        return self._result(
+            [dict(zip(_COLUMNS, row)) for row in rows],
+            [
+                {
+                    "reason": reason,
+                    "type": type_,
+                    "groups": groups,
+                    "count": count,
+                    "last_seen": last_seen,
+                }
+                for reason, type_, groups, count, last_seen in by_reason
+            ],
+            [
+                {"kind": kind, "groups": groups, "count": count, "last_seen": last_seen}
+                for kind, groups, count, last_seen in by_kind
+            ],
+            total_groups=sum(row[2] for row in by_reason),
+        )
+
+    @staticmethod
+    def _result(
+        groups: list[dict[str, Any]],
+        by_reason: list[dict[str, Any]],
+        by_kind: list[dict[str, Any]],
+        *,
+        total_groups: int,
+    ) -> dict[str, Any]:
+        by_reason.sort(key=lambda item: (-item["count"], item["reason"]))
+        by_kind.sort(key=lambda item: (-item["count"], item["kind"]))
+        return {
+            "total_groups": total_groups,
+            "total_count": sum(item["count"] for item in by_reason),
+            "by_reason": by_reason,
+            "by_kind": by_kind,
+            "groups": groups,
+        }
+
+    def summarize(
+        self, objects: dict[str, list[tuple[str, str]]], *, since: float | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Roll up in-memory groups for each named set of (kind, name) objects.
+
+        Used to attach events to overview rows, e.g. a claim's own events plus
+        those of its sandbox and pod. Names without events are left out.
+        """
+        by_object: dict[tuple[str, str], list[EventGroup]] = {}
+        with self._lock:
+            for group in self._groups.values():
+                if since is None or group.last_seen >= since:
+                    by_object.setdefault((group.kind, group.name), []).append(group)
+        summaries: dict[str, dict[str, Any]] = {}
+        for owner, keys in objects.items():
+            groups = [group for key in keys for group in by_object.get(key, ())]
+            if not groups:
+                continue
+            latest = max(groups, key=lambda group: group.last_seen)
+            reasons: dict[str, int] = {}
+            for group in groups:
+                reasons[group.reason] = reasons.get(group.reason, 0) + group.count
+            summaries[owner] = {
+                "count": sum(group.count for group in groups),
+                "warnings": sum(
+                    group.count for group in groups if group.type == "Warning"
+                ),
+                "reasons": reasons,
+                "last_reason": latest.reason,
+                "last_message": latest.message,
+                "last_seen": latest.last_seen,
+            }
+        return summaries
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "groups_in_memory": len(self._groups),
+                "max_entries": self.max_entries,
+                "persistent": self._db is not None,
+                "path": self.path,
+                "retention_seconds": self.retention_seconds,
+                "events": self.events,
+                "occurrences": self.occurrences,
+                "pending_writes": len(self._dirty),
+                "flushes": self.flushes,
+                "pruned": self.pruned,
+                "last_error": self.last_error,
+            }
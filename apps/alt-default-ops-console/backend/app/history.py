@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+METRICS: tuple[str, ...] = (
+    "nodes_total",
+    "nodes_ready",
+    "pods_running",
+    "pods_pending",
+    "pods_failed",
+    "claims_total",
+    "claims_ready",
+    "sandboxes_ready",
+    "warm_pool_replicas",
+    "warm_pool_ready",
+    "total_hourly_usd",
+)
+
+_MAGIC = b"OPSHIST1"
+# magic, capacity, metric count, head, count, metric-names field
+_HEADER = struct.Struct("<8sIIII512s")
+_RANGE_PATTERN = re.compile(r"^(\d+)([smhd]?)$")
+_RANGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_range_seconds(value: str) -> int:
+    match = _RANGE_PATTERN.match(str(value or "").strip().lower())
+    if not match:
+        raise ValueError(f"Invalid range: {value!r} (use e.g. 3600, 30m, 24h, 7d)")
+    seconds = int(match.group(1)) * _RANGE_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError("Range must be positive")
+    return seconds
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    index = max(math.ceil(0.95 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class HistoryStore:
+    """Fixed-capacity columnar ring buffer of metric samples.
+
+    The layout is one uint32 timestamp column plus one float32 column per
+    metric, so a month of 15s samples for every metric in ``METRICS`` is about
+    8 MB. With a ``path`` the columns live in a memory-mapped file and survive
+    restarts; without one they live in an anonymous buffer.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        metrics: tuple[str, ...] = METRICS,
+        path: str | None = None,
+    ) -> None:
+        self.capacity = max(int(capacity), 1)
+        self.metrics = tuple(metrics)
+        self._metric_index = {name: i for i, name in enumerate(self.metrics)}
+        self._names_field = ",".join(self.metrics).encode("utf-8")
+        if len(self._names_field) > 512:
+            raise ValueError("Metric names do not fit the history header")
+        self._lock = threading.Lock()
+        self._size = _HEADER.size + 4 * self.capacity * (1 + len(self.metrics))
+        self._file = None
+        self._buffer: Any
+        if path:
+            self._buffer = self._open_mapped(Path(path))
+        else:
+            self._buffer = bytearray(self._size)
+            self._write_header(0, 0)
+        view = memoryview(self._buffer)
+        offset = _HEADER.size
+        column_bytes = 4 * self.capacity
+        self._timestamps = view[offset : offset + column_bytes].cast("I")
+        self._columns = []
+        for i in range(len(self.metrics)):
+            start = offset + column_bytes * (i + 1)
+            self._columns.append(view[start : start + column_bytes].cast("f"))
+        self._head, self._count = self._read_header()
+
+    def _open_mapped(self, path: Path) -> mmap.mmap:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not path.exists() or path.stat().st_size != self._size
+        if not fresh:
+            with path.open("rb") as handle:
+                raw = handle.read(_HEADER.size)
+            magic, capacity, metric_count, _, _, names = _HEADER.unpack(raw)
+            fresh = (
+                magic != _MAGIC
+                or capacity != self.capacity
+                or metric_count != len(self.metrics)
+                or names.rstrip(b"\0") != self._names_field
+            )
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fresh:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self._size)
+            mapped = mmap.mmap(fd, self._size)
+        finally:
+            os.close(fd)
+        self._file = path
+        if fresh:
+            self._buffer = mapped
+            self._write_header(0, 0)
+        return mapped
+
+    def _write_header(self, head: int, count: int) -> None:
+        _HEADER.pack_into(
+            self._buffer,
+            0,
+            _MAGIC,
+            self.capacity,
+            len(self.metrics),
+            head,
+            count,
+            self._names_field,
+        )
+
+    def _read_header(self) -> tuple[int, int]:
+        _, _, _, head, count, _ = _HEADER.unpack_from(self._buffer, 0)
+        if head >= self.capacity or count > self.capacity:
+            return 0, 0
+        return head, count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _physical(self, logical: int) -> int:
+        return (self._head - self._count + logical) % self.capacity
+
+    def append(self, timestamp: int, values: dict[str, float]) -> None:
+        with self._lock:
+            if self._count:
+                last = self._timestamps[self._physical(self._count - 1)]
+                if timestamp <= last:
+                    return
+            slot = self._head
+            self._timestamps[slot] = int(timestamp)
+            for name, column in zip(self.metrics, self._columns):
+                value = values.get(name)
+                column[slot] = float("nan") if value is None else float(value)
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._write_header(self._head, self._count)
+
+    def _first_at_or_after(self, timestamp: int) -> int:
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._timestamps[self._physical(mid)] < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def query(
+        self,
+        metric: str,
+        *,
+        start: int,
+        end: int,
+        step: int,
+    ) -> list[dict[str, Any]]:
+        """Downsample ``metric`` into ``step``-second buckets over [start, end]."""
+        column_index = self._metric_index.get(metric)
+        if column_index is None:
+            raise KeyError(metric)
+        step = max(int(step), 1)
+        column = self._columns[column_index]
+        buckets: dict[int, list[float]] = {}
+        with self._lock:
+            index = self._first_at_or_after(start)
+            while index < self._count:
+                slot = self._physical(index)
+                timestamp = self._timestamps[slot]
+                if timestamp > end:
+                    break
+                value = column[slot]
+                if not math.isnan(value):
+                    bucket = start + ((timestamp - start) // step) * step
+                    buckets.setdefault(bucket, []).append(value)
+                index += 1
+        return [
+            {
+                "ts": bucket,
+                "count": len(values),
+                "avg": sum(values) / len(values),
+                "min": min(values),
+                "max": max(values),
+                "p95": _p95(values),
+                "last": values[-1],
+            }
+            for bucket, values in sorted(buckets.items())
+        ]
+
+    def summary(self, metric: str, *, start: int, end: int) -> dict[str, Any]:
+        points = self.query(metric, start=start, end=end, step=max(end - start, 1) + 1)
+        if not points:
+            return {"count": 0}
+        return points[0]
+
+    def bytes_used(self) -> int:
+        return self._size
+
+    def flush(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.flush()
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap) and not self._buffer.closed:
+            self._timestamps.release()
+            for column in self._columns:
+                column.release()
+            self._buffer.flush()
+            self._buffer.close()
+
+
+def sample_from_overview(payload: dict[str, Any]) -> dict[str, float]:
+    pods = payload.get("pods") or []
+    phases: dict[str, int] = {}
+    for pod in pods:
+        phase = str(pod.get("phase") or "Unknown")
+        phases[phase] = phases.get(phase, 0) + 1
+    node_summary = payload.get("node_summary") or {}
+    claims = payload.get("sandboxclaims_detailed") or []
+    sandboxes = payload.get("sandboxes_detailed") or []
+    warm_pools = payload.get("sandboxwarmpools") or []
+    cost = payload.get("cost_estimate") or {}
+    return {
+        "nodes_total": float(node_summary.get("total") or 0),
+        "nodes_ready": float(node_summary.get("ready") or 0),
+        "pods_running": float(phases.get("Running", 0)),
+        "pods_pending": float(phases.get("Pending", 0)),
+        "pods_failed": float(phases.get("Failed", 0)),
+        "claims_total": float(len(claims)),
+        "claims_ready": float(sum(1 for c in claims if c.get("ready_condition"))),
+        "sandboxes_ready": float(
+            sum(1 for s in sandboxes if s.get("ready_condition"))
+        ),
+        "warm_pool_replicas": float(
+            sum(int(w.get("replicas") or 0) for w in warm_pools)
+        ),
+        "warm_pool_ready": float(sum(int(w.get("ready") or 0) for w in warm_pools)),
+        "total_hourly_usd": float(cost.get("total_hourly_usd") or 0.0),
+    }
+
+
+class HistorySampler:
+    """Periodically collects a sample and appends it to a ``HistoryStore``."""
+
+    def __init__(
+        self,
+        store: HistoryStore,
+        collect: Callable[[], Awaitable[dict[str, float]]],
+        *,
+        interval_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self._collect = collect
+        self.interval_seconds = max(float(interval_seconds), 1.0)
+        self._clock = clock
+        self._task: asyncio.Task[None] | None = None
+        self.samples = 0
+        self.errors = 0
+        self.last_error = ""
+        self.last_sample_at = 0
+
+    async def sample_once(self) -> bool:
+        try:
+            values = await self._collect()
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = str(exc)
+            return False
+        timestamp = int(self._clock())
+        self.store.append(timestamp, values)
+        self.samples += 1
+        self.last_sample_at = timestamp
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self.sample_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.store.flush()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "capacity": self.store.capacity,
+            "stored": len(self.store),
+            "bytes": self.store.bytes_used(),
+            "samples": self.samples,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_sample_at": self.last_sample_at,
+        }
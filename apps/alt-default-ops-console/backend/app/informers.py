@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from kubernetes import watch
+from kubernetes.client import ApiException
+
+logger = logging.getLogger(__name__)
+
+HTTP_STATUS_GONE = 410
+
+EventHandler = Callable[[str, str, Any, Any], None]
+WatchFactory = Callable[..., Iterable[dict[str, Any]]]
+Indexer = Callable[[Any], Iterable[str]]
+
+
+def _metadata_field(obj: Any, typed_name: str, raw_name: str) -> str:
+    if isinstance(obj, dict):
+        metadata = obj.get("metadata") or {}
+        return str(metadata.get(raw_name) or "")
+    metadata = getattr(obj, "metadata", None)
+    if metadata is None:
+        return ""
+    return str(getattr(metadata, typed_name, None) or "")
+
+
+def object_key(obj: Any) -> str:
+    namespace = _metadata_field(obj, "namespace", "namespace")
+    name = _metadata_field(obj, "name", "name")
+    return f"{namespace}/{name}" if namespace else name
+
+
+def object_resource_version(obj: Any) -> str:
+    return _metadata_field(obj, "resource_version", "resourceVersion")
+
+
+def _list_items(response: Any) -> tuple[list[Any], str]:
+    if isinstance(response, dict):
+        items = response.get("items") or []
+        metadata = response.get("metadata") or {}
+        return list(items), str(metadata.get("resourceVersion") or "")
+    items = getattr(response, "items", None) or []
+    metadata = getattr(response, "metadata", None)
+    resource_version = getattr(metadata, "resource_version", None) if metadata else None
+    return list(items), str(resource_version or "")
+
+
+class WatchExpired(Exception):
+    """Raised when the API server reports 410 Gone for a watch resourceVersion."""
+
+
+class ObjectStore:
+    """Thread-safe keyed object store with optional secondary indexes."""
+
+    def __init__(self, indexers: dict[str, Indexer] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._items: dict[str, Any] = {}
+        self._indexers: dict[str, Indexer] = dict(indexers or {})
+        self._indices: dict[str, dict[str, set[str]]] = {
+            name: {} for name in self._indexers
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def _index_add(self, key: str, obj: Any) -> None:
+        for name, indexer in self._indexers.items():
+            for value in indexer(obj):
+                self._indices[name].setdefault(value, set()).add(key)
+
+    def _index_remove(self, key: str, obj: Any) -> None:
+        for name, indexer in self._indexers.items():
+            index = self._indices[name]
+            for value in indexer(obj):
+                keys = index.get(value)
+                if not keys:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    index.pop(value, None)
+
+    def upsert(self, obj: Any) -> Any | None:
+        key = object_key(obj)
+        with self._lock:
+            old = self._items.get(key)
+            if old is not None:
+                self._index_remove(key, old)
+            self._items[key] = obj
+            self._index_add(key, obj)
+        return old
+
+    def delete(self, obj: Any) -> Any | None:
+        key = object_key(obj)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._index_remove(key, old)
+        return old
+
+    def replace(self, objects: list[Any]) -> list[tuple[str, Any, Any]]:
+        """Swap the whole store contents and return the implied change events."""
+        incoming = {object_key(obj): obj for obj in objects}
+        changes: list[tuple[str, Any, Any]] = []
+        with self._lock:
+            previous = self._items
+            for key, old in previous.items():
+                if key not in incoming:
+                    changes.append(("DELETED", old, old))
+            for key, obj in incoming.items():
+                old = previous.get(key)
+                if old is None:
+                    changes.append(("ADDED", obj, None))
+                elif object_resource_version(old) != object_resource_version(obj):
+                    changes.append(("MODIFIED", obj, old))
+            self._items = incoming
+            self._indices = {name: {} for name in self._indexers}
+            for key, obj in incoming.items():
+                self._index_add(key, obj)
+        return changes
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            return self._items.get(key)
+
+    def list(self) -> list[Any]:
+        with self._lock:
+            return list(self._items.values())
+
+    def by_index(self, index_name: str, value: str) -> list[Any]:
+        with self._lock:
+            keys = self._indices.get(index_name, {}).get(value, set())
+            return [self._items[key] for key in sorted(keys) if key in self._items]
+
+    def index_values(self, index_name: str) -> list[str]:
+        with self._lock:
+            return sorted(self._indices.get(index_name, {}))
+
+
+@dataclass
+class InformerSpec:
+    name: str
+    list_func: Callable[..., Any]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    indexers: dict[str, Indexer] = field(default_factory=dict)
+    # Optional kinds (for example cluster-scoped nodes without RBAC) count as
+    # synced after the first list attempt even if that attempt failed.
+    optional: bool = False
+
+
+def _default_watch_factory(func: Callable[..., Any], **kwargs: Any) -> Iterator[dict[str, Any]]:
+    return watch.Watch().stream(func, **kwargs)
+
+
+class Informer:
+    """LIST once, then WATCH from the returned resourceVersion into a store."""
+
+    def __init__(
+        self,
+        spec: InformerSpec,
+        *,
+        watch_factory: WatchFactory | None = None,
+        watch_timeout_seconds: int = 300,
+        retry_backoff_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+    ) -> None:
+        self.spec = spec
+        self.store = ObjectStore(spec.indexers)
+        self.resource_version = ""
+        self._watch_factory = watch_factory or _default_watch_factory
+        self._watch_timeout_seconds = max(int(watch_timeout_seconds), 1)
+        self._retry_backoff_seconds = max(float(retry_backoff_seconds), 0.0)
+        self._max_backoff_seconds = max(float(max_backoff_seconds), 0.0)
+        self._handlers: list[EventHandler] = []
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.relist_count = 0
+        self.event_count = 0
+        self.last_error = ""
+        self.last_sync_at: float | None = None
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    def add_handler(self, handler: EventHandler) -> None:
+        self._handlers.append(handler)
+
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def _dispatch(self, event_type: str, obj: Any, old: Any) -> None:
+        for handler in self._handlers:
+            try:
+                handler(self.name, event_type, obj, old)
+            except Exception:
+                logger.exception("informer %s handler failed", self.name)
+
+    def list_and_replace(self) -> None:
+        response = self.spec.list_func(**self.spec.kwargs)
+        items, resource_version = _list_items(response)
+        changes = self.store.replace(items)
+        self.resource_version = resource_version
+        self.relist_count += 1
+        self.last_sync_at = time.time()
+        self.last_error = ""
+        self._synced.set()
+        for event_type, obj, old in changes:
+            self._dispatch(event_type, obj, old)
+
+    def apply_event(self, event: dict[str, Any]) -> None:
+        event_type = str(event.get("type") or "")
+        raw_object = event.get("raw_object")
+        obj = event.get("object", raw_object)
+        if event_type == "ERROR":
+            status = raw_object if isinstance(raw_object, dict) else {}
+            if not status and isinstance(obj, dict):
+                status = obj
+            code = int(status.get("code") or 0)
+            if code == HTTP_STATUS_GONE:
+                raise WatchExpired(str(status.get("message") or "watch expired"))
+            raise ApiException(
+                status=code or 500,
+                reason=str(status.get("message") or "watch error"),
+            )
+
+        resource_version = object_resource_version(obj)
+        if event_type == "BOOKMARK":
+            if resource_version:
+                self.resource_version = resource_version
+            return
+        if event_type in {"ADDED", "MODIFIED"}:
+            old = self.store.upsert(obj)
+        elif event_type == "DELETED":
+            old = self.store.delete(obj)
+        else:
+            return
+        if resource_version:
+            self.resource_version = resource_version
+        self.event_count += 1
+        self._dispatch(event_type, obj, old)
+
+    def watch_once(self) -> None:
+        kwargs = dict(self.spec.kwargs)
+        kwargs["resource_version"] = self.resource_version
+        kwargs["timeout_seconds"] = self._watch_timeout_seconds
+        kwargs["allow_watch_bookmarks"] = True
+        try:
+            for event in self._watch_factory(self.spec.list_func, **kwargs):
+                if self._stop.is_set():
+                    return
+                self.apply_event(event)
+        except ApiException as exc:
+            if exc.status == HTTP_STATUS_GONE:
+                raise WatchExpired(str(exc.reason or "watch expired")) from exc
+            raise
+
+    def run(self) -> None:
+        backoff = self._retry_backoff_seconds
+        needs_list = True
+        while not self._stop.is_set():
+            try:
+                if needs_list:
+                    self.list_and_replace()
+                    needs_list = False
+                self.watch_once()
+                backoff = self._retry_backoff_seconds
+            except WatchExpired as exc:
+                logger.info("informer %s watch expired, relisting: %s", self.name, exc)
+                needs_list = True
+            except Exception as exc:
+                self.last_error = str(exc)
+                if needs_list and self.spec.optional and not self.has_synced():
+                    self._synced.set()
+                logger.warning("informer %s failed: %s", self.name, exc)
+                needs_list = True
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(max(backoff * 2, 0.1), self._max_backoff_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name=f"informer-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "synced": self.has_synced(),
+            "objects": len(self.store),
+            "resource_version": self.resource_version,
+            "relists": self.relist_count,
+            "events": self.event_count,
+            "last_error": self.last_error,
+        }
+
+
+class InformerSet:
+    def __init__(self, informers: list[Informer]) -> None:
+        self._informers = {informer.name: informer for informer in informers}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._informers
+
+    def get(self, name: str) -> Informer:
+        return self._informers[name]
+
+    def add_handler(self, handler: EventHandler) -> None:
+        for informer in self._informers.values():
+            informer.add_handler(handler)
+
+    def start(self) -> None:
+        for informer in self._informers.values():
+            informer.start()
+
+    def stop(self) -> None:
+        for informer in self._informers.values():
+            informer._stop.set()
+        for informer in self._informers.values():
+            informer.stop()
+
+    def has_synced(self) -> bool:
+        return all(informer.has_synced() for informer in self._informers.values())
+
+    def snapshot(self) -> dict[str, list[Any]]:
+        return {name: informer.store.list() for name, informer in self._informers.items()}
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "synced": self.has_synced(),
+            "kinds": [informer.status() for informer in self._informers.values()],
+        }
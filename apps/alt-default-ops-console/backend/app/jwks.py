@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from fastapi import HTTPException
+
+_MAX_AGE_PATTERN = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?", re.IGNORECASE)
+
+
+def cache_control_max_age(header: str | None) -> int | None:
+    match = _MAX_AGE_PATTERN.search(str(header or ""))
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class _JwksEntry:
+    keys: dict[str, dict[str, Any]] = field(default_factory=dict)
+    fetched_at: float = 0.0
+    expires_at: float = 0.0
+    refresh_at: float = 0.0
+    last_forced_at: float = float("-inf")
+    retry_at: float = 0.0
+    last_error: str = ""
+    inflight: asyncio.Task[dict[str, dict[str, Any]]] | None = None
+
+
+class JwksCache:
+    """JWKS key sets per URL with single-flight and refresh-ahead fetching.
+
+    Keys live for the issuer's ``Cache-Control: max-age`` (clamped), or
+    ``default_ttl_seconds`` without one. Once ``refresh_ahead_fraction`` of that
+    lifetime has passed, callers get the cached keys and one background fetch
+    starts. Concurrent fetches for a URL share one request. Forced refreshes
+    for unknown ``kid`` values are rate-limited, and when the issuer is
+    unreachable the last good key set keeps being served.
+
+    ``client_factory`` lets fetches share an HTTP client (and its connection
+    pool) owned elsewhere; that client is then not closed by ``aclose``.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_ttl_seconds: float = 900.0,
+        min_ttl_seconds: float = 60.0,
+        max_ttl_seconds: float = 86400.0,
+        refresh_ahead_fraction: float = 0.8,
+        forced_refresh_interval_seconds: float = 30.0,
+        failure_backoff_seconds: float = 30.0,
+        timeout_seconds: float = 5.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.default_ttl_seconds = float(default_ttl_seconds)
+        self.min_ttl_seconds = float(min_ttl_seconds)
+        self.max_ttl_seconds = max(float(max_ttl_seconds), self.min_ttl_seconds)
+        self.refresh_ahead_fraction = min(max(float(refresh_ahead_fraction), 0.0), 1.0)
+        self.forced_refresh_interval_seconds = float(forced_refresh_interval_seconds)
+        self.failure_backoff_seconds = max(float(failure_backoff_seconds), 0.0)
+        self._timeout_seconds = float(timeout_seconds)
+        self._transport = transport
+        self._client_factory = client_factory
+        self._clock = clock
+        self._client: httpx.AsyncClient | None = None
+        self._entries: dict[str, _JwksEntry] = {}
+        self._refresher: asyncio.Task[None] | None = None
+        self._counters = {
+            "hits": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "coalesced": 0,
+            "background_refreshes": 0,
+            "forced_refreshes": 0,
+            "forced_refresh_limited": 0,
+            "stale_served": 0,
+        }
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client_factory is not None:
+            return self._client_factory()
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout_seconds, transport=self._transport
+            )
+        return self._client
+
+    def _ttl(self, response: httpx.Response) -> float:
+        max_age = cache_control_max_age(response.headers.get("cache-control"))
+        ttl = self.default_ttl_seconds if max_age is None else float(max_age)
+        return min(max(ttl, self.min_ttl_seconds), self.max_ttl_seconds)
+
+    async def _fetch(
+        self, jwks_url: str, entry: _JwksEntry
+    ) -> dict[str, dict[str, Any]]:
+        self._counters["fetches"] += 1
+        try:
+            response = await self._http().get(
+                jwks_url, timeout=self._timeout_seconds
+            )
+            response.raise_for_status()
+            payload = response.json()
+            keys: dict[str, dict[str, Any]] = {}
+            for item in payload.get("keys", []):
+                kid = item.get("kid")
+                if kid:
+                    keys[kid] = item
+            if not keys:
+                raise ValueError("JWKS response contained no keys")
+        except Exception as exc:
+            self._counters["fetch_errors"] += 1
+            entry.last_error = str(exc) or exc.__class__.__name__
+            entry.retry_at = self._clock() + self.failure_backoff_seconds
+            raise
+        now = self._clock()
+        ttl = self._ttl(response)
+        entry.keys = keys
+        entry.fetched_at = now
+        entry.expires_at = now + ttl
+        entry.refresh_at = now + ttl * self.refresh_ahead_fraction
+        entry.last_error = ""
+        return keys
+
+    def _refresh(self, jwks_url: str, entry: _JwksEntry) -> asyncio.Task[Any]:
+        if entry.inflight is not None and not entry.inflight.done():
+            self._counters["coalesced"] += 1
+            return entry.inflight
+        task = asyncio.get_running_loop().create_task(self._fetch(jwks_url, entry))
+        # Background fetch failures are recorded on the entry; mark the
+        # exception retrieved so unawaited tasks do not log warnings.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        entry.inflight = task
+        return task
+
+    async def get_keys(
+        self, jwks_url: str, force_refresh: bool = False
+    ) -> dict[str, dict[str, Any]]:
+        entry = self._entries.setdefault(jwks_url, _JwksEntry())
+        now = self._clock()
+
+        if force_refresh:
+            if now - entry.last_forced_at < self.forced_refresh_interval_seconds:
+                self._counters["forced_refresh_limited"] += 1
+                if entry.keys:
+                    self._counters["hits"] += 1
+                    return entry.keys
+            else:
+                entry.last_forced_at = now
+                self._counters["forced_refreshes"] += 1
+                return await self._await_refresh(jwks_url, entry)
+
+        if entry.keys and now < entry.retry_at:
+            # The last fetch failed recently; serve the last good keys without
+            # making every request wait for another timeout.
+            if now >= entry.expires_at:
+                self._counters["stale_served"] += 1
+            else:
+                self._counters["hits"] += 1
+            return entry.keys
+        if entry.keys and now < entry.expires_at:
+            if now >= entry.refresh_at and (
+                entry.inflight is None or entry.inflight.done()
+            ):
+                self._counters["background_refreshes"] += 1
+                self._refresh(jwks_url, entry)
+            self._counters["hits"] += 1
+            return entry.keys
+        return await self._await_refresh(jwks_url, entry)
+
+    async def _await_refresh(
+        self, jwks_url: str, entry: _JwksEntry
+    ) -> dict[str, dict[str, Any]]:
+        try:
+            return await asyncio.shield(self._refresh(jwks_url, entry))
+        except Exception as exc:
+            if entry.keys:
+                self._counters["stale_served"] += 1
+                return entry.keys
+            raise HTTPException(
+                status_code=503, detail=f"JWKS unavailable: {entry.last_error or exc}"
+            ) from exc
+
+    async def prefetch(self, jwks_urls: Iterable[str]) -> None:
+        """Load key sets ahead of the first login; failures are only recorded."""
+        await asyncio.gather(
+            *(self.get_keys(url) for url in dict.fromkeys(jwks_urls) if url),
+            return_exceptions=True,
+        )
+
+    async def refresh_due(self) -> None:
+        """Refresh every known key set whose refresh-ahead point has passed."""
+        now = self._clock()
+        tasks = [
+            self._refresh(url, entry)
+            for url, entry in self._entries.items()
+            if entry.keys and now >= max(entry.refresh_at, entry.retry_at)
+        ]
+        if tasks:
+            self._counters["background_refreshes"] += len(tasks)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_refresher(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.refresh_due()
+
+    def start(self, interval_seconds: float = 30.0) -> None:
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(
+                self._run_refresher(max(float(interval_seconds), 1.0))
+            )
+
+    async def aclose(self) -> None:
+        refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.cancel()
+            try:
+                await refresher
+            except asyncio.CancelledError:
+                pass
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        return {
+            **self._counters,
+            "urls": {
+                url: {
+                    "keys": len(entry.keys),
+                    "age_seconds": round(now - entry.fetched_at, 1)
+                    if entry.keys
+                    else None,
+                    "expires_in_seconds": round(entry.expires_at - now, 1)
+                    if entry.keys
+                    else None,
+                    "last_error": entry.last_error,
+                }
+                for url, entry in self._entries.items()
+            },
+        }
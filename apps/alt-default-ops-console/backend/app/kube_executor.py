@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class KubeExecutorSaturated(Exception):
+    """Raised when the executor queue is full and a call is rejected."""
+
+
+class KubeExecutor:
+    """Bounded thread pool for blocking Kubernetes client calls.
+
+    Calls are awaited from the event loop with a per-call timeout. Work that
+    cannot start because every worker is busy is counted as queued; once the
+    queue reaches ``max_queue`` further calls are rejected instead of piling up.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 8,
+        max_queue: int = 64,
+        default_timeout_seconds: float = 10.0,
+    ) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.default_timeout_seconds = max(float(default_timeout_seconds), 0.1)
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_queue_depth_seen = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._rejected = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="kube-api"
+                )
+            return self._pool
+
+    def _queue_depth(self) -> int:
+        return max(self._pending - self.max_workers, 0)
+
+    def _run(
+        self, func: Callable[..., T], args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, _: Future[Any]) -> None:
+        # Runs on completion and on cancellation of a call that never started.
+        with self._lock:
+            self._pending -= 1
+
+    async def call(
+        self,
+        func: Callable[..., T],
+        /,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        with self._lock:
+            saturated = self._pending >= self.max_workers
+            if saturated and self._queue_depth() >= self.max_queue:
+                self._rejected += 1
+                raise KubeExecutorSaturated(
+                    f"Kubernetes API executor queue is full ({self.max_queue} waiting)"
+                )
+            self._pending += 1
+            self._max_queue_depth_seen = max(
+                self._max_queue_depth_seen, self._queue_depth()
+            )
+
+        try:
+            submitted = self._executor().submit(self._run, func, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        submitted.add_done_callback(self._release)
+        future = asyncio.wrap_future(submitted)
+        wait_seconds = self.default_timeout_seconds if timeout is None else timeout
+        try:
+            result = await asyncio.wait_for(future, timeout=wait_seconds)
+        except TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._running,
+                "queued": self._queue_depth(),
+                "max_queue_depth_seen": self._max_queue_depth_seen,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from .pricing import parse_cpu_cores, parse_quantity_gib
+
+# Field access shared by the informer-fed indexes (latency, capacity, events,
+# cost attribution) and the overview builders. Objects arrive either as raw
+# watch dicts (camelCase keys) or as typed kubernetes client models.
+
+
+def get_field(obj: Any, *path: str) -> Any:
+    """Read a field from a raw dict (camelCase) or typed client model."""
+    value = obj
+    for name in path:
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            value = value.get(name)
+        else:
+            snake = "".join(f"_{c.lower()}" if c.isupper() else c for c in name)
+            value = getattr(value, snake, None)
+    return value
+
+
+def parse_timestamp(value: Any) -> float | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        moment = value if value.tzinfo else value.replace(tzinfo=UTC)
+        return moment.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def claim_sandbox_name(claim: Any) -> str:
+    ref = get_field(claim, "status", "sandbox") or {}
+    if isinstance(ref, dict):
+        return str(ref.get("name") or ref.get("Name") or "")
+    return ""
+
+
+def pod_requests(pod_spec: Any) -> tuple[float, float]:
+    """Sum container CPU (cores) and memory (GiB) requests of a pod spec."""
+    cpu_cores = 0.0
+    memory_gib = 0.0
+    for container in get_field(pod_spec, "containers") or []:
+        requests = get_field(container, "resources", "requests") or {}
+        cpu_cores += parse_cpu_cores(requests.get("cpu"))
+        memory_gib += parse_quantity_gib(requests.get("memory"))
+    return cpu_cores, memory_gib
+
+
+def _labels(node: Any) -> dict[str, Any]:
+    return get_field(node, "metadata", "labels") or {}
+
+
+def node_instance_type(node: Any) -> str:
+    labels = _labels(node)
+    return str(
+        labels.get("node.kubernetes.io/instance-type")
+        or labels.get("beta.kubernetes.io/instance-type")
+        or "unknown"
+    )
+
+
+def node_pool(node: Any) -> str:
+    return str(_labels(node).get("cloud.google.com/gke-nodepool") or "unknown")
+
+
+def node_is_spot(node: Any) -> bool:
+    value = str(_labels(node).get("cloud.google.com/gke-spot") or "")
+    return value.strip().lower() == "true"
+
+
+def node_region(node: Any) -> str:
+    labels = _labels(node)
+    return str(
+        labels.get("topology.kubernetes.io/region")
+        or labels.get("failure-domain.beta.kubernetes.io/region")
+        or ""
+    )
+
+
+def node_accelerator(node: Any) -> str:
+    return str(_labels(node).get("cloud.google.com/gke-accelerator") or "")
+
+
+def node_gpu_count(node: Any) -> int:
+    if not node_accelerator(node):
+        return 0
+    capacity = get_field(node, "status", "capacity") or {}
+    return int(
+        parse_cpu_cores(capacity.get("nvidia.com/gpu"))
+        or parse_cpu_cores(
+            _labels(node).get("cloud.google.com/gke-accelerator-count") or 1
+        )
+    )
+
+
+def node_price_key(node: Any) -> dict[str, Any]:
+    """Keyword arguments for ``PricingTable.node_hourly`` describing ``node``."""
+    return {
+        "instance_type": node_instance_type(node),
+        "spot": node_is_spot(node),
+        "region": node_region(node),
+        "accelerator": node_accelerator(node),
+        "gpu_count": node_gpu_count(node),
+    }
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .kube_objects import claim_sandbox_name, get_field, parse_timestamp
+
+QUANTILES = (0.5, 0.95, 0.99)
+PATHS = ("warm", "cold", "unknown")
+STAGES = ("claim_ready", "sandbox_bound", "pod_scheduled")
+
+
+class QuantileSketch:
+    """Log-bucketed streaming quantile sketch with bounded relative error.
+
+    Values land in buckets whose bounds grow by ``gamma``, so any reported
+    quantile is within ``relative_accuracy`` of the true value while memory
+    grows only with the logarithm of the value range.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        value = max(float(value), 0.0)
+        if value < 1e-9:
+            self._zero += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zero
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        result: dict[str, Any] = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1),
+            "min": round(self.min, 1),
+            "max": round(self.max, 1),
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}"] = round(self.quantile(q) or 0.0, 1)
+        return result
+
+
+def _condition_time(obj: Any, condition_type: str) -> float | None:
+    for condition in get_field(obj, "status", "conditions") or []:
+        if get_field(condition, "type") != condition_type:
+            continue
+        if str(get_field(condition, "status")) != "True":
+            return None
+        return parse_timestamp(get_field(condition, "lastTransitionTime"))
+    return None
+
+
+@dataclass
+class ClaimLifecycle:
+    name: str
+    template: str = ""
+    created_at: float | None = None
+    sandbox: str = ""
+    sandbox_created_at: float | None = None
+    bound_at: float | None = None
+    scheduled_at: float | None = None
+    ready_at: float | None = None
+    recorded: bool = False
+
+    @property
+    def path(self) -> str:
+        if self.created_at is None or self.sandbox_created_at is None:
+            return "unknown"
+        # A sandbox that existed before the claim was adopted from a warm pool.
+        return "warm" if self.sandbox_created_at < self.created_at else "cold"
+
+    def as_dict(self) -> dict[str, Any]:
+        def ms(end: float | None) -> float | None:
+            if end is None or self.created_at is None:
+                return None
+            return round(max(end - self.created_at, 0.0) * 1000.0, 1)
+
+        return {
+            "name": self.name,
+            "template": self.template,
+            "sandbox": self.sandbox,
+            "path": self.path,
+            "sandbox_bound_ms": ms(self.bound_at),
+            "pod_scheduled_ms": ms(self.scheduled_at),
+            "claim_ready_ms": ms(self.ready_at),
+        }
+
+
+class LatencyTracker:
+    """Claim lifecycle timestamps and time-to-ready sketches from watch events.
+
+    ``handle`` has the informer handler signature and accepts ``claims``,
+    ``sandboxes`` and ``pods`` events. Latencies are measured from the claim's
+    ``creationTimestamp``; Ready and PodScheduled use the API server's
+    condition transition times, and binding falls back to when it was observed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_tracked: int = 5000,
+        recent: int = 50,
+        relative_accuracy: float = 0.01,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._clock = clock
+        self.started_at = clock()
+        self._lock = threading.Lock()
+        self._max_tracked = max(int(max_tracked), 1)
+        self._relative_accuracy = relative_accuracy
+        self._claims: OrderedDict[str, ClaimLifecycle] = OrderedDict()
+        self._sandbox_claim: dict[str, str] = {}
+        self._sandbox_created: dict[str, float] = {}
+        self._sketches: dict[tuple[str, str, str], QuantileSketch] = {}
+        self._recent: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._recent_limit = max(int(recent), 0)
+        self.skipped_preexisting = 0
+
+    def _claim(self, name: str) -> ClaimLifecycle:
+        lifecycle = self._claims.get(name)
+        if lifecycle is None:
+            lifecycle = self._claims[name] = ClaimLifecycle(name=name)
+            while len(self._claims) > self._max_tracked:
+                self._claims.popitem(last=False)
+        return lifecycle
+
+    def _sketch(self, stage: str, template: str, path: str) -> QuantileSketch:
+        key = (stage, template, path)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = QuantileSketch(self._relative_accuracy)
+        return sketch
+
+    def _record(self, stage: str, lifecycle: ClaimLifecycle, end: float) -> None:
+        if lifecycle.created_at is None:
+            return
+        elapsed_ms = max(end - lifecycle.created_at, 0.0) * 1000.0
+        path = lifecycle.path
+        for template in ("*", lifecycle.template):
+            for bucket in ("*", path):
+                self._sketch(stage, template, bucket).add(elapsed_ms)
+
+    def _bind(self, lifecycle: ClaimLifecycle, sandbox: str, now: float) -> None:
+        if not sandbox or lifecycle.sandbox:
+            return
+        lifecycle.sandbox = sandbox
+        lifecycle.sandbox_created_at = self._sandbox_created.get(sandbox)
+        self._sandbox_claim[sandbox] = lifecycle.name
+        lifecycle.bound_at = now
+        created_at = lifecycle.created_at
+        if not lifecycle.recorded and created_at is not None:
+            # Binding time is when it was observed, so only claims created
+            # while the console was watching give a meaningful value.
+            if created_at >= self.started_at:
+                self._record("sandbox_bound", lifecycle, now)
+
+    def _maybe_finish(self, lifecycle: ClaimLifecycle) -> None:
+        if lifecycle.recorded or lifecycle.ready_at is None:
+            return
+        lifecycle.recorded = True
+        self._record("claim_ready", lifecycle, lifecycle.ready_at)
+        if self._recent_limit:
+            self._recent[lifecycle.name] = lifecycle.as_dict()
+            self._recent.move_to_end(lifecycle.name)
+            while len(self._recent) > self._recent_limit:
+                self._recent.popitem(last=False)
+
+    def observe_claim(self, event_type: str, claim: Any) -> None:
+        name = str(get_field(claim, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            if event_type == "DELETED":
+                lifecycle = self._claims.pop(name, None)
+                if lifecycle and lifecycle.sandbox:
+                    self._sandbox_claim.pop(lifecycle.sandbox, None)
+                return
+            now = self._clock()
+            is_new = name not in self._claims
+            lifecycle = self._claim(name)
+            lifecycle.created_at = parse_timestamp(
+                get_field(claim, "metadata", "creationTimestamp")
+            )
+            lifecycle.template = str(
+                get_field(claim, "spec", "sandboxTemplateRef", "name") or ""
+            )
+            ready_at = _condition_time(claim, "Ready")
+            if is_new and ready_at is not None and ready_at < self.started_at:
+                # Already Ready before the console started watching; its
+                # lifecycle was not observed, so keep it out of the sketches.
+                lifecycle.recorded = True
+                self.skipped_preexisting += 1
+            self._bind(lifecycle, claim_sandbox_name(claim), now)
+            if ready_at is not None and lifecycle.ready_at is None:
+                lifecycle.ready_at = ready_at
+            self._maybe_finish(lifecycle)
+
+    def observe_sandbox(self, event_type: str, sandbox: Any) -> None:
+        name = str(get_field(sandbox, "metadata", "name") or "")
+        if not name:
+            return
+        with self._lock:
+            if event_type == "DELETED":
+                self._sandbox_created.pop(name, None)
+                self._sandbox_claim.pop(name, None)
+                return
+            created_at = parse_timestamp(
+                get_field(sandbox, "metadata", "creationTimestamp")
+            )
+            if created_at is not None:
+                self._sandbox_created[name] = created_at
+                bound = self._claims.get(self._sandbox_claim.get(name, ""))
+                if bound is not None and bound.sandbox_created_at is None:
+                    bound.sandbox_created_at = created_at
+            claim_name = str(
+                get_field(sandbox, "spec", "sandboxClaimRef", "name")
+                or get_field(sandbox, "status", "sandboxClaimRef", "name")
+                or ""
+            )
+            lifecycle = self._claims.get(claim_name) if claim_name else None
+            if lifecycle is not None:
+                self._bind(lifecycle, name, self._clock())
+
+    def observe_pod(self, event_type: str, pod: Any) -> None:
+        if event_type == "DELETED":
+            return
+        sandbox = ""
+        for owner in get_field(pod, "metadata", "ownerReferences") or []:
+            if get_field(owner, "kind") == "Sandbox":
+                sandbox = str(get_field(owner, "name") or "")
+                break
+        sandbox = sandbox or str(get_field(pod, "metadata", "name") or "")
+        with self._lock:
+            claim_name = self._sandbox_claim.get(sandbox)
+            lifecycle = self._claims.get(claim_name) if claim_name else None
+            if lifecycle is None or lifecycle.scheduled_at is not None:
+                return
+            scheduled_at = _condition_time(pod, "PodScheduled")
+            if scheduled_at is None:
+                return
+            lifecycle.scheduled_at = scheduled_at
+            if not lifecycle.recorded:
+                self._record("pod_scheduled", lifecycle, scheduled_at)
+
+    def handle(self, kind: str, event_type: str, obj: Any, _old: Any) -> None:
+        if kind == "claims":
+            self.observe_claim(event_type, obj)
+        elif kind == "sandboxes":
+            self.observe_sandbox(event_type, obj)
+        elif kind == "pods":
+            self.observe_pod(event_type, obj)
+
+    def snapshot(self, *, template: str | None = None) -> dict[str, Any]:
+        with self._lock:
+            sketches = dict(self._sketches)
+            pending = [
+                lifecycle.as_dict()
+                for lifecycle in self._claims.values()
+                if not lifecycle.recorded
+                and (template is None or lifecycle.template == template)
+            ]
+            recent = [
+                row
+                for row in reversed(self._recent.values())
+                if template is None or row["template"] == template
+            ]
+            tracked = len(self._claims)
+
+        def summary(stage: str, tpl: str, path: str) -> dict[str, Any]:
+            sketch = sketches.get((stage, tpl, path))
+            return sketch.summary() if sketch else {"count": 0}
+
+        templates = sorted({key[1] for key in sketches if key[1] != "*"})
+        if template is not None:
+            templates = [t for t in templates if t == template]
+        scope = template if template is not None else "*"
+        return {
+            "metric": "t_claim_ready_ms",
+            "overall": summary("claim_ready", scope, "*"),
+            "by_path": {path: summary("claim_ready", scope, path) for path in PATHS},
+            "by_template": {
+                tpl: {
+                    "all": summary("claim_ready", tpl, "*"),
+                    **{path: summary("claim_ready", tpl, path) for path in PATHS},
+                }
+                for tpl in templates
+            },
+            "stages": {
+                f"{stage}_ms": summary(stage, scope, "*") for stage in STAGES
+            },
+            "tracked_claims": tracked,
+            "pending": pending,
+            "recent": recent,
+            "skipped_preexisting": self.skipped_preexisting,
+        }
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+# Overview sections a caller can opt into with ``include=``. Keys not listed
+# here (cluster_mode, namespace, ops_integration) are always returned.
+OVERVIEW_SECTIONS: dict[str, tuple[str, ...]] = {
+    "deployments": ("deployments",),
+    "pods": ("pods",),
+    "services": ("services",),
+    "claims": ("sandboxclaims", "sandboxclaims_detailed"),
+    "sandboxes": ("sandboxes", "sandboxes_detailed"),
+    "warm_pools": ("sandboxwarmpools", "warm_pool_profiles"),
+    "templates": ("sandboxtemplates",),
+    "nodes": ("nodes", "node_summary"),
+    "capacity": ("capacity",),
+    "events": ("events_summary",),
+    "pvcs": ("pvcs",),
+    "resources": ("resource_summary",),
+    "cost": ("cost_estimate",),
+    "sra": ("workspace_session_health", "lease_analytics"),
+}
+
+# Sections whose rows are paginated, mapped to (detailed rows key, names key).
+PAGINATED_SECTIONS: dict[str, tuple[str, str | None]] = {
+    "pods": ("pods", None),
+    "claims": ("sandboxclaims_detailed", "sandboxclaims"),
+    "sandboxes": ("sandboxes_detailed", "sandboxes"),
+}
+
+_ALWAYS_KEYS = ("cluster_mode", "namespace", "ops_integration")
+
+
+def parse_csv(value: str | None) -> list[str]:
+    return [item.strip() for item in str(value or "").split(",") if item.strip()]
+
+
+def parse_include(value: str | None) -> list[str] | None:
+    sections = parse_csv(value)
+    if not sections:
+        return None
+    unknown = sorted(set(sections) - set(OVERVIEW_SECTIONS))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown overview sections: {', '.join(unknown)}",
+        )
+    return sections
+
+
+def encode_continue(state: dict[str, Any]) -> str | None:
+    if not state:
+        return None
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_continue(token: str | None) -> dict[str, Any]:
+    if not token:
+        return {}
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid continue token") from exc
+    if not isinstance(state, dict):
+        raise HTTPException(status_code=400, detail="Invalid continue token")
+    return state
+
+
+def _lookup(row: Any, path: str) -> Any:
+    value = row
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def parse_field_selector(expression: str | None) -> list[tuple[str, bool, str]]:
+    """Parse ``a=b,c!=d`` (``==`` also accepted) into (path, equals, value)."""
+    requirements: list[tuple[str, bool, str]] = []
+    for term in parse_csv(expression):
+        if "!=" in term:
+            path, value = term.split("!=", 1)
+            equals = False
+        elif "==" in term:
+            path, value = term.split("==", 1)
+            equals = True
+        elif "=" in term:
+            path, value = term.split("=", 1)
+            equals = True
+        else:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid field selector term: {term}"
+            )
+        if not path.strip():
+            raise HTTPException(
+                status_code=400, detail=f"Invalid field selector term: {term}"
+            )
+        requirements.append((path.strip(), equals, value.strip()))
+    return requirements
+
+
+def _as_selector_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    return str(value)
+
+
+def matches_fields(row: Any, requirements: list[tuple[str, bool, str]]) -> bool:
+    for path, equals, expected in requirements:
+        actual = _as_selector_value(_lookup(row, path))
+        if (actual == expected) != equals:
+            return False
+    return True
+
+
+def project_fields(row: Any, fields: list[str]) -> Any:
+    if not fields or not isinstance(row, dict):
+        return row
+    projected: dict[str, Any] = {}
+    for path in fields:
+        parts = path.split(".")
+        value = _lookup(row, path)
+        if value is None and not _has_path(row, parts):
+            continue
+        target = projected
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return projected
+
+
+def _has_path(row: Any, parts: list[str]) -> bool:
+    value = row
+    for part in parts:
+        if not isinstance(value, dict) or part not in value:
+            return False
+        value = value[part]
+    return True
+
+
+def paginate_rows(
+    rows: list[dict[str, Any]],
+    *,
+    limit: int | None,
+    after: str | None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Page rows sorted by ``name``; the cursor is the last name returned."""
+    start = 0
+    if after:
+        start = len(rows)
+        for index, row in enumerate(rows):
+            if str(row.get("name") or "") > after:
+                start = index
+                break
+    if not limit:
+        return rows[start:], None
+    page = rows[start : start + limit]
+    has_more = start + limit < len(rows)
+    next_after = str(page[-1].get("name") or "") if (page and has_more) else None
+    return page, next_after
+
+
+def select_overview(
+    payload: dict[str, Any],
+    *,
+    include: list[str] | None,
+    fields: list[str],
+    field_selector: list[tuple[str, bool, str]],
+    limit: int | None,
+    continue_token: str | None,
+) -> dict[str, Any]:
+    """Return a new overview dict restricted to the requested view.
+
+    The input payload is a shared cached snapshot and is never mutated.
+    """
+    cursor = decode_continue(continue_token)
+    sections = include or list(OVERVIEW_SECTIONS)
+    if cursor:
+        # A continuation only pages the sections that still have rows left.
+        sections = [section for section in sections if section in cursor]
+
+    result: dict[str, Any] = {key: payload.get(key) for key in _ALWAYS_KEYS}
+    next_cursor: dict[str, Any] = {}
+    totals: dict[str, int] = {}
+    for section in sections:
+        for key in OVERVIEW_SECTIONS[section]:
+            if key in payload:
+                result[key] = payload[key]
+        if section not in PAGINATED_SECTIONS:
+            continue
+        rows_key, names_key = PAGINATED_SECTIONS[section]
+        rows = [
+            row
+            for row in (payload.get(rows_key) or [])
+            if matches_fields(row, field_selector)
+        ]
+        totals[section] = len(rows)
+        page, next_after = paginate_rows(
+            rows, limit=limit, after=cursor.get(section) if cursor else None
+        )
+        if next_after is not None:
+            next_cursor[section] = next_after
+        result[rows_key] = [project_fields(row, fields) for row in page]
+        if names_key:
+            result[names_key] = [str(row.get("name") or "") for row in page]
+
+    if limit or field_selector or cursor:
+        result["page"] = {
+            "limit": limit,
+            "totals": totals,
+            "continue": encode_continue(next_cursor),
+        }
+    return result
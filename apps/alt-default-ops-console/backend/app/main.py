@@ -6,6 +6,7 @@ import json
 import secrets
 import time
 import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -13,14 +14,61 @@ from typing import Any
 from urllib.parse import urlencode
 
 import httpx
+import urllib3
 from fastapi import Cookie, Depends, FastAPI, Header, HTTPException, Query, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from jose import JWTError, jwt
 from kubernetes import client, config
 from kubernetes.client import ApiException
 from pydantic import BaseModel, Field
 
+from .autoscaler import AutoscalerLoop, AutoscalerPolicy, WarmPoolAutoscaler
+from .caching import StaleWhileRevalidateCache
+from .capacity import CapacityTracker, _sandbox_owner
+from .cost_attribution import CostAttributor
+from .events import EventIndex
+from .history import (
+    METRICS as HISTORY_METRICS,
+    HistorySampler,
+    HistoryStore,
+    parse_range_seconds,
+    sample_from_overview,
+)
+from .informers import Informer, InformerSet, InformerSpec
+from .jwks import JwksCache
+from .kube_executor import KubeExecutor, KubeExecutorSaturated
+from .kube_objects import (
+    get_field,
+    node_accelerator,
+    node_gpu_count,
+    node_instance_type,
+    node_is_spot,
+    node_pool,
+    node_region,
+)
+from .latency import LatencyTracker
+from .listing import (
+    decode_continue,
+    encode_continue,
+    matches_fields,
+    parse_csv,
+    parse_field_selector,
+    parse_include,
+    paginate_rows,
+    project_fields,
+    select_overview,
+)
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from .oauth import OAuthClient
+from .overview_stream import ChangeNotifier, json_diff, sse_event, strip_volatile
+from .pricing import PricingTable, load_catalog, parse_quantity_gib
+from .responses import CompressionMiddleware, FastJSONResponse
+from .sessions import SessionStore, SqliteSessionBackend
+from .sra_admin import SraAdminClient, identity_key
+from .synthetic import ChurnSimulator, SyntheticCluster, SyntheticClusterSpec
+from .token_cache import VerifiedTokenCache, token_cache_key
+
 
 class Settings(BaseModel):
     target_namespace: str = Field(
@@ -89,6 +137,29 @@ class Settings(BaseModel):
             in {"1", "true", "yes", "on"}
         )
     )
+    oauth_http_timeout_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("OAUTH_HTTP_TIMEOUT_SECONDS", "10"))
+    )
+    jwks_prewarm: bool = Field(
+        default_factory=lambda: (
+            os.getenv("JWKS_PREWARM", "1").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+    )
+    session_store: str = Field(
+        default_factory=lambda: os.getenv("SESSION_STORE", "memory").strip().lower()
+    )
+    session_db_path: str = Field(
+        default_factory=lambda: os.getenv(
+            "SESSION_DB_PATH", "/tmp/alt-default-ops-console/sessions.sqlite"
+        ).strip()
+    )
+    session_max_entries: int = Field(
+        default_factory=lambda: int(os.getenv("SESSION_MAX_ENTRIES", "1024"))
+    )
+    session_ttl_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+    )
     app_base_path: str = Field(
         default_factory=lambda: os.getenv("APP_BASE_PATH", "").strip()
     )
@@ -113,6 +184,165 @@ class Settings(BaseModel):
     sra_admin_recent_limit: int = Field(
         default_factory=lambda: int(os.getenv("SRA_ADMIN_RECENT_LIMIT", "200"))
     )
+    sra_admin_cache_ttl_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("SRA_ADMIN_CACHE_TTL_SECONDS", "5"))
+    )
+    sra_admin_cache_stale_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("SRA_ADMIN_CACHE_STALE_SECONDS", "30")
+        )
+    )
+    sra_admin_http2: bool = Field(
+        default_factory=lambda: (
+            os.getenv("SRA_ADMIN_HTTP2", "1").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+    )
+    sra_admin_max_connections: int = Field(
+        default_factory=lambda: int(os.getenv("SRA_ADMIN_MAX_CONNECTIONS", "20"))
+    )
+    overview_informers_enabled: bool = Field(
+        default_factory=lambda: (
+            os.getenv("OVERVIEW_INFORMERS_ENABLED", "1").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+    )
+    informer_watch_timeout_seconds: int = Field(
+        default_factory=lambda: int(os.getenv("INFORMER_WATCH_TIMEOUT_SECONDS", "300"))
+    )
+    kube_executor_max_workers: int = Field(
+        default_factory=lambda: int(os.getenv("KUBE_EXECUTOR_MAX_WORKERS", "8"))
+    )
+    kube_executor_max_queue: int = Field(
+        default_factory=lambda: int(os.getenv("KUBE_EXECUTOR_MAX_QUEUE", "64"))
+    )
+    kube_call_timeout_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("KUBE_CALL_TIMEOUT_SECONDS", "10"))
+    )
+    overview_cache_ttl_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("OVERVIEW_CACHE_TTL_SECONDS", "1"))
+    )
+    overview_stream_resync_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("OVERVIEW_STREAM_RESYNC_SECONDS", "15")
+        )
+    )
+    overview_stream_debounce_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("OVERVIEW_STREAM_DEBOUNCE_SECONDS", "0.25")
+        )
+    )
+    history_enabled: bool = Field(
+        default_factory=lambda: (
+            os.getenv("HISTORY_ENABLED", "1").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+    )
+    history_path: str = Field(
+        default_factory=lambda: os.getenv(
+            "HISTORY_PATH", "/tmp/alt-default-ops-console/history.bin"
+        ).strip()
+    )
+    history_sample_interval_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("HISTORY_SAMPLE_INTERVAL_SECONDS", "15")
+        )
+    )
+    history_retention_seconds: int = Field(
+        default_factory=lambda: int(
+            os.getenv("HISTORY_RETENTION_SECONDS", str(30 * 86400))
+        )
+    )
+    events_db_path: str = Field(
+        default_factory=lambda: os.getenv(
+            "EVENTS_DB_PATH", "/tmp/alt-default-ops-console/events.sqlite"
+        ).strip()
+    )
+    events_max_entries: int = Field(
+        default_factory=lambda: int(os.getenv("EVENTS_MAX_ENTRIES", "5000"))
+    )
+    events_retention_seconds: int = Field(
+        default_factory=lambda: int(
+            os.getenv("EVENTS_RETENTION_SECONDS", str(7 * 86400))
+        )
+    )
+    events_overview_window_seconds: int = Field(
+        default_factory=lambda: int(
+            os.getenv("EVENTS_OVERVIEW_WINDOW_SECONDS", "3600")
+        )
+    )
+    pricing_catalog_path: str = Field(
+        default_factory=lambda: os.getenv("PRICING_CATALOG_PATH", "").strip()
+    )
+    token_cache_max_entries: int = Field(
+        default_factory=lambda: int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "1024"))
+    )
+    token_cache_max_ttl_seconds: float = Field(
+        default_factory=lambda: float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+    )
+    response_compression_min_bytes: int = Field(
+        default_factory=lambda: int(
+            os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024")
+        )
+    )
+    metrics_enabled: bool = Field(
+        default_factory=lambda: (
+            os.getenv("METRICS_ENABLED", "1").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+    )
+    metrics_bearer_token: str = Field(
+        default_factory=lambda: os.getenv("METRICS_BEARER_TOKEN", "").strip()
+    )
+    batch_claim_concurrency: int = Field(
+        default_factory=lambda: int(os.getenv("BATCH_CLAIM_CONCURRENCY", "8"))
+    )
+    synthetic_cluster_claims: int = Field(
+        default_factory=lambda: int(os.getenv("SYNTHETIC_CLUSTER_CLAIMS", "0"))
+    )
+    synthetic_cluster_churn_per_second: float = Field(
+        default_factory=lambda: float(
+            os.getenv("SYNTHETIC_CLUSTER_CHURN_PER_SECOND", "0")
+        )
+    )
+    warm_pool_autoscaler_mode: str = Field(
+        default_factory=lambda: os.getenv("WARM_POOL_AUTOSCALER_MODE", "off")
+        .strip()
+        .lower()
+    )
+    warm_pool_autoscaler_interval_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("WARM_POOL_AUTOSCALER_INTERVAL_SECONDS", "30")
+        )
+    )
+    warm_pool_autoscaler_templates: set[str] = Field(
+        default_factory=lambda: {
+            x.strip()
+            for x in os.getenv("WARM_POOL_AUTOSCALER_TEMPLATES", "").split(",")
+            if x.strip()
+        }
+    )
+    warm_pool_autoscaler_min_replicas: int = Field(
+        default_factory=lambda: int(os.getenv("WARM_POOL_AUTOSCALER_MIN_REPLICAS", "0"))
+    )
+    warm_pool_autoscaler_max_replicas: int = Field(
+        default_factory=lambda: int(os.getenv("WARM_POOL_AUTOSCALER_MAX_REPLICAS", "5"))
+    )
+    warm_pool_autoscaler_lead_time_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("WARM_POOL_AUTOSCALER_LEAD_TIME_SECONDS", "120")
+        )
+    )
+    warm_pool_autoscaler_half_life_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("WARM_POOL_AUTOSCALER_HALF_LIFE_SECONDS", "300")
+        )
+    )
+    warm_pool_autoscaler_scale_down_delay_seconds: float = Field(
+        default_factory=lambda: float(
+            os.getenv("WARM_POOL_AUTOSCALER_SCALE_DOWN_DELAY_SECONDS", "600")
+        )
+    )
 
 
 @dataclass(frozen=True)
@@ -131,6 +361,38 @@ class CreateClaimRequest(BaseModel):
     claim_name: str | None = None
 
 
+class ClaimSelector(BaseModel):
+    names: list[str] = Field(default_factory=list)
+    template_name: str | None = None
+    owner_unknown: bool = False
+    older_than_seconds: int | None = Field(default=None, ge=0)
+    label_selector: str | None = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.names
+            or self.template_name
+            or self.owner_unknown
+            or self.older_than_seconds is not None
+            or self.label_selector
+        )
+
+
+class BatchDeleteClaimsRequest(BaseModel):
+    selector: ClaimSelector
+    dry_run: bool = False
+    use_delete_collection: bool = False
+    max_items: int = Field(default=500, ge=1, le=5000)
+
+
+class BatchCreateClaimsRequest(BaseModel):
+    template_name: str = Field(default="python-runtime-template", min_length=1)
+    count: int = Field(default=1, ge=1, le=50)
+    name_prefix: str = Field(default="sandbox-claim", min_length=1, max_length=40)
+    claim_names: list[str] | None = Field(default=None, max_length=50)
+    dry_run: bool = False
+
+
 class WarmPoolUpsertRequest(BaseModel):
     warm_pool_name: str = Field(default="python-sandbox-warmpool", min_length=1)
     template_name: str = Field(default="python-runtime-template", min_length=1)
@@ -144,27 +406,81 @@ class WarmPoolScaleRequest(BaseModel):
 settings = Settings()
 
 
-# Price references (USD) for europe-west4 (Netherlands), sourced from
-# Google Cloud pricing pages and Cloud Billing SKU catalog.
-# - E2 core on-demand: 0.02401338 / vCPU-hour
-# - E2 RAM on-demand: 0.00321816 / GiB-hour
-# - E2 core spot: 0.0095 / vCPU-hour
-# - E2 RAM spot: 0.001272 / GiB-hour
-# - GKE cluster management fee: 0.10 / cluster-hour
-# - PD Standard: 0.044 / GiB-month
-# - PD Balanced: 0.11 / GiB-month
-_E2_CORE_ONDEMAND_USD_PER_HOUR = 0.02401338
-_E2_RAM_ONDEMAND_USD_PER_GIB_HOUR = 0.00321816
-_E2_CORE_SPOT_USD_PER_HOUR = 0.0095
-_E2_RAM_SPOT_USD_PER_GIB_HOUR = 0.001272
-_GKE_CLUSTER_FEE_USD_PER_HOUR = 0.10
-_MONTH_HOURS = 730.0
-_PVC_USD_PER_GIB_MONTH_BY_CLASS = {
-    "standard": 0.044,
-    "standard-rwo": 0.044,
-    "balanced": 0.11,
-    "balanced-rwo": 0.11,
-}
+# List prices per region, machine family, GPU and disk type live in a
+# versioned catalog (app/pricing_catalog.json, or PRICING_CATALOG_PATH).
+pricing_table = PricingTable(load_catalog(settings.pricing_catalog_path or None))
+
+
+# Prometheus metrics served on /metrics. Latencies are recorded where they
+# happen; stats other components already keep are read at scrape time by the
+# collector registered further down.
+metrics = MetricsRegistry(prefix="ops_console_")
+http_request_seconds = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ("method", "route", "status"),
+)
+kube_api_seconds = metrics.histogram(
+    "kube_api_duration_seconds",
+    "Kubernetes API call latency through the bounded executor.",
+    ("verb", "resource", "outcome"),
+)
+sra_request_seconds = metrics.histogram(
+    "sra_request_duration_seconds",
+    "sandboxed-react-agent admin API latency.",
+    ("path", "outcome"),
+)
+sra_errors = metrics.counter(
+    "sra_errors",
+    "sandboxed-react-agent admin API requests that failed.",
+    ("path", "reason"),
+)
+oauth_request_seconds = metrics.histogram(
+    "oauth_request_duration_seconds",
+    "Outbound OAuth token exchange latency.",
+    ("operation", "outcome"),
+)
+token_verify_seconds = metrics.histogram(
+    "token_verify_duration_seconds",
+    "Bearer token verification latency.",
+    ("outcome",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+overview_phase_seconds = metrics.histogram(
+    "overview_phase_duration_seconds",
+    "Time spent per overview build phase (fetch, transform, sort, serialize).",
+    ("phase",),
+)
+overview_built_at = metrics.gauge(
+    "overview_last_build_timestamp_seconds",
+    "Unix time of the last overview build.",
+)
+sandbox_claims_gauge = metrics.gauge(
+    "sandbox_claims", "SandboxClaims by state.", ("state",)
+)
+warm_pool_replicas_gauge = metrics.gauge(
+    "warm_pool_replicas",
+    "Desired warm pool replicas.",
+    ("warm_pool", "template"),
+)
+warm_pool_ready_gauge = metrics.gauge(
+    "warm_pool_ready_replicas",
+    "Ready warm pool replicas.",
+    ("warm_pool", "template"),
+)
+sandbox_headroom_gauge = metrics.gauge(
+    "sandbox_headroom",
+    "Additional sandboxes of a template that fit on current nodes.",
+    ("template",),
+)
+sandbox_pods_pending_gauge = metrics.gauge(
+    "sandbox_pods_pending",
+    "Pending pods in the sandbox namespace by scheduling cause.",
+    ("cause",),
+)
+cost_hourly_gauge = metrics.gauge(
+    "cost_hourly_usd", "Estimated hourly cost by component.", ("component",)
+)
 
 
 def _normalize_base_path(path: str) -> str:
@@ -264,6 +580,231 @@ if not use_mock_cluster:
     except Exception:
         use_mock_cluster = True
 
+# In mock mode, SYNTHETIC_CLUSTER_CLAIMS > 0 replaces the small mock_state view
+# with a generated cluster served through the live overview code path.
+synthetic_cluster: SyntheticCluster | None = None
+if use_mock_cluster and settings.synthetic_cluster_claims > 0:
+    synthetic_cluster = SyntheticCluster(
+        SyntheticClusterSpec.for_claims(
+            settings.synthetic_cluster_claims,
+            namespace=settings.target_namespace,
+            managed_deployments=tuple(sorted(settings.managed_deployments)),
+        )
+    )
+
+
+def _cluster_mode() -> str:
+    if synthetic_cluster is not None:
+        return "synthetic"
+    return "mock" if use_mock_cluster else "live"
+
+
+def _pod_node_index(pod: Any) -> list[str]:
+    return [str(pod.spec.node_name or "unscheduled")]
+
+
+def _template_ref_index(obj: dict[str, Any]) -> list[str]:
+    template_ref = (obj.get("spec") or {}).get("sandboxTemplateRef") or {}
+    return [str(template_ref.get("name") or "")]
+
+
+def _informer_specs() -> list[InformerSpec]:
+    if not apps_api or not core_api or not custom_api:
+        return []
+    ns = settings.target_namespace
+    return [
+        InformerSpec(
+            "deployments", apps_api.list_namespaced_deployment, {"namespace": ns}
+        ),
+        InformerSpec(
+            "pods",
+            core_api.list_namespaced_pod,
+            {"namespace": ns},
+            indexers={"node": _pod_node_index},
+        ),
+        InformerSpec("services", core_api.list_namespaced_service, {"namespace": ns}),
+        InformerSpec(
+            "pvcs",
+            core_api.list_namespaced_persistent_volume_claim,
+            {"namespace": ns},
+            optional=True,
+        ),
+        InformerSpec("nodes", core_api.list_node, optional=True),
+        InformerSpec(
+            "claims",
+            custom_api.list_namespaced_custom_object,
+            {
+                "group": "extensions.agents.x-k8s.io",
+                "version": "v1alpha1",
+                "namespace": ns,
+                "plural": "sandboxclaims",
+            },
+            indexers={"template": _template_ref_index},
+        ),
+        InformerSpec(
+            "sandboxes",
+            custom_api.list_namespaced_custom_object,
+            {
+                "group": "agents.x-k8s.io",
+                "version": "v1alpha1",
+                "namespace": ns,
+                "plural": "sandboxes",
+            },
+        ),
+        InformerSpec(
+            "warm_pools",
+            custom_api.list_namespaced_custom_object,
+            {
+                "group": "extensions.agents.x-k8s.io",
+                "version": "v1alpha1",
+                "namespace": ns,
+                "plural": "sandboxwarmpools",
+            },
+            indexers={"template": _template_ref_index},
+        ),
+        InformerSpec(
+            "templates",
+            custom_api.list_namespaced_custom_object,
+            {
+                "group": "extensions.agents.x-k8s.io",
+                "version": "v1alpha1",
+                "namespace": ns,
+                "plural": "sandboxtemplates",
+            },
+        ),
+        # FailedScheduling events explain why sandbox pods sit Pending.
+        InformerSpec(
+            "events", core_api.list_namespaced_event, {"namespace": ns}, optional=True
+        ),
+    ]
+
+
+cluster_informers: InformerSet | None = None
+if not use_mock_cluster and settings.overview_informers_enabled:
+    cluster_informers = InformerSet(
+        [
+            Informer(
+                spec, watch_timeout_seconds=settings.informer_watch_timeout_seconds
+            )
+            for spec in _informer_specs()
+        ]
+    )
+
+# Kinds whose watch events push a fresh diff to open /api/overview/stream clients.
+_STREAM_TRIGGER_KINDS = frozenset(
+    {"claims", "sandboxes", "pods", "warm_pools", "deployments"}
+)
+overview_changes = ChangeNotifier()
+# Concurrent overview builds for the same caller share one computation; results
+# are reused for OVERVIEW_CACHE_TTL_SECONDS or until the next cluster change.
+overview_cache = StaleWhileRevalidateCache(
+    ttl_seconds=settings.overview_cache_ttl_seconds, stale_seconds=0, max_entries=64
+)
+
+
+def _notify_overview_change(kind: str, _event_type: str, _obj: Any, _old: Any) -> None:
+    if kind in _STREAM_TRIGGER_KINDS:
+        overview_changes.notify_threadsafe()
+
+
+# Claim lifecycle timestamps come from the same watches; without informers
+# (mock mode or OVERVIEW_INFORMERS_ENABLED=0) the tracker stays empty.
+latency_tracker = LatencyTracker()
+# Per-pod costs are updated from the same watches, so /api/cost/attribution
+# only reprices pods whose spec or node changed.
+cost_attributor = CostAttributor(pricing_table)
+# Node allocatable, pod requests and scheduling failures per node, so template
+# headroom next to the warm pool profiles tracks the watches too.
+capacity_tracker = CapacityTracker()
+# Events are deduplicated by involved object and reason and outlive the
+# Kubernetes Event TTL, so e.g. FailedMount on a claim stays searchable.
+event_index = EventIndex(
+    path=settings.events_db_path or None,
+    max_entries=settings.events_max_entries,
+    retention_seconds=settings.events_retention_seconds,
+)
+
+if cluster_informers is not None:
+    cluster_informers.add_handler(_notify_overview_change)
+    cluster_informers.add_handler(latency_tracker.handle)
+    cluster_informers.add_handler(cost_attributor.handle)
+    cluster_informers.add_handler(capacity_tracker.handle)
+    cluster_informers.add_handler(event_index.handle)
+
+if synthetic_cluster is not None:
+    synthetic_cluster.add_handler(_notify_overview_change)
+    synthetic_cluster.add_handler(latency_tracker.handle)
+    synthetic_cluster.add_handler(cost_attributor.handle)
+    synthetic_cluster.add_handler(capacity_tracker.handle)
+    synthetic_cluster.add_handler(event_index.handle)
+    synthetic_cluster.replay()
+
+kube_executor = KubeExecutor(
+    max_workers=settings.kube_executor_max_workers,
+    max_queue=settings.kube_executor_max_queue,
+    default_timeout_seconds=settings.kube_call_timeout_seconds,
+)
+
+
+_KUBE_VERBS = (
+    "list",
+    "read",
+    "create",
+    "patch",
+    "replace",
+    "delete_collection",
+    "delete",
+    "watch",
+)
+
+
+def _kube_call_labels(func: Any, kwargs: dict[str, Any]) -> tuple[str, str]:
+    """Map e.g. ``list_namespaced_pod`` to ``("list", "pod")``.
+
+    Custom object calls are labelled with their ``plural`` instead of the
+    generic ``custom_object`` suffix.
+    """
+    name = str(getattr(func, "__name__", "") or "call")
+    verb = next((v for v in _KUBE_VERBS if name.startswith(f"{v}_")), "call")
+    resource = name[len(verb) + 1 :] if verb != "call" else name
+    for prefix in ("namespaced_", "cluster_"):
+        resource = resource.removeprefix(prefix)
+    if resource == "custom_object" and kwargs.get("plural"):
+        resource = str(kwargs["plural"])
+    return verb, resource
+
+
+async def _kube_call(func: Any, /, *args: Any, **kwargs: Any) -> Any:
+    timeout = max(float(settings.kube_call_timeout_seconds), 0.1)
+    kwargs.setdefault("_request_timeout", timeout)
+    verb, resource = _kube_call_labels(func, kwargs)
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        return await kube_executor.call(func, *args, timeout=timeout, **kwargs)
+    except KubeExecutorSaturated as exc:
+        outcome = "saturated"
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except (TimeoutError, urllib3.exceptions.TimeoutError) as exc:
+        outcome = "timeout"
+        raise HTTPException(
+            status_code=504, detail="Kubernetes API call timed out"
+        ) from exc
+    except ApiException as exc:
+        outcome = str(exc.status or "error")
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        kube_api_seconds.observe(
+            time.perf_counter() - started,
+            verb=verb,
+            resource=resource,
+            outcome=outcome,
+        )
+
+
 mock_state: dict[str, Any] = {
     "deployments": {
         name: {"desired": 1, "ready": 1, "available": 1, "updated": 1}
@@ -279,43 +820,110 @@ mock_state: dict[str, Any] = {
     },
 }
 
-app = FastAPI(title="alt-default-ops-console", version="0.1.0")
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    overview_changes.bind(asyncio.get_running_loop())
+    jwks_cache.start()
+    jwks_prewarm: asyncio.Task[None] | None = None
+    if settings.jwks_prewarm:
+        # Fetch signing keys now so the first login does not wait on them.
+        jwks_prewarm = asyncio.create_task(
+            jwks_cache.prefetch(
+                {"https://www.googleapis.com/oauth2/v3/certs", settings.jwt_jwks_url}
+            )
+        )
+    if cluster_informers is not None:
+        cluster_informers.start()
+    if history_sampler is not None:
+        history_sampler.start()
+    if warm_pool_autoscaler is not None:
+        warm_pool_autoscaler.start()
+    churn_task: asyncio.Task[None] | None = None
+    churn_rate = settings.synthetic_cluster_churn_per_second
+    if synthetic_cluster is not None and churn_rate > 0:
+        churn_task = asyncio.create_task(
+            ChurnSimulator(synthetic_cluster).run_forever(churn_rate)
+        )
+    try:
+        yield
+    finally:
+        if churn_task is not None:
+            churn_task.cancel()
+        if jwks_prewarm is not None:
+            jwks_prewarm.cancel()
+        if warm_pool_autoscaler is not None:
+            await warm_pool_autoscaler.stop()
+        if history_sampler is not None:
+            await history_sampler.stop()
+        if cluster_informers is not None:
+            cluster_informers.stop()
+        event_index.close()
+        kube_executor.shutdown()
+        await sra_admin_client.aclose()
+        await jwks_cache.aclose()
+        await oauth_client.aclose()
+
+
+app = FastAPI(title="alt-default-ops-console", version="0.1.0", lifespan=_lifespan)
+if settings.response_compression_min_bytes > 0:
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.response_compression_min_bytes
+    )
 templates = Jinja2Templates(
     directory=str(Path(__file__).resolve().parent / "templates")
 )
 
 
-class JwksCache:
-    def __init__(self) -> None:
-        self._keys_by_url: dict[str, dict[str, dict[str, Any]]] = {}
-        self._last_fetch_by_url: dict[str, float] = {}
-        self._ttl_seconds = 900
-
-    async def get_keys(
-        self, jwks_url: str, force_refresh: bool = False
-    ) -> dict[str, dict[str, Any]]:
-        now = time.time()
-        cached_keys = self._keys_by_url.get(jwks_url, {})
-        last_fetch = self._last_fetch_by_url.get(jwks_url, 0.0)
-        if not force_refresh and cached_keys and (now - last_fetch) < self._ttl_seconds:
-            return cached_keys
-        async with httpx.AsyncClient(timeout=5.0) as http_client:
-            response = await http_client.get(jwks_url)
-            response.raise_for_status()
-            payload = response.json()
-        keys: dict[str, dict[str, Any]] = {}
-        for item in payload.get("keys", []):
-            kid = item.get("kid")
-            if kid:
-                keys[kid] = item
-        if not keys:
-            raise HTTPException(status_code=503, detail="No JWKS keys available")
-        self._keys_by_url[jwks_url] = keys
-        self._last_fetch_by_url[jwks_url] = now
-        return keys
-
-
-jwks_cache = JwksCache()
+def _record_sra_request(path: str, seconds: float, outcome: str) -> None:
+    sra_request_seconds.observe(seconds, path=path, outcome=outcome)
+    if not outcome.startswith("2"):
+        sra_errors.inc(path=path, reason=outcome)
+
+
+def _record_oauth_request(operation: str, seconds: float, outcome: str) -> None:
+    oauth_request_seconds.observe(seconds, operation=operation, outcome=outcome)
+
+
+# One pooled client for the token exchange and JWKS fetches.
+oauth_client = OAuthClient(
+    timeout_seconds=settings.oauth_http_timeout_seconds,
+    on_request=_record_oauth_request,
+)
+jwks_cache = JwksCache(client_factory=oauth_client.http)
+verified_tokens = VerifiedTokenCache(
+    max_entries=settings.token_cache_max_entries,
+    max_ttl_seconds=settings.token_cache_max_ttl_seconds,
+)
+
+
+def _build_session_store() -> SessionStore | None:
+    if settings.session_store in {"", "0", "off", "none"}:
+        return None
+    if settings.session_store not in {"memory", "sqlite"}:
+        raise RuntimeError(f"Unknown SESSION_STORE: {settings.session_store}")
+    backend = None
+    if settings.session_store == "sqlite" and settings.session_db_path:
+        backend = SqliteSessionBackend(settings.session_db_path)
+    return SessionStore(
+        max_entries=settings.session_max_entries,
+        ttl_seconds=settings.session_ttl_seconds,
+        backend=backend,
+    )
+
+
+# Claims verified at login, keyed by the ops_session cookie; requests carrying
+# a live session skip JWT verification.
+session_store = _build_session_store()
+sra_admin_client = SraAdminClient(
+    timeout_seconds=settings.sra_admin_api_timeout_seconds,
+    cache_ttl_seconds=settings.sra_admin_cache_ttl_seconds,
+    cache_stale_seconds=settings.sra_admin_cache_stale_seconds,
+    http2=settings.sra_admin_http2,
+    max_connections=settings.sra_admin_max_connections,
+    on_request=_record_sra_request,
+)
 
 
 def _extract_token(
@@ -445,7 +1053,7 @@ def _upstream_auth_headers(request: Request) -> dict[str, str]:
     return headers
 
 
-async def _fetch_sra_admin_payload(request: Request) -> dict[str, Any]:
+async def _fetch_sra_admin_payload(request: Request | None) -> dict[str, Any]:
     if not settings.sra_admin_enabled:
         return {
             "enabled": False,
@@ -455,6 +1063,16 @@ async def _fetch_sra_admin_payload(request: Request) -> dict[str, Any]:
             "error": "SRA admin integration is disabled",
         }
 
+    if request is None:
+        # Background samplers have no caller credentials to forward.
+        return {
+            "enabled": True,
+            "reachable": False,
+            "index": {},
+            "analytics": {},
+            "error": "No caller credentials",
+        }
+
     base_url = settings.sra_admin_api_base_url.rstrip("/")
     if not base_url:
         return {
@@ -471,28 +1089,24 @@ async def _fetch_sra_admin_payload(request: Request) -> dict[str, Any]:
         "limit": max(1, min(int(settings.sra_admin_recent_limit), 2000)),
     }
 
-    timeout = max(float(settings.sra_admin_api_timeout_seconds), 1.0)
     try:
-        async with httpx.AsyncClient(timeout=timeout) as http_client:
-            index_response, analytics_response = await asyncio.gather(
-                http_client.get(
-                    f"{base_url}/api/admin/ops/sandbox-index",
-                    headers=headers,
-                    params={"limit": params["limit"]},
-                ),
-                http_client.get(
-                    f"{base_url}/api/admin/ops/lease-analytics",
-                    headers=headers,
-                    params=params,
-                ),
-            )
-        index_response.raise_for_status()
-        analytics_response.raise_for_status()
+        index_payload, analytics_payload = await asyncio.gather(
+            sra_admin_client.get_json_cached(
+                f"{base_url}/api/admin/ops/sandbox-index",
+                headers=headers,
+                params={"limit": params["limit"]},
+            ),
+            sra_admin_client.get_json_cached(
+                f"{base_url}/api/admin/ops/lease-analytics",
+                headers=headers,
+                params=params,
+            ),
+        )
         return {
             "enabled": True,
             "reachable": True,
-            "index": index_response.json(),
-            "analytics": analytics_response.json(),
+            "index": index_payload,
+            "analytics": analytics_payload,
             "error": "",
         }
     except Exception as exc:
@@ -519,19 +1133,15 @@ async def _fetch_sra_admin_users(
         raise HTTPException(status_code=503, detail="SRA_ADMIN_API_BASE_URL is empty")
 
     headers = _upstream_auth_headers(request)
-    timeout = max(float(settings.sra_admin_api_timeout_seconds), 1.0)
     safe_limit = min(max(int(limit), 1), 100)
     safe_query = str(query or "").strip()
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as http_client:
-            response = await http_client.get(
-                f"{base_url}/api/admin/ops/users/search",
-                headers=headers,
-                params={"q": safe_query, "limit": safe_limit},
-            )
-        response.raise_for_status()
-        payload = response.json()
+        payload = await sra_admin_client.get_json(
+            f"{base_url}/api/admin/ops/users/search",
+            headers=headers,
+            params={"q": safe_query, "limit": safe_limit},
+        )
     except httpx.HTTPStatusError as exc:
         detail = exc.response.text.strip() or str(exc)
         raise HTTPException(
@@ -558,7 +1168,12 @@ async def require_auth(
     x_forwarded_access_token: str | None = Header(default=None),
     ops_access_token: str | None = Cookie(default=None),
     ops_google_access_token: str | None = Cookie(default=None),
+    ops_session: str | None = Cookie(default=None),
 ) -> dict[str, Any]:
+    if not (authorization or x_forwarded_access_token):
+        session_claims = _session_claims(ops_session)
+        if session_claims is not None:
+            return session_claims
     token = (
         _extract_token(authorization, x_forwarded_access_token)
         if (authorization or x_forwarded_access_token)
@@ -570,7 +1185,42 @@ async def require_auth(
     return await _verify_token(token, access_token=ops_google_access_token)
 
 
+def _session_claims(session_id: str | None) -> dict[str, Any] | None:
+    if session_store is None or not session_id:
+        return None
+    started = time.perf_counter()
+    claims = session_store.get(session_id)
+    if claims is None:
+        return None
+    # The signature was checked at login; the allowlist may have changed since.
+    _check_authorization(claims)
+    token_verify_seconds.observe(time.perf_counter() - started, outcome="session")
+    return claims
+
+
 async def _verify_token(token: str, access_token: str | None = None) -> dict[str, Any]:
+    started = time.perf_counter()
+    cache_key = token_cache_key(token, access_token)
+    cached_claims = verified_tokens.get(cache_key)
+    if cached_claims is not None:
+        token_verify_seconds.observe(
+            time.perf_counter() - started, outcome="cache_hit"
+        )
+        return cached_claims
+
+    outcome = "rejected"
+    try:
+        claims = await _verify_token_uncached(token, access_token)
+        outcome = "verified"
+    finally:
+        token_verify_seconds.observe(time.perf_counter() - started, outcome=outcome)
+    verified_tokens.put(cache_key, claims)
+    return claims
+
+
+async def _verify_token_uncached(
+    token: str, access_token: str | None
+) -> dict[str, Any]:
     try:
         header = jwt.get_unverified_header(token)
     except JWTError as exc:
@@ -750,7 +1400,12 @@ def _default_warm_pool_name(template_name: str) -> str:
 def _build_warm_pool_profiles(
     templates: list[str],
     warm_pools: list[dict[str, Any]],
+    capacity: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
+    headroom = {
+        str(item.get("template") or ""): item
+        for item in (capacity or {}).get("templates") or []
+    }
     normalized_templates = sorted(
         str(item).strip() for item in templates if str(item).strip()
     )
@@ -791,11 +1446,24 @@ def _build_warm_pool_profiles(
                 ),
                 "total_ready": sum(int(pool.get("ready") or 0) for pool in matching),
                 "pools": matching,
+                "headroom": _profile_headroom(headroom.get(template_name)),
             }
         )
     return profiles
 
 
+def _profile_headroom(item: dict[str, Any] | None) -> dict[str, Any] | None:
+    if item is None:
+        return None
+    return {
+        "fits_now": item["fits_now"],
+        "limited_by": item["limited_by"],
+        "by_node_pool": {
+            pool["node_pool"]: pool["fits"] for pool in item["by_node_pool"]
+        },
+    }
+
+
 def _claim_status(
     claim: dict[str, Any],
     *,
@@ -868,103 +1536,6 @@ def _node_ready(node: Any) -> bool:
     return False
 
 
-def _node_instance_type(node: Any) -> str:
-    labels = node.metadata.labels or {}
-    return (
-        labels.get("node.kubernetes.io/instance-type")
-        or labels.get("beta.kubernetes.io/instance-type")
-        or "unknown"
-    )
-
-
-def _node_pool(node: Any) -> str:
-    labels = node.metadata.labels or {}
-    return labels.get("cloud.google.com/gke-nodepool") or "unknown"
-
-
-def _node_is_spot(node: Any) -> bool:
-    labels = node.metadata.labels or {}
-    value = str(labels.get("cloud.google.com/gke-spot") or "").strip().lower()
-    return value == "true"
-
-
-def _e2_machine_shape(instance_type: str) -> tuple[int, float] | None:
-    machine = instance_type.strip().lower()
-    if machine == "e2-medium":
-        return (2, 4.0)
-    if machine == "e2-small":
-        return (2, 2.0)
-    if machine == "e2-micro":
-        return (2, 1.0)
-    if machine.startswith("e2-standard-"):
-        try:
-            cores = int(machine.split("e2-standard-", 1)[1])
-            if cores > 0:
-                return (cores, float(cores * 4))
-        except Exception:
-            return None
-    return None
-
-
-def _estimate_node_hourly_cost_usd(instance_type: str, is_spot: bool) -> float | None:
-    shape = _e2_machine_shape(instance_type)
-    if not shape:
-        return None
-    cores, memory_gib = shape
-    if is_spot:
-        return (cores * _E2_CORE_SPOT_USD_PER_HOUR) + (
-            memory_gib * _E2_RAM_SPOT_USD_PER_GIB_HOUR
-        )
-    return (cores * _E2_CORE_ONDEMAND_USD_PER_HOUR) + (
-        memory_gib * _E2_RAM_ONDEMAND_USD_PER_GIB_HOUR
-    )
-
-
-def _parse_quantity_gib(quantity: str | None) -> float:
-    if not quantity:
-        return 0.0
-    raw = str(quantity).strip()
-    if not raw:
-        return 0.0
-    units = [
-        ("Ki", 1.0 / (1024 * 1024)),
-        ("Mi", 1.0 / 1024),
-        ("Gi", 1.0),
-        ("Ti", 1024.0),
-        ("Pi", 1024.0 * 1024.0),
-        ("Ei", 1024.0 * 1024.0 * 1024.0),
-        ("K", 1.0 / (1000 * 1000)),
-        ("M", 1.0 / 1000),
-        ("G", 1.0),
-        ("T", 1000.0),
-        ("P", 1000.0 * 1000.0),
-        ("E", 1000.0 * 1000.0 * 1000.0),
-    ]
-    for suffix, factor in units:
-        if raw.endswith(suffix):
-            number = raw[: -len(suffix)]
-            try:
-                return float(number) * factor
-            except Exception:
-                return 0.0
-    try:
-        return float(raw) / (1024.0**3)
-    except Exception:
-        return 0.0
-
-
-def _pvc_cost_rate_usd_per_gib_hour(storage_class: str) -> float | None:
-    key = storage_class.strip().lower()
-    monthly = _PVC_USD_PER_GIB_MONTH_BY_CLASS.get(key)
-    if monthly is not None:
-        return monthly / _MONTH_HOURS
-    if "standard" in key:
-        return _PVC_USD_PER_GIB_MONTH_BY_CLASS["standard"] / _MONTH_HOURS
-    if "balanced" in key:
-        return _PVC_USD_PER_GIB_MONTH_BY_CLASS["balanced"] / _MONTH_HOURS
-    return None
-
-
 def _pvc_storage_class(pvc: Any) -> str:
     if pvc.spec.storage_class_name:
         return str(pvc.spec.storage_class_name)
@@ -973,80 +1544,11 @@ def _pvc_storage_class(pvc: Any) -> str:
 
 
 def _cost_estimate(
-    nodes: list[dict[str, Any]], pvcs: list[dict[str, Any]], cluster_count: int = 1
+    nodes: list[dict[str, Any]],
+    pvcs: list[dict[str, Any]],
+    cluster_count: int = 1,
 ) -> dict[str, Any]:
-    node_breakdown: dict[tuple[str, bool], dict[str, Any]] = {}
-    node_total = 0.0
-
-    for node in nodes:
-        instance_type = str(node.get("instance_type") or "unknown")
-        is_spot = bool(node.get("spot"))
-        hourly_each = _estimate_node_hourly_cost_usd(instance_type, is_spot)
-        key = (instance_type, is_spot)
-        entry = node_breakdown.setdefault(
-            key,
-            {
-                "instance_type": instance_type,
-                "spot": is_spot,
-                "count": 0,
-                "hourly_each_usd": hourly_each,
-                "hourly_total_usd": 0.0,
-            },
-        )
-        entry["count"] = int(entry["count"] or 0) + 1
-        if hourly_each is not None:
-            entry["hourly_total_usd"] = (
-                float(entry["hourly_total_usd"] or 0.0) + hourly_each
-            )
-            node_total += hourly_each
-
-    pvc_breakdown: list[dict[str, Any]] = []
-    pvc_total = 0.0
-    for pvc in pvcs:
-        storage_class = str(pvc.get("storage_class") or "")
-        size_gib = float(pvc.get("requested_gib") or 0.0)
-        hourly_rate = _pvc_cost_rate_usd_per_gib_hour(storage_class)
-        hourly_total = (hourly_rate * size_gib) if hourly_rate is not None else None
-        pvc_breakdown.append(
-            {
-                "name": str(pvc.get("name") or ""),
-                "storage_class": storage_class,
-                "requested_gib": size_gib,
-                "hourly_usd": hourly_total,
-            }
-        )
-        if hourly_total is not None:
-            pvc_total += hourly_total
-
-    gke_fee = float(max(cluster_count, 0)) * _GKE_CLUSTER_FEE_USD_PER_HOUR
-    total = node_total + pvc_total + gke_fee
-
-    return {
-        "currency": "USD",
-        "period": "hour",
-        "region": "europe-west4",
-        "node_hourly_total_usd": node_total,
-        "pvc_hourly_total_usd": pvc_total,
-        "gke_cluster_fee_hourly_usd": gke_fee,
-        "total_hourly_usd": total,
-        "node_breakdown": sorted(
-            node_breakdown.values(),
-            key=lambda x: (str(x.get("instance_type") or ""), bool(x.get("spot"))),
-        ),
-        "pvc_breakdown": sorted(
-            pvc_breakdown,
-            key=lambda x: str(x.get("name") or ""),
-        ),
-        "pricing_source": {
-            "compute": "https://cloud.google.com/compute/all-pricing",
-            "gke": "https://cloud.google.com/kubernetes-engine/pricing",
-        },
-        "notes": [
-            "Estimate includes nodes, PVC capacity, and one GKE cluster management fee.",
-            "Unknown machine/storage classes are excluded from numeric totals.",
-            "Prices are list prices for europe-west4 and may differ with discounts or custom contracts.",
-        ],
-    }
+    return pricing_table.cost_estimate(nodes, pvcs, cluster_count=cluster_count)
 
 
 def _node_summary(nodes: list[dict[str, Any]]) -> dict[str, Any]:
@@ -1057,9 +1559,9 @@ def _node_summary(nodes: list[dict[str, Any]]) -> dict[str, Any]:
         if node.get("ready"):
             ready_count += 1
         node_type = str(node.get("instance_type") or "unknown")
-        node_pool = str(node.get("node_pool") or "unknown")
+        pool_name = str(node.get("node_pool") or "unknown")
         type_counts[node_type] = type_counts.get(node_type, 0) + 1
-        pool_counts[node_pool] = pool_counts.get(node_pool, 0) + 1
+        pool_counts[pool_name] = pool_counts.get(pool_name, 0) + 1
     return {
         "total": len(nodes),
         "ready": ready_count,
@@ -1074,9 +1576,203 @@ def _node_summary(nodes: list[dict[str, Any]]) -> dict[str, Any]:
     }
 
 
-async def _overview_data(request: Request) -> dict[str, Any]:
+async def _list_cluster_objects() -> dict[str, list[Any]]:
+    if not apps_api or not core_api or not custom_api:
+        raise HTTPException(status_code=500, detail="Kubernetes API is not initialized")
+
+    ns = settings.target_namespace
+
+    async def items(func: Any, **kwargs: Any) -> list[Any]:
+        return (await _kube_call(func, **kwargs)).items
+
+    async def optional_items(func: Any, **kwargs: Any) -> list[Any]:
+        try:
+            return await items(func, **kwargs)
+        except ApiException:
+            return []
+
+    async def custom_items(group: str, plural: str) -> list[Any]:
+        response = await _kube_call(
+            custom_api.list_namespaced_custom_object,
+            group=group,
+            version="v1alpha1",
+            namespace=ns,
+            plural=plural,
+        )
+        return response.get("items", [])
+
+    (
+        deployments,
+        pods,
+        services,
+        pvcs,
+        nodes,
+        claims,
+        sandboxes,
+        warm_pools,
+        templates,
+    ) = await asyncio.gather(
+        items(apps_api.list_namespaced_deployment, namespace=ns),
+        items(core_api.list_namespaced_pod, namespace=ns),
+        items(core_api.list_namespaced_service, namespace=ns),
+        optional_items(core_api.list_namespaced_persistent_volume_claim, namespace=ns),
+        optional_items(core_api.list_node),
+        custom_items("extensions.agents.x-k8s.io", "sandboxclaims"),
+        custom_items("agents.x-k8s.io", "sandboxes"),
+        custom_items("extensions.agents.x-k8s.io", "sandboxwarmpools"),
+        custom_items("extensions.agents.x-k8s.io", "sandboxtemplates"),
+    )
+    return {
+        "deployments": deployments,
+        "pods": pods,
+        "services": services,
+        "pvcs": pvcs,
+        "nodes": nodes,
+        "claims": claims,
+        "sandboxes": sandboxes,
+        "warm_pools": warm_pools,
+        "templates": templates,
+    }
+
+
+async def _cluster_objects() -> dict[str, list[Any]]:
+    if synthetic_cluster is not None:
+        return synthetic_cluster.objects()
+    # Serve from the informer store once every kind has completed its initial
+    # LIST; until then (or with informers disabled) fall back to direct lists.
+    if cluster_informers is not None and cluster_informers.has_synced():
+        return cluster_informers.snapshot()
+    return await _list_cluster_objects()
+
+
+def _capacity_snapshot(objects: dict[str, list[Any]]) -> dict[str, Any]:
+    if synthetic_cluster is not None or (
+        cluster_informers is not None and cluster_informers.has_synced()
+    ):
+        return capacity_tracker.snapshot()
+    tracker = CapacityTracker()
+    tracker.load(objects)
+    return tracker.snapshot()
+
+
+def _attach_event_summaries(
+    claim_rows: list[dict[str, Any]],
+    sandbox_rows: list[dict[str, Any]],
+    pods: list[Any],
+    *,
+    now: datetime,
+) -> dict[str, Any]:
+    """Add an ``events`` roll-up to each claim and sandbox row.
+
+    A sandbox collects the events of its pods; a claim additionally collects
+    those of its sandbox, so e.g. a FailedMount on the pod shows on the claim.
+    """
+    since = now.timestamp() - settings.events_overview_window_seconds
+    pods_by_sandbox: dict[str, list[tuple[str, str]]] = {}
+    for pod in pods:
+        sandbox = _sandbox_owner(pod)
+        if sandbox:
+            pods_by_sandbox.setdefault(sandbox, []).append(
+                ("Pod", str(get_field(pod, "metadata", "name") or ""))
+            )
+    sandbox_keys: dict[str, list[tuple[str, str]]] = {}
+    sandboxes_by_claim: dict[str, list[str]] = {}
+    for row in sandbox_rows:
+        name = str(row.get("name") or "")
+        sandbox_keys[name] = [("Sandbox", name), *pods_by_sandbox.get(name, ())]
+        if row.get("claim_name"):
+            sandboxes_by_claim.setdefault(str(row["claim_name"]), []).append(name)
+    objects = {f"sandbox/{name}": keys for name, keys in sandbox_keys.items()}
+    for row in claim_rows:
+        name = str(row.get("name") or "")
+        objects[f"claim/{name}"] = [("SandboxClaim", name)] + [
+            key
+            for sandbox in sandboxes_by_claim.get(name, ())
+            for key in sandbox_keys[sandbox]
+        ]
+    summaries = event_index.summarize(objects, since=since)
+    for prefix, rows in (("claim", claim_rows), ("sandbox", sandbox_rows)):
+        for row in rows:
+            row["events"] = summaries.get(f"{prefix}/{row.get('name') or ''}")
+
+    warnings = event_index.query(event_type="Warning", since=since, limit=0)
+    return {
+        "window_seconds": settings.events_overview_window_seconds,
+        "warnings": warnings["total_count"],
+        "warning_groups": warnings["total_groups"],
+        "by_reason": warnings["by_reason"][:10],
+        "claims_with_warnings": sum(
+            1 for row in claim_rows if (row["events"] or {}).get("warnings")
+        ),
+        "sandboxes_with_warnings": sum(
+            1 for row in sandbox_rows if (row["events"] or {}).get("warnings")
+        ),
+    }
+
+
+def _informers_status() -> dict[str, Any]:
+    if cluster_informers is None:
+        return {"enabled": False, "synced": False, "kinds": []}
+    return cluster_informers.status()
+
+
+def _claim_state(row: dict[str, Any]) -> str:
+    if row.get("ready_condition") is True:
+        return "ready"
+    return str(row.get("phase") or "pending").lower()
+
+
+def _record_overview_gauges(payload: dict[str, Any]) -> None:
+    claim_states: dict[str, int] = {}
+    for row in payload.get("sandboxclaims_detailed") or []:
+        state = _claim_state(row)
+        claim_states[state] = claim_states.get(state, 0) + 1
+    sandbox_claims_gauge.replace(
+        ({"state": state}, count) for state, count in claim_states.items()
+    )
+
+    pools = [
+        (
+            {"warm_pool": row.get("name") or "", "template": row.get("template") or ""},
+            row,
+        )
+        for row in payload.get("sandboxwarmpools") or []
+    ]
+    warm_pool_replicas_gauge.replace(
+        (labels, row.get("replicas") or 0) for labels, row in pools
+    )
+    warm_pool_ready_gauge.replace(
+        (labels, row.get("ready") or 0) for labels, row in pools
+    )
+
+    cost = payload.get("cost_estimate") or {}
+    cost_hourly_gauge.replace(
+        [
+            ({"component": "node"}, cost.get("node_hourly_total_usd") or 0.0),
+            ({"component": "pvc"}, cost.get("pvc_hourly_total_usd") or 0.0),
+            (
+                {"component": "cluster_fee"},
+                cost.get("gke_cluster_fee_hourly_usd") or 0.0,
+            ),
+            ({"component": "total"}, cost.get("total_hourly_usd") or 0.0),
+        ]
+    )
+    capacity = payload.get("capacity") or {}
+    sandbox_headroom_gauge.replace(
+        ({"template": item["template"]}, item["fits_now"])
+        for item in capacity.get("templates") or []
+    )
+    pending_causes = (capacity.get("pending") or {}).get("causes") or {}
+    sandbox_pods_pending_gauge.replace(
+        ({"cause": cause}, count) for cause, count in pending_causes.items()
+    )
+    overview_built_at.set(time.time())
+
+
+async def _overview_data(request: Request | None) -> dict[str, Any]:
     ns = settings.target_namespace
     now = datetime.now(UTC)
+    started_at = time.perf_counter()
     sra_admin = await _fetch_sra_admin_payload(request)
     sra_index = (
         sra_admin.get("index") if isinstance(sra_admin.get("index"), dict) else {}
@@ -1092,7 +1788,7 @@ async def _overview_data(request: Request) -> dict[str, Any]:
         else {}
     )
 
-    if use_mock_cluster:
+    if use_mock_cluster and synthetic_cluster is None:
         mock_nodes = [
             {
                 "name": "mock-node-local-a",
@@ -1172,7 +1868,7 @@ async def _overview_data(request: Request) -> dict[str, Any]:
             }
             for name, state in sorted(mock_state["warm_pools"].items())
         ]
-        return {
+        payload = {
             "cluster_mode": "mock",
             "namespace": ns,
             "deployments": [
@@ -1209,6 +1905,10 @@ async def _overview_data(request: Request) -> dict[str, Any]:
             ),
             "nodes": mock_nodes,
             "node_summary": _node_summary(mock_nodes),
+            "capacity": CapacityTracker().snapshot(),
+            "events_summary": _attach_event_summaries(
+                claims_detailed, sandboxes_detailed, [], now=now
+            ),
             "pvcs": [
                 {
                     "name": "sandboxed-react-agent-backend-data",
@@ -1232,6 +1932,7 @@ async def _overview_data(request: Request) -> dict[str, Any]:
                 pvcs=[
                     {
                         "name": "sandboxed-react-agent-backend-data",
+                        "namespace": ns,
                         "storage_class": "standard",
                         "requested_gib": 5.0,
                     }
@@ -1245,49 +1946,25 @@ async def _overview_data(request: Request) -> dict[str, Any]:
                     "enabled": bool(sra_admin.get("enabled")),
                     "reachable": bool(sra_admin.get("reachable")),
                     "error": str(sra_admin.get("error") or ""),
-                }
+                },
+                "informers": _informers_status(),
             },
         }
-
-    if not apps_api or not core_api or not custom_api:
-        raise HTTPException(status_code=500, detail="Kubernetes API is not initialized")
-
-    deployments = apps_api.list_namespaced_deployment(namespace=ns).items
-    pods = core_api.list_namespaced_pod(namespace=ns).items
-    services = core_api.list_namespaced_service(namespace=ns).items
-    try:
-        pvcs = core_api.list_namespaced_persistent_volume_claim(namespace=ns).items
-    except ApiException:
-        pvcs = []
-    try:
-        nodes = core_api.list_node().items
-    except ApiException:
-        nodes = []
-
-    claims = custom_api.list_namespaced_custom_object(
-        group="extensions.agents.x-k8s.io",
-        version="v1alpha1",
-        namespace=ns,
-        plural="sandboxclaims",
-    ).get("items", [])
-    sandboxes = custom_api.list_namespaced_custom_object(
-        group="agents.x-k8s.io",
-        version="v1alpha1",
-        namespace=ns,
-        plural="sandboxes",
-    ).get("items", [])
-    warm_pools = custom_api.list_namespaced_custom_object(
-        group="extensions.agents.x-k8s.io",
-        version="v1alpha1",
-        namespace=ns,
-        plural="sandboxwarmpools",
-    ).get("items", [])
-    templates = custom_api.list_namespaced_custom_object(
-        group="extensions.agents.x-k8s.io",
-        version="v1alpha1",
-        namespace=ns,
-        plural="sandboxtemplates",
-    ).get("items", [])
+        _record_overview_gauges(payload)
+        return payload
+
+    objects = await _cluster_objects()
+    fetched_at = time.perf_counter()
+    overview_phase_seconds.observe(fetched_at - started_at, phase="fetch")
+    deployments = objects["deployments"]
+    pods = objects["pods"]
+    services = objects["services"]
+    pvcs = objects["pvcs"]
+    nodes = objects["nodes"]
+    claims = objects["claims"]
+    sandboxes = objects["sandboxes"]
+    warm_pools = objects["warm_pools"]
+    templates = objects["templates"]
 
     pod_count_by_node: dict[str, int] = {}
     phase_counts_by_node: dict[str, dict[str, int]] = {}
@@ -1302,9 +1979,12 @@ async def _overview_data(request: Request) -> dict[str, Any]:
         {
             "name": node.metadata.name,
             "ready": _node_ready(node),
-            "instance_type": _node_instance_type(node),
-            "node_pool": _node_pool(node),
-            "spot": _node_is_spot(node),
+            "instance_type": node_instance_type(node),
+            "node_pool": node_pool(node),
+            "spot": node_is_spot(node),
+            "region": node_region(node),
+            "accelerator": node_accelerator(node) or None,
+            "gpu_count": node_gpu_count(node),
             "pod_count": int(pod_count_by_node.get(node.metadata.name, 0)),
             "phase_counts": phase_counts_by_node.get(node.metadata.name, {}),
         }
@@ -1328,12 +2008,13 @@ async def _overview_data(request: Request) -> dict[str, Any]:
     pvc_rows = [
         {
             "name": pvc.metadata.name,
+            "namespace": str(pvc.metadata.namespace or ns),
             "status": str(pvc.status.phase or ""),
             "storage_class": _pvc_storage_class(pvc),
             "requested": str(
                 (pvc.spec.resources.requests or {}).get("storage") or "0Gi"
             ),
-            "requested_gib": _parse_quantity_gib(
+            "requested_gib": parse_quantity_gib(
                 str((pvc.spec.resources.requests or {}).get("storage") or "0Gi")
             ),
             "access_modes": list(pvc.spec.access_modes or []),
@@ -1353,52 +2034,59 @@ async def _overview_data(request: Request) -> dict[str, Any]:
     }
 
     cost_estimate = _cost_estimate(node_rows, pvc_rows, cluster_count=1)
+    capacity = _capacity_snapshot(objects)
 
-    claims_detailed = sorted(
-        (
-            _claim_status(
-                claim,
-                now=now,
-                claim_owner_index=claim_owner_index,
-            )
-            for claim in claims
-        ),
-        key=lambda item: str(item.get("name") or ""),
-    )
-    sandboxes_detailed = sorted(
-        (_sandbox_status(sandbox, now=now) for sandbox in sandboxes),
-        key=lambda item: str(item.get("name") or ""),
-    )
-    warm_pool_rows = sorted(
-        (_warm_pool_status(w, now=now) for w in warm_pools),
-        key=lambda x: str(x.get("name") or ""),
-    )
-    template_names = sorted(
-        [t.get("metadata", {}).get("name") for t in templates if t.get("metadata")]
+    claims_detailed = [
+        _claim_status(claim, now=now, claim_owner_index=claim_owner_index)
+        for claim in claims
+    ]
+    sandboxes_detailed = [_sandbox_status(sandbox, now=now) for sandbox in sandboxes]
+    events_summary = _attach_event_summaries(
+        claims_detailed, sandboxes_detailed, pods, now=now
     )
-
-    return {
-        "cluster_mode": "live",
+    warm_pool_rows = [_warm_pool_status(w, now=now) for w in warm_pools]
+    template_names = [
+        t.get("metadata", {}).get("name") for t in templates if t.get("metadata")
+    ]
+    deployment_rows = [_deployment_status(d, now=now) for d in deployments]
+    pod_rows = [_pod_status(p, now=now) for p in pods]
+    service_names = [s.metadata.name for s in services]
+
+    transformed_at = time.perf_counter()
+    for rows in (
+        claims_detailed,
+        sandboxes_detailed,
+        warm_pool_rows,
+        deployment_rows,
+        pod_rows,
+        node_rows,
+        pvc_rows,
+    ):
+        rows.sort(key=lambda item: str(item.get("name") or ""))
+    template_names.sort()
+    service_names.sort()
+    sorted_at = time.perf_counter()
+
+    payload = {
+        "cluster_mode": _cluster_mode(),
         "namespace": ns,
-        "deployments": sorted(
-            (_deployment_status(d, now=now) for d in deployments),
-            key=lambda x: x["name"],
-        ),
-        "pods": sorted(
-            (_pod_status(p, now=now) for p in pods),
-            key=lambda x: x["name"],
-        ),
-        "services": sorted((s.metadata.name for s in services)),
+        "deployments": deployment_rows,
+        "pods": pod_rows,
+        "services": service_names,
         "sandboxclaims": [c.get("metadata", {}).get("name") for c in claims],
         "sandboxes": [s.get("metadata", {}).get("name") for s in sandboxes],
         "sandboxclaims_detailed": claims_detailed,
         "sandboxes_detailed": sandboxes_detailed,
         "sandboxwarmpools": warm_pool_rows,
         "sandboxtemplates": template_names,
-        "warm_pool_profiles": _build_warm_pool_profiles(template_names, warm_pool_rows),
-        "nodes": sorted(node_rows, key=lambda x: str(x.get("name") or "")),
+        "warm_pool_profiles": _build_warm_pool_profiles(
+            template_names, warm_pool_rows, capacity
+        ),
+        "nodes": node_rows,
         "node_summary": _node_summary(node_rows),
-        "pvcs": sorted(pvc_rows, key=lambda x: str(x.get("name") or "")),
+        "capacity": capacity,
+        "events_summary": events_summary,
+        "pvcs": pvc_rows,
         "resource_summary": resource_summary,
         "cost_estimate": cost_estimate,
         "workspace_session_health": sra_index.get("summary") or {},
@@ -1408,14 +2096,258 @@ async def _overview_data(request: Request) -> dict[str, Any]:
                 "enabled": bool(sra_admin.get("enabled")),
                 "reachable": bool(sra_admin.get("reachable")),
                 "error": str(sra_admin.get("error") or ""),
-            }
+            },
+            "informers": _informers_status(),
         },
     }
+    transform_seconds = (transformed_at - fetched_at) + (
+        time.perf_counter() - sorted_at
+    )
+    overview_phase_seconds.observe(transform_seconds, phase="transform")
+    overview_phase_seconds.observe(sorted_at - transformed_at, phase="sort")
+    _record_overview_gauges(payload)
+    return payload
+
+
+async def _overview_snapshot(request: Request) -> dict[str, Any]:
+    key = (identity_key(_upstream_auth_headers(request)), overview_changes.version)
+    return await overview_cache.get(key, lambda: _overview_data(request))
+
+
+async def _background_overview() -> dict[str, Any]:
+    # Shared by background loops; built without caller credentials (no SRA data).
+    key = ("background", overview_changes.version)
+    return await overview_cache.get(key, lambda: _overview_data(None))
+
+
+async def _history_collect() -> dict[str, float]:
+    return sample_from_overview(await _background_overview())
+
+
+def _build_history_sampler() -> HistorySampler | None:
+    if not settings.history_enabled:
+        return None
+    interval = max(float(settings.history_sample_interval_seconds), 1.0)
+    capacity = int(max(int(settings.history_retention_seconds), 1) / interval) + 1
+    store = HistoryStore(capacity=capacity, path=settings.history_path or None)
+    return HistorySampler(store, _history_collect, interval_seconds=interval)
+
+
+history_sampler = _build_history_sampler()
+
+
+async def _autoscaler_apply(
+    warm_pool_name: str, template_name: str, replicas: int, exists: bool
+) -> None:
+    if exists:
+        await scale_sandbox_warm_pool(
+            warm_pool_name, WarmPoolScaleRequest(replicas=replicas), {}
+        )
+        return
+    await upsert_sandbox_warm_pool(
+        WarmPoolUpsertRequest(
+            warm_pool_name=warm_pool_name,
+            template_name=template_name,
+            replicas=replicas,
+        ),
+        {},
+    )
+
+
+def _build_warm_pool_autoscaler() -> AutoscalerLoop | None:
+    mode = settings.warm_pool_autoscaler_mode
+    if mode not in {"dry_run", "apply"}:
+        return None
+    # Same 0..5 range the manual warm pool endpoints accept.
+    max_replicas = max(0, min(int(settings.warm_pool_autoscaler_max_replicas), 5))
+    policy = AutoscalerPolicy(
+        min_replicas=max(
+            0, min(int(settings.warm_pool_autoscaler_min_replicas), max_replicas)
+        ),
+        max_replicas=max_replicas,
+        lead_time_seconds=settings.warm_pool_autoscaler_lead_time_seconds,
+        half_life_seconds=settings.warm_pool_autoscaler_half_life_seconds,
+        scale_down_delay_seconds=settings.warm_pool_autoscaler_scale_down_delay_seconds,
+    )
+    autoscaler = WarmPoolAutoscaler(
+        policy,
+        _autoscaler_apply,
+        dry_run=mode == "dry_run",
+        templates=settings.warm_pool_autoscaler_templates,
+    )
+    return AutoscalerLoop(
+        autoscaler,
+        _background_overview,
+        interval_seconds=settings.warm_pool_autoscaler_interval_seconds,
+    )
+
+
+warm_pool_autoscaler = _build_warm_pool_autoscaler()
+
+
+def _collect_component_metrics():
+    executor = kube_executor.metrics()
+    yield (
+        "kube_executor_in_flight",
+        "gauge",
+        "Kubernetes API calls currently running.",
+        [({}, executor["in_flight"])],
+    )
+    yield (
+        "kube_executor_queued",
+        "gauge",
+        "Kubernetes API calls waiting for a worker.",
+        [({}, executor["queued"])],
+    )
+    yield (
+        "kube_executor_calls",
+        "counter",
+        "Kubernetes API calls by executor result.",
+        [
+            ({"result": result}, executor[result])
+            for result in ("completed", "failed", "timed_out", "rejected")
+        ],
+    )
+
+    token_stats = verified_tokens.stats()
+    yield (
+        "token_cache_lookups",
+        "counter",
+        "Verified-token cache lookups.",
+        [
+            ({"result": "hit"}, token_stats["hits"]),
+            ({"result": "miss"}, token_stats["misses"]),
+        ],
+    )
+    yield (
+        "token_cache_entries",
+        "gauge",
+        "Verified tokens currently cached.",
+        [({}, token_stats["entries"])],
+    )
+
+    if session_store is not None:
+        session_stats = session_store.stats()
+        yield (
+            "session_lookups",
+            "counter",
+            "Server-side session lookups.",
+            [
+                ({"result": result}, session_stats[key])
+                for result, key in (
+                    ("hit", "hits"),
+                    ("backend_hit", "backend_hits"),
+                    ("miss", "misses"),
+                )
+            ],
+        )
+        yield (
+            "sessions",
+            "gauge",
+            "Server-side sessions held in memory.",
+            [({}, session_stats["entries"])],
+        )
+
+    jwks_stats = jwks_cache.stats()
+    yield (
+        "jwks_cache_events",
+        "counter",
+        "JWKS cache hits, fetches and refreshes.",
+        [
+            ({"event": name}, value)
+            for name, value in jwks_stats.items()
+            if isinstance(value, int | float)
+        ],
+    )
+
+    for cache_name, cache_stats in (
+        ("overview", overview_cache.stats()),
+        ("sra_admin", sra_admin_client.stats()["cache"]),
+    ):
+        yield (
+            f"{cache_name}_cache_lookups",
+            "counter",
+            f"{cache_name} response cache lookups.",
+            [
+                ({"result": result}, cache_stats[key])
+                for result, key in (
+                    ("hit", "hits"),
+                    ("stale_hit", "stale_hits"),
+                    ("miss", "misses"),
+                    ("coalesced", "coalesced"),
+                )
+            ],
+        )
+
+    informers = _informers_status()
+    yield (
+        "informer_synced",
+        "gauge",
+        "1 when the informer's initial list has completed.",
+        [({"kind": k["name"]}, int(bool(k["synced"]))) for k in informers["kinds"]],
+    )
+    yield (
+        "informer_events",
+        "counter",
+        "Watch events applied per informer.",
+        [({"kind": k["name"]}, k["events"]) for k in informers["kinds"]],
+    )
+
+    event_stats = event_index.status()
+    yield (
+        "kube_event_occurrences",
+        "counter",
+        "Kubernetes Event occurrences ingested into the event index.",
+        [({}, event_stats["occurrences"])],
+    )
+    yield (
+        "kube_event_groups",
+        "gauge",
+        "Deduplicated event groups held in memory.",
+        [({}, event_stats["groups_in_memory"])],
+    )
+
+
+metrics.add_collector(_collect_component_metrics)
+
+
+@app.middleware("http")
+async def _record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", None) or "unmatched",
+            status=status,
+        )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(
+    authorization: str | None = Header(default=None),
+) -> Response:
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = settings.metrics_bearer_token
+    if expected:
+        supplied = ""
+        if authorization and authorization.lower().startswith("bearer "):
+            supplied = authorization.split(" ", 1)[1].strip()
+        if not secrets.compare_digest(supplied, expected):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
 
 
 @app.get("/api/health")
 def health() -> dict[str, str]:
-    return {"status": "ok", "cluster_mode": "mock" if use_mock_cluster else "live"}
+    return {"status": "ok", "cluster_mode": _cluster_mode()}
 
 
 @app.get("/auth2/login")
@@ -1461,17 +2393,12 @@ async def auth2_callback(
     if not state or not ops_oauth_state or state != ops_oauth_state:
         raise HTTPException(status_code=400, detail="OAuth state mismatch")
 
-    async with httpx.AsyncClient(timeout=10.0) as http_client:
-        token_response = await http_client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": settings.oauth_client_id,
-                "client_secret": settings.oauth_client_secret,
-                "redirect_uri": settings.oauth_redirect_uri,
-                "grant_type": "authorization_code",
-            },
-        )
+    token_response = await oauth_client.exchange_code(
+        code=code,
+        client_id=settings.oauth_client_id,
+        client_secret=settings.oauth_client_secret,
+        redirect_uri=settings.oauth_redirect_uri,
+    )
 
     if token_response.status_code >= 400:
         raise HTTPException(
@@ -1487,12 +2414,22 @@ async def auth2_callback(
             status_code=401, detail="OAuth token response missing id_token"
         )
 
-    await _verify_token(
+    claims = await _verify_token(
         id_token, access_token=access_token if isinstance(access_token, str) else None
     )
 
     response = RedirectResponse(url=_external_path("/admin"), status_code=302)
     response.delete_cookie("ops_oauth_state", path="/")
+    if session_store is not None:
+        response.set_cookie(
+            key="ops_session",
+            value=session_store.create(claims),
+            httponly=True,
+            secure=settings.cookie_secure,
+            samesite="lax",
+            max_age=int(session_store.ttl_seconds),
+            path="/",
+        )
     response.set_cookie(
         key="ops_access_token",
         value=id_token,
@@ -1525,8 +2462,11 @@ async def oauth2_callback_alias(
 
 
 @app.post("/auth2/logout")
-def auth2_logout() -> RedirectResponse:
+def auth2_logout(ops_session: str | None = Cookie(default=None)) -> RedirectResponse:
+    if session_store is not None:
+        session_store.revoke(ops_session)
     response = RedirectResponse(url=_external_path("/"), status_code=302)
+    response.delete_cookie("ops_session", path="/")
     response.delete_cookie("ops_access_token", path="/")
     response.delete_cookie("ops_google_access_token", path="/")
     response.delete_cookie("ops_oauth_state", path="/")
@@ -1547,8 +2487,269 @@ async def me(claims: dict[str, Any] = Depends(require_auth)) -> dict[str, Any]:
 async def overview(
     request: Request,
     _: dict[str, Any] = Depends(require_auth),
+    include: str | None = Query(default=None, max_length=500),
+    fields: str | None = Query(default=None, max_length=1000),
+    field_selector: str | None = Query(default=None, max_length=1000),
+    limit: int | None = Query(default=None, ge=1, le=5000),
+    continue_token: str | None = Query(default=None, alias="continue"),
+) -> FastJSONResponse:
+    sections = parse_include(include)
+    field_list = parse_csv(fields)
+    selector = parse_field_selector(field_selector)
+    snapshot = await _overview_snapshot(request)
+    if sections is None and not field_list and not selector and not limit:
+        if not continue_token:
+            return _timed_json_response(snapshot)
+    return _timed_json_response(
+        select_overview(
+            snapshot,
+            include=sections,
+            fields=field_list,
+            field_selector=selector,
+            limit=limit,
+            continue_token=continue_token,
+        )
+    )
+
+
+def _timed_json_response(payload: dict[str, Any]) -> FastJSONResponse:
+    with overview_phase_seconds.time(phase="serialize"):
+        return FastJSONResponse(payload)
+
+
+@app.get("/api/overview/stream")
+async def overview_stream(
+    request: Request,
+    _: dict[str, Any] = Depends(require_auth),
+) -> StreamingResponse:
+    resync_seconds = max(float(settings.overview_stream_resync_seconds), 1.0)
+    debounce_seconds = max(float(settings.overview_stream_debounce_seconds), 0.0)
+
+    async def events():
+        previous: dict[str, Any] | None = None
+        seen_version = overview_changes.version
+        sequence = 0
+        while True:
+            try:
+                current = strip_volatile(await _overview_snapshot(request))
+            except HTTPException as exc:
+                yield sse_event(
+                    "error", {"status": exc.status_code, "detail": exc.detail}
+                )
+                current = None
+            if current is not None:
+                sequence += 1
+                if previous is None:
+                    yield sse_event("snapshot", current, event_id=sequence)
+                else:
+                    ops = json_diff(previous, current)
+                    if ops:
+                        yield sse_event("patch", {"ops": ops}, event_id=sequence)
+                    else:
+                        yield ": keepalive\n\n"
+                previous = current
+            if await request.is_disconnected():
+                return
+            seen_version = await overview_changes.wait(seen_version, resync_seconds)
+            if debounce_seconds:
+                await asyncio.sleep(debounce_seconds)
+                seen_version = overview_changes.version
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/diagnostics")
+async def diagnostics(_: dict[str, Any] = Depends(require_auth)) -> dict[str, Any]:
+    return {
+        "cluster_mode": _cluster_mode(),
+        "informers": _informers_status(),
+        "kube_executor": kube_executor.metrics(),
+        "sra_admin": sra_admin_client.stats(),
+        "overview_cache": overview_cache.stats(),
+        "token_cache": verified_tokens.stats(),
+        "jwks": jwks_cache.stats(),
+        "oauth_client": oauth_client.stats(),
+        "sessions": session_store.stats() if session_store else {"enabled": False},
+        "history": history_sampler.status() if history_sampler else {"enabled": False},
+        "events": event_index.status(),
+        "warm_pool_autoscaler": _warm_pool_autoscaler_status(),
+        "synthetic_cluster": (
+            synthetic_cluster.status() if synthetic_cluster else {"enabled": False}
+        ),
+    }
+
+
+def _warm_pool_autoscaler_status() -> dict[str, Any]:
+    if warm_pool_autoscaler is None:
+        return {"enabled": False, "mode": "off"}
+    return {
+        "enabled": True,
+        "mode": settings.warm_pool_autoscaler_mode,
+        **warm_pool_autoscaler.status(),
+    }
+
+
+@app.get("/api/latency")
+async def claim_latency(
+    template: str | None = Query(default=None),
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    return {
+        "enabled": cluster_informers is not None,
+        **latency_tracker.snapshot(template=template or None),
+    }
+
+
+@app.get("/api/cost/attribution")
+async def cost_attribution(
+    request: Request,
+    top: int = Query(default=20, ge=1, le=500),
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    sra_admin = await _fetch_sra_admin_payload(request)
+    index = sra_admin.get("index") if isinstance(sra_admin.get("index"), dict) else {}
+    claim_owner_index = index.get("claim_owner_index")
+    if cluster_informers is not None and cluster_informers.has_synced():
+        attributor, source = cost_attributor, "informers"
+    elif synthetic_cluster is not None:
+        attributor, source = cost_attributor, "synthetic"
+    else:
+        attributor, source = CostAttributor(pricing_table), "list"
+        if use_mock_cluster:
+            source = "mock"
+        else:
+            attributor.load(await _cluster_objects())
+    return {
+        "source": source,
+        "owners": {
+            "reachable": bool(sra_admin.get("reachable")),
+            "error": str(sra_admin.get("error") or ""),
+        },
+        **attributor.snapshot(
+            claim_owner_index=(
+                claim_owner_index if isinstance(claim_owner_index, dict) else {}
+            ),
+            top=top,
+        ),
+    }
+
+
+def _parse_since(value: str) -> float | None:
+    """Accept a relative window (``30m``, ``24h``) or an ISO-8601 timestamp."""
+    if not value:
+        return None
+    try:
+        return time.time() - parse_range_seconds(value)
+    except ValueError:
+        pass
+    parsed = _to_utc_datetime(value)
+    if parsed is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid since: {value} (use e.g. 30m, 24h or an ISO timestamp)",
+        )
+    return parsed.timestamp()
+
+
+@app.get("/api/events")
+async def events(
+    reason: str = Query(default=""),
+    kind: str = Query(default=""),
+    name: str = Query(default=""),
+    type_: str = Query(default="", alias="type"),
+    since: str = Query(default=""),
+    limit: int = Query(default=100, ge=0, le=1000),
+    _: dict[str, Any] = Depends(require_auth),
 ) -> dict[str, Any]:
-    return await _overview_data(request)
+    since_ts = _parse_since(since)
+    if cluster_informers is not None and cluster_informers.has_synced():
+        source = "informers"
+    elif synthetic_cluster is not None:
+        source = "synthetic"
+    elif use_mock_cluster:
+        source = "mock"
+    else:
+        # Repeated lists are idempotent: occurrences are counted per Event uid.
+        source = "list"
+        listed = await _kube_call(
+            core_api.list_namespaced_event, namespace=settings.target_namespace
+        )
+        await asyncio.to_thread(event_index.load, listed.items or [])
+    result = await asyncio.to_thread(
+        event_index.query,
+        reason=reason or None,
+        kind=kind or None,
+        name=name or None,
+        event_type=type_ or None,
+        since=since_ts,
+        limit=limit,
+    )
+    return {"source": source, "since": since_ts, **result}
+
+
+@app.get("/api/warm-pool-autoscaler")
+async def warm_pool_autoscaler_status(
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    return _warm_pool_autoscaler_status()
+
+
+@app.post("/api/warm-pool-autoscaler/evaluate")
+async def evaluate_warm_pool_autoscaler(
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    if warm_pool_autoscaler is None:
+        raise HTTPException(status_code=404, detail="Warm pool autoscaler is disabled")
+    decisions = await warm_pool_autoscaler.tick()
+    return {"mode": settings.warm_pool_autoscaler_mode, "decisions": decisions}
+
+
+@app.get("/api/history")
+async def history(
+    metric: str = Query(default=""),
+    range_: str = Query(default="24h", alias="range"),
+    step: int | None = Query(default=None, ge=1),
+    points: int = Query(default=300, ge=1, le=5000),
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    if history_sampler is None:
+        raise HTTPException(status_code=404, detail="History is disabled")
+    if not metric:
+        return {"metrics": list(HISTORY_METRICS), **history_sampler.status()}
+    if metric not in HISTORY_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+    try:
+        range_seconds = parse_range_seconds(range_)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    interval = history_sampler.interval_seconds
+    if step is None:
+        # Round the bucket up to whole sample intervals so buckets stay even.
+        buckets = max(range_seconds / points, interval)
+        step = int(-(-buckets // interval) * interval)
+    end = int(time.time())
+    start = end - range_seconds
+    store = history_sampler.store
+    # Both scan and sort the ring buffer under the store lock; keep that off
+    # the event loop.
+    series, summary = await asyncio.gather(
+        asyncio.to_thread(store.query, metric, start=start, end=end, step=step),
+        asyncio.to_thread(store.summary, metric, start=start, end=end),
+    )
+    return {
+        "metric": metric,
+        "range_seconds": range_seconds,
+        "step_seconds": step,
+        "start": start,
+        "end": end,
+        "points": series,
+        "summary": summary,
+    }
 
 
 @app.get("/api/users/search")
@@ -1565,49 +2766,111 @@ async def search_users(
 async def sandbox_warm_pool_profiles(
     request: Request,
     _: dict[str, Any] = Depends(require_auth),
-) -> dict[str, Any]:
-    overview_payload = await _overview_data(request)
+) -> FastJSONResponse:
+    overview_payload = await _overview_snapshot(request)
     profiles = overview_payload.get("warm_pool_profiles") or []
 
-    return {
-        "namespace": str(
-            overview_payload.get("namespace") or settings.target_namespace
-        ),
-        "profiles": profiles,
-        "limits": {
-            "replicas_min": 0,
-            "replicas_max": 5,
-        },
-    }
+    return FastJSONResponse(
+        {
+            "namespace": str(
+                overview_payload.get("namespace") or settings.target_namespace
+            ),
+            "profiles": profiles,
+            "limits": {
+                "replicas_min": 0,
+                "replicas_max": 5,
+            },
+        }
+    )
+
+
+_SANDBOX_LIST_KINDS: dict[str, tuple[str, str]] = {
+    "claims": ("extensions.agents.x-k8s.io", "sandboxclaims"),
+    "sandboxes": ("agents.x-k8s.io", "sandboxes"),
+}
 
 
 @app.get("/api/sandboxes")
-async def list_sandboxes(_: dict[str, Any] = Depends(require_auth)) -> dict[str, Any]:
+async def list_sandboxes(
+    _: dict[str, Any] = Depends(require_auth),
+    include: str | None = Query(default=None, max_length=100),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    continue_token: str | None = Query(default=None, alias="continue"),
+    label_selector: str | None = Query(default=None, max_length=1000),
+    field_selector: str | None = Query(default=None, max_length=1000),
+    fields: str | None = Query(default=None, max_length=1000),
+) -> FastJSONResponse:
+    kinds = parse_csv(include) or list(_SANDBOX_LIST_KINDS)
+    unknown = sorted(set(kinds) - set(_SANDBOX_LIST_KINDS))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown sandbox kinds: {', '.join(unknown)}"
+        )
+    cursor = decode_continue(continue_token)
+    if cursor:
+        kinds = [kind for kind in kinds if kind in cursor]
+    field_list = parse_csv(fields)
+
     if use_mock_cluster:
-        return {
-            "claims": [{"metadata": {"name": name}} for name in mock_state["claims"]],
-            "sandboxes": [
-                {"metadata": {"name": name}} for name in mock_state["sandboxes"]
-            ],
+        selector = parse_field_selector(field_selector)
+        mock_names = {
+            "claims": mock_state["claims"],
+            "sandboxes": mock_state["sandboxes"],
         }
+        result: dict[str, Any] = {}
+        next_cursor: dict[str, Any] = {}
+        for kind in kinds:
+            rows = [
+                {"name": name, "item": {"metadata": {"name": name}}}
+                for name in sorted(mock_names[kind])
+            ]
+            rows = [row for row in rows if matches_fields(row["item"], selector)]
+            page, next_after = paginate_rows(rows, limit=limit, after=cursor.get(kind))
+            if next_after is not None:
+                next_cursor[kind] = next_after
+            result[kind] = [project_fields(row["item"], field_list) for row in page]
+        result["continue"] = encode_continue(next_cursor)
+        return FastJSONResponse(result)
 
     if not custom_api:
         raise HTTPException(status_code=500, detail="Kubernetes API is not initialized")
 
     ns = settings.target_namespace
-    claims = custom_api.list_namespaced_custom_object(
-        group="extensions.agents.x-k8s.io",
-        version="v1alpha1",
-        namespace=ns,
-        plural="sandboxclaims",
-    ).get("items", [])
-    sandboxes = custom_api.list_namespaced_custom_object(
-        group="agents.x-k8s.io",
-        version="v1alpha1",
-        namespace=ns,
-        plural="sandboxes",
-    ).get("items", [])
-    return {"claims": claims, "sandboxes": sandboxes}
+
+    async def list_kind(kind: str) -> tuple[list[Any], str | None]:
+        group, plural = _SANDBOX_LIST_KINDS[kind]
+        kwargs: dict[str, Any] = {}
+        if limit:
+            kwargs["limit"] = limit
+        if cursor.get(kind):
+            kwargs["_continue"] = str(cursor[kind])
+        if label_selector:
+            kwargs["label_selector"] = label_selector
+        if field_selector:
+            kwargs["field_selector"] = field_selector
+        try:
+            response = await _kube_call(
+                custom_api.list_namespaced_custom_object,
+                group=group,
+                version="v1alpha1",
+                namespace=ns,
+                plural=plural,
+                **kwargs,
+            )
+        except ApiException as exc:
+            raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
+        metadata = response.get("metadata") or {}
+        return response.get("items", []), (metadata.get("continue") or None)
+
+    listed = await asyncio.gather(*(list_kind(kind) for kind in kinds))
+    result = {}
+    next_cursor = {}
+    for kind, (items, next_token) in zip(kinds, listed):
+        result[kind] = [project_fields(item, field_list) for item in items]
+        if next_token:
+            next_cursor[kind] = next_token
+    result["continue"] = encode_continue(next_cursor)
+    return FastJSONResponse(result)
 
 
 @app.post("/api/sandboxclaims")
@@ -1622,6 +2885,7 @@ async def create_sandbox_claim(
             mock_state["claims"].append(claim_name)
         if claim_name not in mock_state["sandboxes"]:
             mock_state["sandboxes"].append(claim_name)
+        overview_changes.notify()
         return {"created": claim_name, "template": payload.template_name}
 
     if not custom_api:
@@ -1634,7 +2898,8 @@ async def create_sandbox_claim(
         "spec": {"sandboxTemplateRef": {"name": payload.template_name}},
     }
     try:
-        custom_api.create_namespaced_custom_object(
+        await _kube_call(
+            custom_api.create_namespaced_custom_object,
             group="extensions.agents.x-k8s.io",
             version="v1alpha1",
             namespace=ns,
@@ -1643,6 +2908,7 @@ async def create_sandbox_claim(
         )
     except ApiException as exc:
         raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
+    overview_changes.notify()
     return {"created": claim_name, "template": payload.template_name}
 
 
@@ -1657,6 +2923,7 @@ async def delete_sandbox_claim(
         mock_state["sandboxes"] = [
             x for x in mock_state["sandboxes"] if x != claim_name
         ]
+        overview_changes.notify()
         return {"deleted": claim_name}
 
     if not custom_api:
@@ -1664,7 +2931,8 @@ async def delete_sandbox_claim(
 
     ns = settings.target_namespace
     try:
-        custom_api.delete_namespaced_custom_object(
+        await _kube_call(
+            custom_api.delete_namespaced_custom_object,
             group="extensions.agents.x-k8s.io",
             version="v1alpha1",
             namespace=ns,
@@ -1678,9 +2946,217 @@ async def delete_sandbox_claim(
                 status_code=404, detail="SandboxClaim not found"
             ) from exc
         raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
+    overview_changes.notify()
     return {"deleted": claim_name}
 
 
+async def _select_claims(
+    request: Request, selector: ClaimSelector
+) -> list[dict[str, Any]]:
+    overview_payload = await _overview_snapshot(request)
+    if selector.owner_unknown:
+        sra = (overview_payload.get("ops_integration") or {}).get("sra_admin") or {}
+        if not sra.get("reachable"):
+            # Without the SRA owner index every claim looks orphaned.
+            raise HTTPException(
+                status_code=503,
+                detail=(
+                    "owner_unknown needs the SRA admin owner index, "
+                    "which is unavailable"
+                ),
+            )
+    rows = list(overview_payload.get("sandboxclaims_detailed") or [])
+
+    if selector.label_selector:
+        if use_mock_cluster:
+            # Mock claims carry no labels.
+            labelled: set[str] = set()
+        else:
+            if not custom_api:
+                raise HTTPException(
+                    status_code=500, detail="Kubernetes API is not initialized"
+                )
+            try:
+                listed = await _kube_call(
+                    custom_api.list_namespaced_custom_object,
+                    group="extensions.agents.x-k8s.io",
+                    version="v1alpha1",
+                    namespace=settings.target_namespace,
+                    plural="sandboxclaims",
+                    label_selector=selector.label_selector,
+                )
+            except ApiException as exc:
+                raise HTTPException(
+                    status_code=exc.status or 500, detail=exc.body
+                ) from exc
+            labelled = {
+                str((item.get("metadata") or {}).get("name") or "")
+                for item in listed.get("items", [])
+            }
+        rows = [row for row in rows if row.get("name") in labelled]
+
+    names = set(selector.names)
+    selected = []
+    for row in rows:
+        if names and row.get("name") not in names:
+            continue
+        if selector.template_name and row.get("template") != selector.template_name:
+            continue
+        if selector.owner_unknown and (row.get("owner") or {}).get("known"):
+            continue
+        if selector.older_than_seconds is not None and (
+            row.get("age_seconds") is None
+            or int(row.get("age_seconds") or 0) < selector.older_than_seconds
+        ):
+            continue
+        selected.append(row)
+    return sorted(selected, key=lambda row: str(row.get("name") or ""))
+
+
+async def _run_bounded(items: list[Any], operation: Any) -> list[dict[str, Any]]:
+    semaphore = asyncio.Semaphore(max(int(settings.batch_claim_concurrency), 1))
+
+    async def run(item: Any) -> dict[str, Any]:
+        async with semaphore:
+            return await operation(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+def _batch_summary(results: list[dict[str, Any]]) -> dict[str, int]:
+    summary: dict[str, int] = {}
+    for result in results:
+        status = str(result.get("status") or "")
+        summary[status] = summary.get(status, 0) + 1
+    return summary
+
+
+@app.post("/api/sandboxclaims:batchDelete")
+async def batch_delete_sandbox_claims(
+    request: Request,
+    payload: BatchDeleteClaimsRequest,
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    selector = payload.selector
+    if selector.is_empty():
+        raise HTTPException(
+            status_code=400, detail="Refusing to delete claims without a selector"
+        )
+    if payload.use_delete_collection and (
+        not selector.label_selector
+        or selector.names
+        or selector.template_name
+        or selector.owner_unknown
+        or selector.older_than_seconds is not None
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="use_delete_collection only supports a label_selector on its own",
+        )
+
+    matched = await _select_claims(request, selector)
+    names = [str(row.get("name") or "") for row in matched][: payload.max_items]
+    response: dict[str, Any] = {
+        "dry_run": payload.dry_run,
+        "matched": len(matched),
+        "truncated": len(matched) > len(names),
+    }
+
+    if payload.dry_run:
+        results = [{"name": name, "status": "would_delete"} for name in names]
+    elif payload.use_delete_collection and not use_mock_cluster:
+        if not custom_api:
+            raise HTTPException(
+                status_code=500, detail="Kubernetes API is not initialized"
+            )
+        try:
+            await _kube_call(
+                custom_api.delete_collection_namespaced_custom_object,
+                group="extensions.agents.x-k8s.io",
+                version="v1alpha1",
+                namespace=settings.target_namespace,
+                plural="sandboxclaims",
+                label_selector=selector.label_selector,
+            )
+        except ApiException as exc:
+            raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
+        overview_changes.notify()
+        # The collection delete applies to every claim with the label, so the
+        # result reports all matched names rather than the truncated page.
+        names = [str(row.get("name") or "") for row in matched]
+        results = [{"name": name, "status": "deleted"} for name in names]
+    else:
+
+        async def delete_one(name: str) -> dict[str, Any]:
+            try:
+                await delete_sandbox_claim(name, {})
+            except HTTPException as exc:
+                status = "not_found" if exc.status_code == 404 else "error"
+                return {
+                    "name": name,
+                    "status": status,
+                    "status_code": exc.status_code,
+                    "detail": exc.detail,
+                }
+            return {"name": name, "status": "deleted"}
+
+        results = await _run_bounded(names, delete_one)
+
+    response["results"] = results
+    response["summary"] = _batch_summary(results)
+    return response
+
+
+@app.post("/api/sandboxclaims:batchCreate")
+async def batch_create_sandbox_claims(
+    payload: BatchCreateClaimsRequest,
+    _: dict[str, Any] = Depends(require_auth),
+) -> dict[str, Any]:
+    names = [name.strip() for name in payload.claim_names or [] if name.strip()]
+    if not names:
+        prefix = payload.name_prefix.strip().rstrip("-")
+        names = [f"{prefix}-{uuid.uuid4().hex[:8]}" for _ in range(payload.count)]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail="Duplicate claim names")
+
+    if payload.dry_run:
+        results = [
+            {"name": name, "status": "would_create", "template": payload.template_name}
+            for name in names
+        ]
+    else:
+
+        async def create_one(name: str) -> dict[str, Any]:
+            try:
+                await create_sandbox_claim(
+                    CreateClaimRequest(
+                        template_name=payload.template_name, claim_name=name
+                    ),
+                    {},
+                )
+            except HTTPException as exc:
+                return {
+                    "name": name,
+                    "status": "error",
+                    "status_code": exc.status_code,
+                    "detail": exc.detail,
+                }
+            return {
+                "name": name,
+                "status": "created",
+                "template": payload.template_name,
+            }
+
+        results = await _run_bounded(names, create_one)
+
+    return {
+        "dry_run": payload.dry_run,
+        "template": payload.template_name,
+        "results": results,
+        "summary": _batch_summary(results),
+    }
+
+
 @app.post("/api/sandboxwarmpools")
 async def upsert_sandbox_warm_pool(
     payload: WarmPoolUpsertRequest,
@@ -1694,6 +3170,7 @@ async def upsert_sandbox_warm_pool(
             "replicas": payload.replicas,
             "template": payload.template_name,
         }
+        overview_changes.notify()
         return {
             "warm_pool": warm_pool_name,
             "replicas": payload.replicas,
@@ -1716,7 +3193,8 @@ async def upsert_sandbox_warm_pool(
 
     created = False
     try:
-        custom_api.get_namespaced_custom_object(
+        await _kube_call(
+            custom_api.get_namespaced_custom_object,
             group="extensions.agents.x-k8s.io",
             version="v1alpha1",
             namespace=ns,
@@ -1726,7 +3204,8 @@ async def upsert_sandbox_warm_pool(
     except ApiException as exc:
         if exc.status == 404:
             try:
-                custom_api.create_namespaced_custom_object(
+                await _kube_call(
+                    custom_api.create_namespaced_custom_object,
                     group="extensions.agents.x-k8s.io",
                     version="v1alpha1",
                     namespace=ns,
@@ -1749,7 +3228,8 @@ async def upsert_sandbox_warm_pool(
             }
         }
         try:
-            custom_api.patch_namespaced_custom_object(
+            await _kube_call(
+                custom_api.patch_namespaced_custom_object,
                 group="extensions.agents.x-k8s.io",
                 version="v1alpha1",
                 namespace=ns,
@@ -1760,6 +3240,7 @@ async def upsert_sandbox_warm_pool(
         except ApiException as exc:
             raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
 
+    overview_changes.notify()
     return {
         "warm_pool": warm_pool_name,
         "replicas": payload.replicas,
@@ -1781,6 +3262,7 @@ async def scale_sandbox_warm_pool(
         if not warm_pool:
             raise HTTPException(status_code=404, detail="SandboxWarmPool not found")
         warm_pool["replicas"] = payload.replicas
+        overview_changes.notify()
         return {
             "warm_pool": warm_pool_name,
             "replicas": payload.replicas,
@@ -1792,7 +3274,8 @@ async def scale_sandbox_warm_pool(
 
     patch_body = {"spec": {"replicas": payload.replicas}}
     try:
-        custom_api.patch_namespaced_custom_object(
+        await _kube_call(
+            custom_api.patch_namespaced_custom_object,
             group="extensions.agents.x-k8s.io",
             version="v1alpha1",
             namespace=ns,
@@ -1807,6 +3290,7 @@ async def scale_sandbox_warm_pool(
             ) from exc
         raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
 
+    overview_changes.notify()
     return {"warm_pool": warm_pool_name, "replicas": payload.replicas}
 
 
@@ -1828,6 +3312,7 @@ async def scale_deployment(
         mock_state["deployments"][deployment_name]["ready"] = payload.replicas
         mock_state["deployments"][deployment_name]["available"] = payload.replicas
         mock_state["deployments"][deployment_name]["updated"] = payload.replicas
+        overview_changes.notify()
         return {"deployment": deployment_name, "replicas": payload.replicas}
 
     if not apps_api:
@@ -1836,13 +3321,17 @@ async def scale_deployment(
     ns = settings.target_namespace
     body = {"spec": {"replicas": payload.replicas}}
     try:
-        apps_api.patch_namespaced_deployment_scale(
-            name=deployment_name, namespace=ns, body=body
+        await _kube_call(
+            apps_api.patch_namespaced_deployment_scale,
+            name=deployment_name,
+            namespace=ns,
+            body=body,
         )
     except ApiException as exc:
         if exc.status == 404:
             raise HTTPException(status_code=404, detail="Deployment not found") from exc
         raise HTTPException(status_code=exc.status or 500, detail=exc.body) from exc
+    overview_changes.notify()
     return {"deployment": deployment_name, "replicas": payload.replicas}
 
 
@@ -1852,6 +3341,14 @@ async def _optional_auth(request: Request) -> dict[str, Any] | None:
     cookie_token = request.cookies.get("ops_access_token")
     access_token = request.cookies.get("ops_google_access_token")
 
+    if not authorization and not forwarded:
+        try:
+            session_claims = _session_claims(request.cookies.get("ops_session"))
+        except HTTPException:
+            return None
+        if session_claims is not None:
+            return session_claims
+
     token = ""
     if authorization and authorization.lower().startswith("bearer "):
         token = authorization.split(" ", 1)[1].strip()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+
+class OAuthClient:
+    """Long-lived pooled HTTP client for outbound OAuth calls.
+
+    The authorization-code exchange and JWKS fetches share its connection
+    pool, so a login reuses the TLS connection to Google instead of opening a
+    fresh client per callback.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout_seconds: float = 10.0,
+        http2: bool = True,
+        max_connections: int = 10,
+        token_url: str = GOOGLE_TOKEN_URL,
+        transport: httpx.AsyncBaseTransport | None = None,
+        on_request: Callable[[str, float, str], None] | None = None,
+    ) -> None:
+        self._timeout_seconds = max(float(timeout_seconds), 1.0)
+        self._http2 = http2
+        self._max_connections = max(int(max_connections), 1)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        # Called with (operation, seconds, outcome) after every token exchange.
+        self._on_request = on_request
+        self.token_url = token_url
+        self.clients_created = 0
+        self.exchanges = 0
+        self.exchange_errors = 0
+
+    def http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self.clients_created += 1
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout_seconds,
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                    keepalive_expiry=120.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def exchange_code(
+        self,
+        *,
+        code: str,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        outcome = "error"
+        self.exchanges += 1
+        try:
+            response = await self.http().post(
+                self.token_url,
+                data={
+                    "code": code,
+                    "client_id": client_id,
+                    "client_secret": client_secret,
+                    "redirect_uri": redirect_uri,
+                    "grant_type": "authorization_code",
+                },
+            )
+            outcome = str(response.status_code)
+            if response.status_code >= 400:
+                self.exchange_errors += 1
+            return response
+        except httpx.TransportError as exc:
+            self.exchange_errors += 1
+            outcome = exc.__class__.__name__
+            raise
+        finally:
+            if self._on_request is not None:
+                self._on_request("token", time.perf_counter() - started, outcome)
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "http2": self._http2,
+            "max_connections": self._max_connections,
+            "clients_created": self.clients_created,
+            "exchanges": self.exchanges,
+            "exchange_errors": self.exchange_errors,
+        }
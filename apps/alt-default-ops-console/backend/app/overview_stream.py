@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+from typing import Any
+
+# Fields that change on every rebuild without the underlying object changing.
+# The stream drops them and clients derive ages from ``created_at``.
+VOLATILE_KEYS = frozenset({"age_seconds", "pending_seconds"})
+
+_LIST_KEY_FIELDS = ("name", "template_name")
+
+
+def _pointer_token(value: Any) -> str:
+    return str(value).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: strip_volatile(item)
+            for key, item in value.items()
+            if key not in VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [strip_volatile(item) for item in value]
+    return value
+
+
+def _list_keys(items: list[Any]) -> list[Any] | None:
+    if all(isinstance(item, str) for item in items):
+        keys: list[Any] = list(items)
+    elif all(isinstance(item, dict) for item in items):
+        keys = []
+        for item in items:
+            field = next((f for f in _LIST_KEY_FIELDS if f in item), None)
+            if field is None:
+                return None
+            keys.append((field, item[field]))
+    else:
+        return None
+    if len(set(keys)) != len(keys):
+        return None
+    return keys
+
+
+def _diff_list(old: list[Any], new: list[Any], path: str) -> list[dict[str, Any]]:
+    old_keys = _list_keys(old)
+    new_keys = _list_keys(new)
+    replace = [{"op": "replace", "path": path, "value": new}]
+    if old_keys is None or new_keys is None:
+        return replace
+
+    new_key_set = set(new_keys)
+    ops: list[dict[str, Any]] = []
+    for index in range(len(old) - 1, -1, -1):
+        if old_keys[index] not in new_key_set:
+            ops.append({"op": "remove", "path": f"{path}/{index}"})
+    survivors = [
+        (key, item) for key, item in zip(old_keys, old) if key in new_key_set
+    ]
+    surviving = {key for key, _ in survivors}
+    if [key for key, _ in survivors] != [key for key in new_keys if key in surviving]:
+        # Keyed items were reordered; index-based ops would not be smaller.
+        return replace
+
+    cursor = 0
+    for index, (key, item) in enumerate(zip(new_keys, new)):
+        if cursor < len(survivors) and survivors[cursor][0] == key:
+            ops.extend(json_diff(survivors[cursor][1], item, f"{path}/{index}"))
+            cursor += 1
+        else:
+            ops.append({"op": "add", "path": f"{path}/{index}", "value": item})
+    return ops
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """Return RFC 6902 operations that turn ``old`` into ``new``.
+
+    Lists whose items are unique strings or dicts with a ``name`` (or
+    ``template_name``) are diffed item by item so a single pod or claim change
+    yields a single small operation instead of a full list replacement.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_pointer_token(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_pointer_token(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        if old == new:
+            return []
+        return _diff_list(old, new, path)
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: list[dict[str, Any]]) -> Any:
+    result = copy.deepcopy(document)
+    for op in ops:
+        path = str(op.get("path") or "")
+        kind = op.get("op")
+        if not path:
+            if kind in {"add", "replace"}:
+                result = copy.deepcopy(op.get("value"))
+                continue
+            raise ValueError(f"Unsupported root operation: {kind}")
+        tokens = [_unescape_token(token) for token in path.split("/")[1:]]
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        value = copy.deepcopy(op.get("value"))
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if kind == "add":
+                parent.insert(index, value)
+            elif kind == "remove":
+                parent.pop(index)
+            elif kind == "replace":
+                parent[index] = value
+            else:
+                raise ValueError(f"Unsupported patch operation: {kind}")
+        else:
+            if kind in {"add", "replace"}:
+                parent[last] = value
+            elif kind == "remove":
+                parent.pop(last, None)
+            else:
+                raise ValueError(f"Unsupported patch operation: {kind}")
+    return result
+
+
+def sse_event(event: str, data: Any, *, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class ChangeNotifier:
+    """Monotonic change counter that informer threads can bump safely."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event = asyncio.Event()
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        self.version += 1
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    def notify_threadsafe(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.notify)
+
+    async def wait(self, seen_version: int, timeout: float) -> int:
+        if self.version != seen_version:
+            return self.version
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except TimeoutError:
+            pass
+        return self.version
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "pricing_catalog.json"
+
+_GIB = 1024.0**3
+_QUANTITY_PATTERN = re.compile(
+    r"^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)([A-Za-z]*)$"
+)
+_QUANTITY_FACTORS = {
+    "": 1.0,
+    "m": 1e-3,
+    "k": 1e3,
+    "K": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "P": 1e15,
+    "E": 1e18,
+    "Ki": 1024.0,
+    "Mi": 1024.0**2,
+    "Gi": 1024.0**3,
+    "Ti": 1024.0**4,
+    "Pi": 1024.0**5,
+    "Ei": 1024.0**6,
+}
+_MACHINE_PATTERN = re.compile(r"^([a-z0-9]+)-([a-z]+)-(\d+)(?:-(\d+))?$")
+
+
+def parse_quantity(quantity: Any) -> float | None:
+    """Parse a Kubernetes resource quantity (``500m``, ``4Gi``, ``1e3``)."""
+    match = _QUANTITY_PATTERN.match(str(quantity or "").strip())
+    if not match:
+        return None
+    factor = _QUANTITY_FACTORS.get(match.group(2))
+    if factor is None:
+        return None
+    return float(match.group(1)) * factor
+
+
+def parse_quantity_gib(quantity: Any) -> float:
+    value = parse_quantity(quantity)
+    return value / _GIB if value is not None else 0.0
+
+
+def parse_cpu_cores(quantity: Any) -> float:
+    value = parse_quantity(quantity)
+    return value if value is not None else 0.0
+
+
+def request_share(
+    cpu_cores: float,
+    memory_gib: float,
+    allocatable_cpu: float,
+    allocatable_memory_gib: float,
+) -> float:
+    """Fraction of a node claimed by requests: mean of CPU and memory shares."""
+    shares = []
+    if allocatable_cpu > 0:
+        shares.append(min(max(cpu_cores, 0.0) / allocatable_cpu, 1.0))
+    if allocatable_memory_gib > 0:
+        shares.append(min(max(memory_gib, 0.0) / allocatable_memory_gib, 1.0))
+    return sum(shares) / len(shares) if shares else 0.0
+
+
+def load_catalog(path: str | Path | None = None) -> dict[str, Any]:
+    source = Path(path) if path else DEFAULT_CATALOG_PATH
+    text = source.read_text(encoding="utf-8")
+    if source.suffix.lower() in {".yaml", ".yml"}:
+        import yaml
+
+        catalog = yaml.safe_load(text)
+    else:
+        catalog = json.loads(text)
+    if not isinstance(catalog, dict) or not catalog.get("regions"):
+        raise ValueError(f"Pricing catalog {source} has no regions")
+    return catalog
+
+
+class PricingTable:
+    """Pricing catalog compiled into flat lookup tables.
+
+    Every price is a dict lookup keyed by (region, family|gpu|disk, spot);
+    machine-type parsing and storage-class matching are memoized, so costing
+    hundreds of nodes only parses each distinct machine type once.
+    """
+
+    def __init__(self, catalog: dict[str, Any]) -> None:
+        self.version = str(catalog.get("version") or "unversioned")
+        self.currency = str(catalog.get("currency") or "USD")
+        self.default_region = str(catalog.get("default_region") or "")
+        self.month_hours = float(catalog.get("month_hours") or 730.0)
+        self.cluster_fee_hourly = float(catalog.get("gke_cluster_fee_hourly") or 0.0)
+        self.sources = dict(catalog.get("sources") or {})
+        regions = catalog.get("regions") or {}
+        if self.default_region not in regions:
+            self.default_region = sorted(regions)[0]
+
+        self._compute: dict[tuple[str, str, bool], tuple[float, float]] = {}
+        self._gpus: dict[tuple[str, str, bool], float] = {}
+        self._disks: dict[tuple[str, str], float] = {}
+        for region, region_prices in regions.items():
+            for family, modes in (region_prices.get("compute") or {}).items():
+                for mode, spot in (("on_demand", False), ("spot", True)):
+                    rates = modes.get(mode)
+                    if rates:
+                        self._compute[(region, family, spot)] = (
+                            float(rates["core"]),
+                            float(rates["ram_gib"]),
+                        )
+            for gpu, modes in (region_prices.get("gpus") or {}).items():
+                for mode, spot in (("on_demand", False), ("spot", True)):
+                    if modes.get(mode) is not None:
+                        self._gpus[(region, gpu, spot)] = float(modes[mode])
+            for disk, monthly in (region_prices.get("disks_gib_month") or {}).items():
+                self._disks[(region, disk)] = float(monthly) / self.month_hours
+
+        self._ratios = {
+            (family, machine_class): float(ratio)
+            for family, spec in (catalog.get("machine_families") or {}).items()
+            for machine_class, ratio in (spec.get("memory_per_core_gib") or {}).items()
+        }
+        self._shapes = {
+            name: (str(name).split("-", 1)[0], int(s["cores"]), float(s["memory_gib"]))
+            for name, s in (catalog.get("machine_shapes") or {}).items()
+        }
+        self._storage_classes = {
+            str(name).lower(): str(disk)
+            for name, disk in (catalog.get("storage_classes") or {}).items()
+        }
+        self._storage_patterns = [
+            (str(fragment).lower(), str(disk))
+            for fragment, disk in catalog.get("storage_class_patterns") or []
+        ]
+        self._region_cache: dict[str, str] = {}
+        self._shape_cache: dict[str, tuple[str, int, float] | None] = {}
+        self._node_cache: dict[tuple[str, bool, str, str, int], float | None] = {}
+        self._disk_cache: dict[tuple[str, str], float | None] = {}
+
+    def region(self, region: str | None) -> str:
+        key = str(region or "")
+        cached = self._region_cache.get(key)
+        if cached is None:
+            known = any(r == key for r, _ in self._disks) or any(
+                r == key for r, _, _ in self._compute
+            )
+            cached = self._region_cache[key] = key if known else self.default_region
+        return cached
+
+    def machine_shape(self, instance_type: str) -> tuple[str, int, float] | None:
+        machine = str(instance_type or "").strip().lower()
+        if machine in self._shape_cache:
+            return self._shape_cache[machine]
+        shape = self._shapes.get(machine)
+        if shape is None:
+            match = _MACHINE_PATTERN.match(machine)
+            if match:
+                family, machine_class, cores_raw, memory_mib = match.groups()
+                cores = int(cores_raw)
+                if machine_class == "custom" and memory_mib:
+                    shape = (family, cores, int(memory_mib) / 1024.0)
+                elif memory_mib is None and (family, machine_class) in self._ratios:
+                    ratio = self._ratios[(family, machine_class)]
+                    shape = (family, cores, cores * ratio)
+        self._shape_cache[machine] = shape
+        return shape
+
+    def node_hourly(
+        self,
+        instance_type: str,
+        spot: bool,
+        *,
+        region: str | None = None,
+        accelerator: str = "",
+        gpu_count: int = 0,
+    ) -> float | None:
+        resolved = self.region(region)
+        key = (str(instance_type or ""), bool(spot), resolved, accelerator, gpu_count)
+        if key in self._node_cache:
+            return self._node_cache[key]
+        price: float | None = None
+        shape = self.machine_shape(instance_type)
+        if shape is not None:
+            family, cores, memory_gib = shape
+            rates = self._compute.get((resolved, family, bool(spot)))
+            if rates is not None:
+                price = cores * rates[0] + memory_gib * rates[1]
+                if accelerator and gpu_count > 0:
+                    gpu_rate = self._gpus.get((resolved, accelerator, bool(spot)))
+                    price = None if gpu_rate is None else price + gpu_count * gpu_rate
+        self._node_cache[key] = price
+        return price
+
+    def disk_hourly_per_gib(
+        self, storage_class: str, *, region: str | None = None
+    ) -> float | None:
+        resolved = self.region(region)
+        name = str(storage_class or "").strip().lower()
+        key = (resolved, name)
+        if key in self._disk_cache:
+            return self._disk_cache[key]
+        disk = self._storage_classes.get(name)
+        if disk is None:
+            disk = next(
+                (d for fragment, d in self._storage_patterns if fragment in name), None
+            )
+        rate = self._disks.get((resolved, disk)) if disk else None
+        self._disk_cache[key] = rate
+        return rate
+
+    def cost_estimate(
+        self,
+        nodes: list[dict[str, Any]],
+        pvcs: list[dict[str, Any]],
+        *,
+        cluster_count: int = 1,
+    ) -> dict[str, Any]:
+        """Hourly cost of nodes and PVCs plus a node-pool rollup.
+
+        Nodes are grouped by their price key first, so each distinct
+        (machine type, spot, region, GPU) combination is priced once.
+        """
+        groups: dict[tuple[str, bool, str, str, int], dict[str, Any]] = {}
+        node_cost: dict[str, float] = {}
+        pools: dict[str, dict[str, Any]] = {}
+        regions: set[str] = set()
+        for node in nodes:
+            instance_type = str(node.get("instance_type") or "unknown")
+            is_spot = bool(node.get("spot"))
+            region = self.region(node.get("region"))
+            regions.add(region)
+            accelerator = str(node.get("accelerator") or "")
+            gpu_count = int(node.get("gpu_count") or 0)
+            key = (instance_type, is_spot, region, accelerator, gpu_count)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    "instance_type": instance_type,
+                    "spot": is_spot,
+                    "region": region,
+                    "accelerator": accelerator or None,
+                    "gpu_count": gpu_count,
+                    "count": 0,
+                    "hourly_each_usd": self.node_hourly(
+                        instance_type,
+                        is_spot,
+                        region=region,
+                        accelerator=accelerator,
+                        gpu_count=gpu_count,
+                    ),
+                    "hourly_total_usd": 0.0,
+                }
+            group["count"] += 1
+            hourly = group["hourly_each_usd"]
+            pool_name = str(node.get("node_pool") or "unknown")
+            pool = pools.setdefault(
+                pool_name,
+                {
+                    "node_pool": pool_name,
+                    "nodes": 0,
+                    "spot_nodes": 0,
+                    "unpriced_nodes": 0,
+                    "hourly_usd": 0.0,
+                },
+            )
+            pool["nodes"] += 1
+            pool["spot_nodes"] += int(is_spot)
+            if hourly is None:
+                pool["unpriced_nodes"] += 1
+                continue
+            group["hourly_total_usd"] += hourly
+            pool["hourly_usd"] += hourly
+            node_cost[str(node.get("name") or "")] = hourly
+        node_total = sum(node_cost.values())
+
+        pvc_breakdown: list[dict[str, Any]] = []
+        pvc_total = 0.0
+        for pvc in pvcs:
+            storage_class = str(pvc.get("storage_class") or "")
+            size_gib = float(pvc.get("requested_gib") or 0.0)
+            rate = self.disk_hourly_per_gib(storage_class, region=pvc.get("region"))
+            hourly = rate * size_gib if rate is not None else None
+            pvc_breakdown.append(
+                {
+                    "name": str(pvc.get("name") or ""),
+                    "storage_class": storage_class,
+                    "requested_gib": size_gib,
+                    "hourly_usd": hourly,
+                }
+            )
+            if hourly is not None:
+                pvc_total += hourly
+
+        gke_fee = float(max(cluster_count, 0)) * self.cluster_fee_hourly
+        return {
+            "currency": self.currency,
+            "period": "hour",
+            "region": next(iter(regions)) if len(regions) == 1 else self.default_region,
+            "catalog_version": self.version,
+            "node_hourly_total_usd": node_total,
+            "pvc_hourly_total_usd": pvc_total,
+            "gke_cluster_fee_hourly_usd": gke_fee,
+            "total_hourly_usd": node_total + pvc_total + gke_fee,
+            "node_breakdown": sorted(
+                groups.values(),
+                key=lambda x: (
+                    str(x["instance_type"]),
+                    bool(x["spot"]),
+                    str(x["region"]),
+                    str(x["accelerator"] or ""),
+                ),
+            ),
+            "pvc_breakdown": sorted(pvc_breakdown, key=lambda x: x["name"]),
+            "by_node_pool": sorted(pools.values(), key=lambda x: x["node_pool"]),
+            "pricing_source": {
+                "compute": self.sources.get("compute", ""),
+                "gke": self.sources.get("gke", ""),
+            },
+            "notes": [
+                "Estimate includes nodes, PVC capacity, and one GKE cluster management fee.",
+                "Unknown machine/storage classes are excluded from numeric totals.",
+                (
+                    f"Prices come from pricing catalog {self.version} (list prices; "
+                    "discounts and custom contracts are not applied)."
+                ),
+            ],
+        }
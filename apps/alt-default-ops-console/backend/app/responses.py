@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/css")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, set | frozenset | tuple):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize plain JSON data (dicts, lists, scalars) straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(
+            payload, default=_default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        payload, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for large payloads that are already JSON-native.
+
+    Unlike returning a dict from an endpoint, this skips FastAPI's
+    ``jsonable_encoder`` walk and serializes with orjson when installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported content coding from an Accept-Encoding header.
+
+    Codings are ranked by q-value; on a tie brotli wins over gzip. ``*``
+    matches any supported coding and ``q=0`` excludes one.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+    best: tuple[float, str] | None = None
+    for coding in supported_encodings():
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[0]):
+            best = (quality, coding)
+    return best[1] if best else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    # Low levels on purpose: overview JSON is highly repetitive, so the lowest
+    # settings already shrink it ~15x at a fraction of the CPU of higher ones.
+    if encoding == "br":
+        return brotli.compress(body, quality=1)
+    return gzip.compress(body, compresslevel=1)
+
+
+class CompressionMiddleware:
+    """Compress buffered text/JSON responses with brotli or gzip.
+
+    The coding is negotiated per request from Accept-Encoding. Streaming
+    responses (e.g. the overview event stream) and bodies smaller than
+    ``minimum_size`` pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = max(int(minimum_size), 0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or media_type not in _COMPRESSIBLE_TYPES
+                or len(body) < self.minimum_size
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    claims TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at);
+"""
+
+
+def session_key(session_id: str) -> str:
+    # Only a hash of the cookie value is stored, so a leaked store (or SQLite
+    # file) cannot be replayed as session cookies.
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+class SqliteSessionBackend:
+    """Durable session backend, so logins survive a restart of the console.
+
+    Any object with the same ``get``/``put``/``delete``/``prune`` methods can
+    be passed to ``SessionStore`` instead.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, key: str) -> tuple[float, dict[str, Any]] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at, claims FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+        return (float(row[0]), json.loads(row[1])) if row else None
+
+    def put(self, key: str, expires_at: float, claims: dict[str, Any]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (key, expires_at, claims) "
+                "VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(claims)),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def prune(self, now: float) -> int:
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (now,)
+            )
+        return max(cursor.rowcount, 0)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class SessionStore:
+    """Server-side sessions holding the claims verified at login.
+
+    A session id (the ``ops_session`` cookie) maps to those claims until
+    ``ttl_seconds`` or the ID token's ``exp``, whichever comes first, so page
+    loads and API calls skip JWT verification. The most recent
+    ``max_entries`` sessions are kept in an in-memory LRU in front of the
+    optional ``backend``; a miss falls through to the backend.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        backend: Any | None = None,
+        prune_interval_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_seconds = max(float(ttl_seconds), 1.0)
+        self.backend = backend
+        self.prune_interval_seconds = float(prune_interval_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._last_prune = clock()
+        self.created = 0
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.revoked = 0
+        self.evictions = 0
+
+    def create(self, claims: dict[str, Any]) -> str:
+        now = self._clock()
+        expires_at = now + self.ttl_seconds
+        try:
+            expires_at = min(expires_at, float(claims["exp"]))
+        except (KeyError, TypeError, ValueError):
+            pass
+        session_id = secrets.token_urlsafe(32)
+        key = session_key(session_id)
+        self._remember(key, expires_at, dict(claims))
+        if self.backend is not None:
+            self.backend.put(key, expires_at, dict(claims))
+            if now - self._last_prune >= self.prune_interval_seconds:
+                self._last_prune = now
+                self.backend.prune(now)
+        self.created += 1
+        return session_id
+
+    def get(self, session_id: str | None) -> dict[str, Any] | None:
+        if not session_id:
+            return None
+        key = session_key(session_id)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        source = "memory"
+        if entry is None and self.backend is not None:
+            entry = self.backend.get(key)
+            source = "backend"
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= now:
+            self.expired += 1
+            self.misses += 1
+            self._forget(key)
+            return None
+        if source == "backend":
+            self.backend_hits += 1
+            self._remember(key, expires_at, claims)
+        else:
+            self.hits += 1
+        return dict(claims)
+
+    def revoke(self, session_id: str | None) -> None:
+        if not session_id:
+            return
+        self.revoked += 1
+        self._forget(session_key(session_id))
+
+    def _remember(self, key: str, expires_at: float, claims: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def close(self) -> None:
+        if self.backend is not None and hasattr(self.backend, "close"):
+            self.backend.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "backend": type(self.backend).__name__ if self.backend else "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "created": self.created,
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "revoked": self.revoked,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from .caching import StaleWhileRevalidateCache
+
+
+def identity_key(headers: dict[str, str]) -> str:
+    """Cache partition for a caller, derived from its forwarded credentials."""
+    authorization = str(headers.get("Authorization") or "")
+    if not authorization:
+        return "anonymous"
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+class SraAdminClient:
+    """Long-lived pooled HTTP client for the sandboxed-react-agent admin API."""
+
+    def __init__(
+        self,
+        *,
+        timeout_seconds: float,
+        cache_ttl_seconds: float,
+        cache_stale_seconds: float,
+        http2: bool = True,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+        on_request: Callable[[str, float, str], None] | None = None,
+    ) -> None:
+        self._timeout_seconds = max(float(timeout_seconds), 1.0)
+        self._http2 = http2
+        self._max_connections = max(int(max_connections), 1)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        # Called with (path, seconds, outcome) after every upstream request;
+        # outcome is the HTTP status code or the transport error class name.
+        self._on_request = on_request
+        self.cache = StaleWhileRevalidateCache(
+            ttl_seconds=cache_ttl_seconds, stale_seconds=cache_stale_seconds
+        )
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout_seconds,
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str],
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._http().get(url, headers=headers, params=params)
+            outcome = str(response.status_code)
+            response.raise_for_status()
+            return response.json()
+        except httpx.TransportError as exc:
+            outcome = exc.__class__.__name__
+            raise
+        finally:
+            if self._on_request is not None:
+                elapsed = time.perf_counter() - started
+                self._on_request(httpx.URL(url).path, elapsed, outcome)
+
+    async def get_json_cached(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str],
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        key = (identity_key(headers), url, tuple(sorted((params or {}).items())))
+        return await self.cache.get(
+            key, lambda: self.get_json(url, headers=headers, params=params)
+        )
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {"http2": self._http2, "cache": self.cache.stats()}
@@ -0,0 +1,664 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from kubernetes import client
+
+from .pricing import parse_cpu_cores, parse_quantity_gib
+
+EventHandler = Callable[[str, str, Any, Any], None]
+
+KINDS = (
+    "deployments",
+    "pods",
+    "services",
+    "pvcs",
+    "nodes",
+    "claims",
+    "sandboxes",
+    "warm_pools",
+    "templates",
+)
+
+_TEMPLATE_SIZES = (
+    ("python-runtime-template", "500m", "1Gi"),
+    ("pydata-template", "1", "4Gi"),
+    ("python-large-template", "2", "8Gi"),
+    ("python-small-template", "250m", "512Mi"),
+)
+_MACHINES = (
+    ("e2-standard-8", "8", "30Gi", False),
+    ("e2-standard-8", "8", "30Gi", True),
+    ("n2-standard-16", "16", "62Gi", False),
+)
+
+# Models built without a Configuration copy each one; sharing a single
+# non-validating configuration keeps 10k-pod clusters cheap to generate.
+_MODEL_CONFIG = client.Configuration()
+_MODEL_CONFIG.client_side_validation = False
+
+
+def _model(cls: type, **kwargs: Any) -> Any:
+    return cls(local_vars_configuration=_MODEL_CONFIG, **kwargs)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class SyntheticClusterSpec:
+    claims: int = 100
+    nodes: int = 3
+    templates: int = 4
+    warm_pools: int = 4
+    warm_replicas: int = 2
+    ready_fraction: float = 0.9
+    managed_deployments: tuple[str, ...] = (
+        "sandboxed-react-agent-backend",
+        "sandboxed-react-agent-frontend",
+        "sandbox-router-deployment",
+    )
+    namespace: str = "alt-default"
+    seed: int = 7
+
+    @classmethod
+    def for_claims(cls, claims: int, **overrides: Any) -> SyntheticClusterSpec:
+        """Spec where templates and warm pools grow with the claim count."""
+        pools = max(4, int(claims) // 100)
+        defaults = {"claims": int(claims), "templates": pools, "warm_pools": pools}
+        return cls(**{**defaults, **overrides})
+
+
+class SyntheticCluster:
+    """In-memory cluster shaped like the Kubernetes API responses.
+
+    Core objects are typed client models and Agent Sandbox objects are raw
+    dicts, exactly as the informers and list calls return them, so the live
+    overview code path runs unchanged against it. Mutations go through
+    :meth:`apply`, which dispatches informer-style ``(kind, type, obj, old)``
+    events to registered handlers.
+    """
+
+    def __init__(
+        self,
+        spec: SyntheticClusterSpec | None = None,
+        *,
+        now: datetime | None = None,
+    ) -> None:
+        self.spec = spec or SyntheticClusterSpec()
+        self.now = now or datetime.now(UTC)
+        self.rng = random.Random(self.spec.seed)
+        self._lock = threading.Lock()
+        self._handlers: list[EventHandler] = []
+        self._objects: dict[str, dict[str, Any]] = {kind: {} for kind in KINDS}
+        self._node_free: dict[str, list[float]] = {}
+        self._unclaimed: dict[str, dict[str, None]] = {}
+        self._serial = 0
+        self.version = 0
+        self.events = 0
+        self._generated = False
+        self._generate()
+        self._generated = True
+
+    def next_name(self, prefix: str) -> str:
+        self._serial += 1
+        return f"{prefix}-{self._serial:06d}"
+
+    def _created(self, max_age_seconds: int = 86400) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, max_age_seconds))
+
+    def _ns(self) -> str:
+        return self.spec.namespace
+
+    def template_names(self) -> list[str]:
+        names = [name for name, _, _ in _TEMPLATE_SIZES]
+        extra = [f"custom-template-{i}" for i in range(len(names), self.spec.templates)]
+        return (names + extra)[: max(self.spec.templates, 1)]
+
+    def template_size(self, template: str) -> tuple[str, str]:
+        for name, cpu, memory in _TEMPLATE_SIZES:
+            if name == template:
+                return cpu, memory
+        return "500m", "1Gi"
+
+    def _generate(self) -> None:
+        objects = self._objects
+        templates = self.template_names()
+        for name in templates:
+            cpu, memory = self.template_size(name)
+            container = {
+                "name": "sandbox",
+                "resources": {"requests": {"cpu": cpu, "memory": memory}},
+            }
+            objects["templates"][name] = {
+                "metadata": {"name": name, "namespace": self._ns()},
+                "spec": {"podTemplate": {"spec": {"containers": [container]}}},
+            }
+        for _ in range(max(self.spec.nodes, 1)):
+            self._add_node()
+        for name in self.spec.managed_deployments:
+            objects["deployments"][name] = self.make_deployment(name)
+            pod = self.make_pod(
+                f"{name}-{self.next_name('pod')}", cpu="250m", memory="512Mi"
+            )
+            objects["pods"][pod.metadata.name] = pod
+            objects["services"][name] = _model(
+                client.V1Service,
+                metadata=_model(client.V1ObjectMeta, name=name, namespace=self._ns()),
+            )
+        pvc = self.make_pvc("sandboxed-react-agent-backend-data")
+        objects["pvcs"][pvc.metadata.name] = pvc
+
+        for index in range(max(self.spec.warm_pools, 0)):
+            template = templates[index % len(templates)]
+            pool_name = f"{template}-warmpool"
+            if index >= len(templates):
+                pool_name = f"{template}-warmpool-{index}"
+            objects["warm_pools"][pool_name] = self.make_warm_pool(
+                pool_name, template, self.spec.warm_replicas
+            )
+            for _ in range(self.spec.warm_replicas):
+                self._add_sandbox(template, claim="")
+
+        for _ in range(max(self.spec.claims, 0)):
+            template = self.rng.choice(templates)
+            claim_name = self.next_name("claim")
+            sandbox = self._add_sandbox(template, claim=claim_name)
+            ready = self.rng.random() < self.spec.ready_fraction
+            objects["claims"][claim_name] = self.make_claim(
+                claim_name, template, sandbox=sandbox, ready=ready
+            )
+
+    def _add_sandbox(self, template: str, *, claim: str) -> str:
+        name = self.next_name("sandbox")
+        sandbox = self._objects["sandboxes"][name] = self.make_sandbox(
+            name, template, claim
+        )
+        self._index_sandbox(name, sandbox)
+        cpu, memory = self.template_size(template)
+        pod = self.make_pod(name, cpu=cpu, memory=memory, sandbox=name)
+        self._objects["pods"][name] = pod
+        return name
+
+    def _add_node(self) -> str:
+        index = len(self._objects["nodes"])
+        node = self.make_node(f"gke-synthetic-node-{index:05d}", index)
+        allocatable = node.status.allocatable
+        self._objects["nodes"][node.metadata.name] = node
+        self._node_free[node.metadata.name] = [
+            parse_cpu_cores(allocatable["cpu"]),
+            parse_quantity_gib(allocatable["memory"]),
+        ]
+        return node.metadata.name
+
+    def _place(self, cpu: str, memory: str) -> str:
+        """Pick a node with room for the requests, adding nodes while generating.
+
+        Initial placement is next-fit, so clusters grow just enough nodes to
+        hold every sandbox; churn samples a few nodes and falls back to the
+        emptiest one, like pods that would otherwise sit Pending.
+        """
+        need = (parse_cpu_cores(cpu), parse_quantity_gib(memory))
+        names = list(self._node_free)
+        candidates = names[-1:] if not self._generated else self.rng.sample(
+            names, min(len(names), 8)
+        )
+        for name in candidates:
+            free = self._node_free[name]
+            if free[0] >= need[0] and free[1] >= need[1]:
+                break
+        else:
+            if not self._generated:
+                name = self._add_node()
+            else:
+                name = max(candidates, key=lambda n: self._node_free[n][0])
+        free = self._node_free[name]
+        free[0] -= need[0]
+        free[1] -= need[1]
+        return name
+
+    def _release(self, pod: Any) -> None:
+        free = self._node_free.get(str(pod.spec.node_name or ""))
+        if free is None:
+            return
+        requests = pod.spec.containers[0].resources.requests or {}
+        free[0] += parse_cpu_cores(requests.get("cpu"))
+        free[1] += parse_quantity_gib(requests.get("memory"))
+
+    def _index_sandbox(
+        self, name: str, sandbox: dict[str, Any], *, deleted: bool = False
+    ) -> None:
+        spec = sandbox.get("spec") or {}
+        template = str((spec.get("sandboxTemplateRef") or {}).get("name") or "")
+        names = self._unclaimed.setdefault(template, {})
+        if deleted or spec.get("sandboxClaimRef"):
+            names.pop(name, None)
+        else:
+            names[name] = None
+
+    def unclaimed_sandbox(self, template: str) -> str:
+        with self._lock:
+            return next(iter(self._unclaimed.get(template) or ()), "")
+
+    def make_node(self, name: str, index: int) -> Any:
+        machine, cpu, memory, spot = _MACHINES[index % len(_MACHINES)]
+        labels = {
+            "node.kubernetes.io/instance-type": machine,
+            "cloud.google.com/gke-nodepool": "spot-pool" if spot else "default-pool",
+            "topology.kubernetes.io/region": "europe-west4",
+        }
+        if spot:
+            labels["cloud.google.com/gke-spot"] = "true"
+        return _model(
+            client.V1Node,
+            metadata=_model(
+                client.V1ObjectMeta,
+                name=name,
+                labels=labels,
+                creation_timestamp=self._created(7 * 86400),
+            ),
+            status=_model(
+                client.V1NodeStatus,
+                allocatable={"cpu": cpu, "memory": memory},
+                capacity={"cpu": cpu, "memory": memory},
+                conditions=[
+                    _model(client.V1NodeCondition, type="Ready", status="True")
+                ],
+            ),
+        )
+
+    def make_deployment(self, name: str) -> Any:
+        return _model(
+            client.V1Deployment,
+            metadata=_model(
+                client.V1ObjectMeta,
+                name=name,
+                namespace=self._ns(),
+                creation_timestamp=self._created(),
+            ),
+            spec=_model(
+                client.V1DeploymentSpec, replicas=1, selector=None, template=None
+            ),
+            status=_model(
+                client.V1DeploymentStatus,
+                ready_replicas=1,
+                available_replicas=1,
+                updated_replicas=1,
+                conditions=[],
+            ),
+        )
+
+    def make_pvc(self, name: str) -> Any:
+        return _model(
+            client.V1PersistentVolumeClaim,
+            metadata=_model(client.V1ObjectMeta, name=name, namespace=self._ns()),
+            spec=_model(
+                client.V1PersistentVolumeClaimSpec,
+                storage_class_name="standard-rwo",
+                access_modes=["ReadWriteOnce"],
+                resources=_model(
+                    client.V1VolumeResourceRequirements, requests={"storage": "5Gi"}
+                ),
+                volume_name=f"pvc-{name}",
+            ),
+            status=_model(client.V1PersistentVolumeClaimStatus, phase="Bound"),
+        )
+
+    def make_pod(
+        self,
+        name: str,
+        *,
+        cpu: str,
+        memory: str,
+        sandbox: str = "",
+        ready: bool = True,
+        node: str = "",
+    ) -> Any:
+        owners = (
+            [
+                _model(
+                    client.V1OwnerReference,
+                    api_version="agents.x-k8s.io/v1alpha1",
+                    kind="Sandbox",
+                    name=sandbox,
+                    uid=f"uid-{sandbox}",
+                )
+            ]
+            if sandbox
+            else None
+        )
+        created = self._created()
+        return _model(
+            client.V1Pod,
+            metadata=_model(
+                client.V1ObjectMeta,
+                name=name,
+                namespace=self._ns(),
+                owner_references=owners,
+                creation_timestamp=created,
+            ),
+            spec=_model(
+                client.V1PodSpec,
+                node_name=node or self._place(cpu, memory),
+                containers=[
+                    _model(
+                        client.V1Container,
+                        name="main",
+                        resources=_model(
+                            client.V1ResourceRequirements,
+                            requests={"cpu": cpu, "memory": memory},
+                        ),
+                    )
+                ],
+            ),
+            status=_model(
+                client.V1PodStatus,
+                phase="Running",
+                container_statuses=[
+                    _model(
+                        client.V1ContainerStatus,
+                        name="main",
+                        ready=ready,
+                        restart_count=0,
+                        image="synthetic",
+                        image_id="synthetic",
+                    )
+                ],
+                conditions=[
+                    _model(
+                        client.V1PodCondition,
+                        type="PodScheduled",
+                        status="True",
+                        last_transition_time=created,
+                    )
+                ],
+            ),
+        )
+
+    def make_sandbox(self, name: str, template: str, claim: str) -> dict[str, Any]:
+        spec: dict[str, Any] = {"sandboxTemplateRef": {"name": template}}
+        if claim:
+            spec["sandboxClaimRef"] = {"name": claim}
+        return {
+            "metadata": {
+                "name": name,
+                "namespace": self._ns(),
+                "uid": f"uid-{name}",
+                "creationTimestamp": _iso(self._created()),
+            },
+            "spec": spec,
+            "status": {
+                "phase": "Ready",
+                "conditions": [{"type": "Ready", "status": "True"}],
+            },
+        }
+
+    def make_claim(
+        self,
+        name: str,
+        template: str,
+        *,
+        sandbox: str,
+        ready: bool,
+        created: datetime | None = None,
+    ) -> dict[str, Any]:
+        created = created or self._created()
+        conditions = [
+            {
+                "type": "Ready",
+                "status": "True" if ready else "False",
+                "reason": "SandboxReady" if ready else "Pending",
+                "lastTransitionTime": _iso(
+                    created + timedelta(seconds=self.rng.uniform(0.5, 30.0))
+                ),
+            }
+        ]
+        return {
+            "metadata": {
+                "name": name,
+                "namespace": self._ns(),
+                "uid": f"uid-{name}",
+                "generation": 1,
+                "creationTimestamp": _iso(created),
+            },
+            "spec": {"sandboxTemplateRef": {"name": template}},
+            "status": {
+                "phase": "Ready" if ready else "Pending",
+                "conditions": conditions,
+                "sandbox": {"name": sandbox} if sandbox else {},
+            },
+        }
+
+    def make_warm_pool(self, name: str, template: str, replicas: int) -> dict[str, Any]:
+        return {
+            "metadata": {
+                "name": name,
+                "namespace": self._ns(),
+                "creationTimestamp": _iso(self._created()),
+            },
+            "spec": {"replicas": replicas, "sandboxTemplateRef": {"name": template}},
+            "status": {"readyReplicas": replicas},
+        }
+
+    def add_handler(self, handler: EventHandler) -> None:
+        self._handlers.append(handler)
+
+    def remove_handler(self, handler: EventHandler) -> None:
+        self._handlers.remove(handler)
+
+    def replay(self) -> None:
+        """Send ADDED for every object, like an informer's initial LIST."""
+        with self._lock:
+            snapshot = {
+                kind: list(items.values()) for kind, items in self._objects.items()
+            }
+        for kind in ("nodes", "templates", "warm_pools", "claims", "sandboxes", "pods"):
+            for obj in snapshot[kind]:
+                self._dispatch(kind, "ADDED", obj, None)
+
+    def _dispatch(self, kind: str, event_type: str, obj: Any, old: Any) -> None:
+        for handler in self._handlers:
+            handler(kind, event_type, obj, old)
+
+    @staticmethod
+    def name_of(obj: Any) -> str:
+        if isinstance(obj, dict):
+            return str((obj.get("metadata") or {}).get("name") or "")
+        return str(obj.metadata.name or "")
+
+    def apply(self, kind: str, event_type: str, obj: Any) -> None:
+        name = self.name_of(obj)
+        with self._lock:
+            items = self._objects[kind]
+            old = items.get(name)
+            if event_type == "DELETED":
+                items.pop(name, None)
+                if kind == "pods":
+                    self._release(old if old is not None else obj)
+            else:
+                items[name] = obj
+            if kind == "sandboxes":
+                self._index_sandbox(name, obj, deleted=event_type == "DELETED")
+            self.version += 1
+            self.events += 1
+        self._dispatch(kind, event_type, obj, old)
+
+    def get(self, kind: str, name: str) -> Any:
+        return self._objects[kind].get(name)
+
+    def items(self, kind: str) -> list[Any]:
+        with self._lock:
+            return list(self._objects[kind].values())
+
+    def objects(self) -> dict[str, list[Any]]:
+        with self._lock:
+            return {kind: list(items.values()) for kind, items in self._objects.items()}
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            counts = {kind: len(items) for kind, items in self._objects.items()}
+        return {
+            "enabled": True,
+            "spec": asdict(self.spec),
+            "counts": counts,
+            "events": self.events,
+        }
+
+
+class ChurnSimulator:
+    """Random claim create/delete, warm pool resizes and pod flaps.
+
+    Each step mutates the cluster through :meth:`SyntheticCluster.apply`, so
+    handlers see the same event sequence a watch would deliver: a claim is
+    ADDED, its sandbox and pod appear (or a warm sandbox is adopted), then the
+    claim is MODIFIED to Ready.
+    """
+
+    OPERATIONS = (
+        ("create_claim", 0.4),
+        ("delete_claim", 0.3),
+        ("flap_pod", 0.2),
+        ("resize_warm_pool", 0.1),
+    )
+
+    def __init__(self, cluster: SyntheticCluster, *, seed: int | None = None) -> None:
+        self.cluster = cluster
+        self.rng = random.Random(cluster.spec.seed + 1 if seed is None else seed)
+        self.counts = {name: 0 for name, _ in self.OPERATIONS}
+        self._operations = [name for name, _ in self.OPERATIONS]
+        self._weights = [weight for _, weight in self.OPERATIONS]
+
+    def step(self) -> str:
+        operation = self.rng.choices(self._operations, weights=self._weights)[0]
+        if not getattr(self, f"_{operation}")():
+            operation = "create_claim"
+            self._create_claim()
+        self.counts[operation] += 1
+        return operation
+
+    def run(self, steps: int) -> dict[str, int]:
+        for _ in range(max(int(steps), 0)):
+            self.step()
+        return dict(self.counts)
+
+    async def run_forever(self, events_per_second: float) -> None:
+        interval = 1.0 / max(float(events_per_second), 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            self.step()
+
+    def _create_claim(self) -> bool:
+        cluster = self.cluster
+        template = self.rng.choice(cluster.template_names())
+        name = cluster.next_name("claim")
+        created = datetime.now(UTC)
+        cluster.apply(
+            "claims",
+            "ADDED",
+            cluster.make_claim(
+                name, template, sandbox="", ready=False, created=created
+            ),
+        )
+        sandbox_name = self.cluster.unclaimed_sandbox(template)
+        if sandbox_name:
+            sandbox = dict(cluster.get("sandboxes", sandbox_name))
+            sandbox["spec"] = {**sandbox["spec"], "sandboxClaimRef": {"name": name}}
+            cluster.apply("sandboxes", "MODIFIED", sandbox)
+        else:
+            sandbox_name = cluster.next_name("sandbox")
+            cluster.apply(
+                "sandboxes", "ADDED", cluster.make_sandbox(sandbox_name, template, name)
+            )
+            cpu, memory = cluster.template_size(template)
+            cluster.apply(
+                "pods",
+                "ADDED",
+                cluster.make_pod(
+                    sandbox_name, cpu=cpu, memory=memory, sandbox=sandbox_name
+                ),
+            )
+        cluster.apply(
+            "claims",
+            "MODIFIED",
+            cluster.make_claim(
+                name, template, sandbox=sandbox_name, ready=True, created=created
+            ),
+        )
+        return True
+
+    def _delete_claim(self) -> bool:
+        cluster = self.cluster
+        claims = cluster.items("claims")
+        if not claims:
+            return False
+        claim = self.rng.choice(claims)
+        sandbox_name = ((claim.get("status") or {}).get("sandbox") or {}).get("name")
+        cluster.apply("claims", "DELETED", claim)
+        if sandbox_name and cluster.get("sandboxes", sandbox_name) is not None:
+            cluster.apply(
+                "sandboxes", "DELETED", cluster.get("sandboxes", sandbox_name)
+            )
+            pod = cluster.get("pods", sandbox_name)
+            if pod is not None:
+                cluster.apply("pods", "DELETED", pod)
+        return True
+
+    def _flap_pod(self) -> bool:
+        cluster = self.cluster
+        pods = cluster.items("pods")
+        if not pods:
+            return False
+        pod = self.rng.choice(pods)
+        requests = pod.spec.containers[0].resources.requests or {}
+        owners = pod.metadata.owner_references or []
+        replacement = cluster.make_pod(
+            pod.metadata.name,
+            cpu=str(requests.get("cpu") or "500m"),
+            memory=str(requests.get("memory") or "1Gi"),
+            sandbox=owners[0].name if owners else "",
+            ready=not pod.status.container_statuses[0].ready,
+            node=str(pod.spec.node_name or ""),
+        )
+        cluster.apply("pods", "MODIFIED", replacement)
+        return True
+
+    def _resize_warm_pool(self) -> bool:
+        cluster = self.cluster
+        pools = cluster.items("warm_pools")
+        if not pools:
+            return False
+        pool = self.rng.choice(pools)
+        template = pool["spec"]["sandboxTemplateRef"]["name"]
+        replicas = int(pool["spec"]["replicas"])
+        target = max(0, min(5, replicas + self.rng.choice((-1, 1))))
+        cluster.apply(
+            "warm_pools",
+            "MODIFIED",
+            cluster.make_warm_pool(pool["metadata"]["name"], template, target),
+        )
+        if target > replicas:
+            name = cluster.next_name("sandbox")
+            cpu, memory = cluster.template_size(template)
+            cluster.apply(
+                "sandboxes", "ADDED", cluster.make_sandbox(name, template, "")
+            )
+            cluster.apply(
+                "pods",
+                "ADDED",
+                cluster.make_pod(name, cpu=cpu, memory=memory, sandbox=name),
+            )
+        elif target < replicas:
+            name = self.cluster.unclaimed_sandbox(template)
+            if name:
+                cluster.apply("sandboxes", "DELETED", cluster.get("sandboxes", name))
+                pod = cluster.get("pods", name)
+                if pod is not None:
+                    cluster.apply("pods", "DELETED", pod)
+        return True
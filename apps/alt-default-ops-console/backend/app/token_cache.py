@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+def token_cache_key(token: str, access_token: str | None = None) -> str:
+    # at_hash checks depend on the paired access token, so it is part of the key.
+    material = f"{token}\0{access_token or ''}".encode()
+    return hashlib.sha256(material).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified JWT claims keyed by a token hash.
+
+    Entries live until the token's ``exp`` but never longer than
+    ``max_ttl_seconds``, so allowlist or JWKS changes still take effect.
+    Only successful verifications are stored.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(int(max_entries), 0)
+        self.max_ttl_seconds = max(float(max_ttl_seconds), 0.0)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_ttl_seconds > 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(claims)
+
+    def put(self, key: str, claims: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        now = self._clock()
+        expires_at = now + self.max_ttl_seconds
+        try:
+            expires_at = min(expires_at, float(claims["exp"]))
+        except (KeyError, TypeError, ValueError):
+            pass
+        if expires_at <= now:
+            return
+        self._entries[key] = (expires_at, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_ttl_seconds": self.max_ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
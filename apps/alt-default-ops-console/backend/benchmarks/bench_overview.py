@@ -0,0 +1,111 @@
+"""Overview, cost and endpoint benchmarks against synthetic clusters.
+
+Run explicitly (the default test run does not collect ``bench_*`` files)::
+
+    python -m pytest benchmarks/bench_overview.py --benchmark-only
+"""
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.responses import FastJSONResponse, compress, dumps
+from app.synthetic import ChurnSimulator
+
+
+def _cost_inputs(main, cluster, run_async):
+    payload = run_async(main._overview_data(None))
+    pod_requests = []
+    for pod in cluster.items("pods"):
+        cpu_cores, memory_gib = main._pod_requests(pod)
+        pod_requests.append(
+            {
+                "namespace": pod.metadata.namespace,
+                "node": pod.spec.node_name,
+                "cpu_cores": cpu_cores,
+                "memory_gib": memory_gib,
+            }
+        )
+    return payload, pod_requests
+
+
+def test_overview_data(benchmark, synthetic_main, cluster, run_async):
+    payload = benchmark.pedantic(
+        lambda: run_async(synthetic_main._overview_data(None)),
+        rounds=5,
+        warmup_rounds=1,
+    )
+    assert len(payload["sandboxclaims_detailed"]) == len(cluster.items("claims"))
+
+
+def test_serialize_overview_jsonable_encoder(benchmark, synthetic_main, run_async):
+    payload = run_async(synthetic_main._overview_data(None))
+    benchmark(lambda: JSONResponse(jsonable_encoder(payload)))
+
+
+def test_serialize_overview_fast_json(benchmark, synthetic_main, run_async):
+    payload = run_async(synthetic_main._overview_data(None))
+    benchmark(FastJSONResponse, payload)
+
+
+def test_compress_overview_gzip(benchmark, synthetic_main, run_async):
+    body = dumps(run_async(synthetic_main._overview_data(None)))
+    compressed = benchmark(compress, body, "gzip")
+    assert len(compressed) < len(body)
+
+
+def test_build_warm_pool_profiles(benchmark, synthetic_main, cluster, run_async):
+    payload = run_async(synthetic_main._overview_data(None))
+    profiles = benchmark(
+        synthetic_main._build_warm_pool_profiles,
+        payload["sandboxtemplates"],
+        payload["sandboxwarmpools"],
+    )
+    assert len(profiles) == len(payload["sandboxtemplates"])
+
+
+def test_cost_estimate(benchmark, synthetic_main, cluster, run_async):
+    payload, pod_requests = _cost_inputs(synthetic_main, cluster, run_async)
+    estimate = benchmark(
+        synthetic_main._cost_estimate,
+        payload["nodes"],
+        payload["pvcs"],
+        1,
+        pod_requests,
+    )
+    assert estimate["node_hourly_total_usd"] > 0
+
+
+def test_cost_attribution_snapshot(benchmark, synthetic_main, cluster):
+    attributor = synthetic_main.cost_attributor
+    snapshot = benchmark(attributor.snapshot)
+    assert snapshot["stats"]["sandboxes"] == len(cluster.items("sandboxes"))
+
+
+def test_churn_event_handling(benchmark, synthetic_main, cluster):
+    churn = ChurnSimulator(cluster, seed=11)
+    benchmark.pedantic(churn.run, args=(200,), rounds=3, warmup_rounds=0)
+    assert sum(churn.counts.values()) == 600
+
+
+def test_overview_endpoint(benchmark, bench_client):
+    response = benchmark.pedantic(
+        bench_client.get, args=("/api/overview",), rounds=5, warmup_rounds=1
+    )
+    assert response.status_code == 200
+    assert response.json()["cluster_mode"] == "synthetic"
+
+
+def test_overview_endpoint_projected(benchmark, bench_client):
+    response = benchmark.pedantic(
+        bench_client.get,
+        args=("/api/overview?include=claims&fields=name,claim_status&limit=100",),
+        rounds=5,
+        warmup_rounds=1,
+    )
+    assert response.status_code == 200
+
+
+def test_cost_attribution_endpoint(benchmark, bench_client):
+    response = benchmark(bench_client.get, "/api/cost/attribution")
+    assert response.status_code == 200
+    assert response.json()["source"] == "synthetic"
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MOCK_CLUSTER", "1")
+os.environ.setdefault("SRA_ADMIN_ENABLED", "0")
+os.environ.setdefault("JWT_EMAIL_ALLOWLIST", "")
+os.environ.setdefault("HISTORY_PATH", "")
+os.environ.setdefault("EVENTS_DB_PATH", "")
+os.environ.setdefault("JWKS_PREWARM", "0")
+os.environ.setdefault("HISTORY_ENABLED", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+pytest.importorskip("pytest_benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import main  # noqa: E402
+from app.caching import StaleWhileRevalidateCache  # noqa: E402
+from app.cost_attribution import CostAttributor  # noqa: E402
+from app.synthetic import SyntheticCluster, SyntheticClusterSpec  # noqa: E402
+
+CLAIM_COUNTS = (100, 1_000, 10_000)
+
+
+@pytest.fixture(scope="session", params=CLAIM_COUNTS, ids=lambda n: f"{n}-claims")
+def cluster(request) -> SyntheticCluster:
+    return SyntheticCluster(SyntheticClusterSpec.for_claims(request.param))
+
+
+@pytest.fixture
+def synthetic_main(cluster, monkeypatch):
+    """Point the app at ``cluster`` with an always-cold overview cache."""
+    attributor = CostAttributor(main.pricing_table)
+    cluster.add_handler(attributor.handle)
+    cluster.replay()
+    monkeypatch.setattr(main, "synthetic_cluster", cluster)
+    monkeypatch.setattr(main, "cost_attributor", attributor)
+    monkeypatch.setattr(
+        main,
+        "overview_cache",
+        StaleWhileRevalidateCache(ttl_seconds=0, stale_seconds=0),
+    )
+    yield main
+    cluster.remove_handler(attributor.handle)
+
+
+@pytest.fixture
+def run_async():
+    loop = asyncio.new_event_loop()
+    try:
+        yield loop.run_until_complete
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def bench_client(synthetic_main):
+    synthetic_main.app.dependency_overrides[synthetic_main.require_auth] = lambda: {
+        "email": "ops@example.com",
+        "iss": "https://accounts.google.com",
+    }
+    try:
+        with TestClient(synthetic_main.app) as test_client:
+            yield test_client
+    finally:
+        synthetic_main.app.dependency_overrides.pop(synthetic_main.require_auth, None)
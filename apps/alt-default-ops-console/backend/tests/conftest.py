@@ -0,0 +1,31 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MOCK_CLUSTER", "1")
+os.environ.setdefault("SRA_ADMIN_ENABLED", "0")
+os.environ.setdefault("JWT_EMAIL_ALLOWLIST", "")
+os.environ.setdefault("HISTORY_PATH", "")
+os.environ.setdefault("EVENTS_DB_PATH", "")
+os.environ.setdefault("JWKS_PREWARM", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import main  # noqa: E402
+
+
+@pytest.fixture
+def authed_client():
+    main.app.dependency_overrides[main.require_auth] = lambda: {
+        "email": "ops@example.com",
+        "iss": "https://accounts.google.com",
+    }
+    try:
+        with TestClient(main.app) as test_client:
+            yield test_client
+    finally:
+        main.app.dependency_overrides.pop(main.require_auth, None)
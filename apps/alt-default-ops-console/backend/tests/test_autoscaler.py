@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+from app import main
+from app.autoscaler import (
+    AutoscalerPolicy,
+    DemandForecaster,
+    WarmPoolAutoscaler,
+    load_trace,
+    simulate_trace,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _profile(template: str, replicas: int, pool: str = "") -> dict:
+    return {
+        "template_name": template,
+        "default_warm_pool_name": f"{template}-warmpool",
+        "total_replicas": replicas,
+        "pools": [{"name": pool, "replicas": replicas}] if pool else [],
+    }
+
+
+def _claims(count: int, template: str = "tpl") -> list[dict]:
+    return [{"name": f"c{i}", "template": template} for i in range(count)]
+
+
+def test_forecaster_half_life_is_independent_of_tick_size():
+    coarse = DemandForecaster(half_life_seconds=60)
+    fine = DemandForecaster(half_life_seconds=60)
+    coarse.observe("t", 0, 1)
+    fine.observe("t", 0, 1)
+
+    coarse.observe("t", 60, 60)
+    for _ in range(4):
+        fine.observe("t", 15, 15)
+
+    assert abs(coarse.rates["t"] - 0.5) < 1e-9
+    assert abs(fine.rates["t"] - 0.5) < 1e-9
+
+
+def test_scales_up_on_demand_and_down_only_after_delay():
+    clock = _Clock()
+    applied: list[tuple] = []
+
+    async def apply(pool, template, replicas, exists):
+        applied.append((pool, template, replicas, exists))
+
+    policy = AutoscalerPolicy(
+        lead_time_seconds=60,
+        headroom=1.0,
+        half_life_seconds=30,
+        scale_down_delay_seconds=300,
+    )
+    autoscaler = WarmPoolAutoscaler(policy, apply, dry_run=False, clock=clock)
+
+    async def run() -> None:
+        await autoscaler.evaluate([_profile("tpl", 1, "pool")], [])
+        clock.now = 30
+        [up] = await autoscaler.evaluate([_profile("tpl", 1, "pool")], _claims(4))
+        assert up["action"] == "scale_up"
+        assert up["desired"] == 5
+        assert applied == [("pool", "tpl", 5, True)]
+
+        decisions = []
+        for step in range(1, 20):
+            clock.now = 30 + step * 30
+            decisions.extend(
+                await autoscaler.evaluate([_profile("tpl", 5, "pool")], _claims(4))
+            )
+        down = [d for d in decisions if d["action"] == "scale_down"]
+        pending = [d for d in decisions if d["reason"].startswith("scale-down pending")]
+        assert len(down) == 1
+        assert pending
+        assert down[0]["at"] - pending[0]["at"] >= 300
+
+    asyncio.run(run())
+    assert autoscaler.status()["decisions"][0]["action"] == "scale_down"
+
+
+def test_dry_run_records_decisions_without_applying():
+    clock = _Clock()
+
+    async def apply(*_):
+        raise AssertionError("dry run must not apply")
+
+    autoscaler = WarmPoolAutoscaler(
+        AutoscalerPolicy(min_replicas=2), apply, dry_run=True, clock=clock
+    )
+
+    async def run() -> list[dict]:
+        await autoscaler.evaluate([_profile("tpl", 0)], [])
+        clock.now = 10
+        return await autoscaler.evaluate([_profile("tpl", 0)], [])
+
+    [decision] = asyncio.run(run())
+    assert decision["action"] == "scale_up"
+    assert decision["desired"] == 2
+    assert decision["applied"] is False
+    assert decision["pool_exists"] is False
+
+
+def test_apply_path_creates_and_scales_mock_warm_pools(monkeypatch):
+    monkeypatch.setattr(main, "mock_state", {**main.mock_state, "warm_pools": {}})
+    main.mock_state["warm_pools"]["existing-warmpool"] = {
+        "replicas": 1,
+        "template": "python-runtime-template",
+    }
+
+    async def run() -> None:
+        await main._autoscaler_apply(
+            "existing-warmpool", "python-runtime-template", 3, True
+        )
+        await main._autoscaler_apply(
+            "python-runtime-template-small-warmpool",
+            "python-runtime-template-small",
+            2,
+            False,
+        )
+
+    asyncio.run(run())
+    assert main.mock_state["warm_pools"] == {
+        "existing-warmpool": {"replicas": 3, "template": "python-runtime-template"},
+        "python-runtime-template-small-warmpool": {
+            "replicas": 2,
+            "template": "python-runtime-template-small",
+        },
+    }
+
+
+def test_simulator_replays_trace_and_autoscaling_improves_hit_rate(tmp_path):
+    trace = tmp_path / "claims.jsonl"
+    rows = [{"ts": t, "template": "python"} for t in range(0, 3600, 20)]
+    trace.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+    arrivals = load_trace(trace)
+
+    static = simulate_trace(
+        arrivals, AutoscalerPolicy(min_replicas=1, max_replicas=1)
+    )
+    scaled = simulate_trace(arrivals, AutoscalerPolicy(max_replicas=5))
+
+    assert static["claims"] == scaled["claims"] == len(rows)
+    assert scaled["hit_rate"] > static["hit_rate"]
+    assert scaled["final_replicas"]["python"] > 1
+    assert scaled["scale_events"] >= 1
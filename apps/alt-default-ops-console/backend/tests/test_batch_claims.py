@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.caching import StaleWhileRevalidateCache
+
+
+class _Request:
+    headers: dict[str, str] = {}
+    cookies: dict[str, str] = {}
+
+
+@pytest.fixture
+def mock_claims(monkeypatch):
+    monkeypatch.setattr(
+        main, "mock_state", {**main.mock_state, "claims": [], "sandboxes": []}
+    )
+    monkeypatch.setattr(
+        main,
+        "overview_cache",
+        StaleWhileRevalidateCache(ttl_seconds=0, stale_seconds=0),
+    )
+    return main.mock_state
+
+
+def _delete(**kwargs):
+    payload = main.BatchDeleteClaimsRequest(**kwargs)
+    return asyncio.run(main.batch_delete_sandbox_claims(_Request(), payload, {}))
+
+
+def test_batch_create_then_delete_by_template(mock_claims):
+    created = asyncio.run(
+        main.batch_create_sandbox_claims(
+            main.BatchCreateClaimsRequest(count=3, name_prefix="bulk"), {}
+        )
+    )
+    assert created["summary"] == {"created": 3}
+    assert len(mock_claims["claims"]) == 3
+    assert all(name.startswith("bulk-") for name in mock_claims["claims"])
+
+    result = _delete(selector={"template_name": "python-runtime-template"})
+
+    assert result["matched"] == 3
+    assert result["summary"] == {"deleted": 3}
+    assert mock_claims["claims"] == []
+
+
+def test_dry_run_reports_matches_without_deleting(mock_claims):
+    mock_claims["claims"].extend(["a", "b", "c"])
+
+    result = _delete(selector={"names": ["a", "c", "missing"]}, dry_run=True)
+
+    assert [r["name"] for r in result["results"]] == ["a", "c"]
+    assert result["summary"] == {"would_delete": 2}
+    assert mock_claims["claims"] == ["a", "b", "c"]
+
+
+def test_max_items_truncates_selection(mock_claims):
+    mock_claims["claims"].extend(["a", "b", "c"])
+
+    result = _delete(selector={"older_than_seconds": 0}, max_items=2)
+
+    assert result["truncated"] is True
+    assert [r["name"] for r in result["results"]] == ["a", "b"]
+    assert mock_claims["claims"] == ["c"]
+
+
+def test_empty_selector_and_unreachable_owner_index_are_rejected(mock_claims):
+    with pytest.raises(HTTPException) as empty:
+        _delete(selector={})
+    assert empty.value.status_code == 400
+
+    with pytest.raises(HTTPException) as owners:
+        _delete(selector={"owner_unknown": True})
+    assert owners.value.status_code == 503
+
+    with pytest.raises(HTTPException) as collection:
+        _delete(
+            selector={"label_selector": "app=x", "template_name": "t"},
+            use_delete_collection=True,
+        )
+    assert collection.value.status_code == 400
+
+
+def test_batch_create_rejects_duplicate_names(mock_claims):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            main.batch_create_sandbox_claims(
+                main.BatchCreateClaimsRequest(claim_names=["x", "x"]), {}
+            )
+        )
+    assert exc.value.status_code == 400
+
+
+def test_batch_routes_are_registered(authed_client):
+    response = authed_client.post(
+        "/api/sandboxclaims:batchCreate",
+        json={"claim_names": ["route-check"], "dry_run": True},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == {"would_create": 1}
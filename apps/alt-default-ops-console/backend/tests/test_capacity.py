@@ -0,0 +1,195 @@
+import asyncio
+
+from app import main
+from app.capacity import CapacityTracker, scheduling_causes
+from app.synthetic import SyntheticCluster, SyntheticClusterSpec
+
+GVISOR_TAINT = {
+    "key": "sandbox.gke.io/runtime",
+    "value": "gvisor",
+    "effect": "NoSchedule",
+}
+
+
+def _node(name, pool, *, cpu="4", memory="8Gi", gvisor=False, ready=True):
+    labels = {"cloud.google.com/gke-nodepool": pool}
+    if gvisor:
+        labels["workload-isolation"] = "gvisor"
+    return {
+        "metadata": {"name": name, "labels": labels},
+        "spec": {"taints": [GVISOR_TAINT] if gvisor else []},
+        "status": {
+            "allocatable": {"cpu": cpu, "memory": memory, "pods": "110"},
+            "conditions": [{"type": "Ready", "status": "True" if ready else "False"}],
+        },
+    }
+
+
+def _template(name, cpu, memory, *, gvisor=True):
+    spec = {"containers": [{"resources": {"requests": {"cpu": cpu, "memory": memory}}}]}
+    if gvisor:
+        spec["runtimeClassName"] = "gvisor"
+        spec["nodeSelector"] = {"workload-isolation": "gvisor"}
+        spec["tolerations"] = [
+            {
+                "key": "sandbox.gke.io/runtime",
+                "operator": "Equal",
+                "value": "gvisor",
+                "effect": "NoSchedule",
+            }
+        ]
+    return {"metadata": {"name": name}, "spec": {"podTemplate": {"spec": spec}}}
+
+
+def _pod(name, cpu, memory, *, node="", sandbox="", conditions=None):
+    owners = [{"kind": "Sandbox", "name": sandbox}] if sandbox else []
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "alt-default",
+            "ownerReferences": owners,
+        },
+        "spec": {
+            "nodeName": node or None,
+            "containers": [{"resources": {"requests": {"cpu": cpu, "memory": memory}}}],
+        },
+        "status": {"phase": "Running" if node else "Pending", "conditions": conditions},
+    }
+
+
+def _headroom(tracker, template):
+    snapshot = tracker.snapshot()
+    return next(item for item in snapshot["templates"] if item["template"] == template)
+
+
+def test_headroom_respects_requests_selectors_and_taints():
+    tracker = CapacityTracker()
+    tracker.load(
+        {
+            "nodes": [
+                _node("gv-1", "gvisor-sandbox-pool", gvisor=True),
+                _node("gv-2", "gvisor-sandbox-pool", gvisor=True, ready=False),
+                _node("df-1", "default-pool"),
+            ],
+            "templates": [
+                _template("python-runtime-template", "500m", "1Gi"),
+                _template("unsandboxed", "1", "1Gi", gvisor=False),
+            ],
+            "pods": [_pod("sb-1", "3", "1Gi", node="gv-1", sandbox="sb-1")],
+        }
+    )
+
+    default = _headroom(tracker, "python-runtime-template")
+    assert default["fits_now"] == 2
+    assert default["limited_by"] == "cpu"
+    assert default["blocked_nodes"] == {"not_ready": 1, "selector": 1}
+    assert [pool["node_pool"] for pool in default["by_node_pool"]] == [
+        "gvisor-sandbox-pool"
+    ]
+
+    plain = _headroom(tracker, "unsandboxed")
+    assert plain["fits_now"] == 4
+    assert plain["blocked_nodes"] == {"not_ready": 1, "taint": 1}
+
+    pools = {pool["node_pool"]: pool for pool in tracker.snapshot()["node_pools"]}
+    assert pools["gvisor-sandbox-pool"]["requested_cpu"] == 3.0
+    assert pools["gvisor-sandbox-pool"]["taints"] == [
+        "sandbox.gke.io/runtime=gvisor:NoSchedule"
+    ]
+
+
+def test_watch_events_update_headroom_incrementally():
+    tracker = CapacityTracker()
+    tracker.handle("nodes", "ADDED", _node("gv-1", "gvisor", gvisor=True), None)
+    tracker.handle("templates", "ADDED", _template("small", "1", "512Mi"), None)
+    assert _headroom(tracker, "small")["fits_now"] == 4
+
+    pod = _pod("sb-1", "2", "1Gi", node="gv-1")
+    tracker.handle("pods", "ADDED", pod, None)
+    assert _headroom(tracker, "small")["fits_now"] == 2
+
+    tracker.handle("pods", "DELETED", pod, None)
+    tracker.handle(
+        "nodes", "MODIFIED", _node("gv-1", "gvisor", cpu="8", gvisor=True), None
+    )
+    assert _headroom(tracker, "small")["fits_now"] == 8
+
+    tracker.handle("nodes", "DELETED", _node("gv-1", "gvisor"), None)
+    assert _headroom(tracker, "small")["limited_by"] == "no_nodes"
+
+
+def test_pending_pods_report_failed_scheduling_causes():
+    message = (
+        "0/3 nodes are available: 1 Insufficient cpu, 1 Insufficient memory, "
+        "1 node(s) had untolerated taint {sandbox.gke.io/runtime: gvisor}. "
+        "preemption: 0/3 nodes are available."
+    )
+    assert scheduling_causes(message) == {"cpu": 1, "memory": 1, "taint": 1}
+
+    tracker = CapacityTracker(clock=lambda: 1_700_000_100.0)
+    tracker.handle(
+        "pods",
+        "ADDED",
+        _pod(
+            "sb-pending",
+            "2",
+            "4Gi",
+            sandbox="sb-pending",
+            conditions=[
+                {
+                    "type": "PodScheduled",
+                    "status": "False",
+                    "reason": "Unschedulable",
+                    "message": "0/1 nodes are available: 1 Too many pods.",
+                    "lastTransitionTime": "2023-11-14T22:13:20Z",
+                }
+            ],
+        ),
+        None,
+    )
+    pending = tracker.snapshot()["pending"]
+    assert pending["causes"] == {"pods": 1}
+    assert pending["pods"][0]["pending_seconds"] == 100.0
+
+    tracker.handle(
+        "events",
+        "ADDED",
+        {
+            "reason": "FailedScheduling",
+            "involvedObject": {
+                "kind": "Pod",
+                "name": "sb-pending",
+                "namespace": "alt-default",
+            },
+            "message": message,
+            "count": 4,
+            "lastTimestamp": "2023-11-14T22:14:00Z",
+        },
+        None,
+    )
+    pending = tracker.snapshot()["pending"]
+    assert pending["causes"] == {"cpu": 1, "memory": 1, "taint": 1}
+    assert pending["pods"][0]["failed_scheduling_count"] == 4
+    assert pending["sandboxes"] == 1
+
+    tracker.handle("pods", "MODIFIED", _pod("sb-pending", "2", "4Gi", node="n"), None)
+    assert tracker.snapshot()["pending"]["count"] == 0
+
+
+def test_overview_profiles_carry_template_headroom(monkeypatch):
+    cluster = SyntheticCluster(SyntheticClusterSpec.for_claims(40))
+    tracker = CapacityTracker()
+    cluster.add_handler(tracker.handle)
+    cluster.replay()
+    monkeypatch.setattr(main, "synthetic_cluster", cluster)
+    monkeypatch.setattr(main, "capacity_tracker", tracker)
+
+    payload = asyncio.run(main._overview_data(None))
+
+    templates = {item["template"] for item in payload["capacity"]["templates"]}
+    for profile in payload["warm_pool_profiles"]:
+        assert profile["template_name"] in templates
+        assert profile["headroom"]["fits_now"] >= 0
+        assert set(profile["headroom"]["by_node_pool"]) <= {
+            pool["node_pool"] for pool in payload["capacity"]["node_pools"]
+        }
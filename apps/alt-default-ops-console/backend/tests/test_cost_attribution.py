@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from app import main
+from app.cost_attribution import UNCLAIMED, CostAttributor
+from app.pricing import PricingTable, load_catalog
+
+
+@pytest.fixture()
+def pricing() -> PricingTable:
+    return PricingTable(load_catalog())
+
+
+def _node(name: str, instance_type: str = "e2-standard-4") -> dict:
+    return {
+        "metadata": {
+            "name": name,
+            "labels": {
+                "node.kubernetes.io/instance-type": instance_type,
+                "cloud.google.com/gke-nodepool": "default-pool",
+            },
+        },
+        "status": {"allocatable": {"cpu": "4", "memory": "16Gi"}},
+    }
+
+
+def _pod(name: str, node: str, sandbox: str = "", cpu: str = "1") -> dict:
+    owners = [{"kind": "Sandbox", "name": sandbox}] if sandbox else []
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "alt-default",
+            "ownerReferences": owners,
+        },
+        "spec": {
+            "nodeName": node,
+            "containers": [{"resources": {"requests": {"cpu": cpu, "memory": "2Gi"}}}],
+        },
+        "status": {"phase": "Running"},
+    }
+
+
+def _claim(name: str, sandbox: str, template: str = "python-runtime-template") -> dict:
+    return {
+        "metadata": {"name": name},
+        "spec": {"sandboxTemplateRef": {"name": template}},
+        "status": {"sandbox": {"name": sandbox}},
+    }
+
+
+def test_attributes_node_cost_by_request_share_and_owner(pricing):
+    attributor = CostAttributor(pricing)
+    attributor.load(
+        {
+            "nodes": [_node("node-a")],
+            "claims": [_claim("claim-1", "sbx-1"), _claim("claim-2", "sbx-2")],
+            "pods": [
+                _pod("sbx-1", "node-a", sandbox="sbx-1"),
+                _pod("sbx-2", "node-a", sandbox="sbx-2", cpu="2"),
+                _pod("sbx-warm", "node-a", sandbox="sbx-warm"),
+                _pod("backend", "node-a"),
+            ],
+        }
+    )
+    owners = {
+        "claim-1": {"user_id": "alice", "session_id": "s1"},
+        "claim-2": {"user_id": "alice", "session_id": "s2"},
+    }
+    snapshot = attributor.snapshot(claim_owner_index=owners)
+
+    node_hourly = pricing.node_hourly("e2-standard-4", False)
+    share_1cpu = (1 / 4 + 2 / 16) / 2
+    share_2cpu = (2 / 4 + 2 / 16) / 2
+    assert snapshot["node_hourly_total_usd"] == pytest.approx(node_hourly)
+    users = {row["user_id"]: row for row in snapshot["by_user"]}
+    assert users["alice"]["sandboxes"] == 2
+    assert users["alice"]["hourly_usd"] == pytest.approx(
+        node_hourly * (share_1cpu + share_2cpu)
+    )
+    assert users[UNCLAIMED]["hourly_usd"] == pytest.approx(node_hourly * share_1cpu)
+    assert snapshot["by_user"][0]["user_id"] == "alice"
+    assert {row["session_id"] for row in snapshot["by_session"]} == {
+        "s1",
+        "s2",
+        UNCLAIMED,
+    }
+    templates = {row["template"]: row for row in snapshot["by_template"]}
+    assert templates["python-runtime-template"]["sandboxes"] == 2
+    assert snapshot["other_pods_hourly_usd"] == pytest.approx(node_hourly * share_1cpu)
+    assert snapshot["unallocated_hourly_usd"] == pytest.approx(
+        node_hourly * (1 - 3 * share_1cpu - share_2cpu)
+    )
+    assert snapshot["top_sandboxes"][0]["sandbox"] == "sbx-2"
+
+
+def test_recomputes_only_affected_pods(pricing):
+    attributor = CostAttributor(pricing)
+    attributor.load(
+        {
+            "nodes": [_node("node-a"), _node("node-b")],
+            "pods": [
+                _pod("p1", "node-a", sandbox="s1"),
+                _pod("p2", "node-b", sandbox="s2"),
+            ],
+        }
+    )
+    assert attributor.pod_recomputations == 2
+
+    attributor.handle("pods", "MODIFIED", _pod("p1", "node-a", sandbox="s1"), None)
+    assert attributor.pod_recomputations == 2
+
+    attributor.handle("nodes", "MODIFIED", _node("node-a", "e2-standard-8"), None)
+    assert attributor.pod_recomputations == 3
+    before = attributor.snapshot()["stats"]["version"]
+
+    attributor.handle("pods", "DELETED", _pod("p2", "node-b", sandbox="s2"), None)
+    snapshot = attributor.snapshot()
+    assert snapshot["stats"]["version"] == before + 1
+    assert [row["sandbox"] for row in snapshot["top_sandboxes"]] == ["s1"]
+
+
+def test_claim_status_with_capitalised_sandbox_name_is_attributed(pricing):
+    claim = _claim("claim-1", "")
+    claim["status"]["sandbox"] = {"Name": "sbx-1"}
+    attributor = CostAttributor(pricing)
+    attributor.load(
+        {
+            "nodes": [_node("node-a")],
+            "claims": [claim],
+            "pods": [_pod("sbx-1", "node-a", sandbox="sbx-1")],
+        }
+    )
+
+    snapshot = attributor.snapshot(
+        claim_owner_index={"claim-1": {"user_id": "alice", "session_id": "s1"}}
+    )
+
+    assert [row["user_id"] for row in snapshot["by_user"]] == ["alice"]
+
+
+def test_gpu_count_falls_back_to_the_accelerator_count_label(pricing):
+    node = _node("node-a", "g2-standard-8")
+    node["metadata"]["labels"].update(
+        {
+            "cloud.google.com/gke-accelerator": "nvidia-l4",
+            "cloud.google.com/gke-accelerator-count": "2",
+        }
+    )
+    attributor = CostAttributor(pricing)
+    attributor.load({"nodes": [node]})
+
+    assert attributor.snapshot()["node_hourly_total_usd"] == pytest.approx(
+        pricing.node_hourly(
+            "g2-standard-8", False, accelerator="nvidia-l4", gpu_count=2
+        )
+    )
+
+
+def test_endpoint_in_mock_mode_returns_empty_attribution():
+    payload = asyncio.run(main.cost_attribution(request=None, top=5, _={}))
+    assert payload["source"] == "mock"
+    assert payload["by_user"] == []
+    assert payload["catalog_version"] == main.pricing_table.version
@@ -0,0 +1,181 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.events import EventIndex
+from app.synthetic import SyntheticCluster, SyntheticClusterSpec
+
+NOW = 1_700_000_000.0
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _event(
+    uid,
+    reason,
+    *,
+    kind="Pod",
+    name="sb-1",
+    count=1,
+    last=NOW,
+    type_="Warning",
+    message="",
+):
+    return {
+        "metadata": {"uid": uid, "namespace": "alt-default"},
+        "involvedObject": {"kind": kind, "name": name, "namespace": "alt-default"},
+        "reason": reason,
+        "type": type_,
+        "message": message or f"{reason} on {name}",
+        "source": {"component": "kubelet"},
+        "count": count,
+        "firstTimestamp": _iso(last - 60),
+        "lastTimestamp": _iso(last),
+    }
+
+
+def test_repeated_events_are_grouped_and_counted_once():
+    index = EventIndex(clock=lambda: NOW)
+    index.handle("events", "ADDED", _event("e1", "FailedMount", count=2), None)
+    index.handle("events", "MODIFIED", _event("e1", "FailedMount", count=5), None)
+    # A re-list replays the same Event object; nothing new happened.
+    index.load([_event("e1", "FailedMount", count=5)])
+    index.handle("events", "ADDED", _event("e2", "FailedMount", count=1), None)
+    index.handle("events", "DELETED", _event("e2", "FailedMount", count=1), None)
+    index.handle("pods", "ADDED", _event("e3", "Pulled"), None)
+
+    result = index.query(reason="FailedMount")
+
+    assert result["total_groups"] == 1
+    assert result["total_count"] == 6
+    [group] = result["groups"]
+    assert group["kind"] == "Pod"
+    assert group["first_seen"] == NOW - 60
+    assert index.status()["occurrences"] == 6
+
+
+def test_memory_is_bounded_to_most_recent_groups():
+    index = EventIndex(max_entries=2, clock=lambda: NOW)
+    for number in range(3):
+        index.observe(
+            _event(f"e{number}", "BackOff", name=f"sb-{number}", last=NOW + number)
+        )
+
+    names = [group["name"] for group in index.query()["groups"]]
+
+    assert names == ["sb-2", "sb-1"]
+
+
+def test_sqlite_index_searches_history_and_survives_restart(tmp_path):
+    path = str(tmp_path / "events.sqlite")
+    index = EventIndex(path=path, flush_interval_seconds=0, clock=lambda: NOW)
+    index.load(
+        [
+            _event("e1", "FailedMount", count=3, last=NOW - 7200),
+            _event("e2", "FailedMount", name="sb-2", count=1),
+            _event("e3", "Unauthenticated", kind="SandboxClaim", name="c-1"),
+            _event("e4", "Scheduled", type_="Normal"),
+        ]
+    )
+    index.close()
+
+    reopened = EventIndex(path=path, max_entries=1, clock=lambda: NOW)
+    # The informer re-lists after a restart: already stored, not re-counted.
+    reopened.load([_event("e1", "FailedMount", count=3, last=NOW - 7200)])
+    recent = reopened.query(since=NOW - 3600, event_type="Warning")
+    mounts = reopened.query(reason="FailedMount")
+
+    assert recent["total_groups"] == 2
+    assert {item["kind"] for item in recent["by_kind"]} == {"Pod", "SandboxClaim"}
+    assert mounts["total_count"] == 4
+    assert [group["name"] for group in mounts["groups"]] == ["sb-2", "sb-1"]
+
+    reopened.observe(_event("e5", "FailedMount", count=2, last=NOW + 10))
+    assert reopened.query(reason="FailedMount", name="sb-1")["total_count"] == 5
+    reopened.close()
+
+
+def test_old_groups_are_pruned_after_retention(tmp_path):
+    clock = [NOW]
+    index = EventIndex(
+        path=str(tmp_path / "events.sqlite"),
+        retention_seconds=3600,
+        flush_interval_seconds=0,
+        clock=lambda: clock[0],
+    )
+    index.observe(_event("e1", "FailedMount"))
+    clock[0] += 7200
+    index.observe(_event("e2", "BackOff", last=clock[0]))
+
+    assert [g["reason"] for g in index.query()["groups"]] == ["BackOff"]
+    assert index.status()["pruned"] == 1
+
+
+def test_events_endpoint_filters_and_validates_since(monkeypatch):
+    index = EventIndex()
+    now = main.time.time()
+    index.load(
+        [
+            _event("e1", "FailedMount", last=now - 7200),
+            _event("e2", "FailedMount", name="sb-2", last=now),
+        ]
+    )
+    monkeypatch.setattr(main, "event_index", index)
+
+    result = asyncio.run(
+        main.events(
+            reason="FailedMount", kind="", name="", type_="", since="1h", limit=10, _={}
+        )
+    )
+
+    assert result["source"] == "mock"
+    assert [group["name"] for group in result["groups"]] == ["sb-2"]
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(
+            main.events(
+                reason="", kind="", name="", type_="", since="yesterday", limit=10, _={}
+            )
+        )
+    assert excinfo.value.status_code == 400
+
+
+def test_overview_rows_link_pod_and_sandbox_events(monkeypatch):
+    cluster = SyntheticCluster(SyntheticClusterSpec.for_claims(5))
+    objects = cluster.objects()
+    sandbox, claim = next(
+        (s["metadata"]["name"], s["spec"]["sandboxClaimRef"]["name"])
+        for s in objects["sandboxes"]
+        if s["spec"].get("sandboxClaimRef")
+    )
+    pod = next(
+        p.metadata.name
+        for p in objects["pods"]
+        if any(o.name == sandbox for o in p.metadata.owner_references or [])
+    )
+    index = EventIndex()
+    now = main.time.time()
+    index.load(
+        [
+            _event("e1", "FailedMount", name=pod, count=3, last=now),
+            _event("e2", "Scheduled", name=pod, type_="Normal", last=now),
+        ]
+    )
+    monkeypatch.setattr(main, "synthetic_cluster", cluster)
+    monkeypatch.setattr(main, "event_index", index)
+
+    payload = asyncio.run(main._overview_data(None))
+
+    claim_row = next(
+        row for row in payload["sandboxclaims_detailed"] if row["name"] == claim
+    )
+    assert claim_row["events"]["warnings"] == 3
+    assert claim_row["events"]["reasons"] == {"FailedMount": 3, "Scheduled": 1}
+    summary = payload["events_summary"]
+    assert summary["claims_with_warnings"] == 1
+    assert summary["sandboxes_with_warnings"] == 1
+    assert summary["by_reason"][0]["reason"] == "FailedMount"
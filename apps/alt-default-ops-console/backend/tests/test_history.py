@@ -0,0 +1,131 @@
+import asyncio
+import math
+
+import pytest
+
+from app import main
+from app.history import (
+    METRICS,
+    HistorySampler,
+    HistoryStore,
+    parse_range_seconds,
+    sample_from_overview,
+)
+
+
+def test_ring_buffer_wraps_and_keeps_newest_samples():
+    store = HistoryStore(capacity=4, metrics=("a",))
+    for ts in range(100, 106):
+        store.append(ts, {"a": float(ts)})
+
+    points = store.query("a", start=0, end=1000, step=1)
+
+    assert len(store) == 4
+    assert [p["ts"] for p in points] == [102, 103, 104, 105]
+
+
+def test_query_downsamples_into_buckets():
+    store = HistoryStore(capacity=100, metrics=("a",))
+    for i in range(20):
+        store.append(1000 + i * 15, {"a": float(i)})
+
+    points = store.query("a", start=1000, end=1000 + 300, step=60)
+
+    assert [p["ts"] for p in points] == [1000, 1060, 1120, 1180, 1240]
+    assert points[0] == {
+        "ts": 1000,
+        "count": 4,
+        "avg": 1.5,
+        "min": 0.0,
+        "max": 3.0,
+        "p95": 3.0,
+        "last": 3.0,
+    }
+    assert store.query("a", start=1100, end=1130, step=15)[0]["ts"] == 1100
+
+
+def test_missing_values_are_skipped_and_out_of_order_samples_dropped():
+    store = HistoryStore(capacity=10, metrics=("a", "b"))
+    store.append(10, {"a": 1.0})
+    store.append(5, {"a": 9.0, "b": 9.0})
+
+    assert store.query("b", start=0, end=20, step=20) == []
+    assert store.summary("a", start=0, end=20)["max"] == 1.0
+    with pytest.raises(KeyError):
+        store.query("missing", start=0, end=20, step=1)
+
+
+def test_mapped_store_persists_across_reopen(tmp_path):
+    path = tmp_path / "history.bin"
+    store = HistoryStore(capacity=8, path=str(path))
+    store.append(100, {"total_hourly_usd": 0.25})
+    store.close()
+
+    reopened = HistoryStore(capacity=8, path=str(path))
+    assert len(reopened) == 1
+    [point] = reopened.query("total_hourly_usd", start=0, end=200, step=200)
+    assert math.isclose(point["avg"], 0.25)
+    reopened.close()
+
+    resized = HistoryStore(capacity=16, path=str(path))
+    assert len(resized) == 0
+    resized.close()
+
+
+def test_month_of_fifteen_second_samples_fits_in_a_few_megabytes():
+    store = HistoryStore(capacity=30 * 86400 // 15)
+
+    assert store.bytes_used() < 10 * 1024 * 1024
+
+
+def test_parse_range_seconds():
+    assert parse_range_seconds("90") == 90
+    assert parse_range_seconds("30m") == 1800
+    assert parse_range_seconds("7d") == 7 * 86400
+    with pytest.raises(ValueError):
+        parse_range_seconds("soon")
+
+
+def test_sampler_records_mock_overview_and_serves_history(monkeypatch):
+    clock = iter(range(1_000, 2_000, 15))
+    sampler = HistorySampler(
+        HistoryStore(capacity=32),
+        main._history_collect,
+        interval_seconds=15,
+        clock=lambda: next(clock),
+    )
+    monkeypatch.setattr(main, "history_sampler", sampler)
+    monkeypatch.setattr(main.time, "time", lambda: 1_100)
+
+    for _ in range(3):
+        assert asyncio.run(sampler.sample_once())
+
+    result = asyncio.run(
+        main.history(metric="warm_pool_replicas", range_="5m", step=None, points=10, _={})
+    )
+    assert result["step_seconds"] == 30
+    assert sum(p["count"] for p in result["points"]) == 3
+    assert result["summary"]["last"] == float(
+        main.mock_state["warm_pools"]["python-sandbox-warmpool"]["replicas"]
+    )
+    listing = asyncio.run(
+        main.history(metric="", range_="24h", step=None, points=300, _={})
+    )
+    assert listing["metrics"] == list(METRICS)
+    assert listing["samples"] == 3
+
+
+def test_sample_from_overview_counts_phases():
+    sample = sample_from_overview(
+        {
+            "pods": [{"phase": "Running"}, {"phase": "Pending"}, {"phase": "Running"}],
+            "node_summary": {"total": 3, "ready": 2},
+            "sandboxclaims_detailed": [{"ready_condition": True}, {}],
+            "cost_estimate": {"total_hourly_usd": 1.5},
+        }
+    )
+
+    assert sample["pods_running"] == 2
+    assert sample["nodes_ready"] == 2
+    assert sample["claims_ready"] == 1
+    assert sample["total_hourly_usd"] == 1.5
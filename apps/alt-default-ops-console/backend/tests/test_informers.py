@@ -0,0 +1,205 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from kubernetes import client
+from kubernetes.client import ApiException
+
+from app import main
+from app.informers import Informer, InformerSet, InformerSpec, WatchExpired
+
+
+def _claim(name: str, resource_version: str, template: str = "tpl-a") -> dict:
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "alt-default",
+            "resourceVersion": resource_version,
+            "creationTimestamp": "2026-01-01T00:00:00Z",
+        },
+        "spec": {"sandboxTemplateRef": {"name": template}},
+        "status": {},
+    }
+
+
+class FakeApi:
+    def __init__(self, items: list[dict], resource_version: str = "10") -> None:
+        self.items = items
+        self.resource_version = resource_version
+        self.list_calls = 0
+
+    def list_claims(self, **_: object) -> dict:
+        self.list_calls += 1
+        return {
+            "items": list(self.items),
+            "metadata": {"resourceVersion": self.resource_version},
+        }
+
+
+class FakeWatch:
+    def __init__(self, streams: list[list[dict] | Exception]) -> None:
+        self.streams = list(streams)
+        self.calls: list[dict] = []
+
+    def __call__(self, func, **kwargs):
+        self.calls.append(kwargs)
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        yield from stream
+
+
+def _informer(api: FakeApi, fake_watch: FakeWatch) -> Informer:
+    return Informer(
+        InformerSpec(
+            "claims",
+            api.list_claims,
+            indexers={
+                "template": lambda obj: [obj["spec"]["sandboxTemplateRef"]["name"]]
+            },
+        ),
+        watch_factory=fake_watch,
+        retry_backoff_seconds=0,
+    )
+
+
+def test_informer_lists_then_applies_watch_events():
+    api = FakeApi([_claim("a", "5"), _claim("b", "6")])
+    fake_watch = FakeWatch(
+        [
+            [
+                {"type": "ADDED", "object": _claim("c", "11", template="tpl-b")},
+                {"type": "MODIFIED", "object": _claim("a", "12", template="tpl-b")},
+                {"type": "DELETED", "object": _claim("b", "13")},
+                {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "20"}}},
+            ]
+        ]
+    )
+    informer = _informer(api, fake_watch)
+    seen: list[tuple[str, str]] = []
+    informer.add_handler(
+        lambda kind, event_type, obj, old: seen.append(
+            (event_type, obj["metadata"]["name"])
+        )
+    )
+
+    informer.list_and_replace()
+    assert informer.has_synced()
+    assert informer.resource_version == "10"
+
+    informer.watch_once()
+
+    assert fake_watch.calls[0]["resource_version"] == "10"
+    assert informer.resource_version == "20"
+    names = sorted(item["metadata"]["name"] for item in informer.store.list())
+    assert names == ["a", "c"]
+    assert [
+        obj["metadata"]["name"] for obj in informer.store.by_index("template", "tpl-b")
+    ] == ["a", "c"]
+    assert informer.store.by_index("template", "tpl-a") == []
+    assert seen[-3:] == [("ADDED", "c"), ("MODIFIED", "a"), ("DELETED", "b")]
+
+
+def test_informer_relists_after_watch_expiry():
+    api = FakeApi([_claim("a", "5")])
+    fake_watch = FakeWatch(
+        [
+            ApiException(status=410, reason="Gone"),
+            [{"type": "ERROR", "raw_object": {"code": 410, "message": "too old"}}],
+        ]
+    )
+    informer = _informer(api, fake_watch)
+    informer.list_and_replace()
+
+    with pytest.raises(WatchExpired):
+        informer.watch_once()
+    with pytest.raises(WatchExpired):
+        informer.watch_once()
+
+    api.items = [_claim("b", "30")]
+    api.resource_version = "31"
+    deleted: list[str] = []
+    informer.add_handler(
+        lambda kind, event_type, obj, old: deleted.append(obj["metadata"]["name"])
+        if event_type == "DELETED"
+        else None
+    )
+    informer.list_and_replace()
+
+    assert api.list_calls == 2
+    assert informer.resource_version == "31"
+    assert [item["metadata"]["name"] for item in informer.store.list()] == ["b"]
+    assert deleted == ["a"]
+
+
+def test_informer_run_loop_recovers_from_gone():
+    api = FakeApi([_claim("a", "5")])
+    informer: Informer
+
+    def stop_after_relist(func, **kwargs):
+        if api.list_calls >= 2:
+            informer._stop.set()
+            return iter(())
+        raise ApiException(status=410, reason="Gone")
+
+    informer = _informer(api, FakeWatch([]))
+    informer._watch_factory = stop_after_relist
+    informer.run()
+
+    assert api.list_calls == 2
+    assert informer.relist_count == 2
+
+
+def test_overview_served_from_synced_informers(monkeypatch):
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+
+    def listing(*items):
+        return lambda **_: {"items": list(items), "metadata": {"resourceVersion": "1"}}
+
+    pod = client.V1Pod(
+        metadata=client.V1ObjectMeta(
+            name="pod-a", namespace="alt-default", creation_timestamp=now
+        ),
+        spec=client.V1PodSpec(containers=[], node_name="node-a"),
+        status=client.V1PodStatus(phase="Running"),
+    )
+    node = client.V1Node(
+        metadata=client.V1ObjectMeta(
+            name="node-a",
+            labels={"node.kubernetes.io/instance-type": "e2-standard-4"},
+        ),
+        status=client.V1NodeStatus(
+            conditions=[client.V1NodeCondition(type="Ready", status="True")]
+        ),
+    )
+    specs = {
+        "deployments": listing(),
+        "pods": listing(pod),
+        "services": listing(),
+        "pvcs": listing(),
+        "nodes": listing(node),
+        "claims": listing(_claim("claim-a", "1")),
+        "sandboxes": listing(),
+        "warm_pools": listing(),
+        "templates": listing({"metadata": {"name": "tpl-a"}}),
+    }
+    informers = InformerSet(
+        [Informer(InformerSpec(name, func)) for name, func in specs.items()]
+    )
+    for name in specs:
+        informers.get(name).list_and_replace()
+
+    def fail_direct_list():
+        raise AssertionError("overview must not hit the API server when synced")
+
+    monkeypatch.setattr(main, "use_mock_cluster", False)
+    monkeypatch.setattr(main, "cluster_informers", informers)
+    monkeypatch.setattr(main, "_list_cluster_objects", fail_direct_list)
+
+    payload = asyncio.run(main._overview_data(request=None))
+
+    assert payload["cluster_mode"] == "live"
+    assert payload["sandboxclaims"] == ["claim-a"]
+    assert payload["nodes"][0]["pod_count"] == 1
+    assert payload["sandboxtemplates"] == ["tpl-a"]
+    assert payload["ops_integration"]["informers"]["synced"] is True
@@ -0,0 +1,162 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.jwks import JwksCache, cache_control_max_age
+
+URL = "https://issuer.example.com/keys"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Issuer:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.kids = ["k1"]
+        self.max_age: int | None = None
+        self.down = False
+        self.delay = 0.0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.down:
+            raise httpx.ConnectError("unreachable", request=request)
+        headers = {}
+        if self.max_age is not None:
+            headers["Cache-Control"] = f"public, max-age={self.max_age}"
+        keys = [{"kid": kid, "kty": "RSA"} for kid in self.kids]
+        return httpx.Response(200, json={"keys": keys}, headers=headers)
+
+
+@pytest.fixture
+def issuer():
+    return _Issuer()
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+def _cache(issuer, clock, **kwargs) -> JwksCache:
+    return JwksCache(
+        transport=httpx.MockTransport(issuer.handler), clock=clock, **kwargs
+    )
+
+
+def test_concurrent_misses_share_one_fetch(issuer, clock):
+    issuer.delay = 0.02
+    cache = _cache(issuer, clock)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_keys(URL) for _ in range(20)))
+
+    results = asyncio.run(run())
+
+    assert issuer.calls == 1
+    assert all(set(keys) == {"k1"} for keys in results)
+    assert cache.stats()["coalesced"] == 19
+
+
+def test_refreshes_ahead_of_expiry_in_background(issuer, clock):
+    cache = _cache(issuer, clock, default_ttl_seconds=100, min_ttl_seconds=1)
+
+    async def run():
+        await cache.get_keys(URL)
+        issuer.kids = ["k2"]
+        clock.now += 85
+        stale_but_valid = await cache.get_keys(URL)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return stale_but_valid, await cache.get_keys(URL)
+
+    before, after = asyncio.run(run())
+
+    assert set(before) == {"k1"}
+    assert set(after) == {"k2"}
+    assert issuer.calls == 2
+    assert cache.stats()["background_refreshes"] == 1
+
+
+def test_honours_cache_control_max_age(issuer, clock):
+    issuer.max_age = 120
+    cache = _cache(issuer, clock, default_ttl_seconds=900, min_ttl_seconds=60)
+
+    asyncio.run(cache.get_keys(URL))
+
+    assert cache.stats()["urls"][URL]["expires_in_seconds"] == 120
+    assert cache_control_max_age("no-cache, max-age=30") == 30
+    assert cache_control_max_age("no-store") is None
+
+
+def test_forced_refreshes_are_rate_limited(issuer, clock):
+    cache = _cache(issuer, clock, forced_refresh_interval_seconds=30)
+
+    async def run():
+        await cache.get_keys(URL)
+        for _ in range(10):
+            await cache.get_keys(URL, force_refresh=True)
+        clock.now += 31
+        await cache.get_keys(URL, force_refresh=True)
+
+    asyncio.run(run())
+
+    assert issuer.calls == 3
+    assert cache.stats()["forced_refresh_limited"] == 9
+
+
+def test_serves_last_known_good_keys_when_issuer_is_down(issuer, clock):
+    cache = _cache(issuer, clock, default_ttl_seconds=60, failure_backoff_seconds=30)
+
+    async def run():
+        await cache.get_keys(URL)
+        issuer.down = True
+        clock.now += 61
+        first = await cache.get_keys(URL)
+        second = await cache.get_keys(URL)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert set(first) == set(second) == {"k1"}
+    assert issuer.calls == 2
+    stats = cache.stats()
+    assert stats["stale_served"] == 2
+    assert "unreachable" in stats["urls"][URL]["last_error"]
+
+
+def test_unreachable_issuer_without_keys_is_503(issuer, clock):
+    issuer.down = True
+    cache = _cache(issuer, clock)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(cache.get_keys(URL))
+
+    assert exc.value.status_code == 503
+
+
+def test_prefetch_warms_keys_through_a_shared_client(issuer, clock):
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(issuer.handler))
+    cache = JwksCache(client_factory=lambda: shared, clock=clock)
+    other = "https://other.example.com/keys"
+
+    async def run():
+        await cache.prefetch([URL, URL, other, ""])
+        keys = await cache.get_keys(URL)
+        await cache.aclose()
+        return keys
+
+    assert set(asyncio.run(run())) == {"k1"}
+    assert issuer.calls == 2
+    assert cache.stats()["hits"] == 1
+    assert not shared.is_closed
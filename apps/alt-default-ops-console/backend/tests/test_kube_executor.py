@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.kube_executor import KubeExecutor, KubeExecutorSaturated
+
+
+def test_calls_run_concurrently_off_the_event_loop():
+    executor = KubeExecutor(max_workers=4, max_queue=4, default_timeout_seconds=2)
+    loop_thread = threading.get_ident()
+    seen_threads: set[int] = set()
+
+    def slow(value: int) -> int:
+        seen_threads.add(threading.get_ident())
+        time.sleep(0.1)
+        return value * 2
+
+    async def run() -> list[int]:
+        return await asyncio.gather(*(executor.call(slow, i) for i in range(4)))
+
+    started = time.perf_counter()
+    assert asyncio.run(run()) == [0, 2, 4, 6]
+    assert time.perf_counter() - started < 0.35
+    assert loop_thread not in seen_threads
+    assert executor.metrics()["completed"] == 4
+    executor.shutdown()
+
+
+def test_timeout_and_saturation_are_counted():
+    executor = KubeExecutor(max_workers=1, max_queue=1, default_timeout_seconds=2)
+    release = threading.Event()
+
+    async def run() -> None:
+        blocked = asyncio.ensure_future(executor.call(release.wait, 1.0))
+        queued = asyncio.ensure_future(executor.call(lambda: "ok"))
+        await asyncio.sleep(0.05)
+        assert executor.metrics()["queued"] == 1
+        with pytest.raises(KubeExecutorSaturated):
+            await executor.call(lambda: "rejected")
+        release.set()
+        assert await blocked is True
+        assert await queued == "ok"
+        with pytest.raises(TimeoutError):
+            await executor.call(time.sleep, 0.5, timeout=0.01)
+
+    asyncio.run(run())
+    metrics = executor.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["timed_out"] == 1
+    assert metrics["max_queue_depth_seen"] >= 1
+    executor.shutdown()
+
+
+def test_kube_call_maps_timeout_to_504(monkeypatch):
+    monkeypatch.setattr(main.settings, "kube_call_timeout_seconds", 0.01)
+
+    def slow(**_: object) -> None:
+        time.sleep(0.2)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(main._kube_call(slow))
+    assert exc_info.value.status_code == 504
+
+
+def test_direct_overview_lists_fan_out(monkeypatch):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def listing(result):
+        def call(**_: object):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return result
+
+        return call
+
+    typed = SimpleNamespace(items=[])
+    core = SimpleNamespace(
+        list_namespaced_pod=listing(typed),
+        list_namespaced_service=listing(typed),
+        list_namespaced_persistent_volume_claim=listing(typed),
+        list_node=listing(typed),
+    )
+    apps = SimpleNamespace(list_namespaced_deployment=listing(typed))
+    custom = SimpleNamespace(list_namespaced_custom_object=listing({"items": []}))
+    monkeypatch.setattr(main, "core_api", core)
+    monkeypatch.setattr(main, "apps_api", apps)
+    monkeypatch.setattr(main, "custom_api", custom)
+
+    objects = asyncio.run(main._list_cluster_objects())
+
+    assert set(objects) == {
+        "deployments",
+        "pods",
+        "services",
+        "pvcs",
+        "nodes",
+        "claims",
+        "sandboxes",
+        "warm_pools",
+        "templates",
+    }
+    assert peak > 1
@@ -0,0 +1,124 @@
+import asyncio
+import random
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from app import main
+from app.latency import LatencyTracker, QuantileSketch
+
+T0 = 1_700_000_000.0
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _claim(name, created, *, template="python", sandbox="", ready=None):
+    status = {}
+    if sandbox:
+        status["sandbox"] = {"Name": sandbox}
+    if ready is not None:
+        status["conditions"] = [
+            {"type": "Ready", "status": "True", "lastTransitionTime": _iso(ready)}
+        ]
+    return {
+        "metadata": {"name": name, "creationTimestamp": _iso(created)},
+        "spec": {"sandboxTemplateRef": {"name": template}},
+        "status": status,
+    }
+
+
+def _sandbox(name, created, claim=""):
+    spec = {"sandboxClaimRef": {"name": claim}} if claim else {}
+    return {"metadata": {"name": name, "creationTimestamp": _iso(created)}, "spec": spec}
+
+
+def _pod(name, scheduled):
+    condition = SimpleNamespace(
+        type="PodScheduled",
+        status="True",
+        last_transition_time=datetime.fromtimestamp(scheduled, UTC),
+    )
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, owner_references=None),
+        status=SimpleNamespace(conditions=[condition]),
+    )
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(7, 1) for _ in range(20_000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    ordered = sorted(values)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch.quantile(q) - exact) / exact < 0.02
+    assert sketch.summary()["count"] == 20_000
+
+
+def test_tracks_cold_claim_lifecycle_from_watch_events():
+    now = {"t": T0}
+    tracker = LatencyTracker(clock=lambda: now["t"])
+
+    tracker.handle("claims", "ADDED", _claim("c1", T0 + 1), None)
+    now["t"] = T0 + 2
+    tracker.handle("sandboxes", "ADDED", _sandbox("s1", T0 + 1.5, "c1"), None)
+    tracker.handle("pods", "MODIFIED", _pod("s1", T0 + 3), None)
+    tracker.handle(
+        "claims", "MODIFIED", _claim("c1", T0 + 1, sandbox="s1", ready=T0 + 6), None
+    )
+
+    snapshot = tracker.snapshot()
+    assert snapshot["overall"]["count"] == 1
+    assert snapshot["overall"]["p50"] == 5000.0
+    assert snapshot["by_path"]["cold"]["count"] == 1
+    assert snapshot["by_path"]["warm"] == {"count": 0}
+    assert snapshot["stages"]["sandbox_bound_ms"]["p50"] == 1000.0
+    assert snapshot["stages"]["pod_scheduled_ms"]["p50"] == 2000.0
+    assert snapshot["recent"][0]["claim_ready_ms"] == 5000.0
+    assert snapshot["pending"] == []
+
+
+def test_warm_pool_hits_are_split_from_cold_starts_per_template():
+    tracker = LatencyTracker(clock=lambda: T0)
+    tracker.handle("sandboxes", "ADDED", _sandbox("warm-1", T0 - 60), None)
+    tracker.handle(
+        "claims",
+        "ADDED",
+        _claim("c1", T0 + 1, template="small", sandbox="warm-1", ready=T0 + 2),
+        None,
+    )
+    tracker.handle("sandboxes", "ADDED", _sandbox("cold-1", T0 + 5), None)
+    tracker.handle(
+        "claims",
+        "ADDED",
+        _claim("c2", T0 + 4, template="large", sandbox="cold-1", ready=T0 + 34),
+        None,
+    )
+
+    snapshot = tracker.snapshot()
+    assert snapshot["by_template"]["small"]["warm"]["p99"] == 1000.0
+    assert snapshot["by_template"]["large"]["cold"]["p99"] == 30000.0
+    assert snapshot["by_path"]["warm"]["count"] == 1
+    assert tracker.snapshot(template="large")["overall"]["count"] == 1
+
+
+def test_claims_ready_before_tracking_started_are_skipped():
+    tracker = LatencyTracker(clock=lambda: T0)
+    tracker.handle("claims", "ADDED", _claim("old", T0 - 600, ready=T0 - 590), None)
+    tracker.handle("claims", "MODIFIED", _claim("old", T0 - 600, ready=T0 - 590), None)
+
+    snapshot = tracker.snapshot()
+    assert snapshot["overall"] == {"count": 0}
+    assert snapshot["skipped_preexisting"] == 1
+
+
+def test_latency_endpoint_reports_disabled_without_informers():
+    result = asyncio.run(main.claim_latency(template=None, _={}))
+
+    assert result["enabled"] is False
+    assert result["metric"] == "t_claim_ready_ms"
+    assert result["overall"] == {"count": 0}
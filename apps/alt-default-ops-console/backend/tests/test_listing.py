@@ -0,0 +1,166 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.listing import decode_continue, parse_field_selector, select_overview
+
+
+def _payload() -> dict:
+    claims = [
+        {
+            "name": f"claim-{i}",
+            "template": "tpl-a" if i % 2 else "tpl-b",
+            "phase": "Ready",
+            "owner": {"user_id": f"u{i}", "known": i < 3},
+            "conditions": [{"type": "Ready"}],
+        }
+        for i in range(5)
+    ]
+    return {
+        "cluster_mode": "mock",
+        "namespace": "alt-default",
+        "ops_integration": {},
+        "pods": [{"name": "pod-a", "phase": "Running"}],
+        "sandboxclaims": [claim["name"] for claim in claims],
+        "sandboxclaims_detailed": claims,
+        "cost_estimate": {"total_hourly_usd": 1.0},
+    }
+
+
+def test_include_selects_sections_without_mutating_snapshot():
+    payload = _payload()
+    view = select_overview(
+        payload,
+        include=["cost"],
+        fields=[],
+        field_selector=[],
+        limit=None,
+        continue_token=None,
+    )
+    assert set(view) == {"cluster_mode", "namespace", "ops_integration", "cost_estimate"}
+    assert len(payload["sandboxclaims_detailed"]) == 5
+
+
+def test_pagination_fields_and_selector_walk_all_pages():
+    payload = _payload()
+    selector = parse_field_selector("template=tpl-a,owner.known!=false")
+    seen: list[dict] = []
+    token = None
+    while True:
+        view = select_overview(
+            payload,
+            include=["claims"],
+            fields=["name", "owner.user_id"],
+            field_selector=selector,
+            limit=1,
+            continue_token=token,
+        )
+        seen.extend(view["sandboxclaims_detailed"])
+        assert view["page"]["totals"] == {"claims": 1}
+        token = view["page"]["continue"]
+        if not token:
+            break
+    assert seen == [{"name": "claim-1", "owner": {"user_id": "u1"}}]
+
+    all_rows: list[str] = []
+    token = None
+    while True:
+        view = select_overview(
+            payload,
+            include=["claims"],
+            fields=["name"],
+            field_selector=[],
+            limit=2,
+            continue_token=token,
+        )
+        all_rows.extend(view["sandboxclaims"])
+        token = view["page"]["continue"]
+        if not token:
+            break
+    assert all_rows == [f"claim-{i}" for i in range(5)]
+
+
+def test_invalid_inputs_are_rejected():
+    with pytest.raises(HTTPException):
+        parse_field_selector("no-operator")
+    with pytest.raises(HTTPException):
+        decode_continue("!!!")
+
+
+def test_overview_endpoint_include_and_limit(authed_client, monkeypatch):
+    monkeypatch.setitem(main.mock_state, "claims", ["c-1", "c-2", "c-3"])
+    monkeypatch.setitem(main.mock_state, "sandboxes", [])
+    main.overview_changes.notify()
+
+    first = authed_client.get(
+        "/api/overview", params={"include": "claims", "limit": 2, "fields": "name"}
+    ).json()
+    assert first["sandboxclaims_detailed"] == [{"name": "c-1"}, {"name": "c-2"}]
+    assert "pods" not in first
+    second = authed_client.get(
+        "/api/overview",
+        params={"include": "claims", "limit": 2, "continue": first["page"]["continue"]},
+    ).json()
+    assert second["sandboxclaims"] == ["c-3"]
+    assert second["page"]["continue"] is None
+
+    assert authed_client.get("/api/overview", params={"include": "bogus"}).status_code == 400
+
+
+def _json(endpoint_call):
+    return json.loads(asyncio.run(endpoint_call).body)
+
+
+def test_list_sandboxes_passes_k8s_pagination(monkeypatch):
+    calls: list[dict] = []
+
+    def list_namespaced_custom_object(**kwargs):
+        calls.append(kwargs)
+        token = "next-page" if "_continue" not in kwargs else ""
+        return {
+            "items": [{"metadata": {"name": kwargs["plural"]}, "spec": {"x": 1}}],
+            "metadata": {"continue": token},
+        }
+
+    monkeypatch.setattr(main, "use_mock_cluster", False)
+    monkeypatch.setattr(
+        main,
+        "custom_api",
+        SimpleNamespace(list_namespaced_custom_object=list_namespaced_custom_object),
+    )
+
+    first = _json(
+        main.list_sandboxes(
+            {},
+            include="claims",
+            limit=10,
+            continue_token=None,
+            label_selector="app=sandbox",
+            field_selector=None,
+            fields="metadata.name",
+        )
+    )
+    assert first["claims"] == [{"metadata": {"name": "sandboxclaims"}}]
+    assert "sandboxes" not in first
+    assert calls[0]["limit"] == 10
+    assert calls[0]["label_selector"] == "app=sandbox"
+
+    second = _json(
+        main.list_sandboxes(
+            {},
+            include=None,
+            limit=10,
+            continue_token=first["continue"],
+            label_selector=None,
+            field_selector=None,
+            fields=None,
+        )
+    )
+    assert calls[1]["_continue"] == "next-page"
+    assert calls[1]["plural"] == "sandboxclaims"
+    assert len(calls) == 2
+    assert second["continue"] is None
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from kubernetes.client import ApiException
+
+from app import main
+from app.metrics import MetricsRegistry
+
+
+def test_registry_renders_counters_histograms_and_collectors():
+    registry = MetricsRegistry(prefix="test_")
+    errors = registry.counter("errors", "Errors.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.add_collector(
+        lambda: [("hits", "counter", "Hits.", [({"cache": 'a"b'}, 3)])]
+    )
+
+    errors.inc(path="/x")
+    errors.inc(2, path="/x")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    text = registry.render()
+
+    assert "# TYPE test_errors_total counter" in text
+    assert 'test_errors_total{path="/x"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_count 3" in text
+    assert "test_latency_seconds_sum 5.55" in text
+    assert 'test_hits_total{cache="a\\"b"} 3' in text
+    with pytest.raises(ValueError):
+        errors.inc(route="/x")
+
+
+def test_metrics_endpoint_exposes_request_and_overview_metrics(authed_client):
+    assert authed_client.get("/api/overview").status_code == 200
+
+    response = authed_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'ops_console_http_request_duration_seconds_count{method="GET",'
+        'route="/api/overview",status="200"}' in text
+    )
+    assert 'overview_phase_duration_seconds_count{phase="serialize"}' in text
+    assert (
+        'ops_console_warm_pool_replicas{warm_pool="python-sandbox-warmpool",'
+        'template="python-runtime-template"} 2' in text
+    )
+    assert 'ops_console_cost_hourly_usd{component="total"}' in text
+    assert "ops_console_kube_executor_in_flight 0" in text
+    assert 'ops_console_token_cache_lookups_total{result="hit"}' in text
+
+
+def test_metrics_endpoint_requires_configured_bearer_token(
+    authed_client, monkeypatch
+):
+    monkeypatch.setattr(main.settings, "metrics_bearer_token", "scrape-secret")
+
+    assert authed_client.get("/metrics").status_code == 401
+    response = authed_client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    assert response.status_code == 200
+
+
+def test_kube_call_records_verb_resource_and_outcome():
+    def list_namespaced_custom_object(**_):
+        return {"items": []}
+
+    def read_namespaced_deployment(**_):
+        raise ApiException(status=404)
+
+    asyncio.run(main._kube_call(list_namespaced_custom_object, plural="sandboxclaims"))
+    with pytest.raises(ApiException):
+        asyncio.run(main._kube_call(read_namespaced_deployment, name="x"))
+
+    assert main.kube_api_seconds.count(
+        verb="list", resource="sandboxclaims", outcome="ok"
+    ) >= 1
+    assert main.kube_api_seconds.count(
+        verb="read", resource="deployment", outcome="404"
+    ) >= 1
+
+
+def test_token_verification_outcomes_are_timed(monkeypatch):
+    before = main.token_verify_seconds.count(outcome="rejected")
+
+    with pytest.raises(HTTPException):
+        asyncio.run(main._verify_token("not-a-jwt"))
+
+    assert main.token_verify_seconds.count(outcome="rejected") == before + 1
+
+
+def test_sra_requests_record_latency_and_errors():
+    main._record_sra_request("/api/admin/users", 0.02, "200")
+    main._record_sra_request("/api/admin/users", 1.5, "503")
+
+    assert main.sra_request_seconds.count(path="/api/admin/users", outcome="503") >= 1
+    assert main.sra_errors.value(path="/api/admin/users", reason="503") >= 1
+    assert main.sra_errors.value(path="/api/admin/users", reason="200") == 0
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from app import main
+from app.caching import StaleWhileRevalidateCache
+
+
+class _Request:
+    def __init__(self, token: str = "") -> None:
+        self.headers = {"authorization": f"Bearer {token}"} if token else {}
+        self.cookies: dict[str, str] = {}
+
+
+@pytest.fixture
+def counted_overview(monkeypatch):
+    monkeypatch.setattr(
+        main,
+        "overview_cache",
+        StaleWhileRevalidateCache(ttl_seconds=60, stale_seconds=0),
+    )
+    original = main._overview_data
+    calls: list[object] = []
+
+    async def counting(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return await original(request)
+
+    monkeypatch.setattr(main, "_overview_data", counting)
+    return calls
+
+
+def test_concurrent_overview_requests_share_one_build(counted_overview):
+    async def run() -> list[dict]:
+        request = _Request("alice")
+        return await asyncio.gather(
+            *(main._overview_snapshot(request) for _ in range(8)),
+            main.sandbox_warm_pool_profiles(request, {}),
+        )
+
+    results = asyncio.run(run())
+
+    assert len(counted_overview) == 1
+    assert results[0] is results[1]
+    profiles = json.loads(results[-1].body)["profiles"]
+    assert profiles == json.loads(json.dumps(results[0]["warm_pool_profiles"]))
+
+
+def test_overview_cache_is_partitioned_and_invalidated(counted_overview, monkeypatch):
+    monkeypatch.setitem(main.mock_state, "claims", [])
+    monkeypatch.setitem(main.mock_state, "sandboxes", [])
+
+    async def run() -> dict:
+        await main._overview_snapshot(_Request("alice"))
+        await main._overview_snapshot(_Request("bob"))
+        await main._overview_snapshot(_Request("alice"))
+        await main.create_sandbox_claim(
+            main.CreateClaimRequest(claim_name="claim-y"), {}
+        )
+        return await main._overview_snapshot(_Request("alice"))
+
+    latest = asyncio.run(run())
+
+    assert len(counted_overview) == 3
+    assert latest["sandboxclaims"] == ["claim-y"]
+
+
+def test_cancelled_leader_does_not_cancel_coalesced_followers():
+    cache = StaleWhileRevalidateCache(ttl_seconds=60, stale_seconds=0)
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "snapshot"
+
+    async def run():
+        leader = asyncio.create_task(cache.get("overview", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get("overview", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        value = await follower
+        return leader, value
+
+    leader, value = asyncio.run(run())
+
+    assert leader.cancelled()
+    assert value == "snapshot"
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 1
+    assert cache.stats()["inflight"] == 0
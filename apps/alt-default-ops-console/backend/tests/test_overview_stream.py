@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from app import main
+from app.caching import StaleWhileRevalidateCache
+from app.overview_stream import ChangeNotifier, apply_patch, json_diff, strip_volatile
+
+
+def _overview(pods: list[dict], claims: list[str]) -> dict:
+    return {
+        "namespace": "alt-default",
+        "pods": pods,
+        "sandboxclaims": claims,
+        "cost_estimate": {"total_hourly_usd": 0.5},
+    }
+
+
+def test_single_pod_change_produces_small_patch():
+    pods = [{"name": f"pod-{i:03d}", "phase": "Running"} for i in range(200)]
+    old = _overview(pods, ["a", "b", "c"])
+    changed = [dict(pod) for pod in pods]
+    changed[57]["phase"] = "Failed"
+    new = _overview(changed, ["a", "c", "d"])
+
+    ops = json_diff(old, new)
+
+    assert {"op": "replace", "path": "/pods/57/phase", "value": "Failed"} in ops
+    assert len(ops) == 3
+    assert apply_patch(old, ops) == new
+
+
+def test_inserts_removals_and_type_changes_round_trip():
+    old = {
+        "pods": [{"name": "a"}, {"name": "c"}, {"name": "e"}],
+        "gone": 1,
+        "conditions": [{"type": "Ready"}],
+        "value": 1,
+        "path/with~chars": True,
+    }
+    new = {
+        "pods": [{"name": "b"}, {"name": "c", "phase": "Running"}, {"name": "d"}],
+        "added": {"x": 1},
+        "conditions": [{"type": "Ready"}, {"type": "Ready"}],
+        "value": 1.0,
+        "path/with~chars": False,
+    }
+
+    assert apply_patch(old, json_diff(old, new)) == new
+
+
+def test_reordered_list_falls_back_to_replace():
+    ops = json_diff({"x": ["a", "b"]}, {"x": ["b", "a"]})
+    assert ops == [{"op": "replace", "path": "/x", "value": ["b", "a"]}]
+
+
+def test_strip_volatile_drops_ages():
+    payload = {"pods": [{"name": "a", "age_seconds": 3}], "age_seconds": 1}
+    assert strip_volatile(payload) == {"pods": [{"name": "a"}]}
+
+
+def test_notifier_wakes_waiters():
+    async def run() -> tuple[int, int]:
+        notifier = ChangeNotifier()
+        notifier.bind(asyncio.get_running_loop())
+        waiter = asyncio.ensure_future(notifier.wait(0, timeout=5))
+        await asyncio.sleep(0)
+        notifier.notify_threadsafe()
+        woke = await waiter
+        timed_out = await notifier.wait(woke, timeout=0.01)
+        return woke, timed_out
+
+    assert asyncio.run(run()) == (1, 1)
+
+
+class _StreamRequest:
+    headers: dict[str, str] = {}
+    cookies: dict[str, str] = {}
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def _parse_event(chunk: str) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_stream_sends_snapshot_then_patch(monkeypatch):
+    monkeypatch.setattr(main.settings, "overview_stream_debounce_seconds", 0)
+    monkeypatch.setattr(main.settings, "overview_stream_resync_seconds", 5)
+    monkeypatch.setitem(main.mock_state, "claims", [])
+    monkeypatch.setitem(main.mock_state, "sandboxes", [])
+    monkeypatch.setattr(
+        main, "overview_cache", StaleWhileRevalidateCache(ttl_seconds=60, stale_seconds=0)
+    )
+
+    async def run() -> list[tuple[str, dict]]:
+        main.overview_changes.bind(asyncio.get_running_loop())
+        response = await main.overview_stream(_StreamRequest())
+        iterator = response.body_iterator
+        first = _parse_event(await iterator.__anext__())
+        await main.create_sandbox_claim(
+            main.CreateClaimRequest(claim_name="claim-x"), {}
+        )
+        second = _parse_event(await iterator.__anext__())
+        await iterator.aclose()
+        return [first, second]
+
+    (first_event, snapshot), (second_event, patch) = asyncio.run(run())
+
+    assert first_event == "snapshot"
+    assert snapshot["sandboxclaims"] == []
+    assert "age_seconds" not in snapshot["pods"][0]
+    assert second_event == "patch"
+    assert {"op": "add", "path": "/sandboxclaims/0", "value": "claim-x"} in patch["ops"]
+    assert apply_patch(snapshot, patch["ops"])["sandboxclaims"] == ["claim-x"]
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from app.pricing import (
+    PricingTable,
+    load_catalog,
+    parse_cpu_cores,
+    parse_quantity_gib,
+    request_share,
+)
+
+
+@pytest.fixture(scope="module")
+def table() -> PricingTable:
+    return PricingTable(load_catalog())
+
+
+def test_parse_quantities():
+    assert parse_quantity_gib("5Gi") == 5.0
+    assert parse_quantity_gib("512Mi") == 0.5
+    assert parse_quantity_gib(str(2 * 1024**3)) == 2.0
+    assert parse_quantity_gib("1G") == pytest.approx(1e9 / 1024**3)
+    assert parse_quantity_gib("garbage") == 0.0
+    assert parse_quantity_gib(None) == 0.0
+    assert parse_cpu_cores("500m") == 0.5
+    assert parse_cpu_cores("2") == 2.0
+    assert parse_cpu_cores("") == 0.0
+
+
+def test_e2_prices_match_previous_constants(table):
+    standard = table.node_hourly("e2-standard-4", False)
+    assert standard == pytest.approx(4 * 0.02401338 + 16 * 0.00321816)
+    assert table.node_hourly("e2-medium", True) == pytest.approx(
+        2 * 0.0095 + 4 * 0.001272
+    )
+    rate = table.disk_hourly_per_gib("standard-rwo")
+    assert rate == pytest.approx(0.044 / 730)
+
+
+def test_machine_families_custom_shapes_and_regions(table):
+    assert table.machine_shape("n2-highmem-8") == ("n2", 8, 64.0)
+    assert table.machine_shape("n2-custom-4-10240") == ("n2", 4, 10.0)
+    assert table.machine_shape("mystery-9") is None
+    assert table.node_hourly("mystery-9", False) is None
+
+    us = table.node_hourly("n2-standard-2", False, region="us-central1")
+    eu = table.node_hourly("n2-standard-2", False, region="europe-west4")
+    assert us < eu
+    assert table.node_hourly("n2-standard-2", False, region="mars-1") == eu
+
+
+def test_gpu_nodes_add_accelerator_price(table):
+    base = table.node_hourly("g2-standard-8", False)
+    with_gpu = table.node_hourly(
+        "g2-standard-8", False, accelerator="nvidia-l4", gpu_count=1
+    )
+    assert with_gpu == pytest.approx(base + 0.616)
+    assert (
+        table.node_hourly("g2-standard-8", False, accelerator="unknown", gpu_count=1)
+        is None
+    )
+
+
+def test_storage_class_patterns(table):
+    assert table.disk_hourly_per_gib("premium-rwo") == pytest.approx(0.187 / 730)
+    assert table.disk_hourly_per_gib("my-ssd-class") == pytest.approx(0.187 / 730)
+    assert table.disk_hourly_per_gib("nfs") is None
+
+
+def test_cost_estimate_groups_by_price_key_and_node_pool(table):
+    nodes = [
+        {
+            "name": f"node-{i}",
+            "instance_type": "e2-standard-4",
+            "node_pool": "default-pool",
+        }
+        for i in range(3)
+    ] + [
+        {
+            "name": "spot-0",
+            "instance_type": "e2-standard-2",
+            "node_pool": "spot-pool",
+            "spot": True,
+        },
+        {"name": "odd-0", "instance_type": "weird-1", "node_pool": "spot-pool"},
+    ]
+    pvcs = [
+        {
+            "name": "data",
+            "namespace": "alt-default",
+            "storage_class": "standard",
+            "requested_gib": 10.0,
+        }
+    ]
+    estimate = table.cost_estimate(nodes, pvcs)
+
+    each = table.node_hourly("e2-standard-4", False)
+    spot = table.node_hourly("e2-standard-2", True)
+    assert estimate["catalog_version"] == "2026-10-01"
+    assert estimate["node_hourly_total_usd"] == pytest.approx(3 * each + spot)
+    breakdown = {
+        (row["instance_type"], row["spot"]): row for row in estimate["node_breakdown"]
+    }
+    assert breakdown[("e2-standard-4", False)]["count"] == 3
+    assert breakdown[("weird-1", False)]["hourly_each_usd"] is None
+
+    pools = {row["node_pool"]: row for row in estimate["by_node_pool"]}
+    assert pools["default-pool"]["hourly_usd"] == pytest.approx(3 * each)
+    assert pools["spot-pool"]["spot_nodes"] == 1
+    assert pools["spot-pool"]["unpriced_nodes"] == 1
+
+    assert "by_namespace" not in estimate
+    assert request_share(2.0, 4.0, 4.0, 16.0) == pytest.approx(0.375)
+    assert estimate["total_hourly_usd"] == pytest.approx(
+        estimate["node_hourly_total_usd"] + estimate["pvc_hourly_total_usd"] + 0.10
+    )
+
+
+def test_load_catalog_yaml_and_validation(tmp_path):
+    catalog = load_catalog()
+    catalog["version"] = "custom"
+    path = tmp_path / "catalog.yaml"
+    yaml = pytest.importorskip("yaml")
+    path.write_text(yaml.safe_dump(catalog))
+    assert PricingTable(load_catalog(path)).version == "custom"
+
+    empty = tmp_path / "empty.json"
+    empty.write_text(json.dumps({"version": "x"}))
+    with pytest.raises(ValueError):
+        load_catalog(empty)
@@ -0,0 +1,63 @@
+import gzip
+import json
+
+import pytest
+
+from app import responses
+from app.responses import FastJSONResponse, negotiate_encoding
+
+
+def test_negotiate_encoding_prefers_highest_quality_then_brotli(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", object())
+
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.9") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("*, br;q=0") == "gzip"
+
+    monkeypatch.setattr(responses, "brotli", None)
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("br, gzip") == "gzip"
+
+
+def test_fast_json_response_matches_stdlib_json():
+    payload = {"rows": [{"name": "a", "ready": True, "age": 1.5}], "tags": {"x"}}
+
+    body = FastJSONResponse(payload).body
+
+    assert json.loads(body) == {**payload, "tags": ["x"]}
+
+
+def test_overview_is_compressed_per_request(authed_client):
+    plain = authed_client.get("/api/overview", headers={"Accept-Encoding": "identity"})
+    zipped = authed_client.get("/api/overview", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["vary"]
+    assert zipped.json()["cluster_mode"] == plain.json()["cluster_mode"]
+
+
+def test_brotli_is_used_when_available(authed_client):
+    pytest.importorskip("brotli")
+
+    response = authed_client.get("/api/overview", headers={"Accept-Encoding": "br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["namespace"]
+
+
+def test_small_responses_are_not_compressed(authed_client):
+    response = authed_client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json()["status"] == "ok"
+
+
+def test_gzip_payload_round_trips():
+    body = b'{"x":' + b"1" * 4096 + b"}"
+
+    assert gzip.decompress(responses.compress(body, "gzip")) == body
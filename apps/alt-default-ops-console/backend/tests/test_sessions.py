@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.oauth import OAuthClient
+from app.sessions import SessionStore, SqliteSessionBackend, session_key
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sessions_expire_at_ttl_or_token_exp_and_can_be_revoked():
+    clock = _Clock(1_000.0)
+    store = SessionStore(ttl_seconds=300, clock=clock)
+    short = store.create({"email": "a@example.com", "exp": 1_060})
+    long = store.create({"email": "b@example.com", "exp": 9_999})
+
+    assert store.get(short)["email"] == "a@example.com"
+    clock.now = 1_061
+    assert store.get(short) is None
+    assert store.get(long)["email"] == "b@example.com"
+    store.revoke(long)
+    assert store.get(long) is None
+    assert store.get("forged") is None
+
+
+def test_lru_is_bounded_and_sqlite_backend_survives_restart(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    clock = _Clock(1_000.0)
+    store = SessionStore(
+        max_entries=1, backend=SqliteSessionBackend(path), clock=clock
+    )
+    first = store.create({"email": "a@example.com"})
+    second = store.create({"email": "b@example.com"})
+
+    assert store.stats()["entries"] == 1
+    assert store.get(first)["email"] == "a@example.com"
+    assert store.stats()["backend_hits"] == 1
+    store.close()
+
+    backend = SqliteSessionBackend(path)
+    restarted = SessionStore(backend=backend, clock=clock)
+    assert restarted.get(second)["email"] == "b@example.com"
+    # Only hashed ids are stored, so the cookie value itself is not in the DB.
+    assert backend.get(session_key(second)) is not None
+    assert backend.get(second) is None
+    backend.close()
+
+
+def test_session_cookie_skips_token_verification(monkeypatch):
+    store = SessionStore()
+    session_id = store.create({"email": "ops@example.com"})
+    monkeypatch.setattr(main, "session_store", store)
+
+    async def refuse(*_args, **_kwargs):
+        raise AssertionError("token should not be verified")
+
+    monkeypatch.setattr(main, "_verify_token_uncached", refuse)
+
+    claims = asyncio.run(main.require_auth(None, None, "id-token", None, session_id))
+
+    assert claims["email"] == "ops@example.com"
+    with pytest.raises(HTTPException):
+        asyncio.run(main.require_auth(None, None, None, None, "unknown"))
+
+
+def test_session_claims_still_honour_the_allowlist(monkeypatch):
+    store = SessionStore()
+    session_id = store.create({"email": "former@example.com"})
+    monkeypatch.setattr(main, "session_store", store)
+    monkeypatch.setattr(main.settings, "jwt_email_allowlist", {"ops@example.com"})
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(main.require_auth(None, None, None, None, session_id))
+
+    assert exc.value.status_code == 403
+
+
+def test_callback_reuses_the_pooled_client_and_sets_a_session(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id_token": "id", "access_token": "at"})
+
+    oauth = OAuthClient(transport=httpx.MockTransport(handler), http2=False)
+    store = SessionStore()
+
+    async def verified(token, access_token=None):
+        return {"email": "ops@example.com", "token": token}
+
+    monkeypatch.setattr(main, "oauth_client", oauth)
+    monkeypatch.setattr(main, "session_store", store)
+    monkeypatch.setattr(main, "_verify_token", verified)
+
+    async def run():
+        responses = [
+            await main.auth2_callback(code="c", state="s", ops_oauth_state="s")
+            for _ in range(3)
+        ]
+        await oauth.aclose()
+        return responses
+
+    responses = asyncio.run(run())
+
+    assert len(requests) == 3
+    assert oauth.stats()["clients_created"] == 1
+    cookies = responses[-1].headers.getlist("set-cookie")
+    session_cookie = next(c for c in cookies if c.startswith("ops_session="))
+    session_id = session_cookie.split(";", 1)[0].split("=", 1)[1]
+    assert store.get(session_id)["email"] == "ops@example.com"
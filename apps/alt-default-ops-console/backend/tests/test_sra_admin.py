@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.caching import StaleWhileRevalidateCache
+from app.sra_admin import SraAdminClient, identity_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = StaleWhileRevalidateCache(ttl_seconds=5, stale_seconds=30)
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "payload"
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(cache.get("k", fetch) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["payload"] * 10
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 9
+
+
+def test_stale_entry_is_served_while_refreshing():
+    clock = FakeClock()
+    cache = StaleWhileRevalidateCache(ttl_seconds=5, stale_seconds=30, clock=clock)
+    values = iter(["v1", "v2"])
+
+    async def fetch() -> str:
+        return next(values)
+
+    async def run() -> tuple[str, str, str]:
+        first = await cache.get("k", fetch)
+        clock.now += 10
+        stale = await cache.get("k", fetch)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refreshed = await cache.get("k", fetch)
+        return first, stale, refreshed
+
+    assert asyncio.run(run()) == ("v1", "v1", "v2")
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_expired_entries_and_failures_are_refetched():
+    clock = FakeClock()
+    cache = StaleWhileRevalidateCache(ttl_seconds=5, stale_seconds=1, clock=clock)
+    attempts = 0
+
+    async def flaky() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    async def run() -> str:
+        with pytest.raises(RuntimeError):
+            await cache.get("k", flaky)
+        return await cache.get("k", flaky)
+
+    assert asyncio.run(run()) == "ok"
+    clock.now += 100
+    assert asyncio.run(cache.get("k", flaky)) == "ok"
+    assert attempts == 3
+
+
+def test_client_caches_per_caller_identity():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("authorization", ""))
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def run() -> None:
+        sra = SraAdminClient(
+            timeout_seconds=2,
+            cache_ttl_seconds=60,
+            cache_stale_seconds=0,
+            http2=False,
+            transport=httpx.MockTransport(handler),
+        )
+        alice = {"Authorization": "Bearer alice"}
+        bob = {"Authorization": "Bearer bob"}
+        url = "http://sra/api/admin/ops/sandbox-index"
+        await asyncio.gather(
+            *(sra.get_json_cached(url, headers=alice, params={"limit": 5}) for _ in range(5))
+        )
+        await sra.get_json_cached(url, headers=bob, params={"limit": 5})
+        await sra.get_json_cached(url, headers=alice, params={"limit": 6})
+        await sra.aclose()
+
+    asyncio.run(run())
+    assert seen == ["Bearer alice", "Bearer bob", "Bearer alice"]
+    assert identity_key({}) == "anonymous"
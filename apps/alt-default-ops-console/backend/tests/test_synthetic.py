@@ -0,0 +1,59 @@
+import asyncio
+
+from app import main
+from app.latency import LatencyTracker
+from app.pricing import parse_cpu_cores
+from app.synthetic import ChurnSimulator, SyntheticCluster, SyntheticClusterSpec
+
+
+def test_generated_cluster_matches_spec_and_fits_nodes():
+    cluster = SyntheticCluster(SyntheticClusterSpec.for_claims(300))
+    counts = cluster.status()["counts"]
+    assert counts["claims"] == 300
+    assert counts["warm_pools"] == counts["templates"] == 4
+    assert counts["sandboxes"] == 300 + 4 * 2
+    assert counts["pods"] == counts["sandboxes"] + 3
+
+    requested: dict[str, float] = {}
+    for pod in cluster.items("pods"):
+        cpu = pod.spec.containers[0].resources.requests["cpu"]
+        node = pod.spec.node_name
+        requested[node] = requested.get(node, 0.0) + parse_cpu_cores(cpu)
+    for node in cluster.items("nodes"):
+        allocatable = parse_cpu_cores(node.status.allocatable["cpu"])
+        assert requested.get(node.metadata.name, 0.0) <= allocatable
+
+
+def test_churn_emits_watch_style_events_that_keep_objects_consistent():
+    cluster = SyntheticCluster(SyntheticClusterSpec.for_claims(50, seed=3))
+    events: list[tuple[str, str]] = []
+    tracker = LatencyTracker()
+    cluster.add_handler(
+        lambda kind, event_type, _obj, _old: events.append((kind, event_type))
+    )
+    cluster.add_handler(tracker.handle)
+
+    counts = ChurnSimulator(cluster, seed=5).run(300)
+
+    assert sum(counts.values()) == 300
+    assert ("claims", "ADDED") in events and ("claims", "DELETED") in events
+    assert cluster.events == len(events)
+    sandboxes = {cluster.name_of(s) for s in cluster.items("sandboxes")}
+    pods = {cluster.name_of(p) for p in cluster.items("pods")}
+    assert sandboxes <= pods
+    for claim in cluster.items("claims"):
+        bound = ((claim.get("status") or {}).get("sandbox") or {}).get("name")
+        assert not bound or bound in sandboxes
+    assert tracker.snapshot()["overall"]["count"] == counts["create_claim"]
+
+
+def test_synthetic_cluster_drives_live_overview_path(monkeypatch):
+    cluster = SyntheticCluster(SyntheticClusterSpec.for_claims(40))
+    monkeypatch.setattr(main, "synthetic_cluster", cluster)
+
+    payload = asyncio.run(main._overview_data(None))
+
+    assert payload["cluster_mode"] == "synthetic"
+    assert len(payload["sandboxclaims_detailed"]) == 40
+    assert payload["cost_estimate"]["node_hourly_total_usd"] > 0
+    assert len(payload["warm_pool_profiles"]) == 4
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app import main
+from app.token_cache import VerifiedTokenCache, token_cache_key
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public = jwk.construct(
+        key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode(),
+        "RS256",
+    ).to_dict()
+    return pem, {**public, "kid": "k1", "alg": "RS256"}
+
+
+@pytest.fixture
+def token_env(monkeypatch, signing_key):
+    pem, public = signing_key
+
+    async def get_keys(_url, force_refresh=False):
+        return {"k1": public}
+
+    decodes: list[str] = []
+    original_decode = main.jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        decodes.append(token)
+        return original_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(main.jwks_cache, "get_keys", get_keys)
+    monkeypatch.setattr(main.jwt, "decode", counting_decode)
+    monkeypatch.setattr(main, "verified_tokens", VerifiedTokenCache())
+
+    def issue(**claims):
+        payload = {
+            "iss": "https://accounts.google.com",
+            "email": "ops@example.com",
+            "exp": int(time.time()) + 600,
+            **claims,
+        }
+        return jwt.encode(payload, pem, algorithm="RS256", headers={"kid": "k1"})
+
+    return issue, decodes
+
+
+def test_repeated_verification_hits_the_cache(token_env):
+    issue, decodes = token_env
+    token = issue()
+
+    async def run():
+        return [await main._verify_token(token) for _ in range(20)]
+
+    results = asyncio.run(run())
+
+    assert len(decodes) == 1
+    assert all(r["email"] == "ops@example.com" for r in results)
+    stats = main.verified_tokens.stats()
+    assert stats["hits"] == 19
+    assert stats["misses"] == 1
+
+
+def test_cached_claims_are_copies(token_env):
+    issue, _ = token_env
+    token = issue()
+    first = asyncio.run(main._verify_token(token))
+    first["email"] = "tampered@example.com"
+
+    assert asyncio.run(main._verify_token(token))["email"] == "ops@example.com"
+
+
+def test_failed_verification_is_not_cached(token_env):
+    issue, decodes = token_env
+    token = issue(iss="https://evil.example.com")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            asyncio.run(main._verify_token(token))
+
+    assert main.verified_tokens.stats()["entries"] == 0
+
+
+def test_entries_expire_at_token_exp_capped_by_max_ttl():
+    clock = _Clock(1_000.0)
+    cache = VerifiedTokenCache(max_ttl_seconds=300, clock=clock)
+    cache.put("short", {"exp": 1_060})
+    cache.put("long", {"exp": 9_999})
+    cache.put("expired", {"exp": 999})
+
+    clock.now = 1_061
+    assert cache.get("short") is None
+    assert cache.get("long") is not None
+    assert cache.get("expired") is None
+    clock.now = 1_301
+    assert cache.get("long") is None
+    assert cache.stats()["expired"] == 2
+
+
+def test_lru_eviction_and_key_includes_access_token():
+    cache = VerifiedTokenCache(max_entries=2, clock=lambda: 0.0)
+    cache.put("a", {"exp": 100})
+    cache.put("b", {"exp": 100})
+    cache.get("a")
+    cache.put("c", {"exp": 100})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert token_cache_key("t") != token_cache_key("t", "access")
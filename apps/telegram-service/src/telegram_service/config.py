@@ -27,7 +27,25 @@ class Settings(BaseSettings):
 
     secret_backend: str = "env"
     gateway_secret_master_key: str = ""
+    secret_cache_ttl_seconds: float = 300.0
+    secret_cache_max_entries: int = 256
+    context_cache_ttl_seconds: float = 30.0
+    context_cache_max_entries: int = 4096
     telegram_api_base: str = "https://api.telegram.org"
+    telegram_timeout_seconds: float = 20.0
+    telegram_http2: bool = True
+    telegram_max_connections: int = 50
+    telegram_global_rate_per_second: float = 30.0
+    telegram_chat_rate_per_second: float = 1.0
+    telegram_send_max_wait_seconds: float = 60.0
+
+    mtproto_idle_seconds: float = 600.0
+    mtproto_max_clients: int = 50
+
+    update_ingestion_enabled: bool = True
+    update_poll_timeout_seconds: int = 25
+    update_ingester_refresh_seconds: float = 30.0
+    inbox_retention_seconds: float = 604800.0
 
     webhook_shared_secret: str = ""
 
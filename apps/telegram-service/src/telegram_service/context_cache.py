@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+# Immutable copies of the context and connection fields a runtime send or
+# receive needs, cached per (principal subject, context_id) by ``deps``.
+
+
+@dataclass(frozen=True)
+class ContextSnapshot:
+    id: int
+    mode: Any
+    chat_id: str
+
+
+@dataclass(frozen=True)
+class ConnectionSnapshot:
+    id: int
+    type: Any
+    secret_ref_token: str | None
+    secret_ref_session: str | None
@@ -1,16 +1,44 @@
 import hashlib
 
 from fastapi import Depends, Header, HTTPException, Request, status
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from telegram_service.auth import decode_admin_session
 from telegram_service.config import get_settings
 from telegram_service.database import get_db
 from telegram_service.dex import get_dex_verifier
-from telegram_service.models import User
+from telegram_service.models import MessagingContext, TelegramConnection, User
 from telegram_service.schemas import RuntimePrincipal
+from telegram_service.ttl_cache import TtlCache
 
 settings = get_settings()
+# Authorized runtime contexts by (principal subject, context_id); cleared as a
+# whole on any context, connection or user change.
+resolved_context_cache = TtlCache(
+    ttl_seconds=settings.context_cache_ttl_seconds,
+    max_entries=settings.context_cache_max_entries,
+)
+_CACHED_MODELS = (MessagingContext, TelegramConnection, User)
+_CHANGED_KEY = "runtime_contexts_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_contexts(session: Session, _flush_context) -> None:
+    # Any admin, self-service or onboarding change to a context, connection or
+    # user drops the cache now and again on commit, so a lookup that read the
+    # old rows before the commit is not kept.
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _CACHED_MODELS) for obj in changed):
+        resolved_context_cache.clear()
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_committed_contexts(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        resolved_context_cache.clear()
 
 
 def get_current_admin(request: Request, db: Session = Depends(get_db)) -> User:
@@ -56,11 +84,8 @@ def _runtime_username(subject: str) -> str:
     return f"dex-{digest}"
 
 
-def get_current_runtime_user(
-    principal: RuntimePrincipal = Depends(get_runtime_principal),
-    db: Session = Depends(get_db),
-) -> User:
-    username = _runtime_username(principal.subject)
+def get_or_create_runtime_user(db: Session, subject: str) -> User:
+    username = _runtime_username(subject)
     user = db.query(User).filter(User.username == username).first()
     if not user:
         user = User(
@@ -78,3 +103,10 @@ def get_current_runtime_user(
             status_code=status.HTTP_403_FORBIDDEN, detail="Runtime user is inactive"
         )
     return user
+
+
+def get_current_runtime_user(
+    principal: RuntimePrincipal = Depends(get_runtime_principal),
+    db: Session = Depends(get_db),
+) -> User:
+    return get_or_create_runtime_user(db, principal.subject)
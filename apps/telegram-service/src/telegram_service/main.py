@@ -5,11 +5,14 @@ from telegram_service.auth import hash_password
 from telegram_service.config import get_settings
 from telegram_service.database import Base, SessionLocal, engine
 from telegram_service.models import User
+from telegram_service.mtproto import user_client_pool
 from telegram_service.routers.admin_api import router as admin_api_router
 from telegram_service.routers.admin_ui import router as admin_ui_router
 from telegram_service.routers.config_api import router as config_api_router
 from telegram_service.routers.runtime_gateway import router as runtime_router
 from telegram_service.routers.self_service_api import router as self_service_router
+from telegram_service.telegram_client import bot_api
+from telegram_service.update_ingester import update_ingester
 
 settings = get_settings()
 
@@ -41,6 +44,20 @@ def on_startup() -> None:
         db.close()
 
 
+@app.on_event("startup")
+async def start_client_pools() -> None:
+    user_client_pool.start()
+    if settings.update_ingestion_enabled:
+        update_ingester.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await update_ingester.aclose()
+    await user_client_pool.aclose()
+    await bot_api.aclose()
+
+
 @app.get("/")
 def root() -> RedirectResponse:
     return RedirectResponse(url="/admin")
@@ -3,10 +3,12 @@ import hashlib
 
 from cryptography.fernet import Fernet
 from fastapi import HTTPException
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from telegram_service.config import get_settings
 from telegram_service.models import ManagedSecret
+from telegram_service.ttl_cache import TtlCache
 
 settings = get_settings()
 
@@ -21,6 +23,26 @@ def _build_fernet() -> Fernet:
 
 
 fernet = _build_fernet()
+# Decrypted values by secret name; ``_invalidate`` bumps the name's generation.
+secret_cache = TtlCache(
+    ttl_seconds=settings.secret_cache_ttl_seconds,
+    max_entries=settings.secret_cache_max_entries,
+)
+_CHANGED_KEY = "managed_secrets_changed"
+
+
+def _invalidate(db: Session, name: str) -> None:
+    # Invalidate now for this process, and again on commit so a value read by
+    # another request before the commit is not cached as current.
+    secret_cache.invalidate(name)
+    db.info.setdefault(_CHANGED_KEY, set()).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_changed(session: Session) -> None:
+    for name in session.info.pop(_CHANGED_KEY, ()):
+        secret_cache.invalidate(name)
 
 
 def normalize_secret_ref(secret_ref: str | None) -> str | None:
@@ -51,6 +73,7 @@ def create_or_update_managed_secret(
         existing.is_active = True
         db.add(existing)
         db.flush()
+        _invalidate(db, name)
         return existing
 
     record = ManagedSecret(
@@ -63,6 +86,7 @@ def create_or_update_managed_secret(
     )
     db.add(record)
     db.flush()
+    _invalidate(db, name)
     return record
 
 
@@ -73,10 +97,14 @@ def deactivate_managed_secret(db: Session, name: str) -> ManagedSecret:
     record.is_active = False
     db.add(record)
     db.flush()
+    _invalidate(db, name)
     return record
 
 
 def resolve_managed_secret(db: Session, name: str) -> str:
+    version, value = secret_cache.get(name)
+    if value is not None:
+        return value
     record = (
         db.query(ManagedSecret)
         .filter(ManagedSecret.name == name, ManagedSecret.is_active == True)
@@ -84,4 +112,6 @@ def resolve_managed_secret(db: Session, name: str) -> str:
     )  # noqa: E712
     if not record:
         raise RuntimeError(f"Managed secret '{name}' not found or inactive")
-    return fernet.decrypt(record.encrypted_value.encode("utf-8")).decode("utf-8")
+    value = fernet.decrypt(record.encrypted_value.encode("utf-8")).decode("utf-8")
+    secret_cache.put(name, version, value)
+    return value
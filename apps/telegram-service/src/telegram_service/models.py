@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     Enum as SqlEnum,
@@ -163,3 +164,29 @@ class OnboardingLink(Base):
 
     connection: Mapped[TelegramConnection] = relationship()
     context: Mapped[MessagingContext | None] = relationship()
+
+
+class InboxUpdate(Base):
+    """A Telegram update delivered to one messaging context.
+
+    Filled by the background ingester (or the webhook) and read by
+    ``/gateway/contexts/{id}/updates`` with ``update_id`` as the cursor.
+    """
+
+    __tablename__ = "inbox_updates"
+    __table_args__ = (
+        UniqueConstraint("context_id", "update_id", name="uq_inbox_context_update"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    context_id: Mapped[int] = mapped_column(
+        ForeignKey("messaging_contexts.id", ondelete="CASCADE")
+    )
+    connection_id: Mapped[int] = mapped_column(
+        ForeignKey("telegram_connections.id"), index=True
+    )
+    update_id: Mapped[int] = mapped_column(BigInteger)
+    payload: Mapped[str] = mapped_column(Text)
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
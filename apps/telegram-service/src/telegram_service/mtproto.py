@@ -1,9 +1,15 @@
+import hashlib
 import os
 from typing import Any
 
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 
+from telegram_service.config import get_settings
+from telegram_service.mtproto_pool import MtprotoClientPool
+
+settings = get_settings()
+
 
 def build_client(session_string: str | None = None) -> TelegramClient:
     api_id_raw = os.getenv("TELEGRAM_API_ID", "")
@@ -18,6 +24,17 @@ def build_client(session_string: str | None = None) -> TelegramClient:
     return TelegramClient(string_session, api_id=api_id, api_hash=api_hash)
 
 
+user_client_pool = MtprotoClientPool(
+    build_client,
+    idle_seconds=settings.mtproto_idle_seconds,
+    max_clients=settings.mtproto_max_clients,
+)
+
+
+def _pool_key(session_string: str, key: str | None) -> str:
+    return key or hashlib.sha256(session_string.encode("utf-8")).hexdigest()
+
+
 def _parse_chat_target(chat_id: str) -> int | str:
     raw = chat_id.strip()
     if not raw:
@@ -28,21 +45,22 @@ def _parse_chat_target(chat_id: str) -> int | str:
 
 
 async def send_user_message(
-    session_string: str, chat_id: str, text: str
+    session_string: str, chat_id: str, text: str, key: str | None = None
 ) -> dict[str, Any]:
-    client = build_client(session_string=session_string)
-    await client.connect()
-    try:
-        target = _parse_chat_target(chat_id)
-        message = await client.send_message(entity=target, message=text)
-        return {
-            "id": message.id,
-            "text": message.message,
-            "date": message.date.isoformat() if message.date else None,
-            "peer_id": str(message.peer_id),
-        }
-    finally:
-        await client.disconnect()
+    target = _parse_chat_target(chat_id)
+
+    async def send(client: TelegramClient) -> Any:
+        return await client.send_message(entity=target, message=text)
+
+    message = await user_client_pool.run(
+        _pool_key(session_string, key), session_string, send
+    )
+    return {
+        "id": message.id,
+        "text": message.message,
+        "date": message.date.isoformat() if message.date else None,
+        "peer_id": str(message.peer_id),
+    }
 
 
 async def get_user_messages(
@@ -50,23 +68,28 @@ async def get_user_messages(
     chat_id: str,
     limit: int = 20,
     min_id: int | None = None,
+    key: str | None = None,
 ) -> dict[str, Any]:
-    client = build_client(session_string=session_string)
-    await client.connect()
-    try:
-        target = _parse_chat_target(chat_id)
-        messages = await client.get_messages(
+    target = _parse_chat_target(chat_id)
+
+    async def fetch(client: TelegramClient) -> Any:
+        return await client.get_messages(
             entity=target, limit=limit, min_id=min_id or 0
         )
-        items = [
-            {
-                "id": item.id,
-                "text": item.message,
-                "date": item.date.isoformat() if item.date else None,
-                "from_id": str(item.from_id),
-            }
-            for item in messages
-        ]
-        return {"count": len(items), "messages": items}
-    finally:
-        await client.disconnect()
+
+    messages = await user_client_pool.run(
+        _pool_key(session_string, key),
+        session_string,
+        fetch,
+        retry_on_disconnect=True,
+    )
+    items = [
+        {
+            "id": item.id,
+            "text": item.message,
+            "date": item.date.isoformat() if item.date else None,
+            "from_id": str(item.from_id),
+        }
+        for item in messages
+    ]
+    return {"count": len(items), "messages": items}
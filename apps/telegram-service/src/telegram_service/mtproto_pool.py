@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    session_hash: str
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = 0.0
+    connects: int = 0
+    in_use: int = 0
+
+
+class MtprotoClientPool:
+    """Long-lived MTProto clients keyed by their session secret reference.
+
+    A client is connected on first use and kept open, so later operations skip
+    the MTProto handshake. Operations on one client are serialized by a
+    per-client lock. Clients idle for ``idle_seconds`` (or the least recently
+    used ones beyond ``max_clients``) are disconnected. A rotated session
+    string replaces the pooled client for that key.
+
+    ``factory`` builds an unconnected client from a session string; it must
+    provide ``connect()``, ``disconnect()`` and ``is_connected()`` like
+    Telethon's ``TelegramClient``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        *,
+        idle_seconds: float = 600.0,
+        max_clients: int = 50,
+        connect_attempts: int = 3,
+        backoff_seconds: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.factory = factory
+        self.idle_seconds = float(idle_seconds)
+        self.max_clients = max(int(max_clients), 1)
+        self.connect_attempts = max(int(connect_attempts), 1)
+        self.backoff_seconds = float(backoff_seconds)
+        self._clock = clock
+        self._clients: OrderedDict[str, _PooledClient] = OrderedDict()
+        self._janitor: asyncio.Task[None] | None = None
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "connects": 0,
+            "connect_failures": 0,
+            "reconnects": 0,
+            "evicted_idle": 0,
+            "evicted_capacity": 0,
+            "replaced": 0,
+            "janitor_errors": 0,
+        }
+
+    def _checkout(
+        self, key: str, session_string: str
+    ) -> tuple[_PooledClient, _PooledClient | None]:
+        session_hash = hashlib.sha256(session_string.encode("utf-8")).hexdigest()
+        entry = self._clients.get(key)
+        stale = None
+        if entry is not None and entry.session_hash != session_hash:
+            self._counters["replaced"] += 1
+            stale = self._clients.pop(key)
+            entry = None
+        if entry is None:
+            entry = _PooledClient(
+                client=self.factory(session_string), session_hash=session_hash
+            )
+            self._clients[key] = entry
+            self._counters["created"] += 1
+        else:
+            self._counters["reused"] += 1
+        self._clients.move_to_end(key)
+        entry.last_used = self._clock()
+        entry.in_use += 1
+        return entry, stale
+
+    async def _connect(self, entry: _PooledClient) -> None:
+        if entry.client.is_connected():
+            return
+        if entry.connects:
+            self._counters["reconnects"] += 1
+        for attempt in range(self.connect_attempts):
+            try:
+                await entry.client.connect()
+                entry.connects += 1
+                self._counters["connects"] += 1
+                return
+            except (ConnectionError, OSError, asyncio.TimeoutError):
+                self._counters["connect_failures"] += 1
+                if attempt + 1 == self.connect_attempts:
+                    raise
+                await asyncio.sleep(self.backoff_seconds * 2**attempt)
+
+    async def run(
+        self,
+        key: str,
+        session_string: str,
+        operation: Callable[[Any], Awaitable[Any]],
+        *,
+        retry_on_disconnect: bool = False,
+    ) -> Any:
+        """Run ``operation(client)`` on the pooled, connected client for ``key``.
+
+        With ``retry_on_disconnect`` a ``ConnectionError`` raised by the
+        operation reconnects and runs it once more; leave it off for
+        non-idempotent calls such as sending a message.
+        """
+        entry, stale = self._checkout(key, session_string)
+        try:
+            if stale is not None:
+                # Let an operation still using the old session finish first.
+                async with stale.lock:
+                    await self._disconnect(stale.client)
+            async with entry.lock:
+                await self._connect(entry)
+                try:
+                    return await operation(entry.client)
+                except ConnectionError:
+                    if not retry_on_disconnect:
+                        raise
+                    await self._connect(entry)
+                    return await operation(entry.client)
+        finally:
+            entry.in_use -= 1
+            entry.last_used = self._clock()
+            await self._evict_over_capacity()
+
+    async def _disconnect(self, client: Any) -> None:
+        try:
+            await client.disconnect()
+        except Exception:  # noqa: BLE001 - best effort on teardown
+            pass
+
+    async def _evict(self, entry: _PooledClient) -> None:
+        # Callers pop the entry first, so no new operation can check it out;
+        # the lock waits for a stale-session or shutdown disconnect in flight.
+        async with entry.lock:
+            await self._disconnect(entry.client)
+
+    async def _evict_over_capacity(self) -> None:
+        while len(self._clients) > self.max_clients:
+            key = next(
+                (k for k, entry in self._clients.items() if not entry.in_use), None
+            )
+            if key is None:
+                return
+            self._counters["evicted_capacity"] += 1
+            await self._evict(self._clients.pop(key))
+
+    async def evict_idle(self) -> int:
+        cutoff = self._clock() - self.idle_seconds
+        candidates = list(self._clients.items())
+        evicted = 0
+        for key, entry in candidates:
+            # Earlier disconnects yield to the loop, so an operation may have
+            # checked this client out, or replaced or evicted it, meanwhile.
+            if (
+                self._clients.get(key) is not entry
+                or entry.in_use
+                or entry.last_used > cutoff
+            ):
+                continue
+            self._clients.pop(key, None)
+            self._counters["evicted_idle"] += 1
+            evicted += 1
+            await self._evict(entry)
+        return evicted
+
+    async def _run_janitor(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.evict_idle()
+            except Exception:  # noqa: BLE001 - retried on the next sweep
+                self._counters["janitor_errors"] += 1
+
+    def start(self, interval_seconds: float = 60.0) -> None:
+        if self._janitor is None or self._janitor.done():
+            self._janitor = asyncio.get_running_loop().create_task(
+                self._run_janitor(max(float(interval_seconds), 1.0))
+            )
+
+    async def aclose(self) -> None:
+        janitor, self._janitor = self._janitor, None
+        if janitor is not None:
+            janitor.cancel()
+            try:
+                await janitor
+            except asyncio.CancelledError:
+                pass
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for entry in clients:
+            async with entry.lock:
+                await self._disconnect(entry.client)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._counters,
+            "clients": len(self._clients),
+            "connected": sum(
+                1 for entry in self._clients.values() if entry.client.is_connected()
+            ),
+            "in_use": sum(entry.in_use for entry in self._clients.values()),
+            "max_clients": self.max_clients,
+            "idle_seconds": self.idle_seconds,
+        }
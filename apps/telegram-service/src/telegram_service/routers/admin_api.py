@@ -8,11 +8,12 @@ from sqlalchemy.orm import Session
 
 from telegram_service.auth import hash_password
 from telegram_service.database import get_db
-from telegram_service.deps import get_current_admin
+from telegram_service.deps import get_current_admin, resolved_context_cache
 from telegram_service.managed_secrets import (
     create_or_update_managed_secret,
     deactivate_managed_secret,
     normalize_secret_ref,
+    secret_cache,
 )
 from telegram_service.models import (
     AuditLog,
@@ -24,7 +25,7 @@ from telegram_service.models import (
 )
 from telegram_service.onboarding import process_telegram_update_for_onboarding
 from telegram_service.onboarding import is_start_command_without_token
-from telegram_service.mtproto import build_client
+from telegram_service.mtproto import build_client, user_client_pool
 from telegram_service.schemas import (
     ConnectionCreate,
     ConnectionOut,
@@ -42,7 +43,8 @@ from telegram_service.schemas import (
     UserOut,
 )
 from telegram_service.secrets import resolve_secret, upsert_secret
-from telegram_service.telegram_client import get_me, get_updates
+from telegram_service.telegram_client import bot_api, get_me, get_updates
+from telegram_service.update_ingester import update_ingester
 
 router = APIRouter(prefix="/api/admin", tags=["admin-api"])
 pending_user_logins: dict[int, dict] = {}
@@ -306,6 +308,17 @@ def list_audit_logs(
     ]
 
 
+@router.get("/metrics")
+def gateway_metrics(_: User = Depends(get_current_admin)) -> dict:
+    return {
+        "bot_api": bot_api.stats(),
+        "mtproto_pool": user_client_pool.stats(),
+        "update_ingester": update_ingester.stats(),
+        "secret_cache": secret_cache.stats(),
+        "context_cache": resolved_context_cache.stats(),
+    }
+
+
 @router.get("/secrets", response_model=list[ManagedSecretOut])
 def list_managed_secrets(
     include_inactive: bool = Query(default=False),
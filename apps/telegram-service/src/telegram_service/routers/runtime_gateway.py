@@ -4,20 +4,24 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 from telegram_service.config import get_settings
+from telegram_service.context_cache import ConnectionSnapshot, ContextSnapshot
 from telegram_service.database import get_db
-from telegram_service.deps import get_current_runtime_user, get_runtime_principal
+from telegram_service.deps import (
+    get_or_create_runtime_user,
+    get_runtime_principal,
+    resolved_context_cache,
+)
 from telegram_service.models import (
     ConnectionType,
     ContextMode,
     MessagingContext,
     OtpChallenge,
     TelegramConnection,
-    User,
 )
-from telegram_service.onboarding import process_telegram_update_for_onboarding
 from telegram_service.mtproto import get_user_messages, send_user_message
 from telegram_service.schemas import (
     OtpIssueRequest,
@@ -29,45 +33,61 @@ from telegram_service.schemas import (
 )
 from telegram_service.secrets import resolve_secret
 from telegram_service.telegram_client import get_updates, send_message
+from telegram_service.update_ingester import read_inbox, store_updates, update_ingester
 
 router = APIRouter(prefix="/gateway", tags=["runtime-gateway"])
 settings = get_settings()
 
 
 def _resolve_context(
-    db: Session, context_id: int, user: User
-) -> tuple[MessagingContext, TelegramConnection]:
-    context = (
-        db.query(MessagingContext)
+    db: Session, context_id: int, principal: RuntimePrincipal
+) -> tuple[ContextSnapshot, ConnectionSnapshot]:
+    key = (principal.subject, context_id)
+    generation, cached = resolved_context_cache.get(key)
+    if cached is not None:
+        return cached
+
+    user = get_or_create_runtime_user(db, principal.subject)
+    row = (
+        db.query(MessagingContext, TelegramConnection)
+        .outerjoin(
+            TelegramConnection,
+            and_(
+                TelegramConnection.id == MessagingContext.connection_id,
+                TelegramConnection.is_active == True,
+            ),
+        )
         .filter(MessagingContext.id == context_id, MessagingContext.is_active == True)
         .first()
     )  # noqa: E712
-    if not context:
+    if not row:
         raise HTTPException(status_code=404, detail="Context not found")
-
-    connection = (
-        db.query(TelegramConnection)
-        .filter(
-            TelegramConnection.id == context.connection_id,
-            TelegramConnection.is_active == True,
-        )
-        .first()
-    )  # noqa: E712
+    context, connection = row
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
 
     if connection.owner_user_id != user.id:
         raise HTTPException(status_code=404, detail="Owned context not found")
 
-    return context, connection
+    resolved = (
+        ContextSnapshot(id=context.id, mode=context.mode, chat_id=context.chat_id),
+        ConnectionSnapshot(
+            id=connection.id,
+            type=connection.type,
+            secret_ref_token=connection.secret_ref_token,
+            secret_ref_session=connection.secret_ref_session,
+        ),
+    )
+    resolved_context_cache.put(key, generation, resolved)
+    return resolved
 
 
-def _ensure_send_allowed(context: MessagingContext) -> None:
+def _ensure_send_allowed(context: ContextSnapshot) -> None:
     if context.mode == ContextMode.receive_only:
         raise HTTPException(status_code=403, detail="Context is receive_only")
 
 
-def _ensure_receive_allowed(context: MessagingContext) -> None:
+def _ensure_receive_allowed(context: ContextSnapshot) -> None:
     if context.mode == ContextMode.send_only:
         raise HTTPException(status_code=403, detail="Context is send_only")
 
@@ -98,7 +118,7 @@ def _filter_bot_updates_for_chat(
 
 
 async def _send_through_connection(
-    connection: TelegramConnection, chat_id: str, text: str, db: Session
+    connection: ConnectionSnapshot, chat_id: str, text: str, db: Session
 ) -> dict[str, Any]:
     if connection.type == ConnectionType.bot:
         if not connection.secret_ref_token:
@@ -127,15 +147,43 @@ async def _send_through_connection(
             ) from exc
 
         provider_response = await send_user_message(
-            session_string=session_string, chat_id=chat_id, text=text
+            session_string=session_string,
+            chat_id=chat_id,
+            text=text,
+            key=connection.secret_ref_session,
         )
         return {"connection_type": "user", "provider_response": provider_response}
 
     raise HTTPException(status_code=400, detail="Unsupported connection type")
 
 
+async def _receive_from_inbox(
+    context: ContextSnapshot,
+    connection: ConnectionSnapshot,
+    offset: int | None,
+    limit: int,
+    wait: float,
+    db: Session,
+) -> dict[str, Any]:
+    update_ingester.ensure(connection.id)
+    # Take the waiter before reading so an update stored in between wakes us.
+    event = update_ingester.waiter(context.id)
+    updates = read_inbox(db, context.id, offset, limit)
+    if not updates and wait > 0:
+        # End the read transaction so the ingester can commit while we wait.
+        db.rollback()
+        if await update_ingester.wait(event, wait):
+            updates = read_inbox(db, context.id, offset, limit)
+    next_offset = updates[-1]["update_id"] + 1 if updates else offset
+    return {
+        "connection_type": "bot",
+        "provider_response": {"ok": True, "result": updates},
+        "next_offset": next_offset,
+    }
+
+
 async def _receive_through_connection(
-    connection: TelegramConnection, chat_id: str, offset: int | None, db: Session
+    connection: ConnectionSnapshot, chat_id: str, offset: int | None, db: Session
 ) -> dict[str, Any]:
     if connection.type == ConnectionType.bot:
         if not connection.secret_ref_token:
@@ -176,6 +224,7 @@ async def _receive_through_connection(
             chat_id=chat_id,
             min_id=offset,
             limit=20,
+            key=connection.secret_ref_session,
         )
         return {"connection_type": "user", "provider_response": provider_response}
 
@@ -193,11 +242,10 @@ def whoami(
 async def send_to_context(
     context_id: int,
     payload: SendMessageRequest,
-    _: RuntimePrincipal = Depends(get_runtime_principal),
-    user: User = Depends(get_current_runtime_user),
+    principal: RuntimePrincipal = Depends(get_runtime_principal),
     db: Session = Depends(get_db),
 ) -> dict:
-    context, connection = _resolve_context(db, context_id, user)
+    context, connection = _resolve_context(db, context_id, principal)
     _ensure_send_allowed(context)
     response = await _send_through_connection(
         connection, chat_id=context.chat_id, text=payload.text, db=db
@@ -209,15 +257,21 @@ async def send_to_context(
 async def get_context_updates(
     context_id: int,
     offset: int | None = Query(default=None),
-    _: RuntimePrincipal = Depends(get_runtime_principal),
-    user: User = Depends(get_current_runtime_user),
+    limit: int = Query(default=50, ge=1, le=100),
+    wait: float = Query(default=0, ge=0, le=50),
+    principal: RuntimePrincipal = Depends(get_runtime_principal),
     db: Session = Depends(get_db),
 ) -> dict:
-    context, connection = _resolve_context(db, context_id, user)
+    context, connection = _resolve_context(db, context_id, principal)
     _ensure_receive_allowed(context)
-    response = await _receive_through_connection(
-        connection, chat_id=context.chat_id, offset=offset, db=db
-    )
+    if connection.type == ConnectionType.bot and settings.update_ingestion_enabled:
+        response = await _receive_from_inbox(
+            context, connection, offset=offset, limit=limit, wait=wait, db=db
+        )
+    else:
+        response = await _receive_through_connection(
+            connection, chat_id=context.chat_id, offset=offset, db=db
+        )
     return {"ok": True, "context_id": context.id, **response}
 
 
@@ -225,10 +279,9 @@ async def get_context_updates(
 async def issue_otp(
     payload: OtpIssueRequest,
     principal: RuntimePrincipal = Depends(get_runtime_principal),
-    user: User = Depends(get_current_runtime_user),
     db: Session = Depends(get_db),
 ) -> OtpIssueResponse:
-    context, connection = _resolve_context(db, payload.context_id, user)
+    context, connection = _resolve_context(db, payload.context_id, principal)
     _ensure_send_allowed(context)
 
     otp_code = _generate_otp(payload.length)
@@ -332,10 +385,10 @@ async def receive_webhook(
     payload = await request.json()
     completed = 0
     if connection.type == ConnectionType.bot and isinstance(payload, dict):
-        link = process_telegram_update_for_onboarding(db, connection, payload)
-        if link:
-            completed = 1
-            db.commit()
+        notified, stored, completed = store_updates(db, connection, [payload])
+        db.commit()
+        update_ingester.record(stored, completed)
+        update_ingester.notify(notified)
     return {
         "ok": True,
         "message": "Webhook accepted",
@@ -1,37 +1,256 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import httpx
+from fastapi import HTTPException
 
 from telegram_service.config import get_settings
 
 settings = get_settings()
 
 
-async def send_message(token: str, chat_id: str, text: str) -> dict[str, Any]:
-    url = f"{settings.telegram_api_base}/bot{token}/sendMessage"
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        response = await client.post(url, json={"chat_id": chat_id, "text": text})
+class _BotRateLimiter:
+    """Send slots for one bot token: a global rate plus a per-chat rate.
+
+    Callers look up the next free slot, take it if they accept the wait, and
+    sleep until it, so bursts are queued in arrival order instead of being
+    rejected by Telegram with 429. A caller that gives up never takes a slot.
+    """
+
+    def __init__(self, global_per_second: float, chat_per_second: float) -> None:
+        self.global_interval = 1.0 / max(global_per_second, 0.001)
+        self.chat_interval = 1.0 / max(chat_per_second, 0.001)
+        self.next_global = 0.0
+        self.next_chat: dict[str, float] = {}
+        self.paused_until = 0.0
+        self.waiting = 0
+
+    def next_slot(self, chat_id: str, now: float) -> float:
+        return max(
+            now, self.paused_until, self.next_global, self.next_chat.get(chat_id, 0.0)
+        )
+
+    def take(self, chat_id: str, start: float, now: float) -> None:
+        self.next_global = start + self.global_interval
+        self.next_chat[chat_id] = start + self.chat_interval
+        if len(self.next_chat) > 10_000:
+            self.next_chat = {
+                chat: ready for chat, ready in self.next_chat.items() if ready > now
+            }
+
+    def pause(self, seconds: float, now: float) -> None:
+        self.paused_until = max(self.paused_until, now + seconds)
+
+
+class BotApiClient:
+    """App-scoped Bot API client with a shared keep-alive connection pool.
+
+    ``send_message`` is rate limited per bot token (Telegram allows about 30
+    messages/s per bot and 1 message/s per chat). Sends that would exceed the
+    limits wait for their slot; only a wait longer than
+    ``max_send_wait_seconds`` fails with 429. A 429 from Telegram pauses that
+    bot for ``retry_after`` and the send is retried.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        timeout_seconds: float = 20.0,
+        http2: bool = True,
+        max_connections: int = 50,
+        global_per_second: float = 30.0,
+        chat_per_second: float = 1.0,
+        max_send_wait_seconds: float = 60.0,
+        max_retries: int = 2,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = float(timeout_seconds)
+        self.http2 = http2
+        self.max_connections = max(int(max_connections), 1)
+        self.global_per_second = float(global_per_second)
+        self.chat_per_second = float(chat_per_second)
+        self.max_send_wait_seconds = float(max_send_wait_seconds)
+        self.max_retries = max(int(max_retries), 0)
+        self._transport = transport
+        self._clock = clock
+        self._sleep = sleep
+        self._client: httpx.AsyncClient | None = None
+        self._limiters: dict[str, _BotRateLimiter] = {}
+        self._counters = {
+            "clients_created": 0,
+            "requests": 0,
+            "request_errors": 0,
+            "sends": 0,
+            "sends_queued": 0,
+            "sends_rejected": 0,
+            "telegram_429": 0,
+        }
+        self._queue_wait_seconds_total = 0.0
+        self._queue_wait_seconds_max = 0.0
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._counters["clients_created"] += 1
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=120.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _limiter(self, token: str) -> _BotRateLimiter:
+        # Keyed by a hash so stats and memory never hold raw bot tokens.
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = _BotRateLimiter(
+                self.global_per_second, self.chat_per_second
+            )
+        return limiter
+
+    async def _call(
+        self,
+        token: str,
+        method: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        url = f"{self.base_url}/bot{token}/{method}"
+        request_timeout = timeout or httpx.USE_CLIENT_DEFAULT
+        self._counters["requests"] += 1
+        try:
+            if payload is None:
+                return await self._http().get(url, timeout=request_timeout)
+            return await self._http().post(url, json=payload, timeout=request_timeout)
+        except httpx.HTTPError:
+            self._counters["request_errors"] += 1
+            raise
+
+    async def _wait_for_slot(self, limiter: _BotRateLimiter, chat_id: str) -> None:
+        now = self._clock()
+        start = limiter.next_slot(chat_id, now)
+        delay = start - now
+        if delay > self.max_send_wait_seconds:
+            self._counters["sends_rejected"] += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"Telegram send queue is full; retry in {int(delay) + 1}s",
+                headers={"Retry-After": str(int(delay) + 1)},
+            )
+        limiter.take(chat_id, start, now)
+        if delay <= 0:
+            return
+        self._counters["sends_queued"] += 1
+        self._queue_wait_seconds_total += delay
+        self._queue_wait_seconds_max = max(self._queue_wait_seconds_max, delay)
+        limiter.waiting += 1
+        try:
+            await self._sleep(delay)
+        finally:
+            limiter.waiting -= 1
+
+    async def send_message(self, token: str, chat_id: str, text: str) -> dict[str, Any]:
+        limiter = self._limiter(token)
+        self._counters["sends"] += 1
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_slot(limiter, chat_id)
+            response = await self._call(
+                token, "sendMessage", {"chat_id": chat_id, "text": text}
+            )
+            if response.status_code != 429 or attempt == self.max_retries:
+                break
+            self._counters["telegram_429"] += 1
+            try:
+                retry_after = float(
+                    (response.json().get("parameters") or {}).get("retry_after") or 1
+                )
+            except ValueError:
+                retry_after = 1.0
+            limiter.pause(retry_after, self._clock())
         response.raise_for_status()
         return response.json()
 
+    async def get_updates(
+        self,
+        token: str,
+        offset: int | None = None,
+        limit: int = 50,
+        timeout: int = 1,
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {"limit": limit, "timeout": timeout}
+        if offset is not None:
+            payload["offset"] = offset
+        # Long polls hold the connection open for ``timeout`` seconds.
+        response = await self._call(
+            token,
+            "getUpdates",
+            payload,
+            timeout=max(self.timeout_seconds, timeout + 10.0),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_me(self, token: str) -> dict[str, Any]:
+        response = await self._call(token, "getMe")
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        queued = self._counters["sends_queued"]
+        return {
+            **self._counters,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "client_open": self._client is not None and not self._client.is_closed,
+            "bots": len(self._limiters),
+            "sends_waiting": sum(
+                limiter.waiting for limiter in self._limiters.values()
+            ),
+            "queue_wait_seconds_avg": (
+                round(self._queue_wait_seconds_total / queued, 3) if queued else 0.0
+            ),
+            "queue_wait_seconds_max": round(self._queue_wait_seconds_max, 3),
+        }
+
+
+bot_api = BotApiClient(
+    base_url=settings.telegram_api_base,
+    timeout_seconds=settings.telegram_timeout_seconds,
+    http2=settings.telegram_http2,
+    max_connections=settings.telegram_max_connections,
+    global_per_second=settings.telegram_global_rate_per_second,
+    chat_per_second=settings.telegram_chat_rate_per_second,
+    max_send_wait_seconds=settings.telegram_send_max_wait_seconds,
+)
+
+
+async def send_message(token: str, chat_id: str, text: str) -> dict[str, Any]:
+    return await bot_api.send_message(token, chat_id, text)
+
 
 async def get_updates(
     token: str, offset: int | None = None, limit: int = 50
 ) -> dict[str, Any]:
-    url = f"{settings.telegram_api_base}/bot{token}/getUpdates"
-    payload: dict[str, Any] = {"limit": limit, "timeout": 1}
-    if offset is not None:
-        payload["offset"] = offset
-
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
-        return response.json()
+    return await bot_api.get_updates(token, offset=offset, limit=limit)
 
 
 async def get_me(token: str) -> dict[str, Any]:
-    url = f"{settings.telegram_api_base}/bot{token}/getMe"
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        response = await client.get(url)
-        response.raise_for_status()
-        return response.json()
+    return await bot_api.get_me(token)
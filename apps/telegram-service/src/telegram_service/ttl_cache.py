@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TtlCache:
+    """In-process LRU cache with a TTL and invalidation generations.
+
+    ``get`` returns the key's current generation along with the cached value;
+    pass it back to ``put`` so a value loaded before a concurrent
+    ``invalidate(key)`` or ``clear()`` is not cached as current. The TTL
+    bounds how long a change made by another replica can go unnoticed. At most
+    ``max_entries`` values are kept, least recently used first out; a
+    ``ttl_seconds`` of 0 disables caching.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(int(max_entries), 1)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._key_generations: dict[Hashable, int] = {}
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "invalidations": 0,
+            "evictions": 0,
+        }
+
+    def _generation_of(self, key: Hashable) -> tuple[int, int]:
+        return self._generation, self._key_generations.get(key, 0)
+
+    def get(self, key: Hashable) -> tuple[tuple[int, int], Any | None]:
+        with self._lock:
+            generation = self._generation_of(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return generation, None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return generation, None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return generation, value
+
+    def put(self, key: Hashable, generation: tuple[int, int], value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self._generation_of(key):
+                return
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._key_generations[key] = self._key_generations.get(key, 0) + 1
+            self._entries.pop(key, None)
+            self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._key_generations.clear()
+            self._entries.clear()
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_ratio": (
+                    round(self._counters["hits"] / lookups, 3) if lookups else 0.0
+                ),
+            }
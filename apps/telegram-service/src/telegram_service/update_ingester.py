@@ -0,0 +1,381 @@
+import asyncio
+import json
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+import httpx
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from telegram_service.config import get_settings
+from telegram_service.database import SessionLocal
+from telegram_service.models import (
+    ConnectionType,
+    ContextMode,
+    InboxUpdate,
+    MessagingContext,
+    TelegramConnection,
+)
+from telegram_service.onboarding import process_telegram_update_for_onboarding
+from telegram_service.secrets import resolve_secret
+from telegram_service.telegram_client import bot_api
+
+settings = get_settings()
+
+_CHAT_KEYS = ("message", "edited_message", "channel_post", "edited_channel_post")
+
+
+def update_chat_id(update: dict[str, Any]) -> str:
+    for key in _CHAT_KEYS:
+        message = update.get(key)
+        if isinstance(message, dict):
+            return str((message.get("chat") or {}).get("id", "")).strip()
+    callback = update.get("callback_query") or {}
+    message = callback.get("message") or {}
+    return str((message.get("chat") or {}).get("id", "")).strip()
+
+
+def store_updates(
+    db: Session, connection: TelegramConnection, updates: Iterable[dict[str, Any]]
+) -> tuple[set[int], int, int]:
+    """Run onboarding on ``updates`` and copy them into matching context inboxes.
+
+    Returns the ids of contexts that received new updates, the number of inbox
+    rows inserted and the number of onboarding links completed. Updates
+    already in an inbox are skipped, so an update delivered by both the
+    webhook and polling is stored once; a concurrent insert of the same
+    update loses on the ``(context_id, update_id)`` unique constraint. The
+    caller commits.
+    """
+    updates = [
+        item
+        for item in updates
+        if isinstance(item, dict) and isinstance(item.get("update_id"), int)
+    ]
+    if not updates:
+        return set(), 0, 0
+
+    completed = 0
+    if connection.type == ConnectionType.bot:
+        for item in updates:
+            if process_telegram_update_for_onboarding(db, connection, item):
+                completed += 1
+
+    contexts_by_chat: dict[str, list[int]] = {}
+    for context_id, chat_id in (
+        db.query(MessagingContext.id, MessagingContext.chat_id)
+        .filter(
+            MessagingContext.connection_id == connection.id,
+            MessagingContext.is_active == True,
+            MessagingContext.mode != ContextMode.send_only,
+        )
+        .all()
+    ):  # noqa: E712
+        contexts_by_chat.setdefault(str(chat_id).strip(), []).append(context_id)
+
+    rows = [
+        (context_id, item)
+        for item in updates
+        for context_id in contexts_by_chat.get(update_chat_id(item), ())
+    ]
+    if not rows:
+        return set(), 0, completed
+
+    existing = set(
+        db.query(InboxUpdate.context_id, InboxUpdate.update_id)
+        .filter(
+            InboxUpdate.context_id.in_({context_id for context_id, _ in rows}),
+            InboxUpdate.update_id.in_({item["update_id"] for _, item in rows}),
+        )
+        .all()
+    )
+    notified: set[int] = set()
+    stored = 0
+    for context_id, item in rows:
+        key = (context_id, item["update_id"])
+        if key in existing:
+            continue
+        existing.add(key)
+        try:
+            with db.begin_nested():
+                db.add(
+                    InboxUpdate(
+                        context_id=context_id,
+                        connection_id=connection.id,
+                        update_id=item["update_id"],
+                        payload=json.dumps(item, ensure_ascii=False),
+                    )
+                )
+        except IntegrityError:
+            continue
+        stored += 1
+        notified.add(context_id)
+    return notified, stored, completed
+
+
+def read_inbox(
+    db: Session, context_id: int, offset: int | None, limit: int
+) -> list[dict[str, Any]]:
+    query = db.query(InboxUpdate.payload).filter(InboxUpdate.context_id == context_id)
+    if offset is not None:
+        query = query.filter(InboxUpdate.update_id >= offset)
+    rows = query.order_by(InboxUpdate.update_id.asc()).limit(limit).all()
+    return [json.loads(payload) for (payload,) in rows]
+
+
+class UpdateIngester:
+    """Background ``getUpdates`` long-polling for bots with receiving contexts.
+
+    One poller runs per active bot connection that has a ``send_receive`` or
+    ``receive_only`` context. Updates are stored in the per-context inbox,
+    so several runtime callers can read the same chat without consuming each
+    other's updates, and readers blocked in ``wait`` are woken up. A bot that
+    has a webhook set (``getUpdates`` answers 409) is left to the webhook.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_timeout_seconds: int = 25,
+        refresh_seconds: float = 30.0,
+        retention_seconds: float = 7 * 86400,
+        max_backoff_seconds: float = 300.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.poll_timeout_seconds = max(int(poll_timeout_seconds), 0)
+        self.refresh_seconds = max(float(refresh_seconds), 1.0)
+        self.retention_seconds = float(retention_seconds)
+        self.max_backoff_seconds = float(max_backoff_seconds)
+        self._pollers: dict[int, asyncio.Task[None]] = {}
+        self._offsets: dict[int, int] = {}
+        self._states: dict[int, str] = {}
+        self._waiters: dict[int, asyncio.Event] = {}
+        self._supervisor: asyncio.Task[None] | None = None
+        self._counters = {
+            "polls": 0,
+            "poll_errors": 0,
+            "updates": 0,
+            "inbox_rows": 0,
+            "onboarding_completed": 0,
+            "pruned": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._supervisor is not None and not self._supervisor.done()
+
+    def waiter(self, context_id: int) -> asyncio.Event:
+        """Event set by the next update for ``context_id``.
+
+        Take it before reading the inbox, so an update that lands between the
+        read and the wait is not missed.
+        """
+        event = self._waiters.get(context_id)
+        if event is None:
+            event = self._waiters[context_id] = asyncio.Event()
+        return event
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def notify(self, context_ids: Iterable[int]) -> None:
+        for context_id in context_ids:
+            event = self._waiters.pop(context_id, None)
+            if event is not None:
+                event.set()
+
+    def record(self, stored: int, completed: int) -> None:
+        self._counters["inbox_rows"] += stored
+        self._counters["onboarding_completed"] += completed
+
+    def ensure(self, connection_id: int) -> None:
+        """Start polling ``connection_id`` now instead of at the next refresh."""
+        if self.running and connection_id not in self._pollers:
+            self._start_poller(connection_id)
+
+    def _start_poller(self, connection_id: int) -> None:
+        task = asyncio.get_running_loop().create_task(self._poll(connection_id))
+        self._pollers[connection_id] = task
+        task.add_done_callback(lambda _: self._pollers.pop(connection_id, None))
+
+    def _receiving_connection_ids(self) -> set[int]:
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(TelegramConnection.id)
+                .join(
+                    MessagingContext,
+                    MessagingContext.connection_id == TelegramConnection.id,
+                )
+                .filter(
+                    TelegramConnection.type == ConnectionType.bot,
+                    TelegramConnection.is_active == True,
+                    MessagingContext.is_active == True,
+                    MessagingContext.mode != ContextMode.send_only,
+                )
+                .distinct()
+                .all()
+            )  # noqa: E712
+            return {connection_id for (connection_id,) in rows}
+        finally:
+            db.close()
+
+    def prune_inbox(self) -> int:
+        """Delete inbox updates older than ``retention_seconds``."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        db = self.session_factory()
+        try:
+            pruned = (
+                db.query(InboxUpdate)
+                .filter(InboxUpdate.received_at < cutoff)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+        self._counters["pruned"] += pruned
+        return pruned
+
+    def _token(self, connection_id: int) -> str | None:
+        db = self.session_factory()
+        try:
+            connection = db.get(TelegramConnection, connection_id)
+            if not connection or not connection.is_active:
+                return None
+            if not connection.secret_ref_token:
+                return None
+            return resolve_secret(connection.secret_ref_token, db)
+        finally:
+            db.close()
+
+    def _ingest(self, connection_id: int, updates: list[dict[str, Any]]) -> set[int]:
+        db = self.session_factory()
+        try:
+            connection = db.get(TelegramConnection, connection_id)
+            if not connection:
+                return set()
+            notified, stored, completed = store_updates(db, connection, updates)
+            db.commit()
+            self.record(stored, completed)
+            return notified
+        finally:
+            db.close()
+
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                wanted = await asyncio.to_thread(self._receiving_connection_ids)
+            except Exception:  # noqa: BLE001 - keep supervising on DB errors
+                wanted = set(self._pollers)
+            for connection_id in wanted - set(self._pollers):
+                self._start_poller(connection_id)
+            for connection_id in set(self._pollers) - wanted:
+                self._pollers[connection_id].cancel()
+            try:
+                await asyncio.to_thread(self.prune_inbox)
+            except Exception:  # noqa: BLE001 - retried on the next refresh
+                pass
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def poll_once(self, connection_id: int) -> bool:
+        """Fetch one batch of updates for ``connection_id`` into the inbox.
+
+        Returns ``False`` when the connection has no usable token.
+        """
+        token = await asyncio.to_thread(self._token, connection_id)
+        if not token:
+            self._states[connection_id] = "no_token"
+            return False
+        self._states[connection_id] = "polling"
+        self._counters["polls"] += 1
+        response = await bot_api.get_updates(
+            token,
+            offset=self._offsets.get(connection_id),
+            limit=100,
+            timeout=self.poll_timeout_seconds,
+        )
+        updates = [
+            item for item in response.get("result") or [] if isinstance(item, dict)
+        ]
+        if updates:
+            self._counters["updates"] += len(updates)
+            notified = await asyncio.to_thread(self._ingest, connection_id, updates)
+            # Acknowledge only after the inbox commit, so a failed commit
+            # makes Telegram redeliver instead of losing updates.
+            update_ids = [
+                item["update_id"]
+                for item in updates
+                if isinstance(item.get("update_id"), int)
+            ]
+            if update_ids:
+                self._offsets[connection_id] = max(update_ids) + 1
+            self.notify(notified)
+        return True
+
+    async def _poll(self, connection_id: int) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                if not await self.poll_once(connection_id):
+                    return
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except httpx.HTTPStatusError as exc:
+                self._counters["poll_errors"] += 1
+                status = exc.response.status_code
+                if status == 409:
+                    self._states[connection_id] = "webhook"
+                    backoff = self.max_backoff_seconds
+                elif status in {401, 404}:
+                    self._states[connection_id] = "unauthorized"
+                    backoff = self.max_backoff_seconds
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+            except Exception:  # noqa: BLE001 - retried with backoff
+                self._counters["poll_errors"] += 1
+                self._states[connection_id] = "error"
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+
+    def start(self) -> None:
+        if not self.running:
+            self._supervisor = asyncio.get_running_loop().create_task(
+                self._supervise()
+            )
+
+    async def aclose(self) -> None:
+        tasks = [task for task in [self._supervisor, *self._pollers.values()] if task]
+        self._supervisor = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pollers.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._counters,
+            "running": self.running,
+            "pollers": len(self._pollers),
+            "waiting_contexts": len(self._waiters),
+            "connections": {
+                str(connection_id): {
+                    "state": state,
+                    "next_offset": self._offsets.get(connection_id),
+                }
+                for connection_id, state in self._states.items()
+            },
+        }
+
+
+update_ingester = UpdateIngester(
+    poll_timeout_seconds=settings.update_poll_timeout_seconds,
+    refresh_seconds=settings.update_ingester_refresh_seconds,
+    retention_seconds=settings.inbox_retention_seconds,
+)
@@ -0,0 +1,39 @@
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+# ``telegram_service.secrets`` is provided by the deployment image. Tests that
+# need a secret monkeypatch ``resolve_secret`` where it is used, so a stub that
+# refuses every lookup is enough to import the ingester and the routers.
+if importlib.util.find_spec("telegram_service.secrets") is None:
+
+    def _unavailable(*args, **kwargs):
+        raise RuntimeError("telegram_service.secrets is not installed")
+
+    _secrets = types.ModuleType("telegram_service.secrets")
+    _secrets.resolve_secret = _unavailable
+    _secrets.upsert_secret = _unavailable
+    sys.modules["telegram_service.secrets"] = _secrets
+
+from telegram_service import models  # noqa: E402,F401
+from telegram_service.database import Base  # noqa: E402
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False, class_=Session)
+    engine.dispose()
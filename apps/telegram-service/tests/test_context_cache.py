@@ -0,0 +1,140 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from telegram_service.deps import (
+    _runtime_username,
+    get_or_create_runtime_user,
+    resolved_context_cache,
+)
+from telegram_service.models import (
+    AuditLog,
+    ConnectionType,
+    ContextMode,
+    MessagingContext,
+    TelegramConnection,
+    User,
+)
+from telegram_service.routers.runtime_gateway import _resolve_context
+from telegram_service.schemas import RuntimePrincipal
+
+SUBJECT = "dex|alice"
+
+
+@pytest.fixture
+def seeded(session_factory):
+    resolved_context_cache.clear()
+    db = session_factory()
+    owner = User(username=_runtime_username(SUBJECT), is_active=True)
+    connection = TelegramConnection(
+        name="alerts-bot",
+        type=ConnectionType.bot,
+        owner=owner,
+        secret_ref_token="managed://alerts-bot",
+    )
+    context = MessagingContext(
+        connection=connection, name="ops", mode=ContextMode.send_only, chat_id="100"
+    )
+    db.add_all([owner, connection, context])
+    db.commit()
+    ids = {"user": owner.id, "connection": connection.id, "context": context.id}
+    db.close()
+    yield ids
+    resolved_context_cache.clear()
+
+
+def _cache_entry():
+    key = (SUBJECT, 1)
+    resolved_context_cache.put(key, resolved_context_cache.get(key)[0], "resolved")
+    return key
+
+
+def _deactivate_user(db, ids):
+    db.get(User, ids["user"]).is_active = False
+
+
+def _rename_chat(db, ids):
+    db.get(MessagingContext, ids["context"]).chat_id = "200"
+
+
+def _rotate_connection_secret(db, ids):
+    db.get(TelegramConnection, ids["connection"]).secret_ref_token = "managed://new"
+
+
+def _add_context(db, ids):
+    db.add(
+        MessagingContext(
+            connection_id=ids["connection"],
+            name="audit",
+            mode=ContextMode.receive_only,
+            chat_id="300",
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "change",
+    [_deactivate_user, _rename_chat, _rotate_connection_secret, _add_context],
+)
+def test_context_connection_or_user_changes_clear_the_cache(
+    session_factory, seeded, change
+):
+    key = _cache_entry()
+    db = session_factory()
+    change(db, seeded)
+    db.flush()
+
+    assert resolved_context_cache.get(key)[1] is None
+    # A lookup between the flush and the commit still reads the old rows.
+    resolved_context_cache.put(key, resolved_context_cache.get(key)[0], "stale")
+    db.commit()
+
+    assert resolved_context_cache.get(key)[1] is None
+
+
+def test_unrelated_changes_keep_the_cache(session_factory, seeded):
+    key = _cache_entry()
+    db = session_factory()
+    db.add(AuditLog(actor="admin", action="noop", target_type="x", target_id="1"))
+    db.commit()
+
+    assert resolved_context_cache.get(key)[1] == "resolved"
+
+
+def test_deactivated_runtime_user_is_rejected(session_factory, seeded):
+    db = session_factory()
+    db.get(User, seeded["user"]).is_active = False
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_or_create_runtime_user(session_factory(), SUBJECT)
+    assert exc_info.value.status_code == 403
+
+
+def test_warm_resolve_makes_no_database_query(session_factory, seeded):
+    statements = []
+    event.listen(
+        session_factory.kw["bind"],
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    principal = RuntimePrincipal(subject=SUBJECT)
+
+    context, connection = _resolve_context(
+        session_factory(), seeded["context"], principal
+    )
+    cold = len(statements)
+    assert _resolve_context(session_factory(), seeded["context"], principal) == (
+        context,
+        connection,
+    )
+
+    assert cold == 2  # runtime user, then context joined with its connection
+    assert len(statements) == cold
+    assert context.chat_id == "100"
+    assert connection.secret_ref_token == "managed://alerts-bot"
+
+    with pytest.raises(HTTPException):
+        _resolve_context(
+            session_factory(), seeded["context"], RuntimePrincipal(subject="dex|bob")
+        )
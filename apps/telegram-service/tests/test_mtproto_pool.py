@@ -0,0 +1,219 @@
+import asyncio
+
+import pytest
+
+from telegram_service.mtproto_pool import MtprotoClientPool
+
+
+class FakeClient:
+    def __init__(self, session_string, *, fail_connects=0):
+        self.session_string = session_string
+        self.fail_connects = fail_connects
+        self.connected = False
+        self.connects = 0
+        self.disconnects = 0
+        self.active = 0
+        self.max_active = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def connect(self):
+        if self.fail_connects:
+            self.fail_connects -= 1
+            raise ConnectionError("network down")
+        self.connects += 1
+        self.connected = True
+
+    async def disconnect(self):
+        self.disconnects += 1
+        self.connected = False
+
+    async def send(self, text):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return f"{self.session_string}:{text}"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pool(clients, client_kwargs=None, **kwargs):
+    def factory(session_string):
+        client = FakeClient(session_string, **(client_kwargs or {}))
+        clients.append(client)
+        return client
+
+    return MtprotoClientPool(factory, backoff_seconds=0, **kwargs)
+
+
+def test_client_is_connected_once_and_operations_are_serialized():
+    clients = []
+    pool = _pool(clients)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                pool.run("managed://s1", "session-1", lambda c, i=i: c.send(i))
+                for i in range(10)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [f"session-1:{i}" for i in range(10)]
+    assert len(clients) == 1
+    assert clients[0].connects == 1
+    assert clients[0].max_active == 1
+    assert pool.stats()["reused"] == 9
+
+
+def test_reconnects_with_backoff_and_retries_idempotent_operations():
+    clients = []
+    pool = _pool(clients, client_kwargs={"fail_connects": 2})
+    calls = []
+
+    async def flaky(client):
+        calls.append(client)
+        if len(calls) == 1:
+            client.connected = False
+            raise ConnectionError("connection lost")
+        return "ok"
+
+    async def send_once(client):
+        client.connected = False
+        raise ConnectionError("connection lost")
+
+    async def run():
+        result = await pool.run("k", "s", flaky, retry_on_disconnect=True)
+        with pytest.raises(ConnectionError):
+            await pool.run("k", "s", send_once)
+        return result
+
+    assert asyncio.run(run()) == "ok"
+    stats = pool.stats()
+    assert stats["connect_failures"] == 2
+    assert stats["reconnects"] == 1
+    assert len(calls) == 2
+
+
+def test_connect_gives_up_after_attempts():
+    clients = []
+    pool = _pool(clients, connect_attempts=2, client_kwargs={"fail_connects": 5})
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(pool.run("k", "s", lambda c: c.send("x")))
+
+    assert pool.stats()["connect_failures"] == 2
+
+
+def test_idle_capacity_and_rotated_sessions_are_evicted():
+    clients = []
+    clock = Clock()
+    pool = _pool(clients, idle_seconds=60, max_clients=2, clock=clock)
+
+    async def run():
+        await pool.run("a", "sa", lambda c: c.send("x"))
+        await pool.run("b", "sb", lambda c: c.send("x"))
+        await pool.run("c", "sc", lambda c: c.send("x"))
+        # A rotated session string for the same ref replaces the client.
+        await pool.run("c", "sc-rotated", lambda c: c.send("x"))
+        clock.now += 61
+        return await pool.evict_idle()
+
+    assert asyncio.run(run()) == 2
+    stats = pool.stats()
+    assert stats["evicted_capacity"] == 1
+    assert stats["replaced"] == 1
+    assert stats["clients"] == 0
+    assert all(client.disconnects == 1 for client in clients)
+
+
+def test_idle_eviction_skips_clients_checked_out_during_a_disconnect():
+    clients = []
+    clock = Clock()
+    pool = _pool(clients, idle_seconds=60, clock=clock)
+
+    async def run():
+        gate = asyncio.Event()
+        for key in ("a", "b", "c"):
+            await pool.run(key, f"s{key}", lambda c: c.send("x"))
+        clock.now += 61
+        slow = clients[0]
+
+        async def slow_disconnect():
+            slow.disconnects += 1
+            await gate.wait()
+            slow.connected = False
+
+        slow.disconnect = slow_disconnect
+        sweep = asyncio.create_task(pool.evict_idle())
+        await asyncio.sleep(0)
+        # While "a" is disconnecting, "b" is reused and "c" is rotated.
+        reused = asyncio.create_task(pool.run("b", "sb", lambda c: c.send("y")))
+        rotated = await pool.run("c", "sc-rotated", lambda c: c.send("y"))
+        gate.set()
+        return await sweep, await reused, rotated
+
+    evicted, reused, rotated = asyncio.run(run())
+
+    assert evicted == 1
+    assert (reused, rotated) == ("sb:y", "sc-rotated:y")
+    assert [client.session_string for client in clients] == [
+        "sa",
+        "sb",
+        "sc",
+        "sc-rotated",
+    ]
+    assert [client.connected for client in clients] == [False, True, False, True]
+    assert pool.stats()["clients"] == 2
+    assert pool.stats()["evicted_idle"] == 1
+
+
+def test_janitor_survives_eviction_errors(monkeypatch):
+    pool = _pool([])
+    sweeps = []
+
+    async def evict_idle():
+        sweeps.append(None)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(pool, "evict_idle", evict_idle)
+
+    async def run():
+        janitor = asyncio.create_task(pool._run_janitor(0))
+        for _ in range(100):
+            if len(sweeps) == 3 or janitor.done():
+                break
+            await asyncio.sleep(0)
+        assert not janitor.done()
+        janitor.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await janitor
+
+    asyncio.run(run())
+
+    assert pool.stats()["janitor_errors"] == 3
+
+
+def test_aclose_disconnects_every_client():
+    clients = []
+    pool = _pool(clients)
+
+    async def run():
+        pool.start()
+        await pool.run("a", "sa", lambda c: c.send("x"))
+        await pool.run("b", "sb", lambda c: c.send("x"))
+        await pool.aclose()
+
+    asyncio.run(run())
+
+    assert [client.connected for client in clients] == [False, False]
+    assert pool.stats()["clients"] == 0
@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from telegram_service.telegram_client import BotApiClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(handler, clock, *, advance=True, **kwargs):
+    async def sleep(seconds):
+        if advance:
+            clock.now += seconds
+
+    return BotApiClient(
+        base_url="https://telegram.test",
+        http2=False,
+        transport=httpx.MockTransport(handler),
+        clock=clock,
+        sleep=sleep,
+        **kwargs,
+    )
+
+
+def _recording_handler(clock, sent, responses=None):
+    def handler(request):
+        sent.append((clock.now, request.read().decode()))
+        if responses:
+            return responses.pop(0)
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    return handler
+
+
+def test_sends_are_paced_globally_and_per_chat():
+    clock = Clock()
+    sent = []
+    client = _client(
+        _recording_handler(clock, sent),
+        clock,
+        global_per_second=2.0,
+        chat_per_second=1.0,
+    )
+
+    async def run():
+        for chat_id in ("a", "b", "a", "c"):
+            await client.send_message("token", chat_id, "hi")
+
+    asyncio.run(run())
+
+    assert [at - 1_000.0 for at, _ in sent] == [0.0, 0.5, 1.0, 1.5]
+    assert client.stats()["sends_queued"] == 3
+
+
+def test_rejected_send_does_not_take_a_slot():
+    clock = Clock()
+    sent = []
+    # Sleeping does not advance the clock, so every accepted send stays queued.
+    client = _client(
+        _recording_handler(clock, sent),
+        clock,
+        advance=False,
+        chat_per_second=1.0,
+        max_send_wait_seconds=2.5,
+    )
+    limiter = client._limiter("token")
+
+    async def run():
+        for _ in range(3):
+            await client.send_message("token", "busy", "hi")
+        for _ in range(100):
+            with pytest.raises(HTTPException) as exc_info:
+                await client.send_message("token", "busy", "hi")
+            assert exc_info.value.status_code == 429
+        await client.send_message("token", "quiet", "hi")
+
+    asyncio.run(run())
+
+    assert limiter.next_chat["busy"] == pytest.approx(1_003.0)
+    # The other chat only queues behind the accepted sends, not the rejected ones.
+    assert limiter.next_chat["quiet"] == pytest.approx(1_002.0 + 1 / 30 + 1.0)
+    assert limiter.next_global == pytest.approx(1_002.0 + 2 / 30)
+    assert client.stats()["sends_rejected"] == 100
+    assert len(sent) == 4
+
+
+def test_telegram_429_pauses_the_token_for_retry_after():
+    clock = Clock()
+    sent = []
+    responses = [
+        httpx.Response(
+            429,
+            json={"ok": False, "parameters": {"retry_after": 5}},
+        )
+    ]
+    client = _client(_recording_handler(clock, sent, responses), clock)
+
+    async def run():
+        await client.send_message("token", "a", "first")
+        await client.send_message("token", "b", "second")
+
+    asyncio.run(run())
+
+    assert [at - 1_000.0 for at, _ in sent] == [0.0, 5.0, pytest.approx(5 + 1 / 30)]
+    assert '"text":"first"' in sent[1][1]
+    assert client.stats()["telegram_429"] == 1
@@ -0,0 +1,72 @@
+from telegram_service.ttl_cache import TtlCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_after_put_until_ttl_expires():
+    clock = Clock()
+    cache = TtlCache(ttl_seconds=60, max_entries=8, clock=clock)
+
+    generation, value = cache.get("bot-token")
+    assert value is None
+    cache.put("bot-token", generation, "123:abc")
+
+    assert cache.get("bot-token") == (generation, "123:abc")
+    clock.now += 61
+    assert cache.get("bot-token") == (generation, None)
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+
+
+def test_invalidate_and_clear_reject_values_loaded_before_them():
+    cache = TtlCache(ttl_seconds=60, max_entries=8, clock=Clock())
+    token_generation, _ = cache.get("bot-token")
+    other_generation, _ = cache.get("other")
+    cache.put("bot-token", token_generation, "old")
+
+    # A reader that loaded the value before the rotation must not cache it.
+    cache.invalidate("bot-token")
+    cache.put("bot-token", token_generation, "old")
+    assert cache.get("bot-token")[1] is None
+    cache.put("other", other_generation, "kept")
+    assert cache.get("other")[1] == "kept"
+
+    cache.clear()
+    cache.put("other", other_generation, "stale")
+    assert cache.get("other")[1] is None
+
+    generation, _ = cache.get("bot-token")
+    cache.put("bot-token", generation, "new")
+    assert cache.get("bot-token") == (generation, "new")
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TtlCache(ttl_seconds=60, max_entries=2, clock=Clock())
+    for name in ("a", "b"):
+        cache.put(name, cache.get(name)[0], name.upper())
+    cache.get("a")
+    cache.put("c", cache.get("c")[0], "C")
+
+    assert cache.get("b")[1] is None
+    assert cache.get("a")[1] == "A"
+    assert cache.get("c")[1] == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_ttl_disables_caching():
+    cache = TtlCache(ttl_seconds=0, max_entries=8, clock=Clock())
+    cache.put("bot-token", cache.get("bot-token")[0], "value")
+
+    assert cache.get("bot-token")[1] is None
+    assert cache.stats()["entries"] == 0
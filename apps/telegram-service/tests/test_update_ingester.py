@@ -0,0 +1,239 @@
+import asyncio
+
+import pytest
+
+from telegram_service import update_ingester as ingester_module
+from telegram_service.context_cache import ConnectionSnapshot, ContextSnapshot
+from telegram_service.models import (
+    ConnectionType,
+    ContextMode,
+    InboxUpdate,
+    MessagingContext,
+    TelegramConnection,
+    User,
+)
+from telegram_service.routers import runtime_gateway
+from telegram_service.update_ingester import (
+    UpdateIngester,
+    read_inbox,
+    store_updates,
+)
+
+
+def _update(update_id, chat_id="100", text="hi"):
+    return {
+        "update_id": update_id,
+        "message": {"message_id": update_id, "chat": {"id": chat_id}, "text": text},
+    }
+
+
+@pytest.fixture
+def seeded(session_factory):
+    db = session_factory()
+    owner = User(username="owner", is_active=True)
+    connection = TelegramConnection(
+        name="alerts-bot",
+        type=ConnectionType.bot,
+        owner=owner,
+        secret_ref_token="managed://alerts-bot",
+    )
+    contexts = {
+        name: MessagingContext(
+            connection=connection, name=name, mode=mode, chat_id=chat_id
+        )
+        for name, mode, chat_id in [
+            ("ops", ContextMode.send_receive, "100"),
+            ("audit", ContextMode.receive_only, "100"),
+            ("alerts", ContextMode.send_only, "100"),
+            ("other", ContextMode.send_receive, "200"),
+        ]
+    }
+    db.add_all([owner, connection, *contexts.values()])
+    db.commit()
+    ids = {name: context.id for name, context in contexts.items()}
+    ids["connection"] = connection.id
+    db.close()
+    return ids
+
+
+def _inbox(db, context_id):
+    return [
+        update_id
+        for (update_id,) in db.query(InboxUpdate.update_id)
+        .filter(InboxUpdate.context_id == context_id)
+        .order_by(InboxUpdate.update_id)
+    ]
+
+
+def _snapshots(seeded, name="ops"):
+    return (
+        ContextSnapshot(id=seeded[name], mode=ContextMode.send_receive, chat_id="100"),
+        ConnectionSnapshot(
+            id=seeded["connection"],
+            type=ConnectionType.bot,
+            secret_ref_token="managed://alerts-bot",
+            secret_ref_session=None,
+        ),
+    )
+
+
+def test_update_from_webhook_and_polling_is_stored_once(session_factory, seeded):
+    db = session_factory()
+    connection = db.get(TelegramConnection, seeded["connection"])
+
+    webhook, webhook_rows, _ = store_updates(db, connection, [_update(1)])
+    db.commit()
+    polled, polled_rows, _ = store_updates(
+        db, connection, [_update(1), _update(2, "200")]
+    )
+    db.commit()
+
+    assert webhook == {seeded["ops"], seeded["audit"]}
+    assert polled == {seeded["other"]}
+    assert (webhook_rows, polled_rows) == (2, 1)
+    assert _inbox(db, seeded["ops"]) == [1]
+    assert _inbox(db, seeded["audit"]) == [1]
+    assert _inbox(db, seeded["alerts"]) == []
+    assert _inbox(db, seeded["other"]) == [2]
+
+
+def test_concurrent_insert_loses_on_the_unique_constraint(session_factory, seeded):
+    db = session_factory()
+    connection = db.get(TelegramConnection, seeded["connection"])
+    # Not flushed yet, so the pre-check misses it like a concurrent writer's row.
+    db.add(
+        InboxUpdate(
+            context_id=seeded["ops"],
+            connection_id=connection.id,
+            update_id=5,
+            payload="{}",
+        )
+    )
+
+    notified, stored, _ = store_updates(db, connection, [_update(5)])
+    db.commit()
+
+    assert notified == {seeded["audit"]}
+    assert stored == 1
+    assert _inbox(db, seeded["ops"]) == [5]
+    assert _inbox(db, seeded["audit"]) == [5]
+
+
+def test_read_inbox_cursor_and_next_offset(session_factory, seeded):
+    db = session_factory()
+    connection = db.get(TelegramConnection, seeded["connection"])
+    store_updates(db, connection, [_update(12), _update(10), _update(11)])
+    db.commit()
+    context, connection_snapshot = _snapshots(seeded)
+
+    def receive(offset):
+        return asyncio.run(
+            runtime_gateway._receive_from_inbox(
+                context, connection_snapshot, offset=offset, limit=2, wait=0, db=db
+            )
+        )
+
+    assert [u["update_id"] for u in read_inbox(db, seeded["ops"], None, 10)] == [
+        10,
+        11,
+        12,
+    ]
+    first = receive(None)
+    assert [u["update_id"] for u in first["provider_response"]["result"]] == [10, 11]
+    assert first["next_offset"] == 12
+    second = receive(first["next_offset"])
+    assert [u["update_id"] for u in second["provider_response"]["result"]] == [12]
+    assert second["next_offset"] == 13
+    empty = receive(second["next_offset"])
+    assert empty["provider_response"]["result"] == []
+    assert empty["next_offset"] == 13
+
+
+def test_wait_wakes_on_new_update_and_times_out_empty(
+    session_factory, seeded, monkeypatch
+):
+    ingester = UpdateIngester(session_factory=session_factory)
+    monkeypatch.setattr(runtime_gateway, "update_ingester", ingester)
+    context, connection = _snapshots(seeded)
+    db = session_factory()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        empty = await runtime_gateway._receive_from_inbox(
+            context, connection, offset=None, limit=10, wait=0.05, db=db
+        )
+        waited = loop.time() - started
+
+        reader = asyncio.create_task(
+            runtime_gateway._receive_from_inbox(
+                context, connection, offset=None, limit=10, wait=5, db=db
+            )
+        )
+        await asyncio.sleep(0.01)
+        ingester.notify(ingester._ingest(seeded["connection"], [_update(7)]))
+        woken = await asyncio.wait_for(reader, timeout=1)
+        return empty, waited, woken
+
+    empty, waited, woken = asyncio.run(run())
+
+    assert empty["provider_response"]["result"] == []
+    assert empty["next_offset"] is None
+    assert waited >= 0.05
+    assert [u["update_id"] for u in woken["provider_response"]["result"]] == [7]
+    assert woken["next_offset"] == 8
+
+
+def test_inbox_rows_counts_inserted_rows(session_factory, seeded):
+    ingester = UpdateIngester(session_factory=session_factory)
+
+    notified = ingester._ingest(seeded["connection"], [_update(30), _update(31)])
+    ingester._ingest(seeded["connection"], [_update(31)])
+
+    assert notified == {seeded["ops"], seeded["audit"]}
+    # Two updates copied into both receiving contexts for chat 100, once.
+    assert ingester.stats()["inbox_rows"] == 4
+
+
+class FakeBotApi:
+    def __init__(self, batches):
+        self.batches = batches
+        self.offsets = []
+
+    async def get_updates(self, token, offset=None, limit=50, timeout=1):
+        self.offsets.append(offset)
+        return {"ok": True, "result": self.batches.pop(0)}
+
+
+def test_offset_moves_only_after_the_inbox_commit(
+    session_factory, seeded, monkeypatch
+):
+    batch = [_update(20), _update(21)]
+    api = FakeBotApi([list(batch), list(batch), []])
+    monkeypatch.setattr(ingester_module, "bot_api", api)
+    monkeypatch.setattr(ingester_module, "resolve_secret", lambda ref, db: "token")
+    failing = {"commit": True}
+
+    def factory():
+        db = session_factory()
+        if failing["commit"]:
+
+            def commit():
+                raise RuntimeError("database is locked")
+
+            db.commit = commit
+        return db
+
+    ingester = UpdateIngester(session_factory=factory)
+    connection_id = seeded["connection"]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ingester.poll_once(connection_id))
+    assert ingester.stats()["connections"][str(connection_id)]["next_offset"] is None
+
+    failing["commit"] = False
+    assert asyncio.run(ingester.poll_once(connection_id))
+    assert asyncio.run(ingester.poll_once(connection_id))
+
+    assert api.offsets == [None, None, 22]
+    assert _inbox(session_factory(), seeded["ops"]) == [20, 21]